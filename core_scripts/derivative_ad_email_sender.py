@@ -23,6 +23,8 @@ import argparse
 import time
 import uuid
 
+from derivative_email_validation import clean_email_address
+
 # ログ設定
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -37,46 +39,7 @@ class AdEmailSender:
 
     def clean_email_address(self, email):
         """メールアドレスをクリーニング（@より後ろの不要な部分を削除）"""
-        if not email:
-            return email
-
-        # 文字列として処理
-        email_str = str(email).strip()
-
-        # 引用符で囲まれている場合の処理
-        if email_str.startswith('"') and '"' in email_str[1:]:
-            # "HUGAN JOB <client@hugan.co.jp>"@www4009.sakura.ne.jp のような形式
-            quote_end = email_str.find('"', 1)
-            if quote_end > 0:
-                quoted_part = email_str[1:quote_end]
-                # <email@domain> の形式を抽出
-                if '<' in quoted_part and '>' in quoted_part:
-                    start = quoted_part.find('<') + 1
-                    end = quoted_part.find('>')
-                    if start > 0 and end > start:
-                        return quoted_part[start:end]
-
-        # @マークで分割
-        parts = email_str.split('@')
-        if len(parts) < 2:
-            return email_str
-
-        local_part = parts[0]
-        domain_part = parts[1]
-
-        # ドメイン部分から不要な文字を削除
-        # 例: "client@hugan.co.jp"@www4009.sakura.ne.jp -> client@hugan.co.jp
-        if '"' in domain_part:
-            domain_part = domain_part.split('"')[0]
-
-        # 複数の@がある場合の処理（最初のドメインのみ使用）
-        if '@' in domain_part:
-            domain_part = domain_part.split('@')[0]
-
-        # 空白文字を除去
-        domain_part = domain_part.strip()
-
-        return f"{local_part}@{domain_part}"
+        return clean_email_address(email)
 
     def html_to_plain_text(self, html_content):
         """HTMLコンテンツをプレーンテキストに変換"""
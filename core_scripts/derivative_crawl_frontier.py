@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+非同期クロールフロンティア（関連ページの優先度付き並列探索）
+- 1つのイベントループ（専用スレッド）で複数サイトの探索を同時に実行
+- 探索順は ページ種別（お問い合わせ > 会社概要 > 採用情報 > その他）→ キーワードスコア の優先度順
+- URLは正規化（フラグメント・既定ポート・www.・index.html・計測用パラメータを除去）してから重複判定
+- 同一ホストへの同時取得数を全サイト共通で制限
+- 高品質なメールアドレスが見つかった時点で残りの取得をキャンセル
+- 企業ごとの期限（秒）を超えたら探索を打ち切る
+
+ページの取得・解析は同期処理（requests / BeautifulSoup）のため、スレッドプールで実行する。
+キャンセルされた取得のうち未開始のものは実行されず、実行中のものは完了を待ってから結果を破棄する
+（抽出器の訪問済みURL等の状態を、探索の終了後に書き換えないようにするため）。
+
+使用例:
+    result = CRAWL_ENGINE.crawl(extractor, base_url, seeds=[(url, priority)], max_pages=5)
+"""
+
+import re
+import heapq
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+# ページ種別ごとのキーワード（URL・リンクテキストの小文字に対して部分一致）
+HIGH_VALUE_PAGE_KEYWORDS = {
+    # 最優先: お問い合わせページ
+    'contact': ['contact', 'inquiry', 'お問い合わせ', 'お問合せ', 'お問合わせ', 'お問い合せ', 'inquiries', 'contact us', 'toiawase', 'otoiawase', 'mail', 'email', 'メール'],
+
+    # 次点: 会社概要ページ
+    'about': ['about', 'company', 'profile', 'corporate', '会社概要', '企業情報', '会社情報', 'about us', 'company profile', 'corporate profile', '会社案内'],
+
+    # 採用情報ページ（高優先度）
+    'recruit': ['recruit', 'careers', 'jobs', 'recruitment', 'career', '採用', '採用情報', '求人', '募集', '募集要項', 'キャリア'],
+
+    # その他の重要ページ
+    'other_important': ['privacy', 'terms', 'ir', 'news', 'ニュース', 'プライバシー', 'サイトマップ', 'ブログ', 'privacy policy']
+}
+
+# ページ種別ごとのキーワードの一括判定用パターン（いずれかのキーワードを含むか）
+HIGH_VALUE_PAGE_PATTERNS = {
+    page_type: re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+    for page_type, keywords in HIGH_VALUE_PAGE_KEYWORDS.items()
+}
+
+# 探索順のページ種別の順位（大きいほど先に探索）
+# 探索を開始するトップページ（homepage）は採用情報ページと同じ順位
+PAGE_TYPE_RANKS = {'contact': 3, 'about': 2, 'recruit': 1, 'homepage': 1, 'other_important': 0}
+
+# 同じ順位の中でのキーワードスコアの最大値（順位 × この値 + スコア を優先度とする）
+RANK_WEIGHT = 100
+
+# 重複判定で無視するクエリパラメータ（計測用）
+TRACKING_PARAMS = {'fbclid', 'gclid', 'yclid', 'msclkid', '_ga', 'ref'}
+
+# トップページと同じとみなすファイル名
+INDEX_FILES = {'index.html', 'index.htm', 'index.php', 'default.html', 'default.htm', 'default.aspx'}
+
+# 既定値
+DEFAULT_FETCH_THREADS = 32
+DEFAULT_MAX_PER_HOST = 1
+DEFAULT_CRAWL_DEADLINE = 60
+
+
+def canonicalize_url(url, base_url=None):
+    """重複判定用にURLを正規化
+
+    - 相対URLは base_url で解決し、フラグメントを除去
+    - スキーム（http/https）・既定ポート・先頭の www. は区別しない、ホスト名は小文字
+    - 末尾のスラッシュ・index.html 等は除去、空のパスは "/"
+    - utm_* などの計測用パラメータを除去し、残りのパラメータは並べ替え
+    """
+    if base_url:
+        url = urljoin(base_url, url)
+    try:
+        parts = urlsplit(url.strip())
+        host = (parts.hostname or '').lower().rstrip('.')
+    except ValueError:
+        return url
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    segments = parts.path.split('/')
+    if segments and segments[-1].lower() in INDEX_FILES:
+        segments[-1] = ''
+    path = '/'.join(segments).rstrip('/') or '/'
+
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS]
+    return urlunsplit(('', host, path, urlencode(sorted(query)), ''))
+
+
+def classify_page(url, link_text=''):
+    """URL・リンクテキストからページ種別を判定（該当しない場合は None）"""
+    url_lower = url.lower()
+    link_text_lower = (link_text or '').lower()
+    for text in (url_lower, link_text_lower):
+        for page_type, pattern in HIGH_VALUE_PAGE_PATTERNS.items():
+            if pattern.search(text):
+                return page_type
+    return None
+
+
+def crawl_priority(url, link_text='', score=0, page_type=None):
+    """探索の優先度（ページ種別の順位が優先、同じ順位ならキーワードスコアの高い順）"""
+    page_type = page_type or classify_page(url, link_text)
+    return PAGE_TYPE_RANKS.get(page_type, 0) * RANK_WEIGHT + min(score, RANK_WEIGHT - 1)
+
+
+class CrawlFrontier:
+    """優先度付きの探索予定URL（正規化URLで重複を除外）"""
+
+    def __init__(self):
+        self._heap = []
+        self._seen = set()
+        self._counter = 0
+
+    def push(self, url, priority):
+        """未登録のURLを追加（追加した場合は True）"""
+        key = canonicalize_url(url)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        # 同じ優先度は追加順
+        heapq.heappush(self._heap, (-priority, self._counter, url))
+        self._counter += 1
+        return True
+
+    def pop(self):
+        """最も優先度の高いURLを (優先度, URL) で取り出す"""
+        priority, _, url = heapq.heappop(self._heap)
+        return -priority, url
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class CrawlEngine:
+    """共有イベントループで複数サイトの探索を実行するエンジン（スレッドセーフ）"""
+
+    def __init__(self, fetch_threads=DEFAULT_FETCH_THREADS, max_per_host=DEFAULT_MAX_PER_HOST):
+        self.fetch_threads = fetch_threads
+        self.max_per_host = max(1, max_per_host)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=fetch_threads, thread_name_prefix='crawl-fetch')
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        # ホスト → asyncio.Semaphore（イベントループのスレッドからのみ参照）
+        self._host_semaphores = {}
+
+        self._stats_lock = threading.Lock()
+        self.crawls = 0
+        self.pages = 0
+        self.cancelled = 0
+        self.timeouts = 0
+        self.active_crawls = 0
+        self.peak_active_crawls = 0
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name='crawl-loop', daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + amount)
+            if name == 'active_crawls':
+                self.peak_active_crawls = max(self.peak_active_crawls, self.active_crawls)
+
+    def crawl(self, extractor, base_url, seeds, max_pages=15, max_workers=5, deadline=DEFAULT_CRAWL_DEADLINE,
+              stop_when=None):
+        """1サイトを探索（呼び出し元のスレッドで完了を待つ）
+
+        Args:
+            extractor: process_page(url, base_url) を持つ抽出器（企業ごとの状態を持つ）
+            base_url: 探索するサイトのURL（同じドメインのリンクのみ追加）
+            seeds: 初期URLのリスト [(URL, 優先度), ...]
+            max_pages: 取得する最大ページ数
+            max_workers: このサイトで同時に取得するページ数
+            deadline: 探索の期限（秒）。None の場合は期限なし
+            stop_when: 抽出済みメールアドレスのリストを受け取り、探索を終了するか判定する関数
+
+        Returns:
+            dict: emails / pages / cancelled / timed_out
+        """
+        loop = self._ensure_loop()
+        coroutine = self.crawl_async(extractor, base_url, seeds, max_pages, max_workers, deadline, stop_when)
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def crawl_many(self, jobs, **options):
+        """複数サイトを同じイベントループで同時に探索
+
+        Args:
+            jobs: [(抽出器, base_url, seeds), ...]（抽出器はサイトごとに別のインスタンス）
+            options: crawl() と同じ探索設定
+
+        Returns:
+            list: 各サイトの探索結果（jobs と同じ順）
+        """
+        loop = self._ensure_loop()
+
+        async def run_all():
+            return await asyncio.gather(*(
+                self.crawl_async(extractor, base_url, seeds, **options) for extractor, base_url, seeds in jobs
+            ))
+
+        return asyncio.run_coroutine_threadsafe(run_all(), loop).result()
+
+    async def _fetch_page(self, extractor, url, base_url, executions):
+        host = (urlsplit(url).hostname or '').lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        async with semaphore:
+            # スレッドプールでの実行を記録し、キャンセル後も実行中のものは探索の終了時に完了を待つ
+            execution = self._executor.submit(extractor.process_page, url, base_url)
+            executions.append(execution)
+            return await asyncio.wrap_future(execution)
+
+    async def crawl_async(self, extractor, base_url, seeds, max_pages=15, max_workers=5,
+                          deadline=DEFAULT_CRAWL_DEADLINE, stop_when=None):
+        """1サイトの探索（イベントループ上で実行）"""
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + deadline if deadline is not None else None
+        frontier = CrawlFrontier()
+        for url, priority in seeds:
+            frontier.push(url, priority)
+
+        emails = []
+        in_flight = {}
+        executions = []
+        pages = 0
+        started = 0
+        stopped = False
+        timed_out = False
+        self._count('crawls')
+        self._count('active_crawls')
+
+        try:
+            while not stopped:
+                while len(in_flight) < max(1, max_workers) and frontier and started < max_pages:
+                    _, url = frontier.pop()
+                    started += 1
+                    in_flight[asyncio.ensure_future(self._fetch_page(extractor, url, base_url, executions))] = url
+                if not in_flight:
+                    break
+
+                timeout = None
+                if expires_at is not None:
+                    timeout = expires_at - loop.time()
+                    if timeout <= 0:
+                        timed_out = True
+                        break
+
+                done, _ = await asyncio.wait(in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    timed_out = True
+                    break
+
+                for task in done:
+                    url = in_flight.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.warning(f"ページ {url} の処理中にエラー: {e}")
+                        continue
+                    pages += 1
+                    emails.extend(result.get('emails', []))
+                    if stop_when is not None and stop_when(emails):
+                        stopped = True
+                        break
+                    for priority, link in result.get('links', []):
+                        frontier.push(link, priority)
+        finally:
+            # 残りの取得をキャンセル（未開始のものは実行されない）
+            cancelled = len(in_flight)
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+            # 実行中の process_page は中断できないため、完了を待ってから戻る（次の企業と抽出器の状態を共有しない）
+            running = [execution for execution in executions if not execution.done()]
+            if running:
+                await asyncio.gather(*(asyncio.wrap_future(execution) for execution in running), return_exceptions=True)
+            self._count('pages', pages)
+            self._count('cancelled', cancelled)
+            self._count('timeouts', 1 if timed_out else 0)
+            self._count('active_crawls', -1)
+
+        if timed_out:
+            logger.info(f"探索の期限（{deadline}秒）に達したため打ち切りました: {base_url}")
+        return {'emails': emails, 'pages': pages, 'cancelled': cancelled, 'timed_out': timed_out,
+                'stopped_early': stopped}
+
+    def get_stats(self):
+        with self._stats_lock:
+            return {
+                'crawls': self.crawls,
+                'pages': self.pages,
+                'cancelled': self.cancelled,
+                'timeouts': self.timeouts,
+                'peak_active_crawls': self.peak_active_crawls,
+                'fetch_threads': self.fetch_threads,
+                'max_per_host': self.max_per_host
+            }
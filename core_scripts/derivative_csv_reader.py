@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+入力CSVの共通ストリーミングリーダー
+- エンコーディングはファイル先頭のサンプル（BOM → 先頭N KB）のみで判定
+- 本文は厳密にデコードし、サンプル外で判定と合わないバイトが見つかった場合は
+  ファイル全体から再判定（行を返す前）するか、CsvEncodingErrorで読み込みを中断する
+- 行はチャンク単位で逐次読み込み、ファイル全体をメモリに載せない
+- 読み込みバイト数に基づく進捗通知に対応
+- ダッシュボードのCSVインポートとメールアドレス抽出の企業リスト読み込みで共用
+"""
+
+import io
+import os
+import csv
+import codecs
+import logging
+from itertools import islice
+
+logger = logging.getLogger(__name__)
+
+# エンコーディング判定に使うサンプルサイズ（バイト）
+DEFAULT_SAMPLE_SIZE = 64 * 1024
+
+# サンプルがASCIIのみだった場合に追加で読む上限（バイト）
+MAX_SAMPLE_SIZE = 1024 * 1024
+
+# 1チャンクあたりの行数
+DEFAULT_CHUNK_ROWS = 1000
+
+# ファイル全体からの再判定で1回に読むバイト数
+RESNIFF_BLOCK_SIZE = 1024 * 1024
+
+# BOMとエンコーディングの対応（長いBOMから判定）
+BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# BOMがない場合に順に試すエンコーディング
+# （cp932はshift_jisの上位互換のため、shift_jisは個別に試さない）
+CANDIDATE_ENCODINGS = ('utf-8', 'cp932', 'euc_jp')
+
+
+class CsvEncodingError(ValueError):
+    """判定したエンコーディングでデコードできないバイトがあり、読み込みを続けられない"""
+
+    def __init__(self, file_path, encoding, bytes_read, suggested_encoding=None):
+        self.file_path = file_path
+        self.encoding = encoding
+        self.bytes_read = bytes_read
+        self.suggested_encoding = suggested_encoding
+        message = f"{file_path} をエンコーディング {encoding} でデコードできません（{bytes_read}バイト以降）"
+        if suggested_encoding:
+            message += f"。ファイル全体は {suggested_encoding} で読み込めます（エンコーディングを指定して再実行してください）"
+        else:
+            message += "。対応するエンコーディングが見つかりません（ファイルが破損している可能性があります）"
+        super().__init__(message)
+
+
+def _decodes(sample, encoding, final):
+    """サンプルが指定エンコーディングで厳密にデコードできるか（末尾の途切れた文字は許容）"""
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+        decoder.decode(sample, final=final)
+        return True
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+
+def read_sample(file_path, sample_size=DEFAULT_SAMPLE_SIZE, max_sample_size=MAX_SAMPLE_SIZE):
+    """エンコーディング判定用のサンプルを読み込む
+
+    先頭sample_sizeバイトがASCIIのみの場合は、非ASCII文字が現れるか
+    max_sample_sizeに達するまで追加で読み込む。
+
+    Returns:
+        tuple: (サンプルのバイト列, ファイル末尾まで読んだかどうか)
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+        while sample.isascii() and len(sample) < max_sample_size:
+            more = f.read(sample_size)
+            if not more:
+                return sample, True
+            sample += more
+        return sample, not f.read(1)
+
+
+def detect_encoding(file_path, sample_size=DEFAULT_SAMPLE_SIZE):
+    """ファイル先頭のサンプルからエンコーディングを判定
+
+    判定順: BOM → ISO-2022-JPのエスケープシーケンス → chardet（利用可能な場合）→ 候補エンコーディング
+
+    Returns:
+        str: エンコーディング名（判定できない場合は 'utf-8'）
+    """
+    sample, complete = read_sample(file_path, sample_size)
+
+    for bom, encoding in BOM_ENCODINGS:
+        if sample.startswith(bom):
+            return encoding
+
+    if not sample or sample.isascii():
+        # ISO-2022-JPは7bitのため、エスケープシーケンスの有無で判定
+        if b'\x1b$B' in sample or b'\x1b$@' in sample:
+            return 'iso2022_jp'
+        return 'utf-8'
+
+    try:
+        import chardet
+        detected = chardet.detect(sample)
+        encoding = detected.get('encoding')
+        if encoding and detected.get('confidence', 0) > 0.7 and _decodes(sample, encoding, complete):
+            logger.debug(f"chardetによる検出結果: {encoding} (信頼度: {detected['confidence']:.2f})")
+            return encoding.lower()
+    except ImportError:
+        pass
+
+    for encoding in CANDIDATE_ENCODINGS:
+        if _decodes(sample, encoding, complete):
+            return encoding
+
+    logger.warning(f"エンコーディングを判定できませんでした。UTF-8で読み込みます: {file_path}")
+    return 'utf-8'
+
+
+def detect_encoding_full(file_path, exclude=None):
+    """ファイル全体を厳密にデコードできるエンコーディングを判定（サンプルでの判定が外れた場合の再判定用）
+
+    候補エンコーディングをファイル先頭から並行して試し、最初に全体をデコードできたものを返す。
+
+    Returns:
+        str: エンコーディング名（どの候補でもデコードできない場合は None）
+    """
+    decoders = {encoding: codecs.getincrementaldecoder(encoding)(errors='strict')
+                for encoding in CANDIDATE_ENCODINGS if encoding != exclude}
+    with open(file_path, 'rb') as f:
+        while decoders:
+            block = f.read(RESNIFF_BLOCK_SIZE)
+            final = not block
+            for encoding, decoder in list(decoders.items()):
+                try:
+                    decoder.decode(block, final=final)
+                except UnicodeDecodeError:
+                    del decoders[encoding]
+            if final:
+                break
+    for encoding in CANDIDATE_ENCODINGS:
+        if encoding in decoders:
+            return encoding
+    return None
+
+
+def apply_column_mapping(rows, column_mapping):
+    """列マッピング（{項目名: 列番号}）をチャンクの各行に適用して辞書のリストを返す
+
+    列番号がNoneの項目や列が不足している行は空文字になる。
+    """
+    mapped_rows = []
+    for row in rows:
+        mapped = {}
+        for key, index in column_mapping.items():
+            mapped[key] = row[index].strip() if index is not None and index < len(row) else ''
+        mapped_rows.append(mapped)
+    return mapped_rows
+
+
+class CsvInputReader:
+    """入力CSVをチャンク単位で逐次読み込むリーダー
+
+    使用例:
+        reader = CsvInputReader(path, progress_callback=print_progress)
+        header = reader.header
+        for chunk in reader.iter_chunks():
+            ...
+    """
+
+    def __init__(self, file_path, encoding=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+                 sample_size=DEFAULT_SAMPLE_SIZE, progress_callback=None):
+        """
+        Args:
+            file_path: CSVファイルのパス
+            encoding: エンコーディング（省略時はサンプルから判定）
+            chunk_rows: 1チャンクあたりの行数
+            progress_callback: チャンクごとに呼ばれる関数 (rows_read, bytes_read, total_bytes)
+        """
+        self.file_path = file_path
+        self.encoding = encoding or detect_encoding(file_path, sample_size)
+        self.chunk_rows = chunk_rows
+        self.progress_callback = progress_callback
+        self.total_bytes = os.path.getsize(file_path)
+        self.rows_read = 0
+        self.bytes_read = 0
+        self._header = None
+
+    def _open(self):
+        raw = open(self.file_path, 'rb')
+        # 不正なバイトは置換せずにエラーにする（文字化けした行を取り込まない）
+        text = io.TextIOWrapper(raw, encoding=self.encoding, errors='strict', newline='')
+        return raw, text
+
+    def _resniff(self, error):
+        """デコードエラー時にファイル全体からエンコーディングを再判定して切り替える（判定できない場合は送出）"""
+        suggested = detect_encoding_full(self.file_path, exclude=self.encoding)
+        if suggested is None:
+            raise CsvEncodingError(self.file_path, self.encoding, self.bytes_read) from error
+        logger.warning(f"エンコーディング {self.encoding} でデコードできないため {suggested} で読み直します: "
+                       f"{self.file_path} ({error})")
+        self.encoding = suggested
+
+    def _read_with_resniff(self, read):
+        """一度で読み切る処理（ヘッダー・プレビュー）を、デコードエラー時は再判定して1回だけやり直す"""
+        try:
+            return read()
+        except UnicodeDecodeError as e:
+            self._resniff(e)
+            return read()
+
+    @property
+    def header(self):
+        """ヘッダー行（列名のリスト）"""
+        if self._header is None:
+            def read():
+                raw, text = self._open()
+                with text:
+                    return next(csv.reader(text), [])
+            self._header = self._read_with_resniff(read)
+        return self._header
+
+    def _report_progress(self, raw):
+        self.bytes_read = raw.tell()
+        if self.progress_callback:
+            try:
+                self.progress_callback(self.rows_read, self.bytes_read, self.total_bytes)
+            except Exception as e:
+                logger.warning(f"進捗通知エラー: {e}")
+
+    def _iter(self, make_reader, skip_header):
+        """チャンクを返す（最初のチャンクを返す前のデコードエラーは再判定して読み直し、以降は中断）"""
+        yielded = False
+        retried = False
+        while True:
+            try:
+                for chunk in self._iter_once(make_reader, skip_header):
+                    yielded = True
+                    yield chunk
+                return
+            except UnicodeDecodeError as e:
+                if yielded or retried:
+                    # 返した行を取り消せないため、別のエンコーディングでの読み直しはしない
+                    raise CsvEncodingError(self.file_path, self.encoding, self.bytes_read,
+                                           detect_encoding_full(self.file_path, exclude=self.encoding)) from e
+                self._resniff(e)
+                retried = True
+
+    def _iter_once(self, make_reader, skip_header):
+        raw, text = self._open()
+        with text:
+            reader = make_reader(text)
+            if skip_header:
+                self._header = next(reader, [])
+            else:
+                self._header = reader.fieldnames or []
+            self.rows_read = 0
+            while True:
+                chunk = list(islice(reader, self.chunk_rows))
+                if not chunk:
+                    break
+                self.rows_read += len(chunk)
+                self._report_progress(raw)
+                yield chunk
+
+    def iter_chunks(self):
+        """データ行（ヘッダー除く）を行リストのチャンクで返す"""
+        return self._iter(csv.reader, skip_header=True)
+
+    def iter_dict_chunks(self):
+        """データ行を csv.DictReader 形式の辞書のチャンクで返す（空行は含まない）"""
+        return self._iter(csv.DictReader, skip_header=False)
+
+    def iter_mapped_chunks(self, column_mapping):
+        """列マッピングを適用した (行リスト, 項目辞書リスト) のチャンクを返す"""
+        for chunk in self.iter_chunks():
+            yield chunk, apply_column_mapping(chunk, column_mapping)
+
+    def read_head(self, max_rows):
+        """先頭max_rows行（ヘッダー含む）を読み込む（プレビュー用）"""
+        def read():
+            raw, text = self._open()
+            with text:
+                return list(islice(csv.reader(text), max_rows))
+        return self._read_with_resniff(read)
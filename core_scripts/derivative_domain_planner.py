@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+ドメイン単位の処理計画（同じサイトを持つ企業の重複クロール防止）
+- 企業行をウェブサイトの正規化ドメインでグループ化し、抽出・分析はグループごとに1回だけ実行
+- 同じドメインでも別の企業（グループ会社が親会社のサイト内に持つページなど）はまとめない。
+  企業名が同じ行か、代表URLのディレクトリの配下にあるURLの行だけを同じグループにする
+- 結果はグループ内のすべての企業IDに展開（企業名・ID・元URLなど企業ごとの項目は各企業の値）
+- 企業ごとの個別指定（CSVに記載された担当者メールアドレスなど）がある行はグループに含めない
+- URLがない行・ホスティングサービスで利用者を特定できない行もグループに含めず、呼び出し側で従来どおり1行ずつ処理する
+
+クロール量は行数ではなくユニークドメイン数に比例する。
+
+使用例:
+    plan = plan_by_domain(companies, get_url=lambda c: c['URL'], get_name=lambda c: c['企業名'])
+    for group in plan.groups:
+        result = extract(group.url)
+        for company in group.members:
+            ...
+"""
+
+import re
+import math
+import logging
+import unicodedata
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger(__name__)
+
+# URLが未入力であることを示す値
+EMPTY_URL_VALUES = {'', '-', '‐', 'nan', 'none', 'null'}
+
+# 1つのドメインで複数の利用者のページを提供するサービス（利用者を示すパスまでを区別する）
+# host: (利用者を示すパスの既定の深さ, {先頭のパス: 深さ})
+#   深さ 0 は利用者を特定できないパス（投稿・検索・共有など）。利用者を特定できないURLはグループ化しない
+PATH_HOSTED_DOMAINS = {
+    'sites.google.com': (0, {'view': 2, 'site': 2, 'a': 3}),
+    'note.com': (1, {}),
+    'ameblo.jp': (1, {}),
+    'facebook.com': (1, {'pages': 2, 'groups': 2, 'people': 2, 'pg': 2,
+                         'p': 0, 'watch': 0, 'share': 0, 'sharer': 0, 'sharer.php': 0, 'events': 0,
+                         'photo': 0, 'photo.php': 0, 'story.php': 0, 'permalink.php': 0,
+                         'hashtag': 0, 'login': 0, 'marketplace': 0, 'profile.php': 0}),
+    'instagram.com': (1, {'stories': 2, 'p': 0, 'reel': 0, 'reels': 0, 'tv': 0, 'explore': 0,
+                          'accounts': 0, 'direct': 0}),
+    'twitter.com': (1, {'i': 0, 'intent': 0, 'search': 0, 'hashtag': 0, 'home': 0, 'share': 0}),
+    'x.com': (1, {'i': 0, 'intent': 0, 'search': 0, 'hashtag': 0, 'home': 0, 'share': 0}),
+    'linkedin.com': (0, {'company': 2, 'in': 2, 'school': 2, 'showcase': 2}),
+    'youtube.com': (1, {'channel': 2, 'c': 2, 'user': 2, 'watch': 0, 'shorts': 0, 'embed': 0,
+                        'results': 0, 'playlist': 0}),
+    'tiktok.com': (1, {'tag': 0, 'discover': 0, 'search': 0}),
+}
+
+# 利用者のページの下位をパスではなくクエリで示すパス（facebook.com/profile.php?id=...）
+QUERY_TENANT_PATHS = {'facebook.com': ('profile.php', 'id')}
+
+# 企業名の比較で無視する法人格の表記（NFKC正規化後）
+LEGAL_FORM_PATTERN = re.compile(
+    r'株式会社|有限会社|合同会社|合資会社|合名会社|\(株\)|\(有\)|\(同\)|'
+    r'\b(?:co\.?,?\s*ltd|inc|corp(?:oration)?|llc)\b\.?',
+    re.IGNORECASE)
+
+
+def normalize_company_name(name):
+    """企業名を同じ企業かどうかの比較用に正規化（NFKC・小文字・法人格と空白・記号を除去）
+
+    Returns:
+        str or None: 正規化した企業名（空の場合は None）
+    """
+    if name is None or (isinstance(name, float) and math.isnan(name)):
+        return None
+    name = unicodedata.normalize('NFKC', str(name)).lower()
+    name = LEGAL_FORM_PATTERN.sub('', name)
+    name = re.sub(r'[\s・.,、。\-‐]+', '', name)
+    return name or None
+
+
+def normalize_site_domain(url):
+    """ウェブサイトURLをグループ化用のキー（小文字・www.除去のホスト名）に正規化
+
+    ホスティングサービス（PATH_HOSTED_DOMAINS）は利用者を示すパスまでを含めて区別する
+    （sites.google.com/view/<サイト名>、facebook.com/<アカウント> など）。
+
+    Returns:
+        str or None: 正規化したキー（URLが空・解析できない場合、ホスティングサービスで利用者を特定できない場合は None）
+    """
+    if url is None or (isinstance(url, float) and math.isnan(url)):
+        return None
+    url = str(url).strip()
+    if url.lower() in EMPTY_URL_VALUES:
+        return None
+    if '://' not in url:
+        url = 'https://' + url.lstrip('/')
+
+    try:
+        parts = urlsplit(url)
+        host = (parts.hostname or '').rstrip('.')
+    except ValueError:
+        return None
+    if not host or '.' not in host:
+        return None
+    if host.startswith('www.'):
+        host = host[4:]
+
+    if host in PATH_HOSTED_DOMAINS:
+        return _hosted_tenant_key(host, parts)
+    return host
+
+
+def _hosted_tenant_key(host, parts):
+    """ホスティングサービスのURLを利用者単位のキーに正規化（利用者を特定できない場合は None）"""
+    segments = [segment.lower() for segment in parts.path.split('/') if segment]
+    if not segments:
+        return None
+
+    query_tenant = QUERY_TENANT_PATHS.get(host)
+    if query_tenant and segments[0] == query_tenant[0]:
+        values = parse_qs(parts.query).get(query_tenant[1])
+        return f"{host}/{segments[0]}?{query_tenant[1]}={values[0]}" if values and values[0] else None
+
+    default_depth, depths = PATH_HOSTED_DOMAINS[host]
+    depth = depths.get(segments[0], default_depth)
+    if depth == 0 or len(segments) < depth:
+        return None
+    return f"{host}/{'/'.join(segments[:depth])}"
+
+
+def _url_path(url):
+    try:
+        return urlsplit(url if '://' in url else 'https://' + url).path.lower()
+    except ValueError:
+        return ''
+
+
+def _path_segments(url):
+    return [segment for segment in _url_path(url).split('/') if segment]
+
+
+def _path_depth(url):
+    return len(_path_segments(url))
+
+
+def _directory_segments(url):
+    """URLのディレクトリ部分のパス（末尾がファイル名の場合は除く）"""
+    path = _url_path(url)
+    segments = [segment for segment in path.split('/') if segment]
+    if segments and not path.endswith('/') and '.' in segments[-1]:
+        segments = segments[:-1]
+    return segments
+
+
+class DomainGroup:
+    """同じドメインを持つ同じ企業のグループ"""
+
+    def __init__(self, key):
+        self.key = key
+        self.members = []
+        self.urls = []
+        self.names = set()
+
+    @property
+    def url(self):
+        """グループの代表URL（トップページに最も近いURL、同じ深さなら入力順で最初）"""
+        best = min(range(len(self.urls)), key=lambda i: (_path_depth(self.urls[i]), i))
+        return self.urls[best]
+
+    @property
+    def representative(self):
+        """代表URLを持つ企業"""
+        return self.members[self.urls.index(self.url)]
+
+    def __len__(self):
+        return len(self.members)
+
+    def accepts(self, url, name, root_depth):
+        """同じ企業の行か（企業名が同じ、または代表URLのディレクトリの配下のURL）
+
+        ドメインのトップ（ホスティングサービスでは利用者のトップ）はサイト全体を指すため、
+        代表URLがトップにある場合は企業名が同じ行だけを受け入れる。
+        """
+        if name is not None and name in self.names:
+            return True
+        directory = _directory_segments(self.url)
+        return len(directory) > root_depth and _path_segments(url)[:len(directory)] == directory
+
+
+class DomainPlan:
+    """ドメイン単位の処理計画"""
+
+    def __init__(self):
+        self.groups = []
+        self.domains = 0
+        # グループに含めない行: 個別指定あり / URLなし・利用者を特定できない
+        self.overridden = []
+        self.unplanned = []
+        self.rows = 0
+
+    @property
+    def duplicate_rows(self):
+        """グループ化により処理を省略できる行数"""
+        return sum(len(group) - 1 for group in self.groups)
+
+    def summary(self):
+        """計画の概要（ログ出力用）"""
+        return (f"{self.rows}行 → ユニークドメイン {self.domains}件・処理単位 {len(self.groups)}件"
+                f"（重複 {self.duplicate_rows}行を省略, 個別指定 {len(self.overridden)}行, URLなし等 {len(self.unplanned)}行）")
+
+
+def plan_by_domain(items, get_url, has_override=None, get_name=None):
+    """行をウェブサイトの正規化ドメインでグループ化
+
+    同じドメインの行でも、企業名が異なり代表URLのディレクトリの配下にないURLの行は
+    別のグループにする（同じホストに複数の法人のページがある場合に結果を混同しない）。
+
+    Args:
+        items: 企業行のリスト（任意の型）
+        get_url: 行からウェブサイトURLを取り出す関数
+        has_override: 行に個別指定があるか判定する関数（True の行はグループに含めない）
+        get_name: 行から企業名を取り出す関数（省略時は企業名を比較せずドメインだけでグループ化）
+
+    Returns:
+        DomainPlan: グループは最初に現れた順、各グループの企業は入力順
+    """
+    plan = DomainPlan()
+    # ドメインごとの (入力順, 行, URL)
+    by_domain = {}
+    for item in items:
+        plan.rows += 1
+        if has_override is not None and has_override(item):
+            plan.overridden.append(item)
+            continue
+
+        url = get_url(item)
+        key = normalize_site_domain(url)
+        if key is None:
+            plan.unplanned.append(item)
+            continue
+        by_domain.setdefault(key, []).append((plan.rows, item, str(url).strip()))
+
+    ordered = []
+    for key, rows in by_domain.items():
+        plan.domains += 1
+        if get_name is None:
+            group = DomainGroup(key)
+            for _, item, url in rows:
+                group.members.append(item)
+                group.urls.append(url)
+            ordered.append((rows[0][0], group))
+            continue
+
+        # トップページに近い行から順に、同じ企業のグループに入れる（最初の行がグループの代表になる）
+        root_depth = key.count('/')
+        groups = []
+        for position, item, url in sorted(rows, key=lambda row: (_path_depth(row[2]), row[0])):
+            name = normalize_company_name(get_name(item))
+            group = next((g for g, _ in groups if g.accepts(url, name, root_depth)), None)
+            if group is None:
+                group = DomainGroup(key)
+                groups.append((group, []))
+            entries = next(entries for g, entries in groups if g is group)
+            entries.append((position, item, url))
+            group.members.append(item)
+            group.urls.append(url)
+            if name is not None:
+                group.names.add(name)
+
+        for group, entries in groups:
+            entries.sort(key=lambda entry: entry[0])
+            group.members = [item for _, item, _ in entries]
+            group.urls = [url for _, _, url in entries]
+            ordered.append((entries[0][0], group))
+
+    plan.groups = [group for _, group in sorted(ordered, key=lambda entry: entry[0])]
+    logger.info(f"ドメイン単位の処理計画: {plan.summary()}")
+    return plan
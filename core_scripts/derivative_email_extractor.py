@@ -19,19 +19,38 @@ import sys
 import logging
 import requests
 import urllib.parse
-import dns.resolver
-import socket
-import smtplib
 import traceback
 import concurrent.futures
+import threading
 import warnings
+import copy
+import io
+from contextlib import contextmanager
 from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
 from typing import Dict, List, Any, Optional, Tuple, Set
 from datetime import datetime
 from urllib.parse import urljoin
-from queue import PriorityQueue, Queue
 from threading import Lock
 
+from derivative_csv_reader import CsvInputReader
+from derivative_http_session import HttpSessionPool
+from derivative_http_cache import CacheMissError, get_shared_cache, add_cache_arguments, apply_cache_arguments
+from derivative_parsed_document import ParsedDocument
+from derivative_email_scanner import EMAIL_SCANNER, BASIC_EMAIL_REGEX
+from derivative_email_validation import (EXTRACTION_RULES, STRICT_RULES, DISPOSABLE_DOMAINS, ROLE_BASED_PREFIXES,
+                                         EXAMPLE_DOMAINS, EXAMPLE_EMAILS, is_example_email)
+from derivative_mail_verifier import MailVerifier, new_smtp_result
+from derivative_domain_planner import plan_by_domain
+from derivative_extraction_checkpoint import (ExtractionCheckpoint, default_checkpoint_path,
+                                               DEFAULT_MAX_AGE_HOURS)
+from derivative_streaming_fetch import (StreamingFetcher, UnsupportedContentType, ERROR_BODY_BYTES,
+                                        DEFAULT_MAX_BODY_BYTES, DEFAULT_MAX_REDIRECTS)
+from derivative_sitemap_reader import SitemapReader
+from derivative_parse_pool import ParsePool, DEFAULT_PARSE_WORKERS
+from derivative_time_budget import CompanyDeadline, DeadlineExceeded, StageHistogram, DEFAULT_COMPANY_BUDGET
+from derivative_crawl_frontier import (CrawlEngine, HIGH_VALUE_PAGE_PATTERNS, DEFAULT_CRAWL_DEADLINE,
+                                       RANK_WEIGHT, crawl_priority)
+
 # XMLパースエラーの警告を無効化
 warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
 
@@ -69,63 +88,236 @@ USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 Edg/91.0.864.59'
 ]
 
-# 使い捨てメールドメインのリスト（一部）
-DISPOSABLE_DOMAINS = {
-    'mailinator.com', 'guerrillamail.com', 'temp-mail.org', 'disposablemail.com',
-    'tempmail.com', '10minutemail.com', 'yopmail.com', 'mailnesia.com',
-    'tempinbox.com', 'dispostable.com', 'sharklasers.com', 'grr.la',
-    'guerrillamail.info', 'guerrillamail.biz', 'guerrillamail.de',
-    'spam4.me', 'trashmail.com', 'mailcatch.com', 'anonbox.net',
-    'getairmail.com', 'mailexpire.com', 'tempmailaddress.com',
-    'fakeinbox.com', 'tempmailer.com', 'temp-mail.ru', 'throwawaymail.com'
-}
-
-# ロールベースメールプレフィックスのリスト
-ROLE_BASED_PREFIXES = [
-    'info', 'contact', 'inquiry', 'support', 'sales', 'webmaster', 'help',
-    'office', 'mail', 'postmaster', 'hostmaster', 'abuse', 'noc', 'security',
-    'marketing', 'hr', 'jobs', 'career', 'careers', 'recruit', 'recruitment',
-    'service', 'services', 'feedback', 'no-reply', 'noreply',
-    'no_reply', 'newsletter', 'press', 'media', 'billing', 'account', 'accounts'
-]
+# 同時接続数の既定値（全体 / 1ホストあたり）
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_MAX_PER_HOST = 1
+
+
+class HostRequestLimiter:
+    """HTTPリクエストの同時実行数を制限する（スレッドセーフ）
+
+    - 全体の同時接続数の上限（max_connections）
+    - 同一ホストへの同時リクエスト数の上限（max_per_host、既定は1）
+    複数企業を並列処理しても、1つのサイトに同時に複数のリクエストを送らない。
+    """
+
+    def __init__(self, max_connections=DEFAULT_MAX_CONNECTIONS, max_per_host=DEFAULT_MAX_PER_HOST):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self._global = threading.BoundedSemaphore(max_connections)
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.wait_seconds = 0.0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def _host_semaphore(self, host):
+        with self._lock:
+            semaphore = self._hosts.get(host)
+            if semaphore is None:
+                semaphore = self._hosts[host] = threading.BoundedSemaphore(self.max_per_host)
+            return semaphore
+
+    @contextmanager
+    def acquire(self, url):
+        """URLのホストと全体の枠を確保してからリクエストを実行する"""
+        host = urllib.parse.urlparse(url).netloc.lower()
+        host_semaphore = self._host_semaphore(host)
+        started = time.perf_counter()
+        # ホスト枠 → 全体枠の順に確保（全体枠を持ったままホスト待ちをしない）
+        host_semaphore.acquire()
+        self._global.acquire()
+        waited = time.perf_counter() - started
+        with self._lock:
+            self.request_count += 1
+            self.wait_seconds += waited
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._global.release()
+            host_semaphore.release()
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'requests': self.request_count,
+                'hosts': len(self._hosts),
+                'wait_seconds': self.wait_seconds,
+                'peak_in_flight': self.peak_in_flight,
+                'max_connections': self.max_connections,
+                'max_per_host': self.max_per_host
+            }
+
+
+# 同時に起動するブラウザ（動的メール抽出のChromeドライバー）の既定の上限
+DEFAULT_MAX_BROWSERS = 2
+
+
+class DynamicExtractorPool:
+    """動的メール抽出器（Chromeドライバー）を上限付きで共有する（スレッドセーフ）
+
+    - 抽出器はワーカースレッドごとに生成されるが、ブラウザはこのプールから借りて使う
+    - 起動するブラウザは最大 max_browsers 個（空きがない場合は返却を待つ）
+    - ブラウザは初めて必要になった時点で起動し、返却後は次の利用者が再利用する
+    - 借りる際の待ち時間とページ読み込みのタイムアウトは呼び出し側で指定できる（企業の残り時間など）
+    """
+
+    def __init__(self, max_browsers=DEFAULT_MAX_BROWSERS, timeout=5, factory=None):
+        self.max_browsers = max_browsers
+        self.timeout = timeout
+        self._factory = factory or (lambda: DynamicEmailExtractor(timeout=self.timeout))
+        self._slots = threading.BoundedSemaphore(max(1, max_browsers))
+        self._idle = []
+        self._created = []
+        self._lock = threading.Lock()
+        self.launch_count = 0
+        self.borrow_count = 0
+        self.timeout_count = 0
+        self.wait_seconds = 0.0
+
+    @contextmanager
+    def acquire(self, timeout=None, page_load_timeout=None):
+        """動的メール抽出器を1つ借りる（ブラウザの起動数は上限まで）
+
+        Args:
+            timeout: 空きを待つ時間の上限（秒、None の場合は空くまで待つ）。超えた場合は TimeoutError
+            page_load_timeout: 借りている間のページ読み込みのタイムアウト（秒、None の場合は既定の timeout）
+        """
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=None if timeout is None else max(0.0, timeout)):
+            with self._lock:
+                self.wait_seconds += time.perf_counter() - started
+                self.timeout_count += 1
+            raise TimeoutError(f"動的メール抽出器の空きを {timeout:.1f}秒待ちましたが借りられませんでした")
+        try:
+            with self._lock:
+                self.borrow_count += 1
+                self.wait_seconds += time.perf_counter() - started
+                dynamic_extractor = self._idle.pop() if self._idle else None
+            if dynamic_extractor is None:
+                dynamic_extractor = self._factory()
+                with self._lock:
+                    self._created.append(dynamic_extractor)
+                    self.launch_count += 1
+            if page_load_timeout is not None:
+                self._set_page_load_timeout(dynamic_extractor, min(self.timeout, max(0.1, page_load_timeout)))
+            try:
+                yield dynamic_extractor
+            finally:
+                if page_load_timeout is not None:
+                    self._set_page_load_timeout(dynamic_extractor, self.timeout)
+                with self._lock:
+                    self._idle.append(dynamic_extractor)
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    def _set_page_load_timeout(dynamic_extractor, seconds):
+        """ページ読み込みのタイムアウトを設定（ドライバーの起動前は起動時に使われる値）"""
+        dynamic_extractor.timeout = seconds
+        driver = getattr(dynamic_extractor, 'driver', None)
+        if driver is not None:
+            try:
+                driver.set_page_load_timeout(seconds)
+            except Exception as e:
+                logging.debug(f"ページ読み込みのタイムアウト設定エラー: {e}")
+
+    def close(self):
+        """起動したすべてのブラウザを終了する"""
+        with self._lock:
+            created, self._created, self._idle = self._created, [], []
+        for dynamic_extractor in created:
+            try:
+                dynamic_extractor.close_driver()
+            except Exception as e:
+                logging.error(f"動的メール抽出器のドライバー終了中にエラーが発生しました: {e}")
+        if created:
+            logging.info(f"動的メール抽出器のドライバーを終了しました: {len(created)}個")
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'browsers': self.launch_count,
+                'max_browsers': self.max_browsers,
+                'borrows': self.borrow_count,
+                'timeouts': self.timeout_count,
+                'wait_seconds': self.wait_seconds
+            }
+
+
+# 抽出器インスタンス間で共有するリクエスト制限（main() で設定を上書き）
+REQUEST_LIMITER = HostRequestLimiter()
+
+# 抽出器インスタンス間で共有する動的メール抽出器のプール（main() で設定を上書き）
+DYNAMIC_POOL = DynamicExtractorPool()
+
+# 抽出器インスタンス間で共有するキープアライブ接続プール
+HTTP_SESSION_POOL = HttpSessionPool()
+
+# 全抽出器で共有するMX・キャッチオール判定のキャッシュ付き検証サービス
+MAIL_VERIFIER = MailVerifier()
+
+# 関連ページ探索の初期URLとしてサイトマップから採用するURL数
+SITEMAP_TOP_K = 50
+
+# 全抽出器で共有する本文の読み込み制限・リダイレクト追跡（main() で設定を上書き）
+PAGE_FETCHER = StreamingFetcher()
+
+# 全抽出器で共有する関連ページ探索エンジン（1つのイベントループで全企業の探索を実行、main() で設定を上書き）
+CRAWL_ENGINE = CrawlEngine(max_per_host=DEFAULT_MAX_PER_HOST)
+
+# 全抽出器で共有するHTML解析のプロセスプール（取得したページの解析・候補抽出を別プロセスで実行、main() で設定を上書き）
+PARSE_POOL = ParsePool()
+
+# 全企業の段階別の処理時間の分布（処理の終わりに出力）
+STAGE_HISTOGRAM = StageHistogram()
+
 
 class PrioritizedEmailExtractor:
     """優先順位に基づくメールアドレス抽出クラス"""
 
-    def __init__(self, timeout=5, max_retries=1, use_dynamic_extraction=False, use_contact_form_analysis=False):
+    def __init__(self, timeout=5, max_retries=1, use_dynamic_extraction=False, use_contact_form_analysis=False,
+                 request_limiter=None, session_pool=None, http_cache=None, mail_verifier=None,
+                 use_smtp_verification=False, crawl_engine=None, page_fetcher=None, parse_pool=None,
+                 company_budget=DEFAULT_COMPANY_BUDGET, stage_histogram=None, dynamic_pool=None):
         self.timeout = timeout
         self.max_retries = max_retries
+        self.request_limiter = request_limiter or REQUEST_LIMITER
+        self.session_pool = session_pool or HTTP_SESSION_POOL
+        # 共有HTTPキャッシュ（環境変数 HUGANJOB_HTTP_CACHE_MODE=disabled で無効）
+        self.http_cache = http_cache or get_shared_cache()
+        # MXレコード・キャッチオール判定はドメインごとにキャッシュして全企業で共有
+        self.mail_verifier = mail_verifier or MAIL_VERIFIER
+        # 関連ページの探索は共有イベントループで実行（ホストごとの同時取得数は全企業で共通）
+        self.crawl_engine = crawl_engine or CRAWL_ENGINE
+        # 本文はストリーミングで上限バイト数まで読み込み、HTML以外はヘッダーの時点で拒否
+        self.page_fetcher = page_fetcher or PAGE_FETCHER
+        # 取得したページの解析・候補抽出はプロセスプールで実行（ワーカー数0の場合は取得したスレッドで解析）
+        self.parse_pool = parse_pool or PARSE_POOL
+        # 1企業あたりの処理時間の予算（秒、0 で期限なし）。処理中の企業の期限は self.deadline で取得・探索・検証に渡す
+        self.company_budget = company_budget
+        self.stage_histogram = stage_histogram or STAGE_HISTOGRAM
+        self.deadline = None
+        # SMTP検証（Spamhausブロック対策のため既定では無効、本番環境では外部SMTPサービス経由で検証を推奨）
+        self.use_smtp_verification = use_smtp_verification
         self.disposable_domains = DISPOSABLE_DOMAINS
         self.role_based_prefixes = ROLE_BASED_PREFIXES
         self.visited_urls = set()
+        # 処理中の企業の解析済みドキュメント（URL → ParsedDocument）
+        self.documents = {}
 
-        # 入力例・プレースホルダーとして使用される一般的なドメイン
-        self.example_domains = {
-            'google.com', 'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com',
-            'example.com', 'example.org', 'example.net', 'test.com', 'test.org',
-            'sample.com', 'demo.com', 'placeholder.com', 'your-email.com',
-            'yourdomain.com', 'yourcompany.com', 'company.com', 'domain.com',
-            'mail.com', 'email.com', 'address.com'
-        }
+        # 入力例・プレースホルダーとして使用される一般的なドメイン・メールアドレス
+        self.example_domains = set(EXAMPLE_DOMAINS)
+        self.example_emails = set(EXAMPLE_EMAILS)
 
-        # 入力例として使用される一般的なメールアドレス
-        self.example_emails = {
-            'info@google.com', 'test@example.com', 'sample@sample.com',
-            'your-email@example.com', 'email@example.com', 'name@example.com',
-            'user@example.com', 'contact@example.com', 'admin@example.com',
-            'info@gmail.com', 'test@test.com', 'sample@demo.com'
-        }
-
-        # 動的メール抽出の設定
-        self.use_dynamic_extraction = use_dynamic_extraction and DYNAMIC_EXTRACTION_AVAILABLE
-        self.dynamic_extractor = None
-        if self.use_dynamic_extraction:
-            try:
-                self.dynamic_extractor = DynamicEmailExtractor(timeout=timeout)
-                logging.info("動的メール抽出機能を初期化しました")
-            except Exception as e:
-                logging.error(f"動的メール抽出機能の初期化に失敗しました: {e}")
-                self.use_dynamic_extraction = False
+        # 動的メール抽出の設定（ブラウザは共有プールから借りるため、抽出器の数だけ起動しない）
+        self.use_dynamic_extraction = use_dynamic_extraction and (DYNAMIC_EXTRACTION_AVAILABLE or dynamic_pool is not None)
+        self.dynamic_pool = (dynamic_pool or DYNAMIC_POOL) if self.use_dynamic_extraction else None
 
         # 問い合わせフォーム解析の設定
         self.use_contact_form_analysis = use_contact_form_analysis
@@ -156,129 +348,7 @@ class PrioritizedEmailExtractor:
         Returns:
             bool: 有効な場合True
         """
-        if not email or not isinstance(email, str):
-            return False
-
-        email_str = email.strip()
-        if not email_str:
-            return False
-
-        # 基本的なメールアドレス形式チェック
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email_str):
-            return False
-
-        # 長さチェック
-        if len(email_str) > 254:  # RFC 5321の制限
-            return False
-
-        # ローカル部とドメイン部の分離
-        try:
-            local_part, domain_part = email_str.split('@')
-            if len(local_part) > 64:  # RFC 5321の制限
-                return False
-        except ValueError:
-            return False
-
-        # 画像ファイル拡張子の除外チェック
-        image_extensions = [
-            '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.bmp', '.ico',
-            '.tiff', '.tif', '.avif', '.heic', '.heif'
-        ]
-
-        # CSS/JSファイル拡張子の除外チェック
-        web_file_extensions = [
-            '.css', '.js', '.woff', '.woff2', '.otf', '.ttf', '.eot',
-            '.map', '.json', '.xml', '.html', '.htm'
-        ]
-
-        # レスポンシブ画像パターンの除外チェック（@2x.png, @3x.jpg等）
-        responsive_patterns = [
-            r'@\d+x\.(jpg|jpeg|png|gif|svg|webp|bmp|ico)$',
-            r'@retina\.(jpg|jpeg|png|gif|svg|webp|bmp|ico)$',
-            r'@mobile\.(jpg|jpeg|png|gif|svg|webp|bmp|ico)$',
-            r'@tablet\.(jpg|jpeg|png|gif|svg|webp|bmp|ico)$'
-        ]
-
-        email_lower = email_str.lower()
-
-        # 画像ファイル拡張子チェック
-        for ext in image_extensions:
-            if email_lower.endswith(ext):
-                return False
-
-        # CSS/JSファイル拡張子チェック
-        for ext in web_file_extensions:
-            if email_lower.endswith(ext):
-                return False
-
-        # レスポンシブ画像パターンチェック
-        for pattern in responsive_patterns:
-            if re.search(pattern, email_lower):
-                return False
-
-        # 一般的な無効パターンの除外
-        invalid_patterns = [
-            r'@\d+x\d+\.',  # @1080x360.jpg等のサイズ指定
-            r'@sp\.',       # @sp.jpg等のスマートフォン用
-            r'@pc\.',       # @pc.jpg等のPC用
-            r'@mobile\.',   # @mobile.jpg等
-            r'@tablet\.',   # @tablet.jpg等
-            r'banner.*@.*\.(jpg|png|gif|svg)',  # バナー画像
-            r'logo.*@.*\.(jpg|png|gif|svg)',    # ロゴ画像
-            r'icon.*@.*\.(jpg|png|gif|svg)',    # アイコン画像
-            r'hero.*@.*\.(jpg|png|gif|svg)',    # ヒーロー画像
-            r'thumb.*@.*\.(jpg|png|gif|svg)',   # サムネイル画像
-        ]
-
-        for pattern in invalid_patterns:
-            if re.search(pattern, email_lower):
-                return False
-
-        # JavaScript/CSS変数パターンの除外
-        js_css_patterns = [
-            r'window\.',
-            r'\.prototype\.',
-            r'\.version$',
-            r'\.params$',
-            r'\.config$',
-            r'\.settings$',
-            r'\.options$',
-            r'@plugin\.',
-            r'@custom\.',
-            r'@retargeting\.',
-            r'@datalayer\.',
-            r'@large\.',
-            r'@term\.',
-            r'@jquery\.',
-            r'^summary@',
-            r'^search@',
-            r'^my@',
-            r'^gtm4wp@',
-        ]
-
-        # 特定の無効ドメインパターンの除外
-        invalid_domain_patterns = [
-            r'@.*\.image$',
-            r'@.*\.string$',
-            r'@.*\.easing$',
-            r'@.*\.name$',
-            r'@.*\.version$',
-            r'@.*\.params$',
-            r'@.*\.config$',
-            r'@.*\.settings$',
-        ]
-
-        for pattern in js_css_patterns:
-            if re.search(pattern, email_lower):
-                return False
-
-        # 無効ドメインパターンチェック
-        for pattern in invalid_domain_patterns:
-            if re.search(pattern, email_lower):
-                return False
-
-        return True
+        return EXTRACTION_RULES.is_valid(email)
 
     def extract_domain_from_url(self, url):
         """URLからドメイン名を抽出する"""
@@ -302,8 +372,79 @@ class PrioritizedEmailExtractor:
             logging.error(f"ドメイン抽出エラー: {e}")
             return None
 
+    def _network_get(self, url, headers, timeout):
+        """同時接続数の制限内でネットワークから1回分（リダイレクトは追跡しない）を取得
+
+        本文はストリーミングで読み込み、200応答は上限バイト数まで、それ以外は小さな上限まで読む。
+        HTML以外のContent-Typeは本文を読まずに UnsupportedContentType を送出する。
+        """
+        with self.request_limiter.acquire(url):
+            response = self.session_pool.get(url, headers=headers, timeout=timeout, stream=True, allow_redirects=False)
+            try:
+                if response.status_code == 200:
+                    self.page_fetcher.check_content_type(response)
+                    # 本文の読み込み時間は企業の残り時間で頭打ち
+                    return self.page_fetcher.read_body(
+                        response, max_seconds=self.deadline.remaining() if self.deadline is not None else None)
+                return self.page_fetcher.read_body(response, max_bytes=ERROR_BODY_BYTES)
+            except Exception:
+                response.close()
+                raise
+
+    def _fetch_following_redirects(self, url, headers, timeout):
+        """リダイレクトを上限回数まで追跡して取得"""
+        return self.page_fetcher.follow_redirects(url, lambda hop_url: self._network_get(hop_url, headers, timeout))
+
+    def sitemap_read_seconds(self):
+        """サイトマップ1件の読み込み時間の上限（本文の上限時間を企業の残り時間で頭打ち）
+
+        読み込み中はホスト単位の同時接続枠を保持するため、開くたびに残り時間から求める。
+        """
+        if self.deadline is None:
+            return self.page_fetcher.max_seconds
+        return self.deadline.timeout(self.page_fetcher.max_seconds)
+
+    @contextmanager
+    def open_sitemap_stream(self, url):
+        """サイトマップを逐次読み込み用に開く（見つからない場合は None）
+
+        本文は呼び出し側で読み込むため、HTTPキャッシュには保存しない（オフラインモードではキャッシュのみ参照）。
+        """
+        if url in self.visited_urls or (self.deadline is not None and self.deadline.expired()):
+            yield None
+            return
+        self.visited_urls.add(url)
+
+        if self.http_cache is not None and self.http_cache.offline:
+            entry = self.http_cache.lookup(url)
+            yield io.BytesIO(entry['content']) if entry and entry['status'] == 200 else None
+            return
+
+        headers = {'User-Agent': self.get_random_user_agent()}
+        response = None
+        try:
+            with self.request_limiter.acquire(url):
+                try:
+                    timeout = self._request_timeout(self.timeout)
+                    response = self.page_fetcher.follow_redirects(url, lambda hop_url: self.session_pool.get(
+                        hop_url, headers=headers, timeout=timeout, stream=True, allow_redirects=False))
+                except requests.exceptions.RequestException as e:
+                    logging.debug(f"サイトマップの取得エラー: {url} - {e}")
+                if response is None or response.status_code != 200:
+                    yield None
+                    return
+                # Content-Encoding（gzip転送）は展開して読む
+                response.raw.decode_content = True
+                yield response.raw
+        finally:
+            if response is not None:
+                response.close()
+
     def fetch_url(self, url, timeout=None, max_retries=None):
-        """URLからコンテンツを取得（リトライ機能付き）"""
+        """URLからコンテンツを取得（リトライ機能付き）
+
+        リダイレクトは上限回数まで追跡し、本文は上限バイト数まで読み込む（HTML・XML以外は取得しない）。
+        """
         if not url or url == '-':
             return None
 
@@ -317,6 +458,12 @@ class PrioritizedEmailExtractor:
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
 
+        # 企業の処理時間の予算を使い切った場合は取得しない
+        deadline = self.deadline
+        if deadline is not None and deadline.expired():
+            logging.debug(f"処理時間の予算切れのため取得をスキップ: {url}")
+            return None
+
         # 既に訪問したURLはスキップ
         if url in self.visited_urls:
             logging.info(f"既に訪問済みのURL: {url}")
@@ -324,28 +471,24 @@ class PrioritizedEmailExtractor:
 
         self.visited_urls.add(url)
 
-        headers = {
-            'User-Agent': self.get_random_user_agent(),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ja,en-US;q=0.7,en;q=0.3',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Cache-Control': 'max-age=0'
-        }
+        # 共通ヘッダーはセッションに設定済み（User-Agentのみリクエストごとに変更）
+        headers = {'User-Agent': self.get_random_user_agent()}
 
         for attempt in range(max_retries + 1):
+            # タイムアウトは企業の残り時間で頭打ち
+            attempt_timeout = self._request_timeout(timeout)
             try:
-                response = requests.get(url, headers=headers, timeout=timeout)
+                if self.http_cache is not None:
+                    # 鮮度期間内はキャッシュを返し、期限切れは条件付きリクエストで再検証
+                    response = self.http_cache.get(
+                        url, lambda cache_url, conditional: self._fetch_following_redirects(
+                            cache_url, {**headers, **conditional}, attempt_timeout)
+                    )
+                else:
+                    response = self._fetch_following_redirects(url, headers, attempt_timeout)
 
                 if response.status_code == 200:
                     return response
-                elif response.status_code in [301, 302, 303, 307, 308] and 'Location' in response.headers:
-                    redirect_url = urllib.parse.urljoin(url, response.headers['Location'])
-                    if redirect_url != url:
-                        logging.info(f"リダイレクト: {url} -> {redirect_url}")
-                        return self.fetch_url(redirect_url, timeout, max_retries - attempt)
                 else:
                     # 404エラーの場合はログレベルを下げる
                     if response.status_code == 404:
@@ -353,31 +496,109 @@ class PrioritizedEmailExtractor:
                     else:
                         logging.warning(f"HTTPエラー: {response.status_code} - {url}")
 
-                    if attempt < max_retries:
-                        time.sleep(1 * (attempt + 1))  # 指数バックオフ
+                    if self._wait_before_retry(attempt, max_retries):
                         continue
 
                     return None
+            except CacheMissError:
+                logging.debug(f"キャッシュなし（オフラインモード）: {url}")
+                return None
+            except UnsupportedContentType as e:
+                logging.debug(f"取得対象外: {e}")
+                return None
+            except requests.exceptions.TooManyRedirects as e:
+                logging.warning(f"{e}")
+                return None
             except requests.exceptions.Timeout:
                 logging.warning(f"タイムアウト: {url}")
-                if attempt < max_retries:
-                    time.sleep(1 * (attempt + 1))
+                if self._wait_before_retry(attempt, max_retries):
                     continue
             except requests.exceptions.ConnectionError:
                 logging.warning(f"接続エラー: {url}")
-                if attempt < max_retries:
-                    time.sleep(1 * (attempt + 1))
+                if self._wait_before_retry(attempt, max_retries):
                     continue
             except Exception as e:
                 logging.error(f"URL取得エラー ({url}): {e}")
-                if attempt < max_retries:
-                    time.sleep(1 * (attempt + 1))
+                if self._wait_before_retry(attempt, max_retries):
                     continue
 
         return None
 
-    def extract_emails_from_html(self, html, url=None):
-        """HTMLからメールアドレスを抽出（パフォーマンス最適化版）"""
+    def _request_timeout(self, timeout):
+        """企業の残り時間で頭打ちにしたリクエストのタイムアウト
+
+        接続プールは読み込みエラー（タイムアウトを含む）を再試行するため、再試行を含めて残り時間に収める。
+        """
+        if self.deadline is None:
+            return timeout
+        retry = getattr(self.session_pool, 'retry', None)
+        attempts = 1 + ((retry.read or 0) if retry is not None else 0)
+        return self.deadline.timeout(timeout, attempts=attempts)
+
+    def _wait_before_retry(self, attempt, max_retries):
+        """再試行する場合は待機して True を返す（企業の残り時間が待機時間に満たない場合は再試行しない）"""
+        if attempt >= max_retries:
+            return False
+        backoff = 1 * (attempt + 1)  # 指数バックオフ
+        remaining = self.deadline.remaining() if self.deadline is not None else None
+        if remaining is not None and remaining <= backoff:
+            return False
+        time.sleep(backoff)
+        return True
+
+    def get_document(self, url, sections=()):
+        """URLの解析済みドキュメントを取得（企業の処理中は1ページにつき取得・解析は1回だけ）
+
+        取得済みのURLは visited_urls により再取得されないため、解析済みのドキュメントを返す。
+        プロセスプールが有効な場合は本文をワーカープロセスで解析し、抽出結果を持つドキュメントを返す
+        （sections: 追加で算出する結果。'footer' = フッター, 'contact' = お問い合わせページの個人情報欄・フォーム返信先）。
+        """
+        if not url or url == '-':
+            return None
+
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+
+        document = self.documents.get(url)
+        if document is not None:
+            return document
+
+        response = self.fetch_url(url)
+        if not response:
+            return None
+
+        analysis = self.parse_pool.analyze(url, response.content, response.encoding, sections,
+                                           getattr(self, 'current_company_name', ''))
+        if analysis is not None:
+            document = ParsedDocument.from_analysis(url, response.content, response.encoding, analysis)
+        else:
+            document = ParsedDocument.from_response(response, url)
+        self.documents[url] = document
+        return document
+
+    def extract_document_emails(self, document):
+        """解析済みドキュメントからメールアドレスを抽出（結果はドキュメントに保持）"""
+        if document.emails is None:
+            document.emails = self.extract_emails_from_html(document.html, document.url, document=document)
+        return list(document.emails)
+
+    def extract_contact_page_emails(self, document):
+        """お問い合わせページの個人情報欄・フォームの自動返信設定からメールアドレスを抽出（結果はドキュメントに保持）
+
+        Returns:
+            tuple: (個人情報欄のメールアドレス, フォームの自動返信メールアドレス)
+        """
+        if document.privacy_emails is None:
+            document.privacy_emails = self.extract_emails_from_privacy_sections(document.soup, document.url, document.text_blocks)
+        if document.form_reply_emails is None:
+            document.form_reply_emails = self.extract_contact_form_reply_emails(document.soup, document.url)
+        return list(document.privacy_emails), list(document.form_reply_emails)
+
+    def extract_emails_from_html(self, html, url=None, document=None):
+        """HTMLからメールアドレスを抽出（パフォーマンス最適化版）
+
+        document（ParsedDocument）を指定した場合は、その解析木とリンク一覧を再利用する。
+        """
         if not html:
             return []
 
@@ -387,222 +608,48 @@ class PrioritizedEmailExtractor:
             logging.warning(f"HTMLサイズが大きすぎます（{len(html):,}文字）。先頭{max_html_size:,}文字のみ処理します。")
             html = html[:max_html_size]
 
-        # 基本的なメールアドレスパターン
-        basic_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-
-        # 拡張された難読化メールアドレスパターン
-        obfuscated_patterns = [
-            # [at] や (at) などの置換
-            r'([a-zA-Z0-9._%+-]+)\s*[\[\(]at[\]\)]\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+)\s*@\s*([a-zA-Z0-9.-]+)\s*[\[\(]dot[\]\)]\s*([a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+)\s*@\s*([a-zA-Z0-9.-]+)\s*\.\s*([a-zA-Z]{2,})',
-            # スペースや文字で分割されたメールアドレス
-            r'([a-zA-Z0-9._%+-]+)\s+[@＠]\s+([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+)[@＠]([a-zA-Z0-9.-]+)\s+\.\s+([a-zA-Z]{2,})',
-            # 新規追加: より複雑な難読化パターン
-            r'([a-zA-Z0-9._%+-]+)\s*\[アット\]\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+)\s*（アット）\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+)\s*\[ドット\]\s*([a-zA-Z0-9.-]+)\s*\[ドット\]\s*([a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+)\s*（ドット）\s*([a-zA-Z0-9.-]+)\s*（ドット）\s*([a-zA-Z]{2,})',
-            # HTMLエンティティ
-            r'([a-zA-Z0-9._%+-]+)\s*&#64;\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+)\s*&commat;\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            # 画像内テキストでよく見られるパターン
-            r'([a-zA-Z0-9._%+-]+)\s*＠\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+)\s*@\s*([a-zA-Z0-9.-]+)\s*．\s*([a-zA-Z]{2,})',
-            # 複数のスペースや改行を含むパターン
-            r'([a-zA-Z0-9._%+-]+)\s*@\s*([a-zA-Z0-9.-]+)\s*\.\s*([a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+)\s+@\s+([a-zA-Z0-9.-]+)\s+\.\s+([a-zA-Z]{2,})',
-            # 記号による難読化パターン（※、★、●、■など）
-            r'([a-zA-Z0-9._%+-]+)\s*[※★●■▲▼◆◇○△▽☆]\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+)\s*[※★●■▲▼◆◇○△▽☆]\s*([a-zA-Z0-9.-]+)\s*[※★●■▲▼◆◇○△▽☆]\s*([a-zA-Z]{2,})',
-            # 特殊文字による区切り
-            r'([a-zA-Z0-9._%+-]+)\s*[＃＄％＆＊＋－＝]\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+)\s*[＃＄％＆＊＋－＝]\s*([a-zA-Z0-9.-]+)\s*[＃＄％＆＊＋－＝]\s*([a-zA-Z]{2,})',
-            # アンダースコアやハイフンによる区切り
-            r'([a-zA-Z0-9._%+-]+)\s*[_－―─]\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+)\s*[_－―─]\s*([a-zA-Z0-9.-]+)\s*[_－―─]\s*([a-zA-Z]{2,})'
-        ]
-
         emails = []
 
-        # 基本パターンでメールアドレスを抽出（Windows対応版）
-        try:
-            import platform
-            import threading
-            import time
-
-            if platform.system() == "Windows":
-                # Windows用のタイムアウト処理
-                result_container = []
-                exception_container = []
-
-                def extract_with_timeout():
-                    try:
-                        basic_emails = re.findall(basic_pattern, html)
-                        # 画像ファイル名の事前フィルタリング
-                        filtered_emails = []
-                        for email in basic_emails:
-                            if self.is_valid_email_format(email):
-                                filtered_emails.append(email)
-                            else:
-                                logging.debug(f"画像ファイル名等のため除外: {email}")
-                        result_container.append(filtered_emails)
-                    except Exception as e:
-                        exception_container.append(e)
-
-                thread = threading.Thread(target=extract_with_timeout)
-                thread.daemon = True
-                thread.start()
-                thread.join(timeout=3)  # 3秒でタイムアウト
-
-                if thread.is_alive():
-                    logging.warning("基本パターンのメール抽出がタイムアウトしました（Windows）")
-                elif exception_container:
-                    raise exception_container[0]
-                elif result_container:
-                    emails.extend(result_container[0])
-            else:
-                # Unix系用のタイムアウト処理
-                import signal
-
-                def timeout_handler(signum, frame):
-                    raise TimeoutError("基本パターン処理がタイムアウトしました")
-
-                signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(3)  # 3秒でタイムアウト
-
-                try:
-                    basic_emails = re.findall(basic_pattern, html)
-                    # 画像ファイル名の事前フィルタリング
-                    for email in basic_emails:
-                        if self.is_valid_email_format(email):
-                            emails.append(email)
-                        else:
-                            logging.debug(f"画像ファイル名等のため除外: {email}")
-                finally:
-                    signal.alarm(0)  # タイムアウト解除
-
-        except TimeoutError:
-            logging.warning("基本パターンのメール抽出がタイムアウトしました")
-        except Exception as e:
-            logging.warning(f"基本パターンのメール抽出中にエラー: {e}")
+        # 基本パターン・難読化パターンをコンパイル済みスキャナーで抽出
+        # （区切り文字の周辺だけを線形時間で走査するため、タイムアウト処理は不要）
+        basic_emails, obfuscated_matches = EMAIL_SCANNER.scan(html)
 
-        # 難読化パターンを処理（Windows対応版）
-        for pattern in obfuscated_patterns:
-            try:
-                import platform
-                import threading
-
-                if platform.system() == "Windows":
-                    # Windows用のタイムアウト処理
-                    result_container = []
-                    exception_container = []
-
-                    def extract_pattern_with_timeout():
-                        try:
-                            matches = re.findall(pattern, html)
-                            for match in matches:
-                                if isinstance(match, tuple):
-                                    if len(match) == 2:
-                                        # 記号による区切りパターン（※、★、●など）
-                                        email = f"{match[0]}@{match[1]}"
-                                        # 画像ファイル名の事前フィルタリング
-                                        if self.is_valid_email_format(email):
-                                            result_container.append(email)
-                                            logging.info(f"記号区切りメールアドレスを抽出しました: {email}")
-                                        else:
-                                            logging.debug(f"画像ファイル名等のため除外: {email}")
-                                    elif len(match) == 3:
-                                        # ドット区切りパターン
-                                        email = f"{match[0]}@{match[1]}.{match[2]}"
-                                        # 画像ファイル名の事前フィルタリング
-                                        if self.is_valid_email_format(email):
-                                            result_container.append(email)
-                                            logging.info(f"ドット区切りメールアドレスを抽出しました: {email}")
-                                        else:
-                                            logging.debug(f"画像ファイル名等のため除外: {email}")
-                                else:
-                                    # 単一マッチの場合
-                                    email = str(match)
-                                    # 画像ファイル名の事前フィルタリング
-                                    if self.is_valid_email_format(email):
-                                        result_container.append(email)
-                                        logging.info(f"難読化メールアドレスを抽出しました: {email}")
-                                    else:
-                                        logging.debug(f"画像ファイル名等のため除外: {email}")
-                        except Exception as e:
-                            exception_container.append(e)
-
-                    thread = threading.Thread(target=extract_pattern_with_timeout)
-                    thread.daemon = True
-                    thread.start()
-                    thread.join(timeout=5)  # 5秒でタイムアウト
-
-                    if thread.is_alive():
-                        logging.warning(f"正規表現パターン処理がタイムアウトしました（Windows）: {pattern[:50]}...")
-                        continue
-                    elif exception_container:
-                        raise exception_container[0]
-                    else:
-                        emails.extend(result_container)
-                else:
-                    # Unix系用のタイムアウト処理
-                    import signal
-
-                    def timeout_handler(signum, frame):
-                        raise TimeoutError("正規表現処理がタイムアウトしました")
-
-                    signal.signal(signal.SIGALRM, timeout_handler)
-                    signal.alarm(5)  # 5秒でタイムアウト
-
-                    try:
-                        matches = re.findall(pattern, html)
-                        for match in matches:
-                            if isinstance(match, tuple):
-                                if len(match) == 2:
-                                    # 記号による区切りパターン（※、★、●など）
-                                    email = f"{match[0]}@{match[1]}"
-                                    # 画像ファイル名の事前フィルタリング
-                                    if self.is_valid_email_format(email):
-                                        emails.append(email)
-                                        logging.info(f"記号区切りメールアドレスを抽出しました: {email}")
-                                    else:
-                                        logging.debug(f"画像ファイル名等のため除外: {email}")
-                                elif len(match) == 3:
-                                    # ドット区切りパターン
-                                    email = f"{match[0]}@{match[1]}.{match[2]}"
-                                    # 画像ファイル名の事前フィルタリング
-                                    if self.is_valid_email_format(email):
-                                        emails.append(email)
-                                        logging.info(f"ドット区切りメールアドレスを抽出しました: {email}")
-                                    else:
-                                        logging.debug(f"画像ファイル名等のため除外: {email}")
-                            else:
-                                # 単一マッチの場合
-                                email = str(match)
-                                # 画像ファイル名の事前フィルタリング
-                                if self.is_valid_email_format(email):
-                                    emails.append(email)
-                                    logging.info(f"難読化メールアドレスを抽出しました: {email}")
-                                else:
-                                    logging.debug(f"画像ファイル名等のため除外: {email}")
-                    finally:
-                        signal.alarm(0)  # タイムアウト解除
+        # 画像ファイル名の事前フィルタリング
+        for email in basic_emails:
+            if self.is_valid_email_format(email):
+                emails.append(email)
+            else:
+                logging.debug(f"画像ファイル名等のため除外: {email}")
 
-            except TimeoutError:
-                logging.warning(f"正規表現パターン処理がタイムアウトしました: {pattern[:50]}...")
-                continue
-            except Exception as e:
-                logging.warning(f"正規表現パターン処理中にエラー: {e}")
-                continue
+        for match in obfuscated_matches:
+            if len(match) == 2:
+                # 記号による区切りパターン（※、★、●など）
+                email = f"{match[0]}@{match[1]}"
+                label = "記号区切り"
+            else:
+                # ドット区切りパターン
+                email = f"{match[0]}@{match[1]}.{match[2]}"
+                label = "ドット区切り"
+
+            # 画像ファイル名の事前フィルタリング
+            if self.is_valid_email_format(email):
+                emails.append(email)
+                logging.info(f"{label}メールアドレスを抽出しました: {email}")
+            else:
+                logging.debug(f"画像ファイル名等のため除外: {email}")
 
-        # BeautifulSoupでHTMLを解析
-        soup = BeautifulSoup(html, 'html.parser')
+        # BeautifulSoupでHTMLを解析（解析済みドキュメントがあれば再利用）
+        if document is not None:
+            soup = document.soup
+            hrefs = [href for _, href, _ in document.links]
+            text_blocks = document.text_blocks
+        else:
+            soup = BeautifulSoup(html, 'html.parser')
+            hrefs = [a['href'] for a in soup.find_all('a', href=True)]
+            text_blocks = None
 
         # mailto:リンクからメールアドレスを抽出（改善版）
-        for a in soup.find_all('a', href=True):
-            href = a['href']
+        for href in hrefs:
             if href.lower().startswith('mailto:'):
                 try:
                     # URLデコードを行う（%エンコードされた文字に対応）
@@ -620,7 +667,7 @@ class PrioritizedEmailExtractor:
                     continue
 
         # 個人情報の取扱いについての欄からメールアドレスを抽出（新機能）
-        privacy_emails = self.extract_emails_from_privacy_sections(soup, url)
+        privacy_emails = self.extract_emails_from_privacy_sections(soup, url, text_blocks)
         emails.extend(privacy_emails)
 
         # URLから企業ドメインを抽出（company_domainが指定されていない場合）
@@ -636,7 +683,7 @@ class PrioritizedEmailExtractor:
             email = re.sub(r'\s+', '', email)
 
             # 基本的な検証
-            if re.match(basic_pattern, email) and self.is_valid_email_format(email):
+            if BASIC_EMAIL_REGEX.match(email) and self.is_valid_email_format(email):
                 # 入力例・プレースホルダーフィルタリング
                 if not self.is_example_email(email):
                     # 企業ドメインとの一致チェック（URLが提供されている場合）
@@ -653,13 +700,23 @@ class PrioritizedEmailExtractor:
             elif not self.is_valid_email_format(email):
                 logging.debug(f"画像ファイル名等のため除外: {email}")
 
-        # 重複を削除
-        return list(set(cleaned_emails))
+        # 重複を削除（ワーカープロセスでの解析と結果の順序が同じになるよう出現順を保つ）
+        return list(dict.fromkeys(cleaned_emails))
+
+    def extract_emails_from_privacy_sections(self, soup, url=None, text_blocks=None):
+        """個人情報の取扱いについての欄からメールアドレスを抽出
 
-    def extract_emails_from_privacy_sections(self, soup, url=None):
-        """個人情報の取扱いについての欄からメールアドレスを抽出"""
+        text_blocks: 解析済みのテキストノード一覧（省略時はsoupから取得）
+        """
         emails = []
 
+        # テキストノードの一覧は1回だけ取得し、キーワードごとに木を走査しない
+        if text_blocks is None:
+            text_blocks = soup.find_all(string=True)
+
+        # 確認済みの親要素（同じ要素のテキストを繰り返し抽出しない）
+        checked_parents = set()
+
         # 個人情報関連のキーワード
         privacy_keywords = [
             '個人情報', 'プライバシー', 'privacy', '個人情報保護', '個人情報の取扱い',
@@ -671,7 +728,8 @@ class PrioritizedEmailExtractor:
         # 1. テキスト内容から個人情報関連セクションを検索
         for keyword in privacy_keywords:
             # キーワードを含むテキストノードを検索
-            text_nodes = soup.find_all(string=re.compile(keyword, re.IGNORECASE))
+            keyword_pattern = re.compile(keyword, re.IGNORECASE)
+            text_nodes = [text for text in text_blocks if keyword_pattern.search(text)]
 
             for text_node in text_nodes:
                 if hasattr(text_node, 'parent'):
@@ -680,12 +738,14 @@ class PrioritizedEmailExtractor:
                     # 親要素とその周辺からメールアドレスを抽出
                     for level in range(5):  # 5階層上まで確認
                         if parent:
+                            if id(parent) in checked_parents:
+                                parent = parent.parent
+                                continue
+                            checked_parents.add(id(parent))
                             parent_text = parent.get_text()
-                            parent_html = str(parent)
 
                             # 基本的なメールアドレスパターンで抽出
-                            basic_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-                            found_emails = re.findall(basic_pattern, parent_text)
+                            found_emails = EMAIL_SCANNER.find_basic(parent_text)
 
                             for email in found_emails:
                                 if self.is_valid_email_format(email) and self.verify_email_format(email):
@@ -699,32 +759,37 @@ class PrioritizedEmailExtractor:
                             break
 
         # 2. 特定のHTMLクラス・IDから抽出
-        privacy_selectors = [
-            '.privacy', '.privacy-policy', '.personal-info', '.contact-info',
-            '#privacy', '#privacy-policy', '#personal-info', '#contact-info',
-            '[class*="privacy"]', '[class*="contact"]', '[id*="privacy"]', '[id*="contact"]',
-            '.policy', '.terms', '.legal', '.compliance'
-        ]
-
-        for selector in privacy_selectors:
-            try:
-                elements = soup.select(selector)
-                for element in elements:
-                    element_text = element.get_text()
-
-                    # 基本的なメールアドレスパターンで抽出
-                    basic_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-                    found_emails = re.findall(basic_pattern, element_text)
-
-                    for email in found_emails:
-                        if self.is_valid_email_format(email) and self.verify_email_format(email):
-                            emails.append(email)
-                            logging.info(f"プライバシーセクション({selector})からメールアドレスを抽出しました: {email}")
-                        else:
-                            logging.debug(f"画像ファイル名等のため除外: {email}")
-            except Exception as e:
-                logging.debug(f"セレクタ {selector} の処理中にエラー: {e}")
-                continue
+        # 次のCSSセレクタと同じ条件を、soupsieveで木を繰り返し走査せず1回の走査で判定する
+        #   .privacy, .privacy-policy, .personal-info, .contact-info, #privacy, #privacy-policy,
+        #   #personal-info, #contact-info, [class*="privacy"], [class*="contact"],
+        #   [id*="privacy"], [id*="contact"], .policy, .terms, .legal, .compliance
+        privacy_classes = {'personal-info', 'policy', 'terms', 'legal', 'compliance'}
+
+        def is_privacy_element(tag):
+            classes = tag.get('class') or []
+            if isinstance(classes, str):
+                classes = classes.split()
+            class_value = ' '.join(classes)
+            element_id = tag.get('id') or ''
+            return ('privacy' in class_value or 'contact' in class_value
+                    or 'privacy' in element_id or 'contact' in element_id
+                    or element_id == 'personal-info'
+                    or not privacy_classes.isdisjoint(classes))
+
+        elements = soup.find_all(is_privacy_element)
+
+        for element in elements:
+            element_text = element.get_text()
+
+            # 基本的なメールアドレスパターンで抽出
+            found_emails = EMAIL_SCANNER.find_basic(element_text)
+
+            for email in found_emails:
+                if self.is_valid_email_format(email) and self.verify_email_format(email):
+                    emails.append(email)
+                    logging.info(f"プライバシーセクション({element.name})からメールアドレスを抽出しました: {email}")
+                else:
+                    logging.debug(f"画像ファイル名等のため除外: {email}")
 
         # 3. フォーム内の個人情報の取扱いについての記述から抽出
         forms = soup.find_all('form')
@@ -733,8 +798,7 @@ class PrioritizedEmailExtractor:
 
             # 個人情報関連のキーワードが含まれるフォームを対象
             if any(keyword in form_text for keyword in privacy_keywords):
-                basic_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-                found_emails = re.findall(basic_pattern, form_text)
+                found_emails = EMAIL_SCANNER.find_basic(form_text)
 
                 for email in found_emails:
                     if self.is_valid_email_format(email) and self.verify_email_format(email):
@@ -743,8 +807,8 @@ class PrioritizedEmailExtractor:
                     else:
                         logging.debug(f"画像ファイル名等のため除外: {email}")
 
-        # 重複を削除
-        return list(set(emails))
+        # 重複を削除（ワーカープロセスでの解析と結果の順序が同じになるよう出現順を保つ）
+        return list(dict.fromkeys(emails))
 
     def generate_enhanced_autoreply_patterns(self, domain, company_name='', url=''):
         """実例データに基づく強化された自動返信メールアドレスパターン生成"""
@@ -926,43 +990,12 @@ class PrioritizedEmailExtractor:
         except Exception as e:
             logging.warning(f"問い合わせフォーム返信メール抽出中にエラー: {e}")
 
-        # 重複を削除
-        return list(set(emails))
+        # 重複を削除（ワーカープロセスでの解析と結果の順序が同じになるよう出現順を保つ）
+        return list(dict.fromkeys(emails))
 
     def is_example_email(self, email):
         """メールアドレスが入力例・プレースホルダーかどうかを判定"""
-        if not email or '@' not in email:
-            return False
-
-        email = email.lower().strip()
-
-        # 直接的な入力例メールアドレスのチェック
-        if email in self.example_emails:
-            return True
-
-        # ドメイン部分をチェック
-        try:
-            local_part, domain = email.split('@', 1)
-
-            # 入力例ドメインのチェック
-            if domain in self.example_domains:
-                return True
-
-            # 一般的な入力例パターンのチェック
-            example_patterns = [
-                r'^(test|sample|demo|example|placeholder|your-?email|your-?name|user|admin)@',
-                r'@(test|sample|demo|example|placeholder)\.com$',
-                r'@your-?(domain|company|email)\.com$'
-            ]
-
-            for pattern in example_patterns:
-                if re.match(pattern, email):
-                    return True
-
-            return False
-
-        except ValueError:
-            return False
+        return is_example_email(email, self.example_emails, self.example_domains)
 
     def extract_emails_with_contact_form_analysis(self, url):
         """問い合わせフォーム解析によるメールアドレス抽出"""
@@ -1010,69 +1043,92 @@ class PrioritizedEmailExtractor:
             logging.debug(traceback.format_exc())
             return []
 
-    def extract_emails_from_footer(self, html, url=None):
-        """フッター領域からメールアドレスを抽出（強化版）"""
-        if not html:
+    def extract_emails_from_footer(self, html, url=None, document=None):
+        """フッター領域からメールアドレスを抽出（強化版）
+
+        document（ParsedDocument）を指定した場合は、その解析木を再利用し結果を保持する。
+        フッター候補の要素は入れ子を除いた最上位の要素だけを連結し、抽出処理は1回だけ行う。
+        """
+        if not html and document is None:
             return []
 
-        soup = BeautifulSoup(html, 'html.parser')
-        emails = []
+        if document is None:
+            document = ParsedDocument(url, html)
+        elif document.footer_emails is not None:
+            return list(document.footer_emails)
+
+        if not document.html:
+            return []
+
+        soup = document.soup
+        elements = document.elements
 
         # フッター要素を特定（より包括的に）
         footer_elements = []
 
-        # 1. <footer>タグ
-        footer_tags = soup.find_all('footer')
-        footer_elements.extend(footer_tags)
+        for element in elements:
+            # 1. <footer>タグ
+            if element.name == 'footer':
+                footer_elements.append(element)
+                continue
 
-        # 2. class属性にfooterを含む要素（部分一致も含む）
-        footer_classes = soup.find_all(class_=lambda c: c and any('footer' in cls.lower() for cls in c if isinstance(c, list) or isinstance(c, str)))
-        footer_elements.extend(footer_classes)
+            # 2. class属性にfooterを含む要素（部分一致も含む）
+            classes = element.get('class') or []
+            if isinstance(classes, str):
+                classes = [classes]
+            if any('footer' in cls.lower() for cls in classes):
+                footer_elements.append(element)
+                continue
 
-        # 3. id属性にfooterを含む要素
-        footer_ids = soup.find_all(id=lambda i: i and 'footer' in i.lower())
-        footer_elements.extend(footer_ids)
+            # 3. id属性にfooterを含む要素
+            element_id = element.get('id')
+            if isinstance(element_id, str) and 'footer' in element_id.lower():
+                footer_elements.append(element)
 
         # 4. コピーライト情報を含む要素とその親要素
-        copyright_elements = soup.find_all(string=lambda s: s and ('©' in s or 'copyright' in s.lower() or '〒' in s))
-        for element in copyright_elements:
-            parent = element.parent
-            if parent:
-                footer_elements.append(parent)
-                # 親の親も追加（より広範囲をカバー）
-                if parent.parent:
-                    footer_elements.append(parent.parent)
-
         # 5. 連絡先情報を示すキーワードを含む要素
         contact_keywords = ['連絡先', 'お問い合わせ', 'contact', 'email', 'mail', 'tel', 'fax', '電話', 'ファックス']
-        for keyword in contact_keywords:
-            contact_elements = soup.find_all(string=lambda s: s and keyword.lower() in s.lower())
-            for element in contact_elements:
-                if element.parent:
-                    footer_elements.append(element.parent)
-                    if element.parent.parent:
-                        footer_elements.append(element.parent.parent)
+        for text in document.text_blocks:
+            if not text:
+                continue
+            lowered = text.lower()
+            if '©' in text or 'copyright' in lowered or '〒' in text or any(keyword in lowered for keyword in contact_keywords):
+                parent = text.parent
+                if parent:
+                    footer_elements.append(parent)
+                    # 親の親も追加（より広範囲をカバー）
+                    if parent.parent:
+                        footer_elements.append(parent.parent)
 
         # 6. ページ下部50%の要素を取得（範囲を拡大）
-        all_elements = soup.find_all()
-        if len(all_elements) > 10:
-            bottom_elements = all_elements[int(len(all_elements) * 0.5):]
-            for element in bottom_elements:
-                footer_elements.append(element)
+        if len(elements) > 10:
+            footer_elements.extend(elements[int(len(elements) * 0.5):])
+
+        # 入れ子になった要素は外側の要素に含まれるため、最上位の要素だけを対象にする
+        candidate_ids = {id(element) for element in footer_elements}
+        if id(soup) in candidate_ids:
+            # ドキュメント全体がフッター候補の場合はページ全体の抽出結果を使用
+            unique_emails = self.extract_document_emails(document)
+        else:
+            fragments = []
+            seen_ids = set()
+            for element in footer_elements:
+                if id(element) in seen_ids:
+                    continue
+                seen_ids.add(id(element))
+                if any(id(ancestor) in candidate_ids for ancestor in element.parents):
+                    continue
+                fragments.append(str(element))
 
-        # フッター要素からメールアドレスを抽出
-        for element in footer_elements:
-            element_html = str(element)
-            footer_emails = self.extract_emails_from_html(element_html, url)
-            emails.extend(footer_emails)
+            # 要素境界（タグ）をまたいでパターンが一致することはないため連結して1回で抽出
+            unique_emails = self.extract_emails_from_html(''.join(fragments), document.url) if fragments else []
 
-        # 重複を削除
-        unique_emails = list(set(emails))
+        document.footer_emails = list(unique_emails)
 
         if unique_emails:
             logging.info(f"フッター領域から {len(unique_emails)} 件のメールアドレスを抽出: {unique_emails}")
 
-        return unique_emails
+        return list(unique_emails)
 
     def find_contact_pages(self, base_url):
         """お問い合わせページ、会社概要ページ、およびその他の重要なページのURLを特定"""
@@ -1083,11 +1139,18 @@ class PrioritizedEmailExtractor:
         if not base_url.startswith(('http://', 'https://')):
             base_url = 'https://' + base_url
 
-        response = self.fetch_url(base_url)
-        if not response:
+        # トップページは取得・解析済みのドキュメントを再利用（結果もドキュメントに保持）
+        document = self.get_document(base_url)
+        if not document:
             return []
+        return self.find_document_contact_pages(document)
+
+    def find_document_contact_pages(self, document):
+        """解析済みドキュメントのリンクから関連ページを分類（結果はドキュメントに保持）"""
+        if document.contact_pages is not None:
+            return list(document.contact_pages)
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        base_url = document.url
         contact_pages = []
 
         # リンクテキストによる検索 - 大幅拡張版
@@ -1118,12 +1181,13 @@ class PrioritizedEmailExtractor:
             'access': access_keywords
         }
 
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            text = a.get_text().lower()
+        # キーワードの小文字化はリンクごとではなく1回だけ行う
+        keyword_types = {page_type: [keyword.lower() for keyword in keywords] for page_type, keywords in keyword_types.items()}
 
-            # 相対URLを絶対URLに変換
-            full_url = urljoin(base_url, href)
+        # リンクの相対URLはドキュメントのURL（= base_url）を基準に解決済み
+        for full_url, href, link_text in document.links:
+            text = link_text.lower()
+            href_lower = href.lower()
 
             # 同じドメイン内のURLのみを対象
             if not self.is_same_domain(base_url, full_url):
@@ -1131,11 +1195,11 @@ class PrioritizedEmailExtractor:
 
             # 各タイプのキーワードに対してチェック
             for page_type, keywords in keyword_types.items():
-                if any(keyword.lower() in text for keyword in keywords) or any(keyword.lower() in href.lower() for keyword in keywords):
+                if any(keyword in text for keyword in keywords) or any(keyword in href_lower for keyword in keywords):
                     contact_pages.append({
                         'url': full_url,
                         'type': page_type,
-                        'text': a.get_text().strip()
+                        'text': link_text.strip()
                     })
                     break  # 一つのタイプに分類されたら次のリンクへ
 
@@ -1147,7 +1211,8 @@ class PrioritizedEmailExtractor:
                 seen_urls.add(page['url'])
                 unique_pages.append(page)
 
-        return unique_pages
+        document.contact_pages = unique_pages
+        return list(unique_pages)
 
     def is_same_domain(self, url1, url2):
         """2つのURLが同じドメインかどうかを判定"""
@@ -1439,169 +1504,32 @@ class PrioritizedEmailExtractor:
 
     def verify_email_format(self, email):
         """メールアドレスの形式を検証（強化版）"""
-        if not email:
-            return False
-
-        # 基本的な形式チェック
-        basic_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(basic_pattern, email):
-            return False
-
-        # 無効なパターンを除外
-        invalid_patterns = [
-            r'\.wp-block-',  # WordPressのCSSクラス名
-            r'@link\.',      # 明らかに無効なドメイン
-            r'@\d+\.',       # 数字のみのドメイン（例: @200.jp）
-            r'^[^a-zA-Z]',   # 英字以外で始まるローカル部
-            r'@.*\.(no|test|example|invalid)$',  # テスト用ドメイン
-            r'@.*\.(png|jpg|jpeg|gif|css|js)$',  # ファイル拡張子
-            r'[<>"\'\s]',    # HTMLタグや引用符、空白文字
-        ]
-
-        for pattern in invalid_patterns:
-            if re.search(pattern, email, re.IGNORECASE):
-                return False
-
-        # @の前後に文字があるか
-        try:
-            local_part, domain_part = email.split('@')
-            if not local_part or not domain_part:
-                return False
-
-            # ドメイン部分にピリオドがあるか
-            if '.' not in domain_part:
-                return False
-
-            # ローカル部分の長さが適切か
-            if len(local_part) > 64:
-                return False
-
-            # ドメイン部分の長さが適切か
-            if len(domain_part) > 255:
-                return False
-
-            # ローカル部分が無効なパターンでないかチェック
-            if local_part.startswith('.') or local_part.endswith('.'):
-                return False
-
-            # ドメイン部分が無効なパターンでないかチェック
-            if domain_part.startswith('.') or domain_part.endswith('.'):
-                return False
-
-        except:
-            return False
-
-        return True
+        return STRICT_RULES.is_valid(email)
 
     def verify_mx_record(self, domain):
-        """ドメインのMXレコードを確認"""
-        try:
-            mx_records = dns.resolver.resolve(domain, 'MX')
-            return len(mx_records) > 0
-        except Exception as e:
-            logging.error(f"MXレコード確認エラー ({domain}): {e}")
-            return False
+        """ドメインのMXレコードを確認（結果は検証サービスでドメインごとにキャッシュ）"""
+        return self.mail_verifier.has_mx(domain)
 
     def verify_smtp(self, email):
-        """SMTPレベルでメールアドレスの存在を検証（実装版）"""
-        result = {
-            'is_valid': False,
-            'is_catch_all': False,
-            'details': '',
-            'response_code': None,
-            'response_message': ''
-        }
+        """SMTPレベルでメールアドレスの存在を検証（実装版）
 
+        MXレコード・キャッチオール判定・アドレスごとの結果は検証サービスでキャッシュされる。
+        """
         try:
-            # ドメイン部分を取得
-            parts = email.split('@')
-            if len(parts) != 2:
-                result['details'] = '無効なメールアドレス形式'
-                return result
-
-            local_part, domain = parts
-
-            # MXレコードを確認
-            if not self.verify_mx_record(domain):
-                result['details'] = 'MXレコードが存在しない'
-                return result
-
-            # 一般的なドメインは有効と仮定（SMTPサーバーがブロックする可能性があるため）
-            common_domains = ['gmail.com', 'yahoo.co.jp', 'outlook.com', 'hotmail.com', 'icloud.com', 'mail.com', 'aol.com', 'protonmail.com']
-            if domain in common_domains:
-                result['is_valid'] = True
-                result['details'] = '一般的なドメイン'
-                return result
-
-            try:
-                # MXレコードを取得
-                mx_records = dns.resolver.resolve(domain, 'MX')
-                mx_hosts = [str(rdata.exchange).rstrip('.') for rdata in mx_records]
-
-                if not mx_hosts:
-                    result['details'] = 'MXレコードが存在するが、有効なMXホストがない'
-                    return result
-
-                # 最も優先度の高いMXサーバーを使用
-                mx_host = mx_hosts[0]
-
-                # SMTPサーバーに接続（短いタイムアウト）
-                smtp = smtplib.SMTP(timeout=2)  # タイムアウトを2秒に短縮
-                smtp.connect(mx_host)
-                smtp.ehlo_or_helo_if_needed()
-
-                # 送信元アドレス（存在する可能性が高いアドレスを使用）
-                from_address = f"verify@{domain}"
-
-                # MAIL FROMコマンド
-                smtp.mail(from_address)
-
-                # RCPT TOコマンドでメールアドレスを検証
-                code, message = smtp.rcpt(email)
-                result['response_code'] = code
-                result['response_message'] = message.decode('utf-8', errors='ignore') if isinstance(message, bytes) else str(message)
-
-                # 250はOK、それ以外はエラー
-                if code == 250:
-                    result['is_valid'] = True
-                    result['details'] = 'SMTP検証成功'
-
-                    # キャッチオールチェック
-                    # ランダムな文字列を生成してテスト
-                    random_local = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=10))
-                    random_email = f"{random_local}@{domain}"
-
-                    # ランダムアドレスをテスト
-                    random_code, _ = smtp.rcpt(random_email)
-                    if random_code == 250:
-                        result['is_catch_all'] = True
-                        result['details'] = 'キャッチオールドメイン'
-                else:
-                    result['details'] = f"SMTP検証失敗: {code} {result['response_message']}"
-
-                # 接続を閉じる
-                smtp.quit()
-
-            except smtplib.SMTPServerDisconnected:
-                result['details'] = 'SMTPサーバーが接続を切断'
-            except smtplib.SMTPResponseException as e:
-                result['response_code'] = e.smtp_code
-                result['response_message'] = e.smtp_error.decode('utf-8', errors='ignore') if isinstance(e.smtp_error, bytes) else str(e.smtp_error)
-                result['details'] = f"SMTPエラー: {e.smtp_code} {result['response_message']}"
-            except smtplib.SMTPException as e:
-                result['details'] = f"SMTPエラー: {str(e)}"
-            except socket.timeout:
-                result['details'] = 'SMTP接続タイムアウト'
-            except socket.error as e:
-                result['details'] = f"ソケットエラー: {str(e)}"
-            except Exception as e:
-                result['details'] = f"SMTP検証中の予期しないエラー: {str(e)}"
-
-            return result
+            return self.mail_verifier.verify_address(email)
         except Exception as e:
+            result = new_smtp_result()
             result['details'] = f"SMTP検証エラー: {str(e)}"
             return result
 
+    def verify_smtp_batch(self, emails):
+        """複数のメールアドレスをSMTPレベルでまとめて検証（MXホストごとに1回の接続）"""
+        try:
+            return self.mail_verifier.verify_addresses(emails)
+        except Exception as e:
+            logging.error(f"SMTP一括検証エラー: {e}")
+            return {}
+
     def verify_email_smtp(self, email, domain=None):
         """SMTPレベルでメールアドレスの存在を検証（シンプル版）"""
         try:
@@ -1616,41 +1544,32 @@ class PrioritizedEmailExtractor:
             if not self.verify_mx_record(domain):
                 return False, "MXレコードが存在しない"
 
-            # 一般的なドメインは有効と仮定（SMTPサーバーがブロックする可能性があるため）
-            common_domains = ['gmail.com', 'yahoo.co.jp', 'outlook.com', 'hotmail.com', 'icloud.com', 'mail.com', 'aol.com', 'protonmail.com']
-            if domain in common_domains:
-                return True, "一般的なドメイン"
-
-            # MXレコードを取得
-            mx_records = dns.resolver.resolve(domain, 'MX')
-            mx_host = str(mx_records[0].exchange).rstrip('.')
-
-            # SMTPサーバーに接続（短いタイムアウト）
-            server = smtplib.SMTP(timeout=2)  # タイムアウトを2秒に短縮
-            server.connect(mx_host)
-            server.ehlo_or_helo_if_needed()
-
-            # 送信元アドレス
-            from_address = f"verify@{domain}"
+            smtp_result = self.verify_smtp(email)
+            return smtp_result['is_valid'], smtp_result['details']
 
-            # MAIL FROMコマンド
-            server.mail(from_address)
-
-            # RCPT TOコマンド
-            code, message = server.rcpt(email)
+        except Exception as e:
+            return False, f"SMTP検証中にエラー: {e}"
 
-            # 接続を閉じる
-            server.quit()
+    def prefetch_verification(self, emails):
+        """検証前にドメインのMXレコードをまとめて解決（SMTP検証が有効な場合はアドレスも一括検証）
 
-            # 250はOK、それ以外はエラー
-            if code == 250:
-                return True, "SMTP検証成功"
+        結果は検証サービスにキャッシュされ、続く verify_email() はキャッシュを参照する。
+        """
+        emails = [email for email in dict.fromkeys(emails) if email and '@' in email]
+        if not emails:
+            return
+        try:
+            if self.use_smtp_verification and not self._smtp_budget_exhausted():
+                self.mail_verifier.verify_addresses(emails)
             else:
-                message_str = message.decode('utf-8', errors='ignore') if isinstance(message, bytes) else str(message)
-                return False, f"SMTP検証失敗: {code} {message_str}"
-
+                self.mail_verifier.resolve_many(email.split('@')[-1] for email in emails)
         except Exception as e:
-            return False, f"SMTP検証中にエラー: {e}"
+            logging.error(f"メールアドレス検証の事前解決エラー: {e}")
+
+    def _smtp_budget_exhausted(self):
+        """企業の残り時間がSMTP検証のタイムアウトに満たないか"""
+        remaining = self.deadline.remaining() if self.deadline is not None else None
+        return remaining is not None and remaining < self.mail_verifier.smtp_timeout
 
     def verify_email_domain_match(self, email, company_domain):
         """メールアドレスのドメインが企業ドメインと一致するかチェック"""
@@ -1753,11 +1672,15 @@ class PrioritizedEmailExtractor:
             if local_part.lower() in common_prefixes:
                 result['confidence'] = 0.7
 
-            # SMTP検証（Spamhausブロック対策のため一時的に無効化）
+            # SMTP検証（Spamhausブロック対策のため既定では無効）
             # 本番環境では外部SMTPサービス経由で検証を推奨
-            skip_smtp_verification = True  # Spamhausブロック対策
+            skip_smtp_verification = not self.use_smtp_verification
 
-            if not skip_smtp_verification:
+            if not skip_smtp_verification and self._smtp_budget_exhausted():
+                # 企業の処理時間の予算切れ（MX検証のみで信頼度を設定）
+                result['details'] += ' SMTP検証スキップ（処理時間の予算切れ）'
+                result['confidence'] = 0.6
+            elif not skip_smtp_verification:
                 smtp_result = self.verify_smtp(email)
                 if smtp_result['is_valid']:
                     result['smtp_valid'] = True
@@ -1785,14 +1708,19 @@ class PrioritizedEmailExtractor:
         return result
 
     def extract_emails_with_dynamic_rendering(self, url):
-        """JavaScriptによる動的生成メールアドレスを抽出"""
-        if not self.use_dynamic_extraction or not self.dynamic_extractor:
+        """JavaScriptによる動的生成メールアドレスを抽出
+
+        ブラウザの空きを待つ時間とページ読み込みのタイムアウトは企業の残り時間で頭打ちにする。
+        """
+        if not self.use_dynamic_extraction or not self.dynamic_pool:
             logging.debug("動的メール抽出機能は無効です")
             return []
 
+        remaining = self.deadline.remaining() if self.deadline is not None else None
         try:
             logging.info(f"動的レンダリングによるメールアドレス抽出を開始: {url}")
-            emails = self.dynamic_extractor.extract_emails_from_dynamic_page(url)
+            with self.dynamic_pool.acquire(timeout=remaining, page_load_timeout=remaining) as dynamic_extractor:
+                emails = dynamic_extractor.extract_emails_from_dynamic_page(url)
 
             if emails:
                 logging.info(f"動的レンダリングにより {len(emails)} 件のメールアドレスを抽出しました: {url}")
@@ -1800,6 +1728,9 @@ class PrioritizedEmailExtractor:
                 logging.info(f"動的レンダリングではメールアドレスが見つかりませんでした: {url}")
 
             return emails
+        except TimeoutError as e:
+            logging.info(f"動的レンダリングをスキップしました（残り時間内にブラウザが空きませんでした）: {url} - {e}")
+            return []
         except Exception as e:
             logging.error(f"動的メール抽出中にエラーが発生しました: {e}")
             logging.debug(traceback.format_exc())
@@ -1810,43 +1741,32 @@ class PrioritizedEmailExtractor:
         url_lower = url.lower()
         link_text_lower = link_text.lower()
 
-        # 優先度の高いページタイプ
-        high_value_keywords = {
-            # 最優先: お問い合わせページ
-            'contact': ['contact', 'inquiry', 'お問い合わせ', 'お問合せ', 'お問合わせ', 'お問い合せ', 'inquiries', 'contact us', 'toiawase', 'otoiawase', 'mail', 'email', 'メール'],
-
-            # 次点: 会社概要ページ
-            'about': ['about', 'company', 'profile', 'corporate', '会社概要', '企業情報', '会社情報', 'about us', 'company profile', 'corporate profile', '会社案内'],
-
-            # 採用情報ページ（高優先度）
-            'recruit': ['recruit', 'careers', 'jobs', 'recruitment', 'career', '採用', '採用情報', '求人', '募集', '募集要項', 'キャリア'],
-
-            # その他の重要ページ
-            'other_important': ['privacy', 'terms', 'ir', 'news', 'ニュース', 'プライバシー', 'サイトマップ', 'ブログ', 'privacy policy']
-        }
+        # 優先度の高いページタイプ（キーワードは種別ごとに1つの正規表現で判定）
+        patterns = HIGH_VALUE_PAGE_PATTERNS
 
         # 優先度スコアを計算（高いほど優先）
         score = 0
 
         # URLに基づくスコア
-        if any(keyword in url_lower for keyword in high_value_keywords['contact']):
+        if patterns['contact'].search(url_lower):
             score += 10
-        elif any(keyword in url_lower for keyword in high_value_keywords['about']):
+        elif patterns['about'].search(url_lower):
             score += 5
-        elif any(keyword in url_lower for keyword in high_value_keywords['recruit']):
+        elif patterns['recruit'].search(url_lower):
             score += 7  # 採用情報ページは会社概要より優先度高め
-        elif any(keyword in url_lower for keyword in high_value_keywords['other_important']):
+        elif patterns['other_important'].search(url_lower):
             score += 3
 
         # リンクテキストに基づくスコア
-        if any(keyword in link_text_lower for keyword in high_value_keywords['contact']):
-            score += 5
-        elif any(keyword in link_text_lower for keyword in high_value_keywords['about']):
-            score += 3
-        elif any(keyword in link_text_lower for keyword in high_value_keywords['recruit']):
-            score += 4  # 採用情報ページは会社概要より優先度高め
-        elif any(keyword in link_text_lower for keyword in high_value_keywords['other_important']):
-            score += 1
+        if link_text_lower:
+            if patterns['contact'].search(link_text_lower):
+                score += 5
+            elif patterns['about'].search(link_text_lower):
+                score += 3
+            elif patterns['recruit'].search(link_text_lower):
+                score += 4  # 採用情報ページは会社概要より優先度高め
+            elif patterns['other_important'].search(link_text_lower):
+                score += 1
 
         return score
 
@@ -1854,34 +1774,32 @@ class PrioritizedEmailExtractor:
         """単一ページを処理してメールアドレスを抽出（並列処理用）"""
         try:
             logging.info(f"ページを処理中: {url}")
-            response = self.fetch_url(url)
-            if not response:
-                return []
+            document = self.get_document(url)
+            if not document:
+                return {
+                    'emails': [],
+                    'links': [],
+                    'url': url
+                }
 
-            # このページからメールアドレスを抽出
-            page_emails = self.extract_emails_from_html(response.text, url)
+            # このページからメールアドレスを抽出（解析済みの場合は保持している結果を使用）
+            page_emails = self.extract_document_emails(document)
             if page_emails:
                 logging.info(f"{url} から {len(page_emails)} 件のメールアドレスを抽出しました")
 
             # 新しいリンクを見つける
-            soup = BeautifulSoup(response.text, 'html.parser')
-            links = soup.find_all('a', href=True)
-
             new_links = []
-            for link in links:
-                href = link['href']
-                link_text = link.get_text()
-
+            for _, href, link_text in document.links:
                 # 相対URLを絶対URLに変換
                 if not href.startswith(('http://', 'https://')):
                     href = urljoin(base_url, href)
 
                 # 同じドメイン内のURLのみを対象
                 if self.is_same_domain(base_url, href):
-                    # 優先度スコアを計算
+                    # 優先度スコアを計算（探索順はページ種別 → スコアの順）
                     priority_score = self.is_high_value_page(href, link_text)
                     if priority_score > 0:
-                        new_links.append((priority_score, href))
+                        new_links.append((crawl_priority(href, link_text, priority_score), href))
 
             return {
                 'emails': page_emails,
@@ -1897,14 +1815,19 @@ class PrioritizedEmailExtractor:
                 'url': url
             }
 
-    def deep_crawl_for_emails(self, base_url, max_pages=15, max_workers=5, adaptive_depth=True):
+    def deep_crawl_for_emails(self, base_url, max_pages=15, max_workers=5, adaptive_depth=True,
+                              deadline=DEFAULT_CRAWL_DEADLINE):
         """複数のページを並列探索してメールアドレスを抽出（拡張版）
 
+        探索は共有の探索エンジン（CRAWL_ENGINE）のイベントループで実行し、
+        お問い合わせ > 会社概要 > 採用情報 の順に、正規化したURLで重複を除いて取得する。
+
         Args:
             base_url (str): 基本URL
             max_pages (int): 探索する最大ページ数
             max_workers (int): 並列処理するワーカー数
             adaptive_depth (bool): 探索深度を動的に調整するかどうか
+            deadline (float): 探索の期限（秒）。None の場合は期限なし（企業の残り時間がある場合はその範囲内）
 
         Returns:
             list: 抽出されたメールアドレスのリスト
@@ -1912,148 +1835,62 @@ class PrioritizedEmailExtractor:
         if not base_url:
             return []
 
-        # 訪問済みURLと訪問予定URLの管理
-        visited = set()
-        to_visit = PriorityQueue()  # 優先度付きキュー
-        emails = []
-        email_lock = Lock()  # メールリストの同期用ロック
-
-        # 初期URLを追加
-        to_visit.put((-10, base_url))  # 負の値を使用して高い優先度を表現
+        # 初期URL（URL, 優先度）
+        seeds = [(base_url, crawl_priority(base_url, page_type='homepage'))]
 
-        # XMLサイトマップを探索して優先度の高いURLを追加
+        # XMLサイトマップ（インデックス・gzipを含む）を逐次読み込み、価値の高い上位のURLを追加
         try:
-            sitemap_url = urljoin(base_url, '/sitemap.xml')
-            sitemap_response = self.fetch_url(sitemap_url)
-            if sitemap_response and 'xml' in sitemap_response.headers.get('Content-Type', ''):
-                logging.info(f"XMLサイトマップを発見: {sitemap_url}")
-                soup = BeautifulSoup(sitemap_response.text, 'html.parser')
-                # XMLの<loc>タグを探す
-                for loc in soup.find_all('loc'):
-                    url = loc.text.strip()
-                    if self.is_same_domain(base_url, url):
-                        # サイトマップから取得したURLの優先度を計算
-                        priority = -self.is_high_value_page(url)  # 負の値で優先度を表現
-                        to_visit.put((priority, url))
+            reader = SitemapReader(self.open_sitemap_stream, score=self.is_high_value_page,
+                                   accept=lambda url: self.is_same_domain(base_url, url), top_k=SITEMAP_TOP_K,
+                                   max_seconds_per_sitemap=self.sitemap_read_seconds)
+            sitemap_urls = reader.read(urljoin(base_url, '/sitemap.xml'))
+            if sitemap_urls:
+                logging.info(f"XMLサイトマップから {len(sitemap_urls)} 件のURLを追加"
+                             f"（サイトマップ {reader.stats['sitemaps']}件, URL {reader.stats['urls']}件）")
+            for url, score in sitemap_urls:
+                seeds.append((url, crawl_priority(url, score=score)))
         except Exception as e:
             logging.warning(f"XMLサイトマップの探索中にエラー: {e}")
 
-        # お問い合わせページと会社概要ページを優先的に探索
-        contact_pages = self.find_contact_pages(base_url)
-        for page in contact_pages:
-            url = page['url']
-            page_type = page['type']
-            if url not in visited:
-                # ページタイプに応じた優先度を設定
-                if page_type == 'contact':
-                    priority = -15  # 最優先
-                elif page_type == 'about':
-                    priority = -12  # 次点
-                elif page_type == 'recruit':
-                    priority = -10  # 採用情報ページも高い優先度
-                else:
-                    priority = -8   # その他の重要ページ
-                to_visit.put((priority, url))
-
-        # 並列処理で複数ページを同時に探索
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_url = {}
-
-            # 最初のバッチを処理
-            batch_size = min(max_workers, max_pages)
-            for _ in range(batch_size):
-                if to_visit.empty() or len(visited) >= max_pages:
-                    break
+        # お問い合わせページと会社概要ページを優先的に探索（ページタイプに応じた優先度）
+        for page in self.find_contact_pages(base_url):
+            seeds.append((page['url'], crawl_priority(page['url'], page_type=page['type'], score=RANK_WEIGHT - 1)))
 
-                try:
-                    _, url = to_visit.get()
-                    if url in visited:
-                        continue
-
-                    visited.add(url)
-                    future = executor.submit(self.process_page, url, base_url)
-                    future_to_url[future] = url
-                except Exception as e:
-                    logging.warning(f"ページのキューイング中にエラー: {e}")
-
-            # 結果を処理しながら新しいページをキューに追加
-            high_confidence_emails_found = False
-            while future_to_url and len(visited) < max_pages and not high_confidence_emails_found:
-                # 完了したタスクを処理
-                done, _ = concurrent.futures.wait(
-                    future_to_url,
-                    timeout=0.5,
-                    return_when=concurrent.futures.FIRST_COMPLETED
-                )
+        def found_high_confidence(emails):
+            # 十分な数の高品質なメールアドレスが見つかった場合、早期終了（ここでは単純に@前の部分で判断）
+            if not adaptive_depth:
+                return False
+            quality_emails = [email for email in emails if email.split('@')[0].lower() in
+                              ['info', 'contact', 'mail', 'inquiry', 'support', 'sales', 'office']]
+            if quality_emails:
+                logging.info(f"高品質なメールアドレスが見つかったため、探索を早期終了します")
+                return True
+            return False
 
-                for future in done:
-                    url = future_to_url.pop(future)
-                    try:
-                        result = future.result()
-
-                        # メールアドレスを追加
-                        with email_lock:
-                            emails.extend(result['emails'])
-
-                            # 十分な数の高品質なメールアドレスが見つかった場合、早期終了（条件を緩和）
-                            if adaptive_depth and len(emails) >= 1:
-                                # メールアドレスの品質を評価（ここでは単純に@前の部分で判断）
-                                quality_emails = [email for email in emails if email.split('@')[0].lower() in
-                                                ['info', 'contact', 'mail', 'inquiry', 'support', 'sales', 'office']]
-                                if len(quality_emails) >= 1:
-                                    logging.info(f"高品質なメールアドレスが見つかったため、探索を早期終了します")
-                                    high_confidence_emails_found = True
-                                    break
-
-                        # 新しいリンクをキューに追加
-                        if 'links' in result and isinstance(result['links'], list):
-                            for link_info in result['links']:
-                                try:
-                                    # link_infoが文字列の場合は、デフォルト優先度で処理
-                                    if isinstance(link_info, str):
-                                        link = link_info
-                                        priority = 1  # デフォルト優先度
-                                    elif isinstance(link_info, tuple) and len(link_info) == 2:
-                                        priority, link = link_info
-                                    elif isinstance(link_info, dict) and 'url' in link_info:
-                                        link = link_info['url']
-                                        priority = link_info.get('priority', 1)
-                                    else:
-                                        logging.warning(f"予期しないリンク形式: {type(link_info)} - {link_info}")
-                                        continue
-
-                                    if link and link not in visited and len(visited) < max_pages:
-                                        to_visit.put((-priority, link))  # 負の値で優先度を表現
-                                except Exception as link_error:
-                                    logging.warning(f"リンク処理エラー: {link_error} - {link_info}")
-                                    continue
-                    except Exception as e:
-                        logging.warning(f"ページ {url} の結果処理中にエラー: {e}")
-                        logging.debug(f"エラー詳細: {type(e).__name__}: {str(e)}")
-                        # エラーが発生しても処理を続行
-
-                # 新しいタスクをキューに追加
-                while len(future_to_url) < max_workers and not to_visit.empty() and len(visited) < max_pages and not high_confidence_emails_found:
-                    try:
-                        _, url = to_visit.get()
-                        if url in visited:
-                            continue
+        # 探索の期限は企業の残り時間で頭打ち
+        if self.deadline is not None:
+            deadline = self.deadline.timeout(deadline)
 
-                        visited.add(url)
-                        future = executor.submit(self.process_page, url, base_url)
-                        future_to_url[future] = url
-                    except Exception as e:
-                        logging.warning(f"新しいページのキューイング中にエラー: {e}")
+        crawl = self.crawl_engine.crawl(self, base_url, seeds, max_pages=max_pages, max_workers=max_workers,
+                                        deadline=deadline, stop_when=found_high_confidence)
 
         # 重複を削除
-        unique_emails = list(set(emails))
-        logging.info(f"並列探索の結果: {len(unique_emails)} 件のメールアドレスを発見、{len(visited)} ページを探索")
+        unique_emails = list(set(crawl['emails']))
+        logging.info(f"並列探索の結果: {len(unique_emails)} 件のメールアドレスを発見、{crawl['pages']} ページを探索"
+                     f"（取得中止 {crawl['cancelled']}件{', 期限切れ' if crawl['timed_out'] else ''}）")
         return unique_emails
 
-    def extract_emails_with_priority(self, company_name, url, company_id=None):
-        """優先順位に基づいてメールアドレスを抽出"""
+    def extract_emails_with_priority(self, company_name, url, company_id=None, deadline=None):
+        """優先順位に基づいてメールアドレスを抽出
+
+        企業ごとに処理時間の予算（deadline、省略時は company_budget 秒の CompanyDeadline）を設け、
+        取得・関連ページ探索・メール検証に渡す。予算を使い切った場合は以降の段階をスキップし、
+        それまでに見つかったアドレス（と機械的に生成したアドレス）から選択する。
+        """
         # 現在の企業名を設定（他のメソッドで参照できるように）
         self.current_company_name = company_name
+        # 解析済みドキュメントは企業ごとに保持する
+        self.documents = {}
 
         result = {
             'company_name': company_name,
@@ -2065,7 +1902,11 @@ class PrioritizedEmailExtractor:
             'company_id': company_id,
             'id': company_id,  # 互換性のために両方のキーで保存
             '企業ID': company_id,  # 日本語キーでも保存
-            'continue_search': True  # 信頼度の低いメールアドレスでも探索を続けるフラグ
+            'continue_search': True,  # 信頼度の低いメールアドレスでも探索を続けるフラグ
+            'homepage_hash': None,  # トップページ内容のハッシュ（再開時の鮮度判定に使用）
+            'homepage_url': None,  # ハッシュを算出したトップページのURL
+            'budget_exhausted': False,  # 処理時間の予算切れで段階をスキップしたか
+            'stage_seconds': {}  # 段階ごとの処理時間（秒）
         }
 
         # 企業IDがある場合はログに出力
@@ -2091,14 +1932,82 @@ class PrioritizedEmailExtractor:
         result['domain'] = domain
         logging.info(f"{company_name}: ドメイン {domain} を抽出しました")
 
+        # 企業ごとの処理時間の予算（取得・関連ページ探索・メール検証に渡す）
+        deadline = deadline or CompanyDeadline(self.company_budget, histogram=self.stage_histogram)
+        self.deadline = deadline
+        try:
+            try:
+                if self._extract_by_priority(result, company_name, url, domain, deadline):
+                    return result
+            except DeadlineExceeded as e:
+                # 以降の段階はスキップし、それまでの結果から選択する
+                logging.warning(f"{company_name}: {e}（経過 {deadline.elapsed():.1f}秒）")
+
+            # 優先順位6: 機械的メール生成（SMTP検証なし、予算切れの場合も実行）
+            deadline.begin('generation', check=False)
+            logging.info(f"{company_name}: 優先順位6 - 機械的メール生成（info@ドメイン）")
+
+            # info@ドメインを機械的に生成
+            generated_email = f"info@{domain}"
+            logging.info(f"{company_name}: 機械的に生成されたメールアドレス: {generated_email}")
+
+            # SMTP検証をスキップして、機械的に生成されたメールアドレスを追加
+            generated_verification = {
+                'email': generated_email,
+                'confidence': 0.6,  # 機械的生成なので中程度の信頼度
+                'smtp_valid': None,  # SMTP検証をスキップ
+                'is_catch_all': None,
+                'is_role_based': True,
+                'source': 'generated_mechanical',
+                'details': 'SMTP検証をスキップして機械的に生成',
+                'verification_level': 'mechanical',
+                'response_message': 'SMTP検証省略'
+            }
+
+            result['emails'].append(generated_verification)
+            logging.info(f"{company_name}: 機械的生成メールアドレス {generated_email} を追加しました")
+
+            # 最適なメールアドレスの選定
+            valid_emails = [e for e in result['emails'] if e['confidence'] >= 0.5]
+            if valid_emails:
+                result['best_email'] = self.select_best_email(valid_emails)
+                result['extraction_method'] = 'combined'
+            else:
+                # 有効なメールアドレスがない場合は、最も信頼度の高いものを選択
+                if result['emails']:
+                    result['best_email'] = self.select_best_email(result['emails'])
+                    result['extraction_method'] = 'low_confidence'
+
+            return result
+        finally:
+            deadline.finish()
+            self.deadline = None
+            result['budget_exhausted'] = deadline.skipped_stage is not None
+            result['stage_seconds'] = {stage: round(seconds, 3) for stage, seconds in deadline.stage_seconds.items()}
+
+    def _extract_by_priority(self, result, company_name, url, domain, deadline):
+        """優先順位1〜5の段階を順に実行し、抽出したアドレスを result に追加
+
+        各段階の開始時に企業の残り時間を確認し、予算を使い切っている場合は DeadlineExceeded を送出する。
+
+        Returns:
+            dict: 十分な信頼度のアドレスが見つかり抽出を終了する場合は result、続ける場合は None
+        """
         # 優先順位1: トップページからのメールアドレス抽出（強化版）
+        deadline.begin('homepage')
         logging.info(f"{company_name}: 優先順位1 - トップページからのメールアドレス抽出")
-        response = self.fetch_url(url)
-        if response:
+        # トップページは1回だけ取得・解析し、以降の抽出処理（フッター・関連ページ探索・並列探索）で共有
+        document = self.get_document(url, sections=('footer',))
+        if document:
+            result['homepage_hash'] = document.content_hash
+            result['homepage_url'] = url
+
             # 全体からメールアドレスを抽出（フッター以外も含む）
-            all_emails = self.extract_emails_from_html(response.text, url)
+            all_emails = self.extract_document_emails(document)
             if all_emails:
                 logging.info(f"{company_name}: トップページ全体から {len(all_emails)} 件のメールアドレスを抽出しました")
+                # ドメインのMXレコードをまとめて解決（SMTP検証が有効な場合はアドレスも一括検証）
+                self.prefetch_verification(all_emails)
                 for email in all_emails:
                     # 検証（企業ドメインとの一致チェック付き）
                     verification = self.verify_email(email, domain)
@@ -2106,9 +2015,11 @@ class PrioritizedEmailExtractor:
                     result['emails'].append(verification)
 
             # フッター領域からメールアドレスを抽出（より詳細に）
-            footer_emails = self.extract_emails_from_footer(response.text, url)
+            footer_emails = self.extract_emails_from_footer(document.html, url, document=document)
             if footer_emails:
                 logging.info(f"{company_name}: フッターから {len(footer_emails)} 件のメールアドレスを抽出しました")
+                # ドメインのMXレコードをまとめて解決（SMTP検証が有効な場合はアドレスも一括検証）
+                self.prefetch_verification(footer_emails)
                 for email in footer_emails:
                     # 既に抽出済みのメールアドレスはスキップ
                     if email in [e['email'] for e in result['emails']]:
@@ -2130,8 +2041,8 @@ class PrioritizedEmailExtractor:
                 else:
                     logging.info(f"{company_name}: 中程度の信頼度のメールアドレスが見つかりましたが、探索を続けます")
 
-            # トップページ全体からメールアドレスを抽出
-            page_emails = self.extract_emails_from_html(response.text, url)
+            # トップページ全体からメールアドレスを抽出（抽出済みの結果を使用）
+            page_emails = self.extract_document_emails(document)
             if page_emails:
                 logging.info(f"{company_name}: トップページから {len(page_emails)} 件のメールアドレスを抽出しました")
                 for email in page_emails:
@@ -2159,6 +2070,7 @@ class PrioritizedEmailExtractor:
         logging.info(f"{company_name}: 優先順位2 - 会社概要・お問い合わせページからのメールアドレス抽出")
 
         # 特定の問い合わせページURLパターンを直接試行
+        deadline.begin('direct_contact')
         potential_contact_urls = [
             f"{url.rstrip('/')}/sub3.html",  # 北弘機工株式会社のパターン
             f"{url.rstrip('/')}/contact.html",
@@ -2175,13 +2087,15 @@ class PrioritizedEmailExtractor:
                 continue
 
             logging.info(f"{company_name}: 直接お問い合わせページを試行: {contact_url}")
-            contact_response = self.fetch_url(contact_url)
-            if contact_response:
+            contact_document = self.get_document(contact_url)
+            if contact_document:
                 # ページ全体からメールアドレスを抽出
-                contact_emails = self.extract_emails_from_html(contact_response.text, contact_url)
+                contact_emails = self.extract_document_emails(contact_document)
 
                 if contact_emails:
                     logging.info(f"{company_name}: 直接アクセスで {len(contact_emails)} 件のメールアドレスを抽出: {contact_url}")
+                    # ドメインのMXレコードをまとめて解決（SMTP検証が有効な場合はアドレスも一括検証）
+                    self.prefetch_verification(contact_emails)
                     for email in contact_emails:
                         # 既に抽出済みのメールアドレスはスキップ
                         if email in [e['email'] for e in result['emails']]:
@@ -2193,6 +2107,7 @@ class PrioritizedEmailExtractor:
                         result['emails'].append(verification)
 
         # 通常の関連ページ検索
+        deadline.begin('contact_pages')
         contact_pages = self.find_contact_pages(url)
         if contact_pages:
             logging.info(f"{company_name}: {len(contact_pages)} 件の関連ページを発見しました")
@@ -2201,27 +2116,27 @@ class PrioritizedEmailExtractor:
                 page_type = page['type']
 
                 logging.info(f"{company_name}: {page_type} ページを分析中: {page_url}")
-                page_response = self.fetch_url(page_url)
-                if page_response:
+                page_document = self.get_document(page_url, sections=('contact',) if page_type == 'contact' else ())
+                if page_document:
                     # 通常のメール抽出
-                    page_emails = self.extract_emails_from_html(page_response.text, page_url)
+                    page_emails = self.extract_document_emails(page_document)
 
                     # 個人情報の取扱いについての欄からの特別抽出（お問い合わせページの場合）
                     if page_type == 'contact':
-                        page_soup = BeautifulSoup(page_response.text, 'html.parser')
-                        privacy_emails = self.extract_emails_from_privacy_sections(page_soup, page_url)
+                        privacy_emails, form_reply_emails = self.extract_contact_page_emails(page_document)
                         page_emails.extend(privacy_emails)
                         if privacy_emails:
                             logging.info(f"{company_name}: お問い合わせページの個人情報セクションから {len(privacy_emails)} 件のメールアドレスを抽出")
 
                         # 問い合わせフォームの自動返信メールアドレスを抽出（新機能）
-                        form_reply_emails = self.extract_contact_form_reply_emails(page_soup, page_url)
                         page_emails.extend(form_reply_emails)
                         if form_reply_emails:
                             logging.info(f"{company_name}: お問い合わせフォームから {len(form_reply_emails)} 件の自動返信メールアドレスを抽出")
 
                     if page_emails:
                         logging.info(f"{company_name}: {page_type} ページから {len(page_emails)} 件のメールアドレスを抽出しました")
+                        # ドメインのMXレコードをまとめて解決（SMTP検証が有効な場合はアドレスも一括検証）
+                        self.prefetch_verification(page_emails)
                         for email in page_emails:
                             # 既に抽出済みのメールアドレスはスキップ
                             if email in [e['email'] for e in result['emails']]:
@@ -2245,6 +2160,7 @@ class PrioritizedEmailExtractor:
 
         # 優先順位2.5: 問い合わせフォーム解析による推定メールアドレス抽出
         if self.use_contact_form_analysis:
+            deadline.begin('contact_form_analysis')
             logging.info(f"{company_name}: 優先順位2.5 - 問い合わせフォーム解析による推定メールアドレス抽出")
             form_emails = self.extract_emails_with_contact_form_analysis(url)
 
@@ -2275,12 +2191,15 @@ class PrioritizedEmailExtractor:
         # 信頼度の高いメールアドレスが見つかっていない場合、または信頼度が低いメールアドレスしか見つかっていない場合は探索を続ける
         if not any(e['confidence'] >= 0.8 for e in result['emails']):
             logging.info(f"{company_name}: 優先順位3 - 関連ページの戦略的拡大探索（並列処理）")
+            deadline.begin('deep_crawl')
 
             # 拡張された深い探索を実行（高速化設定：ページ数とワーカー数を削減）
             deep_emails = self.deep_crawl_for_emails(url, max_pages=5, max_workers=3, adaptive_depth=True)
 
             if deep_emails:
                 logging.info(f"{company_name}: 戦略的拡大探索から {len(deep_emails)} 件のメールアドレスを抽出しました")
+                # ドメインのMXレコードをまとめて解決（SMTP検証が有効な場合はアドレスも一括検証）
+                self.prefetch_verification(deep_emails)
                 for email in deep_emails:
                     # 既に抽出済みのメールアドレスはスキップ
                     if email in [e['email'] for e in result['emails']]:
@@ -2300,6 +2219,7 @@ class PrioritizedEmailExtractor:
 
             # 特定のページタイプからのメールアドレス抽出を試みる
             logging.info(f"{company_name}: 優先順位4 - 特定ページタイプからの抽出")
+            deadline.begin('special_pages')
             contact_pages = self.find_contact_pages(url)
 
             # 新しく追加されたページタイプを優先的に探索
@@ -2313,9 +2233,9 @@ class PrioritizedEmailExtractor:
                     page_type = page['type']
 
                     logging.info(f"{company_name}: {page_type} ページを分析中: {page_url}")
-                    page_response = self.fetch_url(page_url)
-                    if page_response:
-                        page_emails = self.extract_emails_from_html(page_response.text, page_url)
+                    page_document = self.get_document(page_url)
+                    if page_document:
+                        page_emails = self.extract_document_emails(page_document)
                         if page_emails:
                             logging.info(f"{company_name}: {page_type} ページから {len(page_emails)} 件のメールアドレスを抽出しました")
                             for email in page_emails:
@@ -2338,6 +2258,7 @@ class PrioritizedEmailExtractor:
             # 優先順位5: JavaScriptによる動的生成メールアドレスの抽出
             if self.use_dynamic_extraction:
                 logging.info(f"{company_name}: 優先順位5 - 動的レンダリングによるメールアドレス抽出")
+                deadline.begin('dynamic_rendering')
 
                 # トップページの動的レンダリング
                 dynamic_emails = self.extract_emails_with_dynamic_rendering(url)
@@ -2359,6 +2280,8 @@ class PrioritizedEmailExtractor:
 
                 if contact_urls:
                     for contact_url in contact_urls[:2]:  # 最大2つのお問い合わせページを試行
+                        # レンダリングのたびに残り時間を確認（使い切っていれば以降をスキップ）
+                        deadline.check('dynamic_rendering')
                         logging.info(f"{company_name}: お問い合わせページの動的レンダリング: {contact_url}")
                         contact_dynamic_emails = self.extract_emails_with_dynamic_rendering(contact_url)
 
@@ -2381,41 +2304,7 @@ class PrioritizedEmailExtractor:
                     result['best_email'] = self.select_best_email(valid_emails)
                     return result
 
-        # 優先順位6: 機械的メール生成（SMTP検証なし）
-        logging.info(f"{company_name}: 優先順位6 - 機械的メール生成（info@ドメイン）")
-
-        # info@ドメインを機械的に生成
-        generated_email = f"info@{domain}"
-        logging.info(f"{company_name}: 機械的に生成されたメールアドレス: {generated_email}")
-
-        # SMTP検証をスキップして、機械的に生成されたメールアドレスを追加
-        generated_verification = {
-            'email': generated_email,
-            'confidence': 0.6,  # 機械的生成なので中程度の信頼度
-            'smtp_valid': None,  # SMTP検証をスキップ
-            'is_catch_all': None,
-            'is_role_based': True,
-            'source': 'generated_mechanical',
-            'details': 'SMTP検証をスキップして機械的に生成',
-            'verification_level': 'mechanical',
-            'response_message': 'SMTP検証省略'
-        }
-
-        result['emails'].append(generated_verification)
-        logging.info(f"{company_name}: 機械的生成メールアドレス {generated_email} を追加しました")
-
-        # 最適なメールアドレスの選定
-        valid_emails = [e for e in result['emails'] if e['confidence'] >= 0.5]
-        if valid_emails:
-            result['best_email'] = self.select_best_email(valid_emails)
-            result['extraction_method'] = 'combined'
-        else:
-            # 有効なメールアドレスがない場合は、最も信頼度の高いものを選択
-            if result['emails']:
-                result['best_email'] = self.select_best_email(result['emails'])
-                result['extraction_method'] = 'low_confidence'
-
-        return result
+        return None
 
     def detect_autoreply_address_from_form(self, url, company_name):
         """お問い合わせフォーム送信による自動返信アドレス特定"""
@@ -2540,6 +2429,9 @@ class PrioritizedEmailExtractor:
 def load_companies_from_csv(file_path, start_id=None, end_id=None):
     """CSVファイルから企業情報を読み込む
 
+    エンコーディングはファイル先頭のサンプルから判定し、行はチャンク単位で逐次読み込む。
+    終了IDに達した時点で読み込みを打ち切るため、巨大な入力ファイルでも必要な範囲だけを読む。
+
     Args:
         file_path: CSVファイルのパス
         start_id: 開始ID（1から始まる）
@@ -2547,116 +2439,52 @@ def load_companies_from_csv(file_path, start_id=None, end_id=None):
     """
     companies = []
 
-    # 試すエンコーディングのリスト（より包括的に）
-    encodings = ['utf-8-sig', 'utf-8', 'shift_jis', 'cp932', 'euc_jp', 'iso2022_jp', 'latin1']
-
-    successful_encoding = None
-    file_content = None
+    def log_progress(rows_read, bytes_read, total_bytes):
+        percent = bytes_read * 100 / total_bytes if total_bytes else 100
+        logging.debug(f"企業リスト読み込み中: {rows_read}行 ({percent:.0f}%)")
 
-    # chardetライブラリを使用してエンコーディングを自動検出
     try:
-        import chardet
-        with open(file_path, 'rb') as f:
-            raw_data = f.read()
-            detected = chardet.detect(raw_data)
-            if detected['encoding'] and detected['confidence'] > 0.7:
-                detected_encoding = detected['encoding']
-                logging.info(f"chardetによる検出結果: {detected_encoding} (信頼度: {detected['confidence']:.2f})")
-                # 検出されたエンコーディングを最初に試す
-                if detected_encoding not in encodings:
-                    encodings.insert(0, detected_encoding)
-                else:
-                    # 既にリストにある場合は最初に移動
-                    encodings.remove(detected_encoding)
-                    encodings.insert(0, detected_encoding)
-    except ImportError:
-        logging.info("chardetライブラリが利用できません。手動でエンコーディングを試行します。")
+        csv_reader = CsvInputReader(file_path, progress_callback=log_progress)
+        logging.info(f"エンコーディング {csv_reader.encoding} でファイル '{file_path}' を読み込みます")
     except Exception as e:
-        logging.warning(f"chardetによるエンコーディング検出中にエラー: {e}")
-
-    # 各エンコーディングを試す
-    for encoding in encodings:
-        try:
-            logging.info(f"エンコーディング {encoding} でファイル '{file_path}' を読み込み中...")
-            with open(file_path, 'r', encoding=encoding, errors='strict') as f:
-                file_content = f.read()
-                successful_encoding = encoding
-                logging.info(f"エンコーディング {encoding} で正常に読み込みました")
-                break
-        except UnicodeDecodeError as e:
-            logging.warning(f"エンコーディング {encoding} では読み込めませんでした: {e}")
-            continue
-        except Exception as e:
-            logging.error(f"エンコーディング {encoding} での読み込み中にエラー: {e}")
-            continue
-
-    # すべてのエンコーディングで失敗した場合、エラーを無視して読み込む
-    if not successful_encoding:
-        logging.warning("すべてのエンコーディングで失敗しました。エラーを無視してUTF-8で読み込みます。")
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                file_content = f.read()
-                successful_encoding = 'utf-8 (errors ignored)'
-                logging.info("UTF-8（エラー無視）で読み込みました")
-        except Exception as e:
-            logging.error(f"最終的な読み込み試行でもエラー: {e}")
-            return []
-
-    if not successful_encoding:
-        logging.error(f"ファイル '{file_path}' を読み込めませんでした")
+        logging.error(f"ファイル '{file_path}' を読み込めませんでした: {e}")
         return []
 
     try:
-        # 成功したエンコーディングでCSVを解析
-        from io import StringIO
-        csv_file = StringIO(file_content)
-
-        # CSVファイルの最初の行を読み込んでカラム名を確認
-        first_line = file_content.split('\n')[0].strip()
-        csv_file.seek(0)  # ファイルポインタを先頭に戻す
+        # CSVファイルの最初の行（ヘッダー）を読み込んでカラム名を確認
+        first_line = ','.join(csv_reader.header)
 
         # カラム名が指定されていない場合は、最初のカラムを企業名として扱う
         if '企業名' not in first_line:
             logging.info("CSVファイルにカラム名「企業名」が見つかりません。最初のカラムを企業名として扱います。")
-            reader = csv.reader(csv_file)
-            header = next(reader)  # ヘッダー行をスキップ
-
-            for i, row in enumerate(reader):
-                if not row:  # 空行をスキップ
-                    continue
-
-                # 1から始まるIDを割り当て
-                company_id = i + 1
-
-                # IDの範囲が指定されている場合はフィルタリング
-                if start_id is not None and company_id < start_id:
-                    continue
-                if end_id is not None and company_id > end_id:
-                    continue
-
-                company_data = {
-                    'id': str(company_id),
-                    '企業名': row[0] if len(row) > 0 else '',
-                    'URL': row[1] if len(row) > 1 else '',
-                    '企業URL': row[1] if len(row) > 1 else ''  # 互換性のため
-                }
-
-                # 企業名が存在することを確認
-                if not company_data['企業名']:
-                    logging.warning(f"ID {company_id} の企業名が見つかりません")
-
-                companies.append(company_data)
+            chunks = csv_reader.iter_chunks()
         else:
             # 通常のDictReaderを使用
-            reader = csv.DictReader(csv_file)
-            for i, row in enumerate(reader):
-                # 1から始まるIDを割り当て
-                company_id = i + 1
-                row['id'] = str(company_id)
+            chunks = csv_reader.iter_dict_chunks()
+
+        company_id = 0
+        for chunk in chunks:
+            for row in chunk:
+                if isinstance(row, list):
+                    # 1から始まるIDを割り当て（空行もIDを消費する）
+                    company_id += 1
+                    if not row:  # 空行をスキップ
+                        continue
+                    company_data = {
+                        'id': str(company_id),
+                        '企業名': row[0] if len(row) > 0 else '',
+                        'URL': row[1] if len(row) > 1 else '',
+                        '企業URL': row[1] if len(row) > 1 else ''  # 互換性のため
+                    }
+                else:
+                    # 1から始まるIDを割り当て
+                    company_id += 1
+                    company_data = row
+                    company_data['id'] = str(company_id)
 
-                # 企業URL列をURL列にマッピング（互換性のため）
-                if '企業URL' in row and 'URL' not in row:
-                    row['URL'] = row['企業URL']
+                    # 企業URL列をURL列にマッピング（互換性のため）
+                    if '企業URL' in company_data and 'URL' not in company_data:
+                        company_data['URL'] = company_data['企業URL']
 
                 # IDの範囲が指定されている場合はフィルタリング
                 if start_id is not None and company_id < start_id:
@@ -2665,10 +2493,15 @@ def load_companies_from_csv(file_path, start_id=None, end_id=None):
                     continue
 
                 # 企業名が存在することを確認
-                if '企業名' not in row or not row['企業名']:
+                if not company_data.get('企業名'):
                     logging.warning(f"ID {company_id} の企業名が見つかりません")
 
-                companies.append(row)
+                companies.append(company_data)
+
+            # 終了IDを超えたら残りは読まない
+            if end_id is not None and company_id >= end_id:
+                chunks.close()
+                break
 
         if start_id is not None or end_id is not None:
             id_range = f"ID {start_id or 1} から {end_id or '最後'} までの "
@@ -2679,7 +2512,7 @@ def load_companies_from_csv(file_path, start_id=None, end_id=None):
 
         # 企業名のカラムを確認
         if companies:
-            logging.info(f"CSVファイルのカラム: {', '.join(companies[0].keys())}")
+            logging.info(f"CSVファイルのカラム: {', '.join(str(key) for key in companies[0].keys())}")
 
         return companies
     except Exception as e:
@@ -2749,6 +2582,219 @@ def save_results_to_csv(results, output_file):
         logging.error(f"CSVファイルの保存エラー: {e}")
         return False
 
+def fan_out_extraction_result(result, company):
+    """代表企業の抽出結果を同じドメインの同じ企業の行用に複製（企業名・ID・URLは各企業の値）"""
+    company_id = company.get('id', '')
+    if result.get('company_id') == company_id:
+        return result
+
+    shared = copy.deepcopy(result)
+    shared['company_name'] = company.get('企業名', '')
+    shared['url'] = company.get('URL', '')
+    shared['company_id'] = company_id
+    shared['id'] = company_id
+    shared['企業ID'] = company_id
+    return shared
+
+def homepage_hash_for(url, extractor=None):
+    """トップページを取得して内容のハッシュを返す（取得できない場合は None）
+
+    extractor を指定した場合は使い回す（訪問済みURL・解析済みドキュメントは取得ごとに初期化する）。
+    """
+    if not url or url == '-':
+        return None
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    if extractor is None:
+        extractor = PrioritizedEmailExtractor()
+    extractor.visited_urls = set()
+    extractor.documents = {}
+    document = extractor.get_document(url)
+    return document.content_hash if document else None
+
+def select_companies_to_extract(companies, checkpoint, max_age_hours=DEFAULT_MAX_AGE_HOURS,
+                                check_homepage=False, workers=8, retry_fallback=False):
+    """チェックポイントに鮮度のある結果がある企業を除外する
+
+    retry_fallback が True の場合は、機械的に生成したアドレスしかない結果も再抽出する。
+
+    check_homepage が True の場合は、経過時間の条件を満たす企業のトップページを並列に取得し、
+    内容のハッシュが記録時と同じ場合のみ結果を再利用する（変更を確認するためHTTPキャッシュは使わない）。
+    取得するのはハッシュを記録したURL（同じドメインの代表企業の結果を複製した企業では代表企業の
+    トップページ）で、同じURLは1回だけ取得する。
+
+    Returns:
+        tuple: (抽出が必要な企業のリスト, 企業ID → 再利用する結果)
+    """
+    candidates = {}
+    for company in companies:
+        result = checkpoint.get_fresh(company.get('id', ''), company.get('URL', ''), max_age_hours,
+                                      retry_fallback=retry_fallback)
+        if result is not None:
+            candidates[company.get('id', '')] = (company, result)
+
+    if check_homepage and candidates:
+        logging.info(f"トップページの変更を確認しています: {len(candidates)}社")
+        local = threading.local()
+
+        def current_homepage_hash(url):
+            # 抽出器はスレッドごとに1つを使い回し、HTTPキャッシュを使わずに取得する
+            extractor = getattr(local, 'extractor', None)
+            if extractor is None:
+                extractor = local.extractor = PrioritizedEmailExtractor()
+                extractor.http_cache = None
+            return homepage_hash_for(url, extractor)
+
+        homepage_urls = {}
+        for company_id, (company, _) in candidates.items():
+            record = checkpoint.get(company_id) or {}
+            homepage_urls[company_id] = record.get('homepage_url') or company.get('URL', '')
+        urls = list(dict.fromkeys(homepage_urls.values()))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='resume') as executor:
+            url_hashes = dict(zip(urls, executor.map(current_homepage_hash, urls)))
+        for company_id, homepage_url in homepage_urls.items():
+            company, _ = candidates[company_id]
+            homepage_hash = url_hashes[homepage_url]
+            if homepage_hash is None or checkpoint.get_fresh(
+                    company_id, company.get('URL', ''), max_age_hours, homepage_hash=homepage_hash,
+                    retry_fallback=retry_fallback) is None:
+                del candidates[company_id]
+
+    resumed = {company_id: result for company_id, (_, result) in candidates.items()}
+    pending = [company for company in companies if company.get('id', '') not in resumed]
+    logging.info(f"再開: 完了済み {len(resumed)}社をスキップ, 抽出対象 {len(pending)}社")
+    return pending, resumed
+
+def run_concurrent_extraction(companies, workers=8, use_dynamic_extraction=False, use_smtp_verification=False,
+                              checkpoint=None, company_budget=DEFAULT_COMPANY_BUDGET):
+    """企業単位でメールアドレス抽出を並列実行する
+
+    - ワーカー数を上限とするスレッドプールで複数企業を同時に処理
+    - 抽出器はワーカースレッドごとに1つ生成（企業名などの状態を共有しない）
+    - HTTPリクエストは REQUEST_LIMITER により全体・ホスト単位で同時実行数を制限
+    - MXレコード・キャッチオール判定は MAIL_VERIFIER のキャッシュを全企業で共有
+    - 関連ページの探索は CRAWL_ENGINE の1つのイベントループで全企業分を実行
+    - 同じウェブサイトのドメインを持つ企業は1回だけ抽出し、結果を各企業に展開
+    - 結果は完了順ではなく入力順で返す（出力CSVは逐次処理と同じ並びになる）
+    - checkpoint を指定した場合、各企業の結果を完了するたびにディスクへ追記
+    - 1企業あたりの処理時間は company_budget 秒まで（超えた段階はスキップ）。段階別の処理時間は STAGE_HISTOGRAM に集計
+
+    Returns:
+        tuple: (結果のリスト, 処理性能の統計)
+    """
+    results = [None] * len(companies)
+    thread_local = threading.local()
+    extractors = []
+    extractors_lock = Lock()
+    started = time.perf_counter()
+
+    def get_extractor():
+        extractor = getattr(thread_local, 'extractor', None)
+        if extractor is None:
+            extractor = PrioritizedEmailExtractor(use_dynamic_extraction=use_dynamic_extraction,
+                                                  use_smtp_verification=use_smtp_verification,
+                                                  company_budget=company_budget)
+            thread_local.extractor = extractor
+            with extractors_lock:
+                extractors.append(extractor)
+        return extractor
+
+    def process_company(index, company):
+        company_name = company.get('企業名', '')
+        url = company.get('URL', '')
+        company_id = company.get('id', '')
+
+        logging.info(f"\n企業 {index+1}/{total}: {company_name} (ID: {company_id})")
+
+        # 企業名が空の場合はログに出力
+        if not company_name:
+            logging.warning(f"ID {company_id} の企業名が空です。CSVファイルを確認してください。")
+
+        extractor = get_extractor()
+        # 訪問済みURLは企業ごとに管理する（処理順によって結果が変わらないように）
+        extractor.visited_urls = set()
+
+        try:
+            result = extractor.extract_emails_with_priority(company_name, url, company_id)
+        except Exception as e:
+            logging.error(f"{company_name}: メールアドレス抽出中にエラーが発生しました: {e}")
+            logging.error(traceback.format_exc())
+            result = {
+                'company_name': company_name,
+                'url': url,
+                'domain': None,
+                'emails': [],
+                'best_email': None,
+                'extraction_method': None,
+                'company_id': company_id,
+                'id': company_id,
+                '企業ID': company_id,
+                'error': str(e)
+            }
+
+        # 結果を表示
+        if result['best_email']:
+            email = result['best_email']['email']
+            confidence = result['best_email']['confidence']
+            source = result['best_email'].get('source', result['extraction_method'])
+            logging.info(f"{company_name}: メールアドレス {email} を抽出しました（信頼度: {confidence:.2f}, 抽出方法: {source}）")
+        else:
+            logging.info(f"{company_name}: メールアドレスを抽出できませんでした")
+
+        return result
+
+    # 同じドメインの同じ企業は代表企業だけを抽出（URLがない企業は1社ずつ処理）
+    plan = plan_by_domain(companies, get_url=lambda company: company.get('URL', ''),
+                          get_name=lambda company: company.get('企業名', ''))
+    positions = {id(company): i for i, company in enumerate(companies)}
+    units = [(group.representative, [positions[id(company)] for company in group.members]) for group in plan.groups]
+    units += [(company, [positions[id(company)]]) for company in plan.unplanned]
+    total = len(units)
+
+    completed = 0
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='extract') as executor:
+            futures = {executor.submit(process_company, i, company): members for i, (company, members) in enumerate(units)}
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                for position in futures[future]:
+                    results[position] = fan_out_extraction_result(result, companies[position])
+                    if checkpoint is not None:
+                        company = companies[position]
+                        checkpoint.append(company.get('id', ''), company.get('URL', ''), results[position],
+                                          results[position].get('homepage_hash'), results[position].get('homepage_url'))
+                completed += 1
+
+                elapsed = time.perf_counter() - started
+                rate = completed / elapsed if elapsed > 0 else 0
+                remaining = (total - completed) / rate if rate > 0 else 0
+                logging.info(f"進捗: {completed}/{total}ドメイン ({completed / total * 100:.1f}%) - "
+                             f"{rate * 60:.1f}ドメイン/分, 経過 {elapsed:.0f}秒, 残り約 {remaining:.0f}秒")
+    finally:
+        # 動的メール抽出器のクリーンアップ（共有プールで起動したブラウザをすべて終了）
+        for pool in {id(extractor.dynamic_pool): extractor.dynamic_pool
+                     for extractor in extractors if extractor.dynamic_pool}.values():
+            pool.close()
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        'companies': len(companies),
+        'domains': total,
+        'workers': workers,
+        'elapsed_seconds': elapsed,
+        'companies_per_minute': len(companies) / elapsed * 60 if elapsed > 0 else 0,
+        'requests': extractors[0].request_limiter.get_stats() if extractors else REQUEST_LIMITER.get_stats(),
+        'connections': HTTP_SESSION_POOL.get_stats(),
+        'verification': extractors[0].mail_verifier.get_stats() if extractors else MAIL_VERIFIER.get_stats(),
+        'crawl': extractors[0].crawl_engine.get_stats() if extractors else CRAWL_ENGINE.get_stats(),
+        'bodies': extractors[0].page_fetcher.get_stats() if extractors else PAGE_FETCHER.get_stats(),
+        'parsing': extractors[0].parse_pool.get_stats() if extractors else PARSE_POOL.get_stats(),
+        'stages': extractors[0].stage_histogram.get_stats() if extractors else STAGE_HISTOGRAM.get_stats(),
+        'cache': extractors[0].http_cache.get_stats() if extractors and extractors[0].http_cache else None,
+        'browsers': extractors[0].dynamic_pool.get_stats() if extractors and extractors[0].dynamic_pool else None
+    }
+    return results, stats
+
 def main():
     """メイン関数"""
     import argparse
@@ -2760,8 +2806,46 @@ def main():
     parser.add_argument('--input-file', default='data/derivative_input.csv', help='入力CSVファイル')
     parser.add_argument('--random', action='store_true', help='ランダムに10社を選択する')
     parser.add_argument('--no-dynamic', action='store_true', help='動的メール抽出を無効化する')
+    parser.add_argument('--workers', type=int, default=8, help='同時に処理する企業数（デフォルト: 8）')
+    parser.add_argument('--max-connections', type=int, default=DEFAULT_MAX_CONNECTIONS,
+                        help=f'全体の同時HTTP接続数の上限（デフォルト: {DEFAULT_MAX_CONNECTIONS}）')
+    parser.add_argument('--max-per-host', type=int, default=DEFAULT_MAX_PER_HOST,
+                        help=f'同一ホストへの同時リクエスト数の上限（デフォルト: {DEFAULT_MAX_PER_HOST}）')
+    parser.add_argument('--max-browsers', type=int, default=DEFAULT_MAX_BROWSERS,
+                        help=f'動的メール抽出で同時に起動するブラウザ数の上限（デフォルト: {DEFAULT_MAX_BROWSERS}）')
+    parser.add_argument('--max-page-kb', type=int, default=DEFAULT_MAX_BODY_BYTES // 1024,
+                        help=f'1ページの本文の読み込み上限（KB、デフォルト: {DEFAULT_MAX_BODY_BYTES // 1024}）')
+    parser.add_argument('--max-redirects', type=int, default=DEFAULT_MAX_REDIRECTS,
+                        help=f'リダイレクトの最大回数（デフォルト: {DEFAULT_MAX_REDIRECTS}）')
+    parser.add_argument('--parse-workers', type=int, default=DEFAULT_PARSE_WORKERS,
+                        help=f'HTML解析を行うプロセス数（0: 取得したスレッドで解析、デフォルト: {DEFAULT_PARSE_WORKERS}）')
+    parser.add_argument('--company-budget', type=float, default=DEFAULT_COMPANY_BUDGET,
+                        help=f'1企業あたりの処理時間の予算（秒、0で無制限、デフォルト: {DEFAULT_COMPANY_BUDGET}）')
+    parser.add_argument('--resume', action='store_true',
+                        help='チェックポイントに鮮度のある結果がある企業をスキップして再開する')
+    parser.add_argument('--checkpoint-file', help='チェックポイントのパス（デフォルト: 入力ファイルごとに data/extraction_checkpoints 配下）')
+    parser.add_argument('--max-result-age', type=float, default=DEFAULT_MAX_AGE_HOURS,
+                        help=f'--resume で再利用する結果の最大経過時間（時間、デフォルト: {DEFAULT_MAX_AGE_HOURS}）')
+    parser.add_argument('--check-homepage', action='store_true',
+                        help='--resume 時にトップページを取得し、内容が変わった企業は再抽出する')
+    parser.add_argument('--retry-fallback', action='store_true',
+                        help='--resume 時に、機械的に生成したアドレスしかない企業も再抽出する')
+    parser.add_argument('--smtp-verify', action='store_true',
+                        help='SMTPレベルの検証を有効にする（MXホストごとに1回の接続でまとめて検証）')
+    add_cache_arguments(parser)
     args = parser.parse_args()
 
+    # HTTPキャッシュの設定（--cache-only ではネットワークに接続しない）
+    apply_cache_arguments(args)
+
+    # リクエスト制限を設定（全抽出器で共有）
+    global REQUEST_LIMITER, CRAWL_ENGINE, PAGE_FETCHER, PARSE_POOL, DYNAMIC_POOL
+    REQUEST_LIMITER = HostRequestLimiter(max_connections=args.max_connections, max_per_host=args.max_per_host)
+    DYNAMIC_POOL = DynamicExtractorPool(max_browsers=args.max_browsers)
+    CRAWL_ENGINE = CrawlEngine(fetch_threads=args.max_connections * 2, max_per_host=args.max_per_host)
+    PAGE_FETCHER = StreamingFetcher(max_bytes=args.max_page_kb * 1024, max_redirects=args.max_redirects)
+    PARSE_POOL = ParsePool(workers=args.parse_workers)
+
     # 現在の時刻を取得（ファイル名用）
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -2804,53 +2888,37 @@ def main():
         selected_companies = valid_companies
         logging.info(f"全{len(valid_companies)}社を処理します")
 
-    # メールアドレス抽出器を初期化（動的メール抽出機能付き）
-    extractor = PrioritizedEmailExtractor(use_dynamic_extraction=not args.no_dynamic)
-
     if args.no_dynamic:
         logging.info("動的メール抽出機能は無効化されています")
     else:
         logging.info("動的メール抽出機能が有効です")
 
-    # 各企業のメールアドレスを抽出
-    results = []
+    # 企業ごとの結果は完了するたびにチェックポイントへ追記（停止しても --resume で再開できる）
+    checkpoint = ExtractionCheckpoint(args.checkpoint_file or default_checkpoint_path(input_file_path))
+    resumed = {}
+    pending_companies = selected_companies
+    if args.resume:
+        pending_companies, resumed = select_companies_to_extract(
+            selected_companies, checkpoint, max_age_hours=args.max_result_age,
+            check_homepage=args.check_homepage, workers=args.workers, retry_fallback=args.retry_fallback
+        )
+
+    # 各企業のメールアドレスを並列に抽出（結果は入力順）
+    logging.info(f"並列抽出: ワーカー {args.workers}, 同時接続上限 {args.max_connections}, ホストあたり {args.max_per_host}, "
+                 f"ブラウザ上限 {args.max_browsers}")
     try:
-        for i, company in enumerate(selected_companies):
-            company_name = company.get('企業名', '')
-            url = company.get('URL', '')
-            company_id = company.get('id', '')
-
-            logging.info(f"\n企業 {i+1}/{len(selected_companies)}: {company_name} (ID: {company_id})")
-
-            # 企業名が空の場合はログに出力
-            if not company_name:
-                logging.warning(f"ID {company_id} の企業名が空です。CSVファイルを確認してください。")
-
-            result = extractor.extract_emails_with_priority(company_name, url, company_id)
-            results.append(result)
-
-            # 結果を表示
-            if result['best_email']:
-                email = result['best_email']['email']
-                confidence = result['best_email']['confidence']
-                source = result['best_email'].get('source', result['extraction_method'])
-                logging.info(f"{company_name}: メールアドレス {email} を抽出しました（信頼度: {confidence:.2f}, 抽出方法: {source}）")
-            else:
-                logging.info(f"{company_name}: メールアドレスを抽出できませんでした")
-
-            # サーバーに負荷をかけないよう少し待機（高速化のため待機時間をさらに短縮）
-            if i < len(selected_companies) - 1:
-                wait_time = random.uniform(0.1, 0.3)
-                logging.info(f"次の企業の分析まで{wait_time:.1f}秒待機します...")
-                time.sleep(wait_time)
+        extracted, run_stats = run_concurrent_extraction(
+            pending_companies,
+            workers=args.workers,
+            use_dynamic_extraction=not args.no_dynamic,
+            use_smtp_verification=args.smtp_verify,
+            checkpoint=checkpoint,
+            company_budget=args.company_budget
+        )
     finally:
-        # 動的メール抽出器のクリーンアップ
-        if extractor.use_dynamic_extraction and extractor.dynamic_extractor:
-            try:
-                extractor.dynamic_extractor.close_driver()
-                logging.info("動的メール抽出器のドライバーを正常に終了しました")
-            except Exception as e:
-                logging.error(f"動的メール抽出器のドライバー終了中にエラーが発生しました: {e}")
+        PARSE_POOL.shutdown()
+    extracted = {company.get('id', ''): result for company, result in zip(pending_companies, extracted)}
+    results = [resumed.get(company.get('id', '')) or extracted[company.get('id', '')] for company in selected_companies]
 
     # 結果サマリーを表示
     print("\n===== 抽出結果サマリー =====")
@@ -2897,6 +2965,54 @@ def main():
         else:
             print(f"{company_name}: 抽出失敗")
 
+    # 処理性能を表示
+    request_stats = run_stats['requests']
+    print("\n===== 処理性能 =====")
+    print(f"処理時間: {run_stats['elapsed_seconds']:.1f}秒 (ワーカー {run_stats['workers']})")
+    print(f"抽出したドメイン: {run_stats['domains']}件 / 企業 {run_stats['companies']}社"
+          + (f"（再開: 完了済み {len(resumed)}社をスキップ）" if args.resume else ""))
+    print(f"スループット: {run_stats['companies_per_minute']:.1f}社/分")
+    print(f"HTTPリクエスト: {request_stats['requests']}件 / {request_stats['hosts']}ホスト "
+          f"(同時接続 最大{request_stats['peak_in_flight']}/{request_stats['max_connections']}, "
+          f"枠待ち合計 {request_stats['wait_seconds']:.1f}秒)")
+    connection_stats = run_stats['connections']
+    print(f"接続再利用: {connection_stats['reused_connections']}/{connection_stats['requests']}件 "
+          f"(再利用率 {connection_stats['reuse_rate'] * 100:.1f}%, 新規接続 {connection_stats['new_connections']}件)")
+    verification_stats = run_stats['verification']
+    print(f"メール検証: DNS問い合わせ {verification_stats['dns_queries']}件 "
+          f"(MXキャッシュヒット率 {verification_stats['mx_hit_rate'] * 100:.1f}%, {verification_stats['mx_cache_entries']}ドメイン), "
+          f"SMTP接続 {verification_stats['smtp_sessions']}件 / RCPT {verification_stats['rcpt_commands']}件")
+    body_stats = run_stats['bodies']
+    print(f"本文の読み込み: {body_stats['bodies']}件 / {body_stats['bytes_read'] / 1024 / 1024:.1f}MB "
+          f"(上限で打ち切り {body_stats['truncated']}件, HTML以外を拒否 {body_stats['rejected']}件, "
+          f"リダイレクト {body_stats['redirects']}回 / 中止 {body_stats['redirect_failures']}件)")
+    parse_stats = run_stats['parsing']
+    if parse_stats['workers']:
+        print(f"HTML解析: {parse_stats['pages']}ページ / {parse_stats['bytes_parsed'] / 1024 / 1024:.1f}MB "
+              f"({parse_stats['workers']}プロセス, 解析時間合計 {parse_stats['parse_seconds']:.1f}秒, "
+              f"失敗 {parse_stats['failures']}件)")
+    else:
+        print("HTML解析: 取得したスレッドで解析（プロセスプール不使用）")
+    crawl_stats = run_stats['crawl']
+    print(f"関連ページ探索: {crawl_stats['crawls']}サイト / {crawl_stats['pages']}ページ "
+          f"(同時探索 最大{crawl_stats['peak_active_crawls']}サイト, 取得中止 {crawl_stats['cancelled']}件, "
+          f"期限切れ {crawl_stats['timeouts']}サイト)")
+    stage_stats = run_stats['stages']
+    budget_label = f"{args.company_budget:g}秒" if args.company_budget > 0 else "無制限"
+    print(f"段階別の処理時間（予算 {budget_label}, 予算切れ {stage_stats['exhausted']}社"
+          + (f", スキップ開始段階 {stage_stats['skipped']}" if stage_stats['skipped'] else "") + "）:")
+    for line in STAGE_HISTOGRAM.format_lines():
+        print(f"  {line}")
+    browser_stats = run_stats['browsers']
+    if browser_stats:
+        print(f"動的メール抽出: ブラウザ {browser_stats['browsers']}/{browser_stats['max_browsers']}個 "
+              f"(利用 {browser_stats['borrows']}回, 空き待ち合計 {browser_stats['wait_seconds']:.1f}秒)")
+    cache_stats = run_stats['cache']
+    if cache_stats:
+        print(f"HTTPキャッシュ: ヒット {cache_stats['hits']}件, 再検証(304) {cache_stats['revalidated']}件, "
+              f"取得 {cache_stats['misses']}件, オフライン未取得 {cache_stats['offline_misses']}件 "
+              f"(ヒット率 {cache_stats['hit_rate'] * 100:.1f}%, {cache_stats['entries']}件 / {cache_stats['size_bytes'] / 1024 / 1024:.1f}MB)")
+
     # 結果をCSVファイルに保存
     save_results_to_csv(results, output_file)
 
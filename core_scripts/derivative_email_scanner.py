@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+メールアドレス候補スキャナー（コンパイル済みパターン・区切り文字による事前絞り込み）
+- 基本パターンと難読化パターンはモジュール読み込み時に1回だけコンパイル
+- 区切り文字（@ ＠ [at] アット ドット &#64; 記号など）の周辺だけを切り出してパターンを適用
+- 空白の連続は1文字に、長い英数字記号の連続は先頭と末尾だけに短縮して処理するため、
+  処理時間は入力の長さに比例する（最悪ケースでも二乗時間にならない）
+  （signal.alarm やタイムアウト用スレッドは不要）
+
+使用例:
+    basic, obfuscated = EMAIL_SCANNER.scan(html)
+"""
+
+import re
+
+# 基本的なメールアドレスパターン
+BASIC_EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+BASIC_EMAIL_REGEX = re.compile(BASIC_EMAIL_PATTERN)
+
+# 拡張された難読化メールアドレスパターン（区切り文字の種類ごと）
+OBFUSCATED_EMAIL_PATTERNS = {
+    # @ ＠ とHTMLエンティティ
+    'at_sign': [
+        r'([a-zA-Z0-9._%+-]+)\s*@\s*([a-zA-Z0-9.-]+)\s*[\[\(]dot[\]\)]\s*([a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*@\s*([a-zA-Z0-9.-]+)\s*\.\s*([a-zA-Z]{2,})',
+        # スペースや文字で分割されたメールアドレス
+        r'([a-zA-Z0-9._%+-]+)\s+[@＠]\s+([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)[@＠]([a-zA-Z0-9.-]+)\s+\.\s+([a-zA-Z]{2,})',
+        # HTMLエンティティ
+        r'([a-zA-Z0-9._%+-]+)\s*&#64;\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*&commat;\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        # 画像内テキストでよく見られるパターン
+        r'([a-zA-Z0-9._%+-]+)\s*＠\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*@\s*([a-zA-Z0-9.-]+)\s*．\s*([a-zA-Z]{2,})',
+        # 複数のスペースや改行を含むパターン
+        r'([a-zA-Z0-9._%+-]+)\s+@\s+([a-zA-Z0-9.-]+)\s+\.\s+([a-zA-Z]{2,})',
+    ],
+    # [at] (at) アット ドット
+    'word': [
+        r'([a-zA-Z0-9._%+-]+)\s*[\[\(]at[\]\)]\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*\[アット\]\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*（アット）\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*\[ドット\]\s*([a-zA-Z0-9.-]+)\s*\[ドット\]\s*([a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*（ドット）\s*([a-zA-Z0-9.-]+)\s*（ドット）\s*([a-zA-Z]{2,})',
+    ],
+    # 記号・特殊文字・アンダースコアやハイフンによる区切り
+    'symbol': [
+        r'([a-zA-Z0-9._%+-]+)\s*[※★●■▲▼◆◇○△▽☆]\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*[※★●■▲▼◆◇○△▽☆]\s*([a-zA-Z0-9.-]+)\s*[※★●■▲▼◆◇○△▽☆]\s*([a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*[＃＄％＆＊＋－＝]\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*[＃＄％＆＊＋－＝]\s*([a-zA-Z0-9.-]+)\s*[＃＄％＆＊＋－＝]\s*([a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*[_－―─]\s*([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        r'([a-zA-Z0-9._%+-]+)\s*[_－―─]\s*([a-zA-Z0-9.-]+)\s*[_－―─]\s*([a-zA-Z]{2,})',
+    ],
+}
+
+# 区切り文字の種類ごとの事前絞り込みパターン（各パターンの一致には必ずいずれかが含まれる）
+TRIGGER_PATTERNS = {
+    'at_sign': r'[@＠]|&#64;|&commat;',
+    'word': r'[\[\(]at[\]\)]|アット|ドット',
+    'symbol': r'[※★●■▲▼◆◇○△▽☆＃＄％＆＊＋－＝_―─]',
+}
+
+# メールアドレスを構成する文字（ローカル部・ドメイン部）
+TOKEN_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-')
+
+# 英数字記号の連続がこの2倍を超える場合は、先頭と末尾のこの文字数だけを残す
+# （ドメイン部は連続の先頭、ローカル部は末尾に位置し、ローカル部は64文字・アドレス全体は254文字まで）
+MAX_TOKEN_LENGTH = 256
+
+# 区切り文字の前後に切り出す範囲（文字数）
+# 区切り文字より前はローカル部（64文字超は無効）、後ろは「ドメイン + 区切り + トップレベル」
+# （正規化後はそれぞれ最大512文字）が収まる長さ
+WINDOW_BEFORE = 300
+WINDOW_AFTER = 1040
+
+WHITESPACE_RUN = re.compile(r'\s{2,}')
+LONG_TOKEN_RUN = re.compile(r'(?<![a-zA-Z0-9._%%+-])[a-zA-Z0-9._%%+-]{%d,}' % (MAX_TOKEN_LENGTH * 2 + 1))
+
+
+def _shorten_token_run(match):
+    run = match.group()
+    return run[:MAX_TOKEN_LENGTH] + ' ' + run[-MAX_TOKEN_LENGTH:]
+
+
+def normalize_for_scan(text):
+    """スキャン用にテキストを正規化（有効なアドレスの抽出結果が変わらない範囲で連続文字を短縮）
+
+    - 空白の連続は1文字の空白にする（パターン中の空白は \\s* / \\s+ のみで、抽出する部分には含まれない）
+    - 長い英数字記号の連続は先頭と末尾だけを残す（1回の照合で走査する長さを抑え、線形時間にする）
+    """
+    text = WHITESPACE_RUN.sub(' ', text)
+    return LONG_TOKEN_RUN.sub(_shorten_token_run, text)
+
+
+class EmailScanner:
+    """区切り文字の周辺だけにパターンを適用するメールアドレス候補スキャナー
+
+    結果は各パターンで全文に re.findall を実行した場合と同じ形式
+    （基本パターンは文字列、難読化パターンはグループのタプル）で返す。
+    """
+
+    def __init__(self, obfuscated_patterns=None, trigger_patterns=None):
+        obfuscated_patterns = obfuscated_patterns or OBFUSCATED_EMAIL_PATTERNS
+        trigger_patterns = trigger_patterns or TRIGGER_PATTERNS
+        self.triggers = {family: re.compile(pattern) for family, pattern in trigger_patterns.items()}
+        self.obfuscated = {
+            family: [re.compile(pattern) for pattern in patterns]
+            for family, patterns in obfuscated_patterns.items()
+        }
+
+    def windows(self, text, family):
+        """区切り文字の周辺範囲（重なる範囲は結合）を (開始, 終了) のリストで返す"""
+        length = len(text)
+        windows = []
+        for match in self.triggers[family].finditer(text):
+            start = max(0, match.start() - WINDOW_BEFORE)
+            end = min(length, match.end() + WINDOW_AFTER)
+            if windows and start <= windows[-1][1]:
+                windows[-1][1] = end
+            else:
+                windows.append([start, end])
+
+        # 範囲の端で途切れた英数字記号の連続は除外（途中から始まる誤った候補を作らない）
+        result = []
+        for start, end in windows:
+            if start > 0 and text[start - 1] in TOKEN_CHARS:
+                while start < end and text[start] in TOKEN_CHARS:
+                    start += 1
+            if end < length and text[end] in TOKEN_CHARS:
+                while end > start and text[end - 1] in TOKEN_CHARS:
+                    end -= 1
+            if start < end:
+                result.append((start, end))
+        return result
+
+    def find_basic(self, text, normalized=False):
+        """基本パターンに一致する文字列のリスト"""
+        if not text:
+            return []
+        if not normalized:
+            text = normalize_for_scan(text)
+        found = []
+        for start, end in self.windows(text, 'at_sign'):
+            found.extend(BASIC_EMAIL_REGEX.findall(text, start, end))
+        return found
+
+    def find_obfuscated(self, text, normalized=False):
+        """難読化パターンに一致したグループのタプルのリスト"""
+        if not text:
+            return []
+        if not normalized:
+            text = normalize_for_scan(text)
+        found = []
+        for family, patterns in self.obfuscated.items():
+            windows = self.windows(text, family)
+            if not windows:
+                continue
+            for pattern in patterns:
+                for start, end in windows:
+                    found.extend(pattern.findall(text, start, end))
+        return found
+
+    def scan(self, text):
+        """基本パターンと難読化パターンの候補を返す
+
+        Returns:
+            tuple: (基本パターンの一致リスト, 難読化パターンのタプルリスト)
+        """
+        if not text:
+            return [], []
+        text = normalize_for_scan(text)
+        return self.find_basic(text, normalized=True), self.find_obfuscated(text, normalized=True)
+
+
+# 共有インスタンス（コンパイル済みパターンはスレッド間で共有可能）
+EMAIL_SCANNER = EmailScanner()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+メールアドレスの検証（1件ずつの判定と列単位の一括判定で同じ規則を使用）
+- 形式・画像ファイル名等の除外・入力例ドメイン・使い捨てドメイン・ロールベースの規則を1か所で定義
+- 規則セットごとに形式と除外パターンを1つの正規表現にまとめてコンパイルし、1件あたり1回の照合で判定する
+- 列単位の判定（valid_mask / classify_emails / clean_email_addresses）は同じ値をまとめて（pd.factorize）
+  1回だけ判定し、NumPy配列（Series を渡した場合は同じインデックスの Series）で返す
+- 呼び出し元ごとの判定基準は規則セット（EmailRules）として定義する
+    EXTRACTION_RULES: ページから抽出した候補の判定（PrioritizedEmailExtractor.is_valid_email_format）
+    RESOLVER_RULES: 送信先の決定（HuganJobEmailResolver.is_valid_email）
+    STRICT_RULES: 検証前の厳密な形式チェック（PrioritizedEmailExtractor.verify_email_format）
+
+使用例:
+    if EXTRACTION_RULES.is_valid(email):
+        ...
+    df['有効'] = RESOLVER_RULES.valid_mask(df['担当者メールアドレス'])
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# 基本的なメールアドレス形式（ローカル部@ドメイン部.英字2文字以上のTLD）
+EMAIL_FORMAT = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+
+# 画像ファイル・ウェブファイルの拡張子
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.bmp', '.ico',
+                    '.tiff', '.tif', '.avif', '.heic', '.heif')
+WEB_FILE_EXTENSIONS = ('.css', '.js', '.woff', '.woff2', '.otf', '.ttf', '.eot',
+                       '.map', '.json', '.xml', '.html', '.htm')
+
+# スクリプト・CSSの識別子に由来する無効なドメイン拡張子
+SCRIPT_NAME_EXTENSIONS = (
+    '.print', '.catalog', '.shop', '.contact', '.nav', '.main',
+    '.logo', '.banner', '.header', '.footer', '.sidebar', '.content',
+    '.image', '.string', '.easing', '.name', '.version', '.params',
+    '.config', '.settings', '.options', '.plugin', '.custom',
+    '.retargeting', '.datalayer', '.large', '.term', '.jquery',
+    '.init', '.top', '.bottom', '.post', '.postdata', '.combox',
+    '.duration', '.after', '.selector', '.offset', '.areas',
+    '.mode', '.me', '.tag', '.captcha', '.mp', '.bg', '.com'
+)
+
+# レスポンシブ画像（@2x.png, @3x.jpg等）とサイズ・端末別の画像ファイル名
+RESPONSIVE_IMAGE_PATTERNS = (
+    r'@\d+x\.(?:jpg|jpeg|png|gif|svg|webp|bmp|ico)\Z',
+    r'@retina\.(?:jpg|jpeg|png|gif|svg|webp|bmp|ico)\Z',
+    r'@mobile\.(?:jpg|jpeg|png|gif|svg|webp|bmp|ico)\Z',
+    r'@tablet\.(?:jpg|jpeg|png|gif|svg|webp|bmp|ico)\Z',
+)
+IMAGE_NAME_PATTERNS = (
+    r'@\d+x\d+\.',  # @1080x360.jpg等のサイズ指定
+    r'@sp\.',       # @sp.jpg等のスマートフォン用
+    r'@pc\.',       # @pc.jpg等のPC用
+    r'@mobile\.',
+    r'@tablet\.',
+    r'banner.*@.*\.(?:jpg|png|gif|svg)',
+    r'logo.*@.*\.(?:jpg|png|gif|svg)',
+    r'icon.*@.*\.(?:jpg|png|gif|svg)',
+    r'hero.*@.*\.(?:jpg|png|gif|svg)',
+    r'thumb.*@.*\.(?:jpg|png|gif|svg)',
+)
+
+# JavaScript/CSS変数に由来するパターン（抽出候補の判定用）
+SCRIPT_VARIABLE_PATTERNS = (
+    r'window\.', r'\.prototype\.',
+    r'\.version\Z', r'\.params\Z', r'\.config\Z', r'\.settings\Z', r'\.options\Z',
+    r'@plugin\.', r'@custom\.', r'@retargeting\.', r'@datalayer\.', r'@large\.', r'@term\.', r'@jquery\.',
+    r'\Asummary@', r'\Asearch@', r'\Amy@', r'\Agtm4wp@',
+    r'@.*\.image\Z', r'@.*\.string\Z', r'@.*\.easing\Z', r'@.*\.name\Z',
+)
+
+# JavaScript/CSS変数に由来する文字列（送信先の決定用、部分一致）
+SCRIPT_VARIABLE_SUBSTRINGS = (
+    'window.', '.prototype.', '.version', '.params', '.config', '.settings', '.options',
+    '@plugin.', '@custom.', '@retargeting.', '@datalayer.', '@large.', '@term.', '@jquery.',
+    'summary@', 'search@', 'my@', 'gtm4wp@', '@reset.', '@polisy.', '@bg.', '@scroll.',
+    '@fade.', '@hide.', '@element.', '@container.', '@widget.', '@reload.', '@check.',
+    '@unit.', '@post.', '@challenge.', '@captcha.', '@2.', '@sp.', '@pc.', '@mobile.',
+    '@tablet.', 'comp-', 'webpackjsonp', 'self.webpackjsonp', 'thunderbolt.app'
+)
+
+# 検証前の厳密な形式チェックで除外するパターン
+STRICT_EXCLUDED_PATTERNS = (
+    r'\.wp-block-',  # WordPressのCSSクラス名
+    r'@link\.',      # 明らかに無効なドメイン
+    r'@\d+\.',       # 数字のみのドメイン（例: @200.jp）
+    r'\A[^a-zA-Z]',  # 英字以外で始まるローカル部
+    r'@.*\.(?:no|test|example|invalid)\Z',  # テスト用ドメイン
+    r'@.*\.(?:png|jpg|jpeg|gif|css|js)\Z',  # ファイル拡張子
+    r'[<>"\'\s]',    # HTMLタグや引用符、空白文字
+    r'\.@',          # ピリオドで終わるローカル部
+    r'@\.',          # ピリオドで始まるドメイン部
+)
+
+# 使い捨てメールドメインのリスト（一部）
+DISPOSABLE_DOMAINS = {
+    'mailinator.com', 'guerrillamail.com', 'temp-mail.org', 'disposablemail.com',
+    'tempmail.com', '10minutemail.com', 'yopmail.com', 'mailnesia.com',
+    'tempinbox.com', 'dispostable.com', 'sharklasers.com', 'grr.la',
+    'guerrillamail.info', 'guerrillamail.biz', 'guerrillamail.de',
+    'spam4.me', 'trashmail.com', 'mailcatch.com', 'anonbox.net',
+    'getairmail.com', 'mailexpire.com', 'tempmailaddress.com',
+    'fakeinbox.com', 'tempmailer.com', 'temp-mail.ru', 'throwawaymail.com'
+}
+
+# ロールベースメールプレフィックスのリスト
+ROLE_BASED_PREFIXES = [
+    'info', 'contact', 'inquiry', 'support', 'sales', 'webmaster', 'help',
+    'office', 'mail', 'postmaster', 'hostmaster', 'abuse', 'noc', 'security',
+    'marketing', 'hr', 'jobs', 'career', 'careers', 'recruit', 'recruitment',
+    'service', 'services', 'feedback', 'no-reply', 'noreply',
+    'no_reply', 'newsletter', 'press', 'media', 'billing', 'account', 'accounts'
+]
+
+# 入力例・プレースホルダーとして使用される一般的なドメイン
+EXAMPLE_DOMAINS = {
+    'google.com', 'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com',
+    'example.com', 'example.org', 'example.net', 'test.com', 'test.org',
+    'sample.com', 'demo.com', 'placeholder.com', 'your-email.com',
+    'yourdomain.com', 'yourcompany.com', 'company.com', 'domain.com',
+    'mail.com', 'email.com', 'address.com'
+}
+
+# 入力例として使用される一般的なメールアドレス
+EXAMPLE_EMAILS = {
+    'info@google.com', 'test@example.com', 'sample@sample.com',
+    'your-email@example.com', 'email@example.com', 'name@example.com',
+    'user@example.com', 'contact@example.com', 'admin@example.com',
+    'info@gmail.com', 'test@test.com', 'sample@demo.com'
+}
+
+# 一般的な入力例パターン（小文字化したアドレスの先頭から照合）
+EXAMPLE_EMAIL_REGEX = re.compile(
+    r'(?:test|sample|demo|example|placeholder|your-?email|your-?name|user|admin)@'
+    r'|@(?:test|sample|demo|example|placeholder)\.com\Z'
+    r'|@your-?(?:domain|company|email)\.com\Z'
+)
+
+
+def _suffix_pattern(extensions):
+    return r'\.(?:%s)\Z' % '|'.join(re.escape(ext.lstrip('.')) for ext in sorted(set(extensions)))
+
+
+def _exclusion_lookaheads(excluded):
+    """除外パターンを先頭の文字ごとにまとめた否定先読み
+
+    「どこかに一致したら無効」を (?!.*(?:p1|p2|...)) のまま書くと全位置で全パターンを試すため、
+    先頭が \\A のパターンは文字列の先頭だけ、@ で始まるパターンは（形式上1つしかない）@ の位置だけ、
+    \\. で始まるパターンは . の位置だけで試すようにまとめる（判定結果は同じ）。
+    """
+    groups = {r'\A': [], '@': [], r'\.': [], '': []}
+    for pattern in excluded:
+        prefix = next((p for p in (r'\A', '@', r'\.') if pattern.startswith(p)), '')
+        groups[prefix].append(pattern[len(prefix):])
+
+    lookaheads = []
+    if groups[r'\A']:
+        lookaheads.append(r'(?!(?:%s))' % '|'.join(groups[r'\A']))
+    if groups['@']:
+        lookaheads.append(r'(?![^@]*@(?:%s))' % '|'.join(groups['@']))
+    if groups[r'\.']:
+        lookaheads.append(r'(?!.*\.(?:%s))' % '|'.join(groups[r'\.']))
+    if groups['']:
+        lookaheads.append(r'(?!.*(?:%s))' % '|'.join(groups['']))
+    return lookaheads
+
+
+class EmailRules:
+    """メールアドレスの判定規則（形式と除外パターンを1つの正規表現にまとめたもの）
+
+    Args:
+        name: 規則セットの名前
+        excluded: 除外パターン（正規表現、アドレスのどこかに一致したら無効。大文字小文字は区別しない）
+        strip: 前後の空白を除いてから判定する
+        coerce: 文字列以外の値（数値など）も文字列に変換して判定する（欠損値は常に無効）
+        max_length: アドレス全体の最大長（None の場合は制限なし）
+        max_local_length: ローカル部の最大長
+        max_domain_length: ドメイン部の最大長（None の場合は制限なし）
+    """
+
+    def __init__(self, name, excluded=(), strip=True, coerce=False, max_length=254, max_local_length=64,
+                 max_domain_length=None):
+        self.name = name
+        self.strip = strip
+        self.coerce = coerce
+
+        lookaheads = [rf'(?=[^@]{{1,{max_local_length}}}@)']
+        if max_length:
+            lookaheads.append(rf'(?=.{{1,{max_length}}}\Z)')
+        if max_domain_length:
+            lookaheads.append(rf'(?=[^@]*@[^@]{{1,{max_domain_length}}}\Z)')
+        lookaheads += _exclusion_lookaheads(excluded)
+        # ASCIIの範囲で大文字小文字を区別しない（小文字化してから除外パターンを適用するのと同じ結果）
+        self.regex = re.compile(r'\A' + ''.join(lookaheads) + EMAIL_FORMAT + r'\Z', re.IGNORECASE | re.ASCII)
+
+    def normalize(self, email):
+        """判定対象の文字列（判定できない値は None）"""
+        if not isinstance(email, str):
+            if not self.coerce or email is None or (isinstance(email, float) and email != email):
+                return None
+            email = str(email)
+        return email.strip() if self.strip else email
+
+    def is_valid(self, email):
+        """1件のメールアドレスを判定"""
+        email = self.normalize(email)
+        return bool(email) and self.regex.match(email) is not None
+
+    def valid_mask(self, emails):
+        """列単位でメールアドレスを判定
+
+        Args:
+            emails: メールアドレスの列（pd.Series・リスト・NumPy配列）
+
+        Returns:
+            np.ndarray（bool）。pd.Series を渡した場合は同じインデックスの pd.Series
+        """
+        return map_unique(self.is_valid, emails, dtype=bool)
+
+    def __repr__(self):
+        return f"EmailRules({self.name!r})"
+
+
+def _factorize(values):
+    """(インデックス, 値ごとのコード, ユニークな値) を返す（欠損値のコードは -1）"""
+    index = values.index if isinstance(values, pd.Series) else None
+    if not isinstance(values, (pd.Series, np.ndarray)):
+        values = np.asarray(list(values), dtype=object)
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    return index, codes, uniques
+
+
+def map_unique(func, values, dtype=object):
+    """値ごとに1回だけ func を適用して列全体に展開（欠損値は func(None)）
+
+    Returns:
+        np.ndarray。pd.Series を渡した場合は同じインデックスの pd.Series
+    """
+    index, codes, uniques = _factorize(values)
+    results = [func(value) for value in uniques]
+    results.append(func(None))
+    if dtype is object:
+        mapped = np.empty(len(results), dtype=object)
+        mapped[:] = results
+    else:
+        mapped = np.array(results, dtype=dtype)
+    # 欠損値（コード -1）は最後の要素（func(None)）を参照する
+    result = mapped[codes]
+    return pd.Series(result, index=index) if index is not None else result
+
+
+def split_email(email):
+    """(ローカル部, ドメイン部) を小文字で返す（@がない場合は None）"""
+    if not isinstance(email, str) or '@' not in email:
+        return None
+    local_part, domain = email.strip().lower().split('@', 1)
+    return local_part, domain
+
+
+def is_disposable_domain(domain):
+    return (domain or '').lower() in DISPOSABLE_DOMAINS
+
+
+def is_role_based(email, prefixes=ROLE_BASED_PREFIXES):
+    """ロールベースアドレス（info@・contact@ など）かどうか"""
+    parts = split_email(email)
+    return parts is not None and parts[0] in prefixes
+
+
+def is_example_email(email, example_emails=EXAMPLE_EMAILS, example_domains=EXAMPLE_DOMAINS):
+    """メールアドレスが入力例・プレースホルダーかどうかを判定"""
+    if not email or not isinstance(email, str) or '@' not in email:
+        return False
+
+    email = email.lower().strip()
+    if email in example_emails:
+        return True
+    if email.split('@', 1)[1] in example_domains:
+        return True
+    return EXAMPLE_EMAIL_REGEX.match(email) is not None
+
+
+def classify_emails(emails, rules=None):
+    """列単位でメールアドレスを分類
+
+    Args:
+        emails: メールアドレスの列
+        rules: 形式の判定に使う規則セット（省略時は EXTRACTION_RULES）
+
+    Returns:
+        pd.DataFrame: valid（形式）, example（入力例）, disposable（使い捨てドメイン）, role_based（ロールベース）
+    """
+    rules = rules or EXTRACTION_RULES
+
+    def classify(email):
+        valid = rules.is_valid(email)
+        if not isinstance(email, str) or '@' not in email:
+            return valid, False, False, False
+        # 小文字化・分割は1回だけ行う（is_example_email・split_email と同じ判定）
+        email = email.strip().lower()
+        local_part, domain = email.split('@', 1)
+        example = email in EXAMPLE_EMAILS or domain in EXAMPLE_DOMAINS or EXAMPLE_EMAIL_REGEX.match(email) is not None
+        return valid, example, domain in DISPOSABLE_DOMAINS, local_part in ROLE_BASED_PREFIXES
+
+    index, codes, uniques = _factorize(emails)
+    table = np.array([classify(email) for email in uniques] + [classify(None)], dtype=bool).reshape(-1, 4)
+    return pd.DataFrame(table[codes], columns=['valid', 'example', 'disposable', 'role_based'], index=index)
+
+
+def clean_email_address(email):
+    """メールアドレスをクリーニング（@より後ろの不要な部分を削除）
+
+    例: "HUGAN JOB <client@hugan.co.jp>"@www4009.sakura.ne.jp -> client@hugan.co.jp
+    """
+    if not email:
+        return email
+
+    email_str = str(email).strip()
+
+    # 引用符で囲まれた表示名の中の <email@domain> を取り出す
+    if email_str.startswith('"') and '"' in email_str[1:]:
+        quote_end = email_str.find('"', 1)
+        quoted_part = email_str[1:quote_end]
+        start = quoted_part.find('<') + 1
+        end = quoted_part.find('>')
+        if start > 0 and end > start:
+            return quoted_part[start:end]
+
+    parts = email_str.split('@')
+    if len(parts) < 2:
+        return email_str
+
+    # ドメイン部分の引用符以降・2つ目以降の@を削除
+    domain_part = parts[1].split('"')[0].strip()
+    return f"{parts[0]}@{domain_part}"
+
+
+def clean_email_addresses(emails):
+    """列単位でメールアドレスをクリーニング"""
+    return map_unique(clean_email_address, emails)
+
+
+# ページから抽出した候補の判定（画像ファイル名・スクリプトの識別子を除外）
+EXTRACTION_RULES = EmailRules(
+    'extraction',
+    excluded=[_suffix_pattern(IMAGE_EXTENSIONS + WEB_FILE_EXTENSIONS)]
+    + list(RESPONSIVE_IMAGE_PATTERNS + IMAGE_NAME_PATTERNS + SCRIPT_VARIABLE_PATTERNS),
+)
+
+# 送信先の決定（抽出候補の判定に加え、連続するドット・スクリプト由来のドメイン拡張子なども除外）
+RESOLVER_RULES = EmailRules(
+    'resolver',
+    excluded=[r'\A\.', r'\.\.', _suffix_pattern(IMAGE_EXTENSIONS + WEB_FILE_EXTENSIONS + SCRIPT_NAME_EXTENSIONS)]
+    + list(RESPONSIVE_IMAGE_PATTERNS + IMAGE_NAME_PATTERNS)
+    + [re.escape(substring) for substring in SCRIPT_VARIABLE_SUBSTRINGS],
+    coerce=True,
+)
+
+# 検証前の厳密な形式チェック（前後の空白も無効）
+STRICT_RULES = EmailRules(
+    'strict',
+    excluded=list(STRICT_EXCLUDED_PATTERNS),
+    strip=False,
+    max_length=None,
+    max_domain_length=255,
+)
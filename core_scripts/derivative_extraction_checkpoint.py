@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+メールアドレス抽出のチェックポイント（企業ごとの結果を逐次保存して再開可能にする）
+- 1社の抽出が終わるたびに結果を1行のJSONとして追記し、flush + fsync でディスクに書き込む
+- 途中で停止しても、次回 --resume で鮮度のある結果を持つ企業はスキップする
+- 鮮度は「抽出からの経過時間」と「トップページ内容のハッシュ」で判定
+  （ハッシュは算出したトップページのURLと組で記録し、再開時は同じURLを取得して比較する）
+- 抽出中にエラーが発生した結果・処理時間の予算切れで段階をスキップした結果は再利用しない
+- サイトを最後まで確認してアドレスがなかった結果も完了として再利用する
+  （機械的に生成したアドレスしかない結果の再抽出は retry_fallback を指定した場合のみ）
+- 書き込み途中で停止した末尾の不完全な行は読み込み時に無視する
+- 同じ企業の古い行が増えたら最新の結果だけを残して書き直す（一時ファイル + 置き換え）
+
+ファイル形式（JSON Lines）:
+    {"company_id": "12", "url": "...", "finished_at": 1718000000.0, "homepage_hash": "...",
+     "homepage_url": "...", "result": {...}}
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_DIR = 'data/extraction_checkpoints'
+
+# 結果を再利用する期間の既定値（時間）
+DEFAULT_MAX_AGE_HOURS = 24 * 7
+
+# 機械的に生成したアドレスの取得元の接頭辞（サイトから抽出できなかった場合のフォールバック）
+FALLBACK_SOURCE_PREFIX = 'generated'
+
+# 古い行がこの数を超え、かつ最新の結果の数を上回ったらファイルを書き直す
+COMPACTION_MIN_STALE_LINES = 1000
+
+
+def default_checkpoint_path(input_file):
+    """入力ファイルごとのチェックポイントのパス（企業IDは入力ファイルの行番号のため）"""
+    name = os.path.splitext(os.path.basename(input_file or 'input'))[0]
+    return os.path.join(DEFAULT_CHECKPOINT_DIR, f"{name}_email_extraction.jsonl")
+
+
+class ExtractionCheckpoint:
+    """企業ごとの抽出結果の追記ファイル（スレッドセーフ）"""
+
+    def __init__(self, path, fsync=True):
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self.records = {}
+        self.lines = 0
+        self.appended = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._load()
+        self._compact_if_needed()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+
+        skipped = 0
+        with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    self.records[str(record['company_id'])] = record
+                    self.lines += 1
+                except (ValueError, KeyError, TypeError):
+                    skipped += 1
+
+        if skipped:
+            logger.warning(f"チェックポイントの不完全な行を {skipped} 行無視しました: {self.path}")
+        logger.info(f"チェックポイントを読み込みました: {len(self.records)}社 ({self.path})")
+
+    def _compact_if_needed(self):
+        stale = self.lines - len(self.records)
+        if stale < COMPACTION_MIN_STALE_LINES or stale < len(self.records):
+            return
+
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for record in self.records.values():
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        logger.info(f"チェックポイントを整理しました: {self.lines}行 → {len(self.records)}行")
+        self.lines = len(self.records)
+
+    def append(self, company_id, url, result, homepage_hash=None, homepage_url=None):
+        """1社分の結果を追記（戻った時点でディスクに書き込み済み）
+
+        homepage_url は homepage_hash を算出したURL（同じドメインの代表企業の結果を複製した場合は
+        代表企業のトップページ）。省略時は url と同じとみなす。
+        """
+        record = {
+            'company_id': str(company_id),
+            'url': url,
+            'finished_at': time.time(),
+            'homepage_hash': homepage_hash,
+            'homepage_url': homepage_url,
+            'result': result
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+
+        with self._lock:
+            with open(self.path, 'a+b') as f:
+                # 前回書き込み途中で停止した行に続けて書かないよう改行を補う
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+                f.write(line.encode('utf-8'))
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            self.records[record['company_id']] = record
+            self.lines += 1
+            self.appended += 1
+
+    def get(self, company_id):
+        with self._lock:
+            return self.records.get(str(company_id))
+
+    def get_fresh(self, company_id, url, max_age_hours=DEFAULT_MAX_AGE_HOURS, homepage_hash=None,
+                  retry_fallback=False):
+        """鮮度のある結果を返す（ない場合は None）
+
+        - 記録時と入力URLが異なる場合は対象外
+        - 抽出中にエラーが発生した結果、処理時間の予算切れで段階をスキップした結果は対象外
+        - サイトからアドレスを抽出できなかった結果は、最後まで処理していれば完了として再利用する
+          （retry_fallback が True の場合は、機械的に生成したアドレスしかない結果も対象外）
+        - max_age_hours を超えて古い結果は対象外（None の場合は経過時間を問わない）
+        - homepage_hash を指定した場合、記録時のトップページのハッシュと異なれば対象外
+        """
+        record = self.get(company_id)
+        if record is None or record.get('url') != url:
+            return None
+
+        result = record.get('result') or {}
+        if result.get('error') or result.get('budget_exhausted'):
+            return None
+
+        emails = result.get('emails') or []
+        if retry_fallback and emails and all(
+                str(email.get('source') or '').startswith(FALLBACK_SOURCE_PREFIX) for email in emails):
+            return None
+
+        if max_age_hours is not None and time.time() - record.get('finished_at', 0) > max_age_hours * 3600:
+            return None
+
+        if homepage_hash is not None and record.get('homepage_hash') != homepage_hash:
+            return None
+
+        return result
+
+    def get_stats(self):
+        with self._lock:
+            return {'companies': len(self.records), 'appended': self.appended, 'path': self.path}
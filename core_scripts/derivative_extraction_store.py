@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+メールアドレス抽出結果のストア（既存の抽出結果CSVを1回だけ読み込み、企業ID・ドメインで索引化）
+- 抽出結果CSVは最初の検索時に1回だけ読み込み、企業ID・企業名・正規化ドメインごとの索引を作成する
+- 検索は索引の参照のみで、企業ごとにCSVを読み直さない（決定処理全体で O(企業数 + ファイルサイズ)）
+- 企業IDの一致（企業ID列がないファイルは企業名の一致）を全ファイルで優先し、
+  見つからない場合は同じドメインで企業名も同じ抽出結果を使う
+  （同じホストに複数の企業のページがあるため、ドメインだけが一致する別企業の結果は使わない）
+- メールアドレスの有効性は呼び出し側で判定する（候補を優先順に返す）
+
+使用例:
+    store = ExtractionResultStore(EXTRACTION_RESULT_FILES)
+    for path, email in store.candidates(company_id, company_name, website_url):
+        if is_valid_email(email):
+            return email
+"""
+
+import os
+import math
+import logging
+import threading
+
+import pandas as pd
+
+from derivative_domain_planner import normalize_site_domain, normalize_company_name
+
+logger = logging.getLogger(__name__)
+
+# 既存のメールアドレス抽出結果ファイル（検索順）
+EXTRACTION_RESULT_FILES = (
+    'new_email_extraction_results_latest.csv',
+    'huganjob_email_extraction_results.csv',
+    'derivative_ad_email_extraction_results.csv',
+)
+
+# 企業ID・企業名・ウェブサイト・メールアドレスの列名（優先順）
+# 企業ID列は検索ごとに優先順を指定できる（両方の列があるファイルはどちらで照合するかが変わる）
+ID_COLUMNS = ('企業ID', 'ID')
+NAME_COLUMNS = ('企業名', 'company_name')
+DOMAIN_COLUMNS = ('ドメイン', 'domain', 'URL', '企業ホームページ', 'website_url', 'url')
+EMAIL_COLUMNS = ('メールアドレス', 'email', 'Email', 'EMAIL', 'extracted_email')
+
+
+def normalize_company_id(value):
+    """企業IDを索引のキーに正規化（1, 1.0, '1' を同じキーとして扱う）"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    key = str(value).strip()
+    if key.endswith('.0') and key[:-2].isdigit():
+        key = key[:-2]
+    return key or None
+
+
+def _first_column(columns, candidates):
+    return next((column for column in candidates if column in columns), None)
+
+
+class _ResultFile:
+    """1つの抽出結果ファイルの索引（キー → 行ごとのメールアドレス候補のリスト、ファイル内の行順）
+
+    ドメインの索引は (正規化した企業名, メールアドレス候補) のリスト（企業名列がないファイルは作らない）。
+    """
+
+    def __init__(self, path, df):
+        self.path = path
+        self.rows = len(df)
+        # 企業ID列ごとの索引
+        self.by_id = {}
+        self.by_name = {}
+        self.by_domain = {}
+
+        email_columns = [column for column in EMAIL_COLUMNS if column in df.columns]
+        id_columns = [column for column in ID_COLUMNS if column in df.columns]
+        name_column = _first_column(df.columns, NAME_COLUMNS)
+        domain_column = _first_column(df.columns, DOMAIN_COLUMNS)
+        self.has_id = bool(id_columns)
+        if not email_columns:
+            return
+
+        emails = [[value for value in values if value] for values in zip(*(df[c].tolist() for c in email_columns))]
+        for id_column in id_columns:
+            self._index(self.by_id.setdefault(id_column, {}), map(normalize_company_id, df[id_column].tolist()), emails)
+        if not id_columns and name_column:
+            self._index(self.by_name, (str(v).strip() if v else None for v in df[name_column].tolist()), emails)
+        if domain_column and name_column:
+            names = [normalize_company_name(v) if v else None for v in df[name_column].tolist()]
+            self._index(self.by_domain, map(normalize_site_domain, df[domain_column].tolist()),
+                        [(name, candidates) if name and candidates else None
+                         for name, candidates in zip(names, emails)])
+
+    @staticmethod
+    def _index(index, keys, emails):
+        for key, candidates in zip(keys, emails):
+            if key and candidates:
+                index.setdefault(key, []).append(candidates)
+
+
+class ExtractionResultStore:
+    """既存のメールアドレス抽出結果（スレッドセーフ、ファイルは初回の検索時に読み込む）
+
+    Args:
+        paths: 抽出結果CSVのパス（検索順、存在しないファイルは無視）
+    """
+
+    def __init__(self, paths=EXTRACTION_RESULT_FILES):
+        self.paths = tuple(paths)
+        self._files = None
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+
+    def _load(self):
+        with self._lock:
+            if self._files is not None:
+                return self._files
+            files = []
+            for path in self.paths:
+                if not os.path.exists(path):
+                    continue
+                try:
+                    df = pd.read_csv(path, encoding='utf-8-sig', dtype=str, keep_default_na=False)
+                except Exception as e:
+                    logger.warning(f"抽出結果ファイル読み込みエラー: {path} - {e}")
+                    continue
+                files.append(_ResultFile(path, df))
+                logger.info(f"抽出結果ファイルを読み込みました: {path} ({len(df)}行)")
+            self._files = files
+            return files
+
+    def reload(self):
+        """次回の検索時にファイルを読み込み直す"""
+        with self._lock:
+            self._files = None
+
+    def candidates(self, company_id=None, company_name=None, website_url=None, latest=False, paths=None,
+                   id_columns=ID_COLUMNS):
+        """企業の抽出結果のメールアドレス候補を優先順に返す
+
+        Args:
+            company_id: 企業ID（企業ID列のあるファイルで照合）
+            company_name: 企業名（企業ID列のないファイル、および同じドメインの結果の照合に使う）
+            website_url: ウェブサイトURL（企業で見つからない場合に同じドメイン・同じ企業名の結果で照合）
+            latest: True の場合は各ファイルで最後の行（最新の結果）、False の場合は最初の行を使う
+            paths: 検索するファイル（省略時はすべて、指定した順に検索）
+            id_columns: 企業ID列の優先順（ファイルごとに最初に見つかった列で照合する）
+
+        Returns:
+            list: (ファイルのパス, メールアドレス) のリスト
+        """
+        files = self._load()
+        if paths is not None:
+            order = {path: i for i, path in enumerate(paths)}
+            files = sorted((f for f in files if f.path in order), key=lambda f: order[f.path])
+
+        id_key = normalize_company_id(company_id)
+        name_key = str(company_name).strip() if company_name else None
+        domain_key = normalize_site_domain(website_url)
+        normalized_name = normalize_company_name(company_name) if company_name else None
+
+        matches = []
+        for result_file in files:
+            if result_file.has_id:
+                id_column = _first_column(result_file.by_id, id_columns)
+                rows = result_file.by_id[id_column].get(id_key) if id_column else None
+            else:
+                rows = result_file.by_name.get(name_key)
+            if rows:
+                matches += [(result_file.path, email) for email in rows[-1 if latest else 0]]
+        if domain_key and normalized_name:
+            for result_file in files:
+                rows = [candidates for name, candidates in result_file.by_domain.get(domain_key, ())
+                        if name == normalized_name]
+                if rows:
+                    matches += [(result_file.path, email) for email in rows[-1 if latest else 0]]
+
+        with self._lock:
+            self.lookups += 1
+            self.hits += bool(matches)
+        return matches
+
+    def get_stats(self):
+        files = self._files or []
+        return {
+            'files': len(files),
+            'rows': sum(f.rows for f in files),
+            'lookups': self.lookups,
+            'hits': self.hits
+        }
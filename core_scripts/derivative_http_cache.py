@@ -0,0 +1,438 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+共有HTTPキャッシュ（ディスク保存）
+- メールアドレス抽出・ウェブサイト分析・メールアドレス決定で同じページの再取得を避ける
+- キーは正規化URL、本文は内容のハッシュで重複排除してzlib圧縮で保存（SQLite 1ファイル）
+- 鮮度期間内はネットワークに接続せずキャッシュを返す
+- 期限切れ後は ETag / Last-Modified による条件付きリクエストで再検証（304なら本文を再利用）
+- 合計サイズが上限を超えたら最終参照が古いものから削除
+- オフライン（キャッシュのみ）モードではネットワークに一切接続しない
+- 複数プロセス（抽出・分析を並行実行）から同時に利用できるようWALモードで動作
+
+設定は環境変数でも指定でき、サブプロセスとして起動される各スクリプトに引き継がれる:
+    HUGANJOB_HTTP_CACHE_MODE     normal（既定）/ offline（キャッシュのみ）/ disabled
+    HUGANJOB_HTTP_CACHE_PATH     キャッシュファイルのパス
+    HUGANJOB_HTTP_CACHE_MAX_AGE  鮮度期間（時間）
+    HUGANJOB_HTTP_CACHE_MAX_MB   最大サイズ（MB）
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import datetime
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = 'data/http_cache/http_cache.sqlite3'
+DEFAULT_MAX_AGE_HOURS = 24
+DEFAULT_MAX_MB = 512
+
+MODE_NORMAL = 'normal'
+MODE_OFFLINE = 'offline'
+MODE_DISABLED = 'disabled'
+
+# 書き込み競合時の待機時間（秒）
+BUSY_TIMEOUT_SECONDS = 30
+
+# 何回保存するごとにサイズ上限を確認するか
+EVICTION_CHECK_INTERVAL = 50
+
+# サイズ超過時に上限の何割まで削減するか
+EVICTION_TARGET_RATIO = 0.9
+
+# 保存しないレスポンスヘッダー（本文は展開済みで保存するため）
+_SKIPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive', 'set-cookie'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url_key       TEXT PRIMARY KEY,
+    final_url     TEXT NOT NULL,
+    status        INTEGER NOT NULL,
+    headers       TEXT NOT NULL,
+    encoding      TEXT,
+    body_hash     TEXT NOT NULL,
+    elapsed       REAL NOT NULL,
+    fetched_at    REAL NOT NULL,
+    accessed_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS idx_entries_body ON entries (body_hash);
+CREATE TABLE IF NOT EXISTS bodies (
+    body_hash  TEXT PRIMARY KEY,
+    data       BLOB NOT NULL,
+    size       INTEGER NOT NULL
+);
+"""
+
+
+class CacheMissError(requests.exceptions.ConnectionError):
+    """オフラインモードでキャッシュに存在しないURLを要求した"""
+
+
+def normalize_cache_url(url):
+    """キャッシュキー用にURLを正規化
+
+    スキーム・ホストの小文字化、既定ポートとフラグメントの除去、空パスの '/' 化、
+    クエリパラメータの並べ替えを行う。
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or 'https'
+    host = (parts.hostname or '').lower()
+    port = parts.port
+    if port and not ((scheme == 'http' and port == 80) or (scheme == 'https' and port == 443)):
+        host = f'{host}:{port}'
+    path = parts.path or '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class HttpCache:
+    """ディスク上の共有HTTPキャッシュ
+
+    使用例:
+        cache = HttpCache()
+        response = cache.get(url, lambda url, headers: session.get(url, headers=headers, timeout=5))
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_age_hours=DEFAULT_MAX_AGE_HOURS,
+                 max_mb=DEFAULT_MAX_MB, mode=MODE_NORMAL):
+        """
+        Args:
+            path: キャッシュファイル（SQLite）のパス
+            max_age_hours: 鮮度期間（時間）。期間内はネットワークに接続しない
+            max_mb: 圧縮後本文の合計サイズ上限（MB）
+            mode: normal / offline（キャッシュのみ）
+        """
+        self.path = path
+        self.max_age = max_age_hours * 3600
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.mode = mode
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._initialized_pid = None
+        self._stores_since_check = 0
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stored': 0, 'offline_misses': 0, 'evicted': 0}
+
+    @property
+    def offline(self):
+        return self.mode == MODE_OFFLINE
+
+    # ------------------------------------------------------------------
+    # 接続管理
+    # ------------------------------------------------------------------
+    def _connect(self):
+        """現在のプロセス・スレッド用の接続を取得"""
+        pid = os.getpid()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and getattr(self._local, 'pid', None) == pid:
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+
+        with self._lock:
+            if self._initialized_pid != pid:
+                conn.executescript(SCHEMA)
+                self._initialized_pid = pid
+
+        self._local.conn = conn
+        self._local.pid = pid
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    # ------------------------------------------------------------------
+    # 読み書き
+    # ------------------------------------------------------------------
+    def lookup(self, url):
+        """キャッシュエントリを取得（存在しない場合はNone）"""
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT e.final_url, e.status, e.headers, e.encoding, e.elapsed, e.fetched_at, b.data '
+            'FROM entries e JOIN bodies b ON b.body_hash = e.body_hash WHERE e.url_key = ?',
+            (normalize_cache_url(url),)
+        ).fetchone()
+        if not row:
+            return None
+        final_url, status, headers, encoding, elapsed, fetched_at, data = row
+        return {
+            'final_url': final_url,
+            'status': status,
+            'headers': json.loads(headers),
+            'encoding': encoding,
+            'elapsed': elapsed,
+            'fetched_at': fetched_at,
+            'content': zlib.decompress(data)
+        }
+
+    def iter_entries(self, limit=None, content_type='html'):
+        """保存済みのエントリを (URL, エントリ) で列挙（ベンチマーク用の保存済みページ集として使用）
+
+        Args:
+            limit: 最大件数（Noneは全件）
+            content_type: Content-Typeに含まれる文字列で絞り込み（Noneは絞り込まない）
+        """
+        conn = self._connect()
+        rows = conn.execute('SELECT url_key FROM entries WHERE status = 200 ORDER BY fetched_at').fetchall()
+        count = 0
+        for (url_key,) in rows:
+            entry = self.lookup(url_key)
+            if entry is None:
+                continue
+            if content_type:
+                headers = {key.lower(): value for key, value in entry['headers'].items()}
+                if content_type not in headers.get('content-type', ''):
+                    continue
+            yield url_key, entry
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+    def store(self, url, response):
+        """レスポンスを保存（本文は内容ハッシュで重複排除）"""
+        content = response.content or b''
+        body_hash = hashlib.sha256(content).hexdigest()
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _SKIPPED_HEADERS}
+        now = time.time()
+        elapsed = response.elapsed.total_seconds() if getattr(response, 'elapsed', None) else 0.0
+
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            exists = conn.execute('SELECT 1 FROM bodies WHERE body_hash = ?', (body_hash,)).fetchone()
+            if not exists:
+                data = zlib.compress(content, 6)
+                conn.execute('INSERT INTO bodies (body_hash, data, size) VALUES (?, ?, ?)', (body_hash, data, len(data)))
+            old = conn.execute('SELECT body_hash FROM entries WHERE url_key = ?', (normalize_cache_url(url),)).fetchone()
+            conn.execute(
+                'INSERT OR REPLACE INTO entries (url_key, final_url, status, headers, encoding, body_hash, elapsed, fetched_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (normalize_cache_url(url), response.url or url, response.status_code,
+                 json.dumps(headers, ensure_ascii=False), response.encoding, body_hash, elapsed, now, now)
+            )
+            if old and old[0] != body_hash:
+                self._delete_orphan_body(conn, old[0])
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        self._count('stored')
+        with self._lock:
+            self._stores_since_check += 1
+            check = self._stores_since_check >= EVICTION_CHECK_INTERVAL
+            if check:
+                self._stores_since_check = 0
+        if check:
+            self.evict()
+
+    def _touch(self, url, revalidated_headers=None):
+        """参照時刻（と再検証時は取得時刻・ヘッダー）を更新"""
+        conn = self._connect()
+        now = time.time()
+        key = normalize_cache_url(url)
+        if revalidated_headers is None:
+            conn.execute('UPDATE entries SET accessed_at = ? WHERE url_key = ?', (now, key))
+            return
+        row = conn.execute('SELECT headers FROM entries WHERE url_key = ?', (key,)).fetchone()
+        headers = json.loads(row[0]) if row else {}
+        for name in ('ETag', 'Last-Modified', 'Cache-Control', 'Expires', 'Date'):
+            value = revalidated_headers.get(name)
+            if value:
+                headers[name] = value
+        conn.execute('UPDATE entries SET fetched_at = ?, accessed_at = ?, headers = ? WHERE url_key = ?',
+                     (now, now, json.dumps(headers, ensure_ascii=False), key))
+
+    @staticmethod
+    def _delete_orphan_body(conn, body_hash):
+        if not conn.execute('SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1', (body_hash,)).fetchone():
+            conn.execute('DELETE FROM bodies WHERE body_hash = ?', (body_hash,))
+
+    def evict(self):
+        """合計サイズが上限を超えていれば、最終参照が古いエントリから削除"""
+        conn = self._connect()
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM bodies').fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        target = int(self.max_bytes * EVICTION_TARGET_RATIO)
+        removed = 0
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute('SELECT url_key, body_hash FROM entries ORDER BY accessed_at').fetchall()
+            for url_key, body_hash in rows:
+                if total <= target:
+                    break
+                conn.execute('DELETE FROM entries WHERE url_key = ?', (url_key,))
+                removed += 1
+                if not conn.execute('SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1', (body_hash,)).fetchone():
+                    size = conn.execute('SELECT size FROM bodies WHERE body_hash = ?', (body_hash,)).fetchone()
+                    conn.execute('DELETE FROM bodies WHERE body_hash = ?', (body_hash,))
+                    total -= size[0] if size else 0
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        with self._lock:
+            self.stats['evicted'] += removed
+        logger.info(f"HTTPキャッシュ: サイズ上限超過のため {removed}件を削除しました（{total / 1024 / 1024:.1f}MB）")
+        return removed
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute('DELETE FROM entries')
+        conn.execute('DELETE FROM bodies')
+
+    def get_stats(self):
+        """ヒット数等の統計と現在のサイズ"""
+        conn = self._connect()
+        entries = conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        size = conn.execute('SELECT COALESCE(SUM(size), 0) FROM bodies').fetchone()[0]
+        with self._lock:
+            stats = dict(self.stats)
+        requests_total = stats['hits'] + stats['misses'] + stats['revalidated'] + stats['offline_misses']
+        stats.update({
+            'entries': entries,
+            'size_bytes': size,
+            'hit_rate': (stats['hits'] + stats['revalidated']) / requests_total if requests_total else 0.0
+        })
+        return stats
+
+    # ------------------------------------------------------------------
+    # 取得
+    # ------------------------------------------------------------------
+    @staticmethod
+    def build_response(entry, request_url):
+        """キャッシュエントリから requests.Response を復元"""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = 'OK' if entry['status'] == 200 else ''
+        response._content = entry['content']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.url = entry['final_url'] or request_url
+        response.encoding = entry['encoding']
+        response.elapsed = datetime.timedelta(seconds=entry['elapsed'])
+        response.from_cache = True
+        return response
+
+    def get(self, url, fetch):
+        """キャッシュを利用してURLを取得
+
+        Args:
+            url: 取得するURL
+            fetch: ネットワーク取得関数 fetch(url, headers) -> requests.Response
+                   headers には再検証用の条件付きヘッダーが入る（空の場合あり）
+
+        Returns:
+            requests.Response（キャッシュから復元した場合は from_cache=True）
+
+        Raises:
+            CacheMissError: オフラインモードでキャッシュに存在しない場合
+        """
+        entry = self.lookup(url)
+
+        if entry is not None and (self.offline or time.time() - entry['fetched_at'] < self.max_age):
+            self._count('hits')
+            self._touch(url)
+            return self.build_response(entry, url)
+
+        if self.offline:
+            self._count('offline_misses')
+            raise CacheMissError(f"キャッシュにありません（オフラインモード）: {url}")
+
+        conditional_headers = {}
+        if entry is not None:
+            etag = entry['headers'].get('ETag') or entry['headers'].get('etag')
+            last_modified = entry['headers'].get('Last-Modified') or entry['headers'].get('last-modified')
+            if etag:
+                conditional_headers['If-None-Match'] = etag
+            if last_modified:
+                conditional_headers['If-Modified-Since'] = last_modified
+
+        response = fetch(url, conditional_headers)
+
+        if response.status_code == 304 and entry is not None:
+            self._count('revalidated')
+            self._touch(url, response.headers)
+            return self.build_response(entry, url)
+
+        self._count('misses')
+        if response.status_code == 200:
+            try:
+                self.store(url, response)
+            except Exception as e:
+                logger.warning(f"HTTPキャッシュへの保存に失敗しました: {url} - {e}")
+        response.from_cache = False
+        return response
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def configure_shared_cache(mode=None, path=None, max_age_hours=None, max_mb=None):
+    """共有キャッシュの設定を環境変数に反映（サブプロセスにも引き継がれる）"""
+    global _shared_cache
+    if mode is not None:
+        os.environ['HUGANJOB_HTTP_CACHE_MODE'] = mode
+    if path is not None:
+        os.environ['HUGANJOB_HTTP_CACHE_PATH'] = path
+    if max_age_hours is not None:
+        os.environ['HUGANJOB_HTTP_CACHE_MAX_AGE'] = str(max_age_hours)
+    if max_mb is not None:
+        os.environ['HUGANJOB_HTTP_CACHE_MAX_MB'] = str(max_mb)
+    with _shared_cache_lock:
+        _shared_cache = None
+
+
+def get_shared_cache():
+    """環境変数の設定に従った共有キャッシュを取得（無効の場合はNone）"""
+    global _shared_cache
+    mode = os.environ.get('HUGANJOB_HTTP_CACHE_MODE', MODE_NORMAL).lower()
+    if mode == MODE_DISABLED:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = HttpCache(
+                path=os.environ.get('HUGANJOB_HTTP_CACHE_PATH', DEFAULT_CACHE_PATH),
+                max_age_hours=float(os.environ.get('HUGANJOB_HTTP_CACHE_MAX_AGE', DEFAULT_MAX_AGE_HOURS)),
+                max_mb=float(os.environ.get('HUGANJOB_HTTP_CACHE_MAX_MB', DEFAULT_MAX_MB)),
+                mode=MODE_OFFLINE if mode == MODE_OFFLINE else MODE_NORMAL
+            )
+        return _shared_cache
+
+
+def add_cache_arguments(parser):
+    """キャッシュ関連のコマンドライン引数を追加"""
+    parser.add_argument('--no-cache', action='store_true', help='HTTPキャッシュを使用しない')
+    parser.add_argument('--cache-only', action='store_true', help='キャッシュのみで処理する（ネットワークに接続しない）')
+    parser.add_argument('--cache-max-age', type=float, help=f'HTTPキャッシュの鮮度期間（時間、デフォルト: {DEFAULT_MAX_AGE_HOURS}）')
+
+
+def apply_cache_arguments(args):
+    """コマンドライン引数を共有キャッシュの設定に反映"""
+    mode = None
+    if args.no_cache:
+        mode = MODE_DISABLED
+    elif args.cache_only:
+        mode = MODE_OFFLINE
+    configure_shared_cache(mode=mode, max_age_hours=args.cache_max_age)
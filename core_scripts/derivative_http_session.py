@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HTTPセッションプール（キープアライブ接続の共有）
+- 全スレッドで1つのHTTPAdapter（urllib3のコネクションプール）を共有し、
+  同一ホストへのTCP/TLS接続を再利用する
+- requests.Session はスレッドごとに生成（Cookie等の状態はスレッド間で共有しない）
+- 接続エラー・読み込みエラーはアダプター側でバックオフ付きリトライ
+- 新規接続数・リクエスト数を計測し、接続再利用率を算出
+"""
+
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# キャッシュするホスト別コネクションプールの数
+DEFAULT_POOL_CONNECTIONS = 128
+
+# 1ホストあたりに保持する接続数
+DEFAULT_POOL_MAXSIZE = 8
+
+# 接続・読み込みエラー時のリトライ回数とバックオフ係数
+DEFAULT_CONNECT_RETRIES = 2
+DEFAULT_READ_RETRIES = 1
+DEFAULT_BACKOFF_FACTOR = 0.3
+
+# brotli（br）はデコード用ライブラリがある場合のみ受け付ける
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# 全リクエスト共通のヘッダー（User-Agentはリクエストごとに指定）
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'ja,en-US;q=0.7,en;q=0.3',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Cache-Control': 'max-age=0'
+}
+
+
+class ConnectionStats:
+    """新規接続数とリクエスト数の集計（スレッドセーフ）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def snapshot(self):
+        with self._lock:
+            requests_count = self.requests
+            new_connections = self.new_connections
+        reused = max(0, requests_count - new_connections)
+        return {
+            'requests': requests_count,
+            'new_connections': new_connections,
+            'reused_connections': reused,
+            'reuse_rate': reused / requests_count if requests_count else 0.0
+        }
+
+
+def _counting_pool_class(base_class, stats):
+    """新規接続・リクエストを計測するコネクションプールクラスを生成"""
+
+    class CountingConnectionPool(base_class):
+        def _new_conn(self):
+            stats.record_new_connection()
+            return super()._new_conn()
+
+        def _make_request(self, *args, **kwargs):
+            stats.record_request()
+            return super()._make_request(*args, **kwargs)
+
+    CountingConnectionPool.__name__ = f'Counting{base_class.__name__}'
+    return CountingConnectionPool
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """接続の新規作成・再利用を計測するHTTPAdapter"""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool_class(HTTPConnectionPool, self.stats),
+            'https': _counting_pool_class(HTTPSConnectionPool, self.stats),
+        }
+
+
+class HttpSessionPool:
+    """スレッド間で接続を共有するHTTPセッションプール
+
+    使用例:
+        pool = HttpSessionPool()
+        response = pool.get(url, headers={'User-Agent': ua}, timeout=5)
+        print(pool.get_stats()['reuse_rate'])
+    """
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 connect_retries=DEFAULT_CONNECT_RETRIES, read_retries=DEFAULT_READ_RETRIES,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR, headers=None):
+        """
+        Args:
+            pool_connections: 保持するホスト別コネクションプールの数
+            pool_maxsize: 1ホストあたりに保持する接続数
+            connect_retries: 接続エラー時のリトライ回数
+            read_retries: 読み込みエラー時のリトライ回数（切断されたキープアライブ接続の再試行を含む）
+            backoff_factor: リトライ間隔の係数（秒）
+        """
+        self.stats = ConnectionStats()
+        # HTTPステータスによる再試行は呼び出し側で判断するため、ここでは行わない
+        self.retry = Retry(
+            total=connect_retries + read_retries,
+            connect=connect_retries,
+            read=read_retries,
+            status=0,
+            redirect=False,
+            backoff_factor=backoff_factor,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        self.adapter = CountingHTTPAdapter(
+            self.stats,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=self.retry,
+            pool_block=False
+        )
+        self.headers = dict(headers or DEFAULT_HEADERS)
+        self._local = threading.local()
+
+    def session(self):
+        """現在のスレッド用のセッションを取得（アダプターは全スレッドで共有）"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            self._local.session = session
+        return session
+
+    def get(self, url, **kwargs):
+        return self.session().get(url, **kwargs)
+
+    def get_stats(self):
+        """接続再利用の統計"""
+        return self.stats.snapshot()
+
+    def close(self):
+        """保持している接続をすべて閉じる"""
+        self.adapter.close()
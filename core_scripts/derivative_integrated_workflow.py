@@ -81,6 +81,11 @@ SCRIPTS = {
     'bounce_processing': 'core_scripts/derivative_bounce_processor.py'
 }
 
+# メールアドレス抽出の再開設定（--resume-extraction を指定した場合のみ抽出済みの企業をスキップ）
+# max_result_age: 再利用する結果の最大経過時間（時間、None の場合は抽出スクリプトの既定値）
+# check_homepage: トップページの内容が変わった企業は再抽出する
+EXTRACTION_RESUME = {'enabled': False, 'max_result_age': None, 'check_homepage': False}
+
 # メモリ監視とクリーンアップ機能
 class MemoryManager:
     """メモリ使用量の監視とクリーンアップを行うクラス"""
@@ -964,6 +969,14 @@ def run_email_extraction(start_id=None, end_id=None, test_mode=False):
     if start_id and end_id:
         command += f" --start-id {start_id} --end-id {end_id}"
 
+    # 抽出済みの企業はスキップ（指定した場合のみ。中断後の再開で同じ企業を再抽出しない）
+    if EXTRACTION_RESUME['enabled']:
+        command += " --resume"
+        if EXTRACTION_RESUME['max_result_age'] is not None:
+            command += f" --max-result-age {EXTRACTION_RESUME['max_result_age']}"
+        if EXTRACTION_RESUME['check_homepage']:
+            command += " --check-homepage"
+
     # 動的メール抽出を有効化（デフォルト）
     # --no-dynamic フラグは使用しない（動的抽出を有効にするため）
 
@@ -1917,8 +1930,16 @@ def main():
     parser.add_argument('--rank', choices=['A', 'B', 'C'], help='メール送信時の対象ランク')
     parser.add_argument('--batch-mode', action='store_true', help='大量データを分割して安全に処理する')
     parser.add_argument('--batch-size', type=int, default=20, help='分割処理時のバッチサイズ（デフォルト: 20）')
+    parser.add_argument('--resume-extraction', action='store_true',
+                        help='メールアドレス抽出で抽出済みの企業をスキップする（中断後の再開用）')
+    parser.add_argument('--max-result-age', type=float,
+                        help='--resume-extraction で再利用する結果の最大経過時間（時間）')
+    parser.add_argument('--check-homepage', action='store_true',
+                        help='--resume-extraction 時にトップページの内容が変わった企業は再抽出する')
 
     args = parser.parse_args()
+    EXTRACTION_RESUME.update(enabled=args.resume_extraction, max_result_age=args.max_result_age,
+                             check_homepage=args.check_homepage)
 
     # 前提条件チェック
     if not check_prerequisites():
@@ -0,0 +1,485 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+メールアドレス検証サービス（MX・キャッチオール判定のキャッシュ）
+- MXレコードの解決結果をドメインごとにTTL付きでキャッシュ（MXなし・解決失敗も短いTTLでキャッシュ）
+- 複数ドメインのMXレコードは非同期DNS（dns.asyncresolver）でまとめて解決
+- 同じドメインを複数スレッドが同時に解決しようとした場合は1回だけ問い合わせる
+- SMTP検証はMXホストごとに1回だけ接続し、複数アドレスの RCPT TO を同じセッションで送る
+- キャッチオール判定（ランダムなアドレスへの RCPT TO）はドメインごとに1回だけ行いキャッシュ
+- アドレス単位の検証結果もキャッシュ（抽出段階が変わっても同じアドレスを再検証しない）
+
+DNSサーバー・SMTPポートを指定すると、ローカルのDNS・SMTPサーバーで動作を確認できる:
+    verifier = MailVerifier(nameservers=['127.0.0.1'], dns_port=5353, smtp_port=2525)
+"""
+
+import time
+import random
+import socket
+import asyncio
+import logging
+import smtplib
+import threading
+import concurrent.futures
+
+import dns.resolver
+import dns.asyncresolver
+import dns.exception
+
+logger = logging.getLogger(__name__)
+
+# MXレコードのキャッシュ期間（秒）: 存在する場合 / 存在しない・解決失敗の場合
+DEFAULT_MX_TTL = 6 * 3600
+DEFAULT_NEGATIVE_MX_TTL = 30 * 60
+
+# キャッチオール判定・アドレス単位の検証結果のキャッシュ期間（秒）
+DEFAULT_CATCH_ALL_TTL = 24 * 3600
+DEFAULT_ADDRESS_TTL = 6 * 3600
+
+# DNS問い合わせ・SMTP接続のタイムアウト（秒）
+DEFAULT_DNS_TIMEOUT = 5
+DEFAULT_SMTP_TIMEOUT = 2
+
+# 1回のSMTPトランザクションで送る RCPT TO の上限（超えた分は RSET して同じ接続で続ける）
+DEFAULT_MAX_RCPT_PER_TRANSACTION = 20
+
+# 同時に接続するMXホスト数
+DEFAULT_SMTP_WORKERS = 4
+
+# 一般的なドメインは有効と仮定（SMTPサーバーがブロックする可能性があるため）
+COMMON_DOMAINS = {
+    'gmail.com', 'yahoo.co.jp', 'outlook.com', 'hotmail.com', 'icloud.com', 'mail.com', 'aol.com', 'protonmail.com'
+}
+
+
+def new_smtp_result():
+    """SMTP検証結果の初期値（PrioritizedEmailExtractor.verify_smtp と同じ形式）"""
+    return {
+        'is_valid': False,
+        'is_catch_all': False,
+        'details': '',
+        'response_code': None,
+        'response_message': ''
+    }
+
+
+def _decode_message(message):
+    return message.decode('utf-8', errors='ignore') if isinstance(message, bytes) else str(message)
+
+
+class TtlCache:
+    """有効期限付きの辞書（スレッドセーフ）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """有効期限内の値を (True, 値) で返す。存在しない・期限切れの場合は (False, None)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class MailVerifier:
+    """MXレコード・SMTP検証の結果をキャッシュする検証サービス（スレッドセーフ）"""
+
+    def __init__(self, nameservers=None, dns_port=53, dns_timeout=DEFAULT_DNS_TIMEOUT,
+                 smtp_port=25, smtp_timeout=DEFAULT_SMTP_TIMEOUT,
+                 mx_ttl=DEFAULT_MX_TTL, negative_mx_ttl=DEFAULT_NEGATIVE_MX_TTL,
+                 catch_all_ttl=DEFAULT_CATCH_ALL_TTL, address_ttl=DEFAULT_ADDRESS_TTL,
+                 max_rcpt_per_transaction=DEFAULT_MAX_RCPT_PER_TRANSACTION,
+                 smtp_workers=DEFAULT_SMTP_WORKERS, helo_hostname=None):
+        self.nameservers = list(nameservers) if nameservers else None
+        self.dns_port = dns_port
+        self.dns_timeout = dns_timeout
+        self.smtp_port = smtp_port
+        self.smtp_timeout = smtp_timeout
+        self.mx_ttl = mx_ttl
+        self.negative_mx_ttl = negative_mx_ttl
+        self.catch_all_ttl = catch_all_ttl
+        self.address_ttl = address_ttl
+        self.max_rcpt_per_transaction = max(1, max_rcpt_per_transaction)
+        self.smtp_workers = max(1, smtp_workers)
+        self.helo_hostname = helo_hostname
+
+        self.mx_cache = TtlCache()
+        self.catch_all_cache = TtlCache()
+        self.address_cache = TtlCache()
+
+        self._resolver = self._configure(dns.resolver.Resolver(configure=self.nameservers is None))
+        # 解決中のドメイン（同じドメインの同時問い合わせを1回にまとめる）
+        self._inflight_lock = threading.Lock()
+        self._inflight = {}
+
+        self._stats_lock = threading.Lock()
+        self.dns_queries = 0
+        self.smtp_sessions = 0
+        self.rcpt_commands = 0
+        self.catch_all_probes = 0
+
+    def _configure(self, resolver):
+        if self.nameservers:
+            resolver.nameservers = self.nameservers
+            resolver.port = self.dns_port
+        resolver.lifetime = self.dns_timeout
+        return resolver
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    # ------------------------------------------------------------------
+    # MXレコード
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize_domain(domain):
+        return (domain or '').strip().lower().rstrip('.')
+
+    @staticmethod
+    def _mx_hosts(answer):
+        """優先度順のMXホスト名のリスト（ヌルMX "." は除外）"""
+        records = sorted(answer, key=lambda rdata: rdata.preference)
+        hosts = [str(rdata.exchange).rstrip('.') for rdata in records]
+        return [host for host in hosts if host]
+
+    def _store_mx(self, domain, hosts, error=None):
+        if hosts:
+            self.mx_cache.set(domain, hosts, self.mx_ttl)
+        else:
+            if error is not None:
+                logging.error(f"MXレコード確認エラー ({domain}): {error}")
+            self.mx_cache.set(domain, [], self.negative_mx_ttl)
+        return hosts
+
+    def get_mx_hosts(self, domain):
+        """ドメインのMXホスト名を優先度順に返す（MXレコードがない場合は空リスト）"""
+        domain = self._normalize_domain(domain)
+        if not domain:
+            return []
+
+        found, hosts = self.mx_cache.get(domain)
+        if found:
+            return hosts
+
+        with self._inflight_lock:
+            event = self._inflight.get(domain)
+            owner = event is None
+            if owner:
+                event = threading.Event()
+                self._inflight[domain] = event
+
+        if not owner:
+            # 他のスレッドが解決中（完了後のキャッシュを使用）
+            event.wait(self.dns_timeout + 1)
+            found, hosts = self.mx_cache.get(domain)
+            return hosts if found else []
+
+        try:
+            self._count('dns_queries')
+            try:
+                return self._store_mx(domain, self._mx_hosts(self._resolver.resolve(domain, 'MX')))
+            except (dns.exception.DNSException, OSError) as e:
+                return self._store_mx(domain, [], e)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[domain]
+            event.set()
+
+    def has_mx(self, domain):
+        """MXレコードが存在するか"""
+        return bool(self.get_mx_hosts(domain))
+
+    async def _resolve_mx_async(self, resolver, domain):
+        self._count('dns_queries')
+        try:
+            answer = await resolver.resolve(domain, 'MX')
+            return self._store_mx(domain, self._mx_hosts(answer))
+        except (dns.exception.DNSException, OSError) as e:
+            return self._store_mx(domain, [], e)
+
+    async def _resolve_all(self, domains):
+        resolver = self._configure(dns.asyncresolver.Resolver(configure=self.nameservers is None))
+        results = await asyncio.gather(*(self._resolve_mx_async(resolver, domain) for domain in domains))
+        return dict(zip(domains, results))
+
+    def resolve_many(self, domains):
+        """複数ドメインのMXレコードを非同期DNSでまとめて解決（キャッシュ済みのドメインは問い合わせない）
+
+        Returns:
+            dict: ドメイン → MXホスト名のリスト
+        """
+        results = {}
+        pending = []
+        for domain in dict.fromkeys(self._normalize_domain(d) for d in domains):
+            if not domain:
+                continue
+            found, hosts = self.mx_cache.get(domain)
+            if found:
+                results[domain] = hosts
+            else:
+                pending.append(domain)
+
+        if len(pending) == 1:
+            results[pending[0]] = self.get_mx_hosts(pending[0])
+        elif pending:
+            try:
+                asyncio.get_running_loop()
+                in_event_loop = True
+            except RuntimeError:
+                in_event_loop = False
+
+            if in_event_loop:
+                # 実行中のイベントループからは同期的に1件ずつ解決
+                for domain in pending:
+                    results[domain] = self.get_mx_hosts(domain)
+            else:
+                results.update(asyncio.run(self._resolve_all(pending)))
+        return results
+
+    # ------------------------------------------------------------------
+    # SMTP検証
+    # ------------------------------------------------------------------
+
+    def get_catch_all(self, domain):
+        """キャッシュ済みのキャッチオール判定（未判定の場合は None）"""
+        found, value = self.catch_all_cache.get(self._normalize_domain(domain))
+        return value if found else None
+
+    def verify_addresses(self, emails):
+        """複数のメールアドレスをSMTPレベルで検証
+
+        - ドメインごとのMXレコードは非同期DNSでまとめて解決（キャッシュ済みは問い合わせない）
+        - 同じMXホストを使うアドレスは1回の接続で RCPT TO を送る
+        - キャッチオール判定が未判定のドメインは、同じ接続でランダムなアドレスを1回だけ確認
+
+        Returns:
+            dict: メールアドレス → 検証結果（verify_smtp と同じ形式）
+        """
+        results = {}
+        by_domain = {}
+        for email in dict.fromkeys(emails):
+            parts = email.split('@') if email else []
+            if len(parts) != 2 or not parts[0] or not parts[1]:
+                result = new_smtp_result()
+                result['details'] = '無効なメールアドレス形式'
+                results[email] = result
+                continue
+            found, cached = self.address_cache.get(email.lower())
+            if found:
+                results[email] = dict(cached)
+                continue
+            by_domain.setdefault(self._normalize_domain(parts[1]), []).append(email)
+
+        if not by_domain:
+            return results
+
+        mx_hosts = self.resolve_many(by_domain)
+
+        # MXホストごとにまとめる（同じメールサーバーを使う複数ドメインも1回の接続で検証）
+        by_host = {}
+        for domain, addresses in by_domain.items():
+            hosts = mx_hosts.get(domain) or []
+            if not hosts:
+                for email in addresses:
+                    result = new_smtp_result()
+                    result['details'] = 'MXレコードが存在しない'
+                    results[email] = result
+                continue
+            if domain in COMMON_DOMAINS:
+                for email in addresses:
+                    result = new_smtp_result()
+                    result['is_valid'] = True
+                    result['details'] = '一般的なドメイン'
+                    results[email] = self._store_address(email, result)
+                continue
+            by_host.setdefault(tuple(hosts), []).append((domain, addresses))
+
+        if len(by_host) == 1:
+            (hosts, domains), = by_host.items()
+            results.update(self._verify_on_host(hosts, domains))
+        elif by_host:
+            workers = min(self.smtp_workers, len(by_host))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='smtp-verify') as executor:
+                futures = [executor.submit(self._verify_on_host, hosts, domains) for hosts, domains in by_host.items()]
+                for future in futures:
+                    results.update(future.result())
+        return results
+
+    def verify_address(self, email):
+        """1件のメールアドレスをSMTPレベルで検証（キャッシュ済みの判定を再利用）"""
+        return self.verify_addresses([email])[email]
+
+    def _store_address(self, email, result):
+        # 接続エラー等の一時的な失敗はキャッシュしない（次回の検証で再試行）
+        if result['response_code'] is not None or result['is_valid']:
+            self.address_cache.set(email.lower(), dict(result), self.address_ttl)
+        return result
+
+    def _verify_on_host(self, hosts, domains):
+        """1つのMXホストに接続し、複数ドメインのアドレスを同じセッションで検証"""
+        results = {}
+        pending = [email for _, addresses in domains for email in addresses]
+        smtp = None
+        last_error = None
+        for mx_host in hosts:
+            try:
+                smtp = smtplib.SMTP(timeout=self.smtp_timeout, local_hostname=self.helo_hostname)
+                smtp.connect(mx_host, self.smtp_port)
+                smtp.ehlo_or_helo_if_needed()
+                self._count('smtp_sessions')
+                break
+            except (smtplib.SMTPException, OSError) as e:
+                last_error = e
+                smtp = None
+
+        if smtp is None:
+            for email in pending:
+                results[email] = self._error_result(last_error)
+            return results
+
+        try:
+            for domain, addresses in domains:
+                try:
+                    # 途中で切断された場合も、それまでに得た応答は results に残る
+                    self._verify_domain(smtp, domain, addresses, results)
+                except smtplib.SMTPServerDisconnected as e:
+                    for email in addresses:
+                        results.setdefault(email, self._error_result(e))
+                    break
+                except (smtplib.SMTPException, OSError) as e:
+                    for email in addresses:
+                        results.setdefault(email, self._error_result(e))
+        finally:
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                smtp.close()
+
+        for email in pending:
+            results.setdefault(email, self._error_result(smtplib.SMTPServerDisconnected('接続が切断されました')))
+        return results
+
+    def _verify_domain(self, smtp, domain, addresses, results=None):
+        """確立済みのSMTPセッションで1ドメイン分の RCPT TO を送る
+
+        results を指定した場合は応答を得たアドレスから順に書き込む（途中で切断されても部分的な結果が残る）。
+        """
+        results = {} if results is None else results
+        collected = []
+        from_address = f"verify@{domain}"
+        catch_all = self.get_catch_all(domain)
+        probe_catch_all = catch_all is None
+        completed = False
+
+        try:
+            for offset in range(0, len(addresses), self.max_rcpt_per_transaction):
+                chunk = addresses[offset:offset + self.max_rcpt_per_transaction]
+                smtp.rset()
+                code, message = smtp.mail(from_address)
+                if code != 250:
+                    raise smtplib.SMTPSenderRefused(code, message, from_address)
+
+                for email in chunk:
+                    code, message = smtp.rcpt(email)
+                    self._count('rcpt_commands')
+                    result = new_smtp_result()
+                    result['response_code'] = code
+                    result['response_message'] = _decode_message(message)
+                    if code == 250:
+                        result['is_valid'] = True
+                        result['details'] = 'SMTP検証成功'
+                    else:
+                        result['details'] = f"SMTP検証失敗: {code} {result['response_message']}"
+                    results[email] = result
+                    collected.append(email)
+
+                # キャッチオールチェック（受け付けられたアドレスがある場合のみ、ドメインごとに1回）
+                if probe_catch_all and any(results[email]['is_valid'] for email in chunk):
+                    random_local = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=10))
+                    random_code, _ = smtp.rcpt(f"{random_local}@{domain}")
+                    self._count('rcpt_commands')
+                    self._count('catch_all_probes')
+                    catch_all = random_code == 250
+                    self.catch_all_cache.set(domain, catch_all, self.catch_all_ttl)
+                    probe_catch_all = False
+            completed = True
+        finally:
+            for email in collected:
+                result = results[email]
+                if result['is_valid'] and catch_all:
+                    result['is_catch_all'] = True
+                    result['details'] = 'キャッチオールドメイン'
+                # キャッチオール判定の前に切断された受理結果はキャッシュしない（次回は改めて検証）
+                if completed or not result['is_valid'] or catch_all is not None:
+                    self._store_address(email, result)
+        return results
+
+    @staticmethod
+    def _error_result(error):
+        result = new_smtp_result()
+        if isinstance(error, smtplib.SMTPServerDisconnected):
+            result['details'] = 'SMTPサーバーが接続を切断'
+        elif isinstance(error, smtplib.SMTPResponseException):
+            result['response_code'] = error.smtp_code
+            result['response_message'] = _decode_message(error.smtp_error)
+            result['details'] = f"SMTPエラー: {error.smtp_code} {result['response_message']}"
+        elif isinstance(error, smtplib.SMTPException):
+            result['details'] = f"SMTPエラー: {str(error)}"
+        elif isinstance(error, socket.timeout):
+            result['details'] = 'SMTP接続タイムアウト'
+        elif isinstance(error, OSError):
+            result['details'] = f"ソケットエラー: {str(error)}"
+        else:
+            result['details'] = f"SMTP検証中の予期しないエラー: {str(error)}"
+        return result
+
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        """すべてのキャッシュを削除"""
+        self.mx_cache.clear()
+        self.catch_all_cache.clear()
+        self.address_cache.clear()
+
+    def get_stats(self):
+        """問い合わせ数・キャッシュヒット数の統計"""
+        with self._stats_lock:
+            stats = {
+                'dns_queries': self.dns_queries,
+                'smtp_sessions': self.smtp_sessions,
+                'rcpt_commands': self.rcpt_commands,
+                'catch_all_probes': self.catch_all_probes,
+            }
+        lookups = self.mx_cache.hits + self.mx_cache.misses
+        stats.update({
+            'mx_cache_hits': self.mx_cache.hits,
+            'mx_cache_entries': len(self.mx_cache),
+            'mx_hit_rate': self.mx_cache.hits / lookups if lookups else 0.0,
+            'catch_all_cache_entries': len(self.catch_all_cache),
+            'address_cache_hits': self.address_cache.hits,
+        })
+        return stats
@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+ページの特徴量抽出（ウェブサイト評価用、文書ツリーを1回だけ走査）
+- タグの数・CSSクラス・meta/link/script/img の属性・表示テキスト・マークアップを1回の走査で集計し、PageFeatures にまとめる
+- テキスト・マークアップ・CSSクラスのキーワードは KeywordMatcher（Aho-Corasick法）でそれぞれ1回の走査で検出する
+- マークアップ（str(soup)）の生成は1ページにつき1回だけ
+- 判定は BeautifulSoup の find_all・get_text を使った従来の判定と同じ結果になる
+  （CSSクラスはクラス名ごと・空白区切りで連結した値のどちらかに一致すれば一致、属性値は大文字小文字を区別する）
+
+使用例:
+    extractor = PageFeatureExtractor(text_keywords=['会社概要', 'privacy'], class_keywords=['logo'])
+    features = extractor.extract(soup, response)
+    if features.text_has('会社概要', 'privacy') and features.count('h1') == 1:
+        ...
+"""
+
+from collections import Counter
+
+from bs4 import Tag, NavigableString
+
+
+class KeywordMatcher:
+    """複数のキーワードを1回の走査で検出（Aho-Corasick法）
+
+    Args:
+        keywords: 検出するキーワード（大文字小文字は区別する）
+    """
+
+    def __init__(self, keywords):
+        self.keywords = frozenset(keyword for keyword in keywords if keyword)
+        self._goto = [{}]
+        self._output = [frozenset()]
+        for keyword in self.keywords:
+            state = 0
+            for char in keyword:
+                if char not in self._goto[state]:
+                    self._goto[state][char] = len(self._goto)
+                    self._goto.append({})
+                    self._output.append(frozenset())
+                state = self._goto[state][char]
+            self._output[state] = self._output[state] | {keyword}
+
+        # 失敗遷移（幅優先で、一致したキーワードに含まれる短いキーワードの出力もまとめる）
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] | self._output[self._fail[next_state]]
+
+    def find(self, text):
+        """テキストに含まれるキーワードの集合"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+                if len(found) == len(self.keywords):
+                    break
+        return found
+
+
+class PageFeatures:
+    """1ページの特徴量（PageFeatureExtractor.extract で作成）
+
+    Attributes:
+        url: レスポンスのURL
+        response_time: レスポンス時間（秒、計測できない場合は None）
+        tag_counts: タグ名ごとの数
+        text_hits: 表示テキスト（小文字）に含まれるキーワード
+        markup_hits: マークアップに含まれるキーワード（大文字小文字を区別）
+        markup_hits_ci: マークアップ（小文字）に含まれるキーワード（小文字）
+        hash_segments: マークアップを # で分割した3文字以上の部分の数（# がない場合は 0）
+        class_hits: いずれかの要素のCSSクラスに含まれるキーワード
+        class_tag_hits: CSSクラスに含まれるキーワードの組み合わせごとの要素数
+        unique_class_count: CSSクラス名の種類数
+        id_hits: いずれかの要素のIDに含まれるキーワード（小文字で照合）
+        onclick: onclick属性のある要素があるか
+        text_links: テキストのあるリンク（a要素）の数
+        title_text: 最初のtitle要素のテキスト（title要素がない場合は None）
+        description: 最初の meta name="description" の content（ない場合は None）
+        html_lang: 最初のhtml要素の lang 属性
+        viewport: meta name="viewport" があるか
+        security_meta: http-equiv に security を含む meta があるか
+        stylesheets: rel に stylesheet を含む link の数
+        screen_stylesheet: media に screen を含むスタイルシートがあるか
+        scripts_with_src: src属性のある script の数
+        ld_json_scripts: type="application/ld+json" の script の数
+        search_inputs: type="search" の input の数
+        images: img の数
+        images_with_alt: alt が空でない img の数
+        images_with_text_alt: alt が空白以外の文字を含む img の数
+        images_with_size: width か height のある img の数
+        images_with_srcset: srcset のある img の数
+        lazy_images: 遅延読み込み（loading="lazy" か class に lazy）の img の数
+        logo_image_alt: alt にキーワード（logo）を含む img があるか
+        logo_image_src: src にキーワード（logo）を含む img があるか
+    """
+
+    def __init__(self, text_keywords, markup_keywords, markup_keywords_ci, class_keywords, id_keywords):
+        self._registered = {
+            'text': text_keywords, 'markup': markup_keywords, 'markup_ci': markup_keywords_ci,
+            'class': class_keywords, 'id': id_keywords,
+        }
+        self.url = ''
+        self.response_time = None
+        self.tag_counts = Counter()
+        self.text_hits = set()
+        self.markup_hits = set()
+        self.markup_hits_ci = set()
+        self.hash_segments = 0
+        self.class_hits = set()
+        self.class_tag_hits = Counter()
+        self.unique_class_count = 0
+        self.id_hits = set()
+        self.onclick = False
+        self.text_links = 0
+        self.title_text = None
+        self.description = None
+        self.html_lang = None
+        self.viewport = False
+        self.security_meta = False
+        self.stylesheets = 0
+        self.screen_stylesheet = False
+        self.scripts_with_src = 0
+        self.ld_json_scripts = 0
+        self.search_inputs = 0
+        self.images = 0
+        self.images_with_alt = 0
+        self.images_with_text_alt = 0
+        self.images_with_size = 0
+        self.images_with_srcset = 0
+        self.lazy_images = 0
+        self.logo_image_alt = False
+        self.logo_image_src = False
+
+    def _check(self, kind, keywords):
+        unknown = set(keywords) - self._registered[kind]
+        if unknown:
+            raise ValueError(f"特徴量の抽出対象ではないキーワードです（{kind}）: {sorted(unknown)}")
+
+    def _has(self, kind, hits, keywords):
+        self._check(kind, keywords)
+        return any(keyword in hits for keyword in keywords)
+
+    def count(self, *names):
+        """指定したタグの数の合計"""
+        return sum(self.tag_counts[name] for name in names)
+
+    def text_has(self, *keywords):
+        """表示テキスト（小文字）にいずれかのキーワードを含むか"""
+        return self._has('text', self.text_hits, keywords)
+
+    def markup_has(self, *keywords):
+        """マークアップにいずれかのキーワードを含むか（大文字小文字を区別）"""
+        return self._has('markup', self.markup_hits, keywords)
+
+    def markup_has_ci(self, *keywords):
+        """マークアップ（小文字）にいずれかのキーワードを含むか"""
+        return self._has('markup_ci', self.markup_hits_ci, keywords)
+
+    def class_has(self, *keywords):
+        """いずれかの要素のCSSクラスにいずれかのキーワードを含むか"""
+        return self._has('class', self.class_hits, keywords)
+
+    def class_tags(self, keywords, require_all=False):
+        """CSSクラスにキーワードのいずれか（require_all=True の場合はすべて）を含む要素の数"""
+        keywords = set(keywords)
+        self._check('class', keywords)
+        if require_all:
+            return sum(count for hits, count in self.class_tag_hits.items() if keywords <= hits)
+        return sum(count for hits, count in self.class_tag_hits.items() if keywords & hits)
+
+    def id_has(self, *keywords):
+        """いずれかの要素のID（小文字）にいずれかのキーワードを含むか"""
+        return self._has('id', self.id_hits, keywords)
+
+
+class PageFeatureExtractor:
+    """ページの特徴量の抽出器（キーワードの照合器は作成時に1回だけ構築する）
+
+    Args:
+        text_keywords: 表示テキスト（小文字）で検出するキーワード
+        markup_keywords: マークアップで検出するキーワード（大文字小文字を区別）
+        markup_keywords_ci: マークアップ（小文字）で検出するキーワード（小文字で指定）
+        class_keywords: CSSクラス（小文字）で検出するキーワード（小文字・空白を含まないもの）
+        id_keywords: 要素のID（小文字）で検出するキーワード
+        image_keyword: img の alt・src（小文字）で検出するキーワード（logo_image_alt・logo_image_src に記録）
+    """
+
+    def __init__(self, text_keywords=(), markup_keywords=(), markup_keywords_ci=(), class_keywords=(),
+                 id_keywords=(), image_keyword='logo'):
+        self.text_keywords = frozenset(text_keywords)
+        self.markup_keywords = frozenset(markup_keywords)
+        self.markup_keywords_ci = frozenset(markup_keywords_ci)
+        self.class_keywords = frozenset(class_keywords)
+        self.id_keywords = frozenset(id_keywords)
+        self.image_keyword = image_keyword
+        self.text_matcher = KeywordMatcher(self.text_keywords)
+        # 大文字小文字を区別するキーワードは小文字のマークアップで候補を見つけてから元のマークアップで確認する
+        self.markup_matcher = KeywordMatcher(self.markup_keywords_ci | {k.lower() for k in self.markup_keywords})
+        self.class_matcher = KeywordMatcher(self.class_keywords)
+
+    def extract(self, soup, response=None):
+        """ページの特徴量を抽出
+
+        Args:
+            soup: ページの BeautifulSoup
+            response: レスポンス（url・elapsed を使う。None の場合は記録しない）
+
+        Returns:
+            PageFeatures
+        """
+        features = PageFeatures(self.text_keywords, self.markup_keywords, self.markup_keywords_ci,
+                                self.class_keywords, self.id_keywords)
+        if response is not None:
+            features.url = response.url
+            if hasattr(response, 'elapsed'):
+                features.response_time = response.elapsed.total_seconds()
+
+        # get_text() と同じ種類の文字列（コメント・script・style の中身を除く）
+        text_types = soup.interesting_string_types or Tag.MAIN_CONTENT_STRING_TYPES
+        if isinstance(text_types, type):
+            text_types = {text_types}
+        text_parts = []
+        anchors = []
+        class_hits_cache = {}
+        unique_classes = set()
+        tag_counts = features.tag_counts
+        image_keyword = self.image_keyword
+        description_found = False
+
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                if isinstance(element, NavigableString) and type(element) in text_types:
+                    text_parts.append(element)
+                continue
+
+            name = element.name
+            tag_counts[name] += 1
+            attrs = element.attrs
+
+            classes = attrs.get('class')
+            if classes:
+                if isinstance(classes, list):
+                    unique_classes.update(classes)
+                    joined = ' '.join(classes)
+                else:
+                    unique_classes.add(classes)
+                    joined = classes
+                hits = class_hits_cache.get(joined)
+                if hits is None:
+                    hits = class_hits_cache[joined] = frozenset(self.class_matcher.find(joined.lower()))
+                features.class_tag_hits[hits] += 1
+
+            element_id = attrs.get('id')
+            if element_id and self.id_keywords:
+                lowered = element_id.lower()
+                features.id_hits.update(keyword for keyword in self.id_keywords if keyword in lowered)
+
+            if 'onclick' in attrs:
+                features.onclick = True
+
+            if name == 'a':
+                anchors.append(element)
+            elif name == 'img':
+                features.images += 1
+                alt = attrs.get('alt')
+                src = attrs.get('src')
+                if alt:
+                    features.images_with_alt += 1
+                    if alt.strip():
+                        features.images_with_text_alt += 1
+                    if image_keyword in alt.lower():
+                        features.logo_image_alt = True
+                if src and image_keyword in src.lower():
+                    features.logo_image_src = True
+                if attrs.get('width') or attrs.get('height'):
+                    features.images_with_size += 1
+                if attrs.get('srcset'):
+                    features.images_with_srcset += 1
+                if attrs.get('loading') == 'lazy' or 'lazy' in str(attrs.get('class', '')):
+                    features.lazy_images += 1
+            elif name == 'meta':
+                meta_name = attrs.get('name')
+                if meta_name == 'viewport':
+                    features.viewport = True
+                elif meta_name == 'description' and not description_found:
+                    features.description = attrs.get('content')
+                    description_found = True
+                http_equiv = attrs.get('http-equiv')
+                if http_equiv and 'security' in http_equiv.lower():
+                    features.security_meta = True
+            elif name == 'link':
+                rel = attrs.get('rel')
+                if rel is not None and 'stylesheet' in (rel if isinstance(rel, list) else [rel]):
+                    features.stylesheets += 1
+                    media = attrs.get('media')
+                    if media and 'screen' in media:
+                        features.screen_stylesheet = True
+            elif name == 'script':
+                if attrs.get('src') is not None:
+                    features.scripts_with_src += 1
+                if attrs.get('type') == 'application/ld+json':
+                    features.ld_json_scripts += 1
+            elif name == 'input':
+                if attrs.get('type') == 'search':
+                    features.search_inputs += 1
+            elif name == 'title':
+                if features.title_text is None:
+                    features.title_text = element.get_text()
+            elif name == 'html':
+                if tag_counts[name] == 1:
+                    features.html_lang = attrs.get('lang')
+
+        features.unique_class_count = len(unique_classes)
+        for hits in features.class_tag_hits:
+            features.class_hits |= hits
+        features.text_links = sum(1 for anchor in anchors if anchor.get_text().strip())
+        features.text_hits = self.text_matcher.find(''.join(text_parts).lower())
+
+        markup = str(soup)
+        lowered_hits = self.markup_matcher.find(markup.lower())
+        features.markup_hits_ci = lowered_hits & self.markup_keywords_ci
+        features.markup_hits = {keyword for keyword in self.markup_keywords
+                                if keyword.lower() in lowered_hits and keyword in markup}
+        if '#' in markup:
+            features.hash_segments = sum(1 for part in markup.split('#') if len(part) >= 3)
+        return features
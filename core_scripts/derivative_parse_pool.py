@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HTML解析のプロセスプール（CPU負荷の高い解析・抽出処理を別プロセスで実行）
+- 取得（I/O）はスレッドで行い、本文のバイト列とエンコーディングだけをプロセスプールに渡す
+- ワーカープロセスで本文のデコード・BeautifulSoupでの解析・メールアドレス候補とリンクの抽出を行い、
+  抽出結果（メールアドレス・リンク・関連ページ）だけを返す（解析木はプロセス間で受け渡さない）
+- 検証・最適なアドレスの選択（select_best_email）はメインプロセスで行う
+- ワーカー数が0の場合、プロセスプールが使えなくなった場合、解析が時間内に終わらない場合は
+  analyze() が None を返し、呼び出し元は従来どおり自身のスレッドで解析する
+- ワーカープロセスは forkserver（使えない環境では spawn）で起動する
+  （取得スレッドが動いているプロセスを fork すると、ロックを保持したままの状態が複製されるため）
+
+GILに制約されないため、解析のスループットはCPUコア数に応じて向上する。
+
+使用例:
+    pool = ParsePool(workers=4)
+    analysis = pool.analyze(url, response.content, response.encoding, sections=('footer',))
+    if analysis is not None:
+        document = ParsedDocument.from_analysis(url, response.content, response.encoding, analysis)
+"""
+
+import os
+import time
+import signal
+import logging
+import threading
+import multiprocessing
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+
+from derivative_parsed_document import ParsedDocument, decode_body
+
+logger = logging.getLogger(__name__)
+
+# 追加で算出する結果（'footer': フッターのメールアドレス, 'contact': お問い合わせページの個人情報欄・フォーム返信先）
+ANALYSIS_SECTIONS = ('footer', 'contact')
+
+
+def available_cpus():
+    """このプロセスが使用できるCPUコア数"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# ワーカープロセス数の既定値（取得・検証を行うメインプロセス用に1コア残す。1コアの環境では使用しない）
+DEFAULT_PARSE_WORKERS = max(0, available_cpus() - 1)
+
+# 1ページの解析を待つ時間（秒）。超えた場合は呼び出し元で解析する
+DEFAULT_PARSE_TIMEOUT = 30.0
+
+# ワーカープロセスの起動方法（優先順）
+START_METHODS = ('forkserver', 'spawn')
+
+# ワーカープロセス内で使用する抽出器（プロセスごとに1つ、ネットワークには接続しない）
+_worker_extractor = None
+
+
+def _init_worker():
+    """ワーカープロセスの初期化（Ctrl+C はメインプロセスだけで処理する）"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # ワーカーは取得を行わないため、HTTPキャッシュ（SQLite）を開かない
+    os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+
+def _process_context():
+    """ワーカープロセスの起動方法（スレッドを使うプロセスから安全に起動できるもの）"""
+    available = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(next(method for method in START_METHODS if method in available))
+
+
+def _get_worker_extractor():
+    global _worker_extractor
+    if _worker_extractor is None:
+        # 抽出器のモジュールはこのモジュールを読み込むため、ワーカー内で初めて使う時点で読み込む
+        from derivative_email_extractor import PrioritizedEmailExtractor
+        _worker_extractor = PrioritizedEmailExtractor()
+    return _worker_extractor
+
+
+def analyze_page(url, content, encoding, sections=(), company_name=''):
+    """1ページを解析して抽出結果を返す（ワーカープロセスで実行）
+
+    Args:
+        url: ページのURL
+        content: 本文のバイト列
+        encoding: レスポンスのエンコーディング（None の場合は本文から推定）
+        sections: 追加で算出する結果（ANALYSIS_SECTIONS）
+        company_name: 処理中の企業名（フォーム返信先の推定に使用）
+
+    Returns:
+        dict: content_hash, emails, links, contact_pages と sections に応じた
+              footer_emails / privacy_emails, form_reply_emails, parse_seconds
+    """
+    started = time.perf_counter()
+    extractor = _get_worker_extractor()
+    extractor.current_company_name = company_name
+
+    document = ParsedDocument(url, decode_body(content, encoding))
+    analysis = {
+        'content_hash': document.content_hash,
+        'emails': extractor.extract_document_emails(document),
+        'links': document.links,
+        'contact_pages': extractor.find_document_contact_pages(document),
+    }
+    if 'footer' in sections:
+        analysis['footer_emails'] = extractor.extract_emails_from_footer(document.html, url, document=document)
+    if 'contact' in sections:
+        analysis['privacy_emails'], analysis['form_reply_emails'] = extractor.extract_contact_page_emails(document)
+    analysis['parse_seconds'] = time.perf_counter() - started
+    return analysis
+
+
+class ParsePool:
+    """HTML解析のプロセスプール（スレッドセーフ、ワーカープロセスは初回の解析時に起動）"""
+
+    def __init__(self, workers=DEFAULT_PARSE_WORKERS, timeout=DEFAULT_PARSE_TIMEOUT):
+        self.workers = max(0, int(workers or 0))
+        self.timeout = timeout
+        self._executor = None
+        self._broken = False
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.bytes_parsed = 0
+        self.parse_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.failures = 0
+        self.timeouts = 0
+
+    @property
+    def enabled(self):
+        return self.workers > 0 and not self._broken
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers,
+                                                                        mp_context=_process_context(),
+                                                                        initializer=_init_worker)
+                logger.info(f"HTML解析のプロセスプールを起動しました（{self.workers}プロセス）")
+            return self._executor
+
+    def analyze(self, url, content, encoding, sections=(), company_name=''):
+        """ワーカープロセスでページを解析（無効・失敗した場合は None）"""
+        if not self.enabled or not content:
+            return None
+
+        started = time.perf_counter()
+        try:
+            future = self._get_executor().submit(analyze_page, url, content, encoding, tuple(sections), company_name)
+            analysis = future.result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            # 解析中のワーカーはそのまま終わらせ、このページは呼び出し元で解析する
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            logger.warning(f"プロセスプールでの解析が{self.timeout:.0f}秒以内に終わりませんでした（通常の解析を行います）: {url}")
+            return None
+        except BrokenProcessPool as e:
+            # ワーカープロセスが異常終了した場合は以降の解析をすべて呼び出し元で行う
+            with self._lock:
+                self._broken = True
+                self.failures += 1
+            logger.warning(f"HTML解析のプロセスプールが使用できなくなりました。以降は通常の解析を行います: {e}")
+            return None
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+            logger.warning(f"プロセスプールでの解析に失敗しました（通常の解析を行います）: {url} - {e}")
+            return None
+
+        with self._lock:
+            self.pages += 1
+            self.bytes_parsed += len(content)
+            self.parse_seconds += analysis['parse_seconds']
+            self.wait_seconds += time.perf_counter() - started
+        return analysis
+
+    def shutdown(self):
+        """ワーカープロセスを終了"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers if not self._broken else 0,
+                'pages': self.pages,
+                'bytes_parsed': self.bytes_parsed,
+                'parse_seconds': self.parse_seconds,
+                'wait_seconds': self.wait_seconds,
+                'failures': self.failures,
+                'timeouts': self.timeouts
+            }
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+解析済みHTMLドキュメント（1ページ1回だけ解析して各抽出処理で共有）
+- HTMLテキストのデコード・BeautifulSoupの構築・リンク一覧・テキストブロックを
+  初回参照時に1回だけ行い、結果を保持する
+- メールアドレス候補・関連ページ一覧など、抽出器が算出した結果もページ単位で保持する
+- トップページ全体・フッター・関連ページ探索・並列探索で同じドキュメントを参照する
+- プロセスプールで解析した結果（from_analysis）から生成した場合は、HTMLテキストのデコードと
+  解析木の構築を必要になるまで行わない
+"""
+
+import hashlib
+import logging
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup, NavigableString
+
+logger = logging.getLogger(__name__)
+
+# 解析対象とするHTMLの最大サイズ（文字数）。超える場合は先頭部分のみ解析
+MAX_HTML_SIZE = 1024 * 1024
+
+# 解析に使うパーサー（従来の抽出結果と同じ木構造になるよう html.parser を使用）
+HTML_PARSER = 'html.parser'
+
+# 内容のハッシュに含めない要素（表示されないテキスト）
+HIDDEN_TEXT_PARENTS = frozenset(['script', 'style', 'noscript', 'template'])
+
+
+def decode_body(content, encoding):
+    """本文のバイト列をHTMLテキストにデコード（requestsの response.text と同じ結果）"""
+    response = requests.models.Response()
+    response._content = content
+    response._content_consumed = True
+    response.encoding = encoding
+    return response.text
+
+
+def _limit_html_size(html):
+    """MAX_HTML_SIZE を超える部分を切り捨てる"""
+    html = html or ''
+    if len(html) > MAX_HTML_SIZE:
+        logger.warning(f"HTMLサイズが大きすぎます（{len(html):,}文字）。先頭{MAX_HTML_SIZE:,}文字のみ処理します。")
+        html = html[:MAX_HTML_SIZE]
+    return html
+
+
+class ParsedDocument:
+    """1ページ分の解析済みドキュメント
+
+    使用例:
+        document = ParsedDocument(url, response.text)
+        for absolute_url, href, text in document.links:
+            ...
+    """
+
+    def __init__(self, url, html, body=None):
+        """
+        Args:
+            url: ページのURL（相対リンクの解決に使用）
+            html: HTMLテキスト（MAX_HTML_SIZE を超える部分は切り捨て）
+            body: (本文のバイト列, エンコーディング)。html の代わりに指定すると、
+                  HTMLテキストは初回参照時にデコードする
+        """
+        self.url = url
+        self._html = None if body is not None else _limit_html_size(html)
+        self._body = body
+        self._content_hash = None
+        self._soup = None
+        self._links = None
+        self._text_blocks = None
+        self._elements = None
+
+        # 抽出器が算出した結果（未算出はNone）
+        self.emails = None
+        self.footer_emails = None
+        self.contact_pages = None
+        self.privacy_emails = None
+        self.form_reply_emails = None
+
+    @classmethod
+    def from_response(cls, response, url=None):
+        """requestsのレスポンスから生成（response.text のデコードは1回だけ行う）"""
+        return cls(url or response.url, response.text)
+
+    @classmethod
+    def from_analysis(cls, url, content, encoding, analysis):
+        """プロセスプールの解析結果（derivative_parse_pool.analyze_page の戻り値）から生成
+
+        算出済みの結果を保持し、HTMLテキスト・解析木は参照された時点で本文から作成する。
+        """
+        document = cls(url, None, body=(content, encoding))
+        document._content_hash = analysis['content_hash']
+        document._links = analysis['links']
+        document.emails = analysis['emails']
+        document.contact_pages = analysis['contact_pages']
+        document.footer_emails = analysis.get('footer_emails')
+        document.privacy_emails = analysis.get('privacy_emails')
+        document.form_reply_emails = analysis.get('form_reply_emails')
+        return document
+
+    @property
+    def html(self):
+        """HTMLテキスト"""
+        if self._html is None:
+            content, encoding = self._body
+            self._html = _limit_html_size(decode_body(content, encoding))
+            self._body = None
+        return self._html
+
+    @property
+    def content_hash(self):
+        """表示テキストとリンクのハッシュ（ページ内容が変わったかの判定に使用）
+
+        CSRFトークン・nonce・スクリプト内のタイムスタンプなど、表示に現れない値が
+        リクエストごとに変わっても同じハッシュになるよう、HTMLテキスト全体ではなく
+        表示テキスト（空白は1つにまとめる）とリンク先・リンクテキストから算出する。
+        """
+        if self._content_hash is None:
+            digest = hashlib.sha256()
+            for text in self._visible_texts():
+                digest.update(text.encode('utf-8', errors='replace') + b'\n')
+            digest.update(b'\0')
+            for absolute_url, _, text in self.links:
+                digest.update(f"{absolute_url}\t{' '.join(text.split())}\n".encode('utf-8', errors='replace'))
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    def _visible_texts(self):
+        """表示されるテキストの一覧（コメント・スクリプト等を除き、空白を1つにまとめる）"""
+        texts = []
+        for block in self.text_blocks:
+            # Comment・Doctype などは NavigableString のサブクラス
+            if type(block) is not NavigableString or block.parent is None:
+                continue
+            if block.parent.name in HIDDEN_TEXT_PARENTS:
+                continue
+            text = ' '.join(block.split())
+            if text:
+                texts.append(text)
+        return texts
+
+    @property
+    def soup(self):
+        """BeautifulSoupの解析木"""
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, HTML_PARSER)
+        return self._soup
+
+    @property
+    def links(self):
+        """href属性を持つリンクの一覧 [(絶対URL, href, リンクテキスト), ...]（文書順）"""
+        if self._links is None:
+            links = []
+            for a in self.soup.find_all('a', href=True):
+                href = a['href']
+                links.append((urljoin(self.url, href), href, a.get_text()))
+            self._links = links
+        return self._links
+
+    @property
+    def text_blocks(self):
+        """テキストノードの一覧（soup.find_all(string=...) の検索対象と同じ）"""
+        if self._text_blocks is None:
+            self._text_blocks = self.soup.find_all(string=True)
+        return self._text_blocks
+
+    @property
+    def elements(self):
+        """全要素の一覧（文書順）"""
+        if self._elements is None:
+            self._elements = self.soup.find_all()
+        return self._elements
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JavaScriptによる描画が必要なページの判定（静的HTMLで足りるかどうか）
+- requestsで取得した静的HTMLを調べ、ブラウザ（Selenium）での取得が必要な明確な兆候がある場合だけ理由を返す
+- 兆候: 本文が空・SPAのルート要素が空・noscriptの「JavaScriptを有効にしてください」表示
+- 本文が十分にあるページは、SPAのルート要素やnoscriptがあっても静的HTMLのまま分析する
+
+使用例:
+    soup = BeautifulSoup(html, 'html.parser')
+    reason = detect_javascript_rendering(soup)
+    if reason:
+        html = get_html_with_selenium(url)
+"""
+
+import re
+
+from bs4 import Comment
+
+# 判定の理由
+REASON_FETCH_FAILED = 'fetch_failed'
+REASON_EMPTY_BODY = 'empty_body'
+REASON_SPA_ROOT = 'spa_root'
+REASON_NOSCRIPT_WARNING = 'noscript_warning'
+
+# 本文が空とみなす表示テキストの文字数（リンク・画像もほとんどない場合）
+EMPTY_BODY_TEXT_LENGTH = 50
+EMPTY_BODY_MAX_ELEMENTS = 3
+# SPAのルート要素・noscriptの表示があっても静的HTMLで足りるとみなす表示テキストの文字数
+THIN_BODY_TEXT_LENGTH = 500
+# 描画前とみなすSPAのルート要素内のテキストの文字数
+SPA_ROOT_TEXT_LENGTH = 100
+
+# SPAフレームワークがアプリケーションを描画するルート要素のID・属性
+SPA_ROOT_IDS = ('root', 'app', '__next', '__nuxt', 'q-app', 'svelte', 'ember-app')
+SPA_ROOT_ATTRIBUTES = ('ng-app', 'ng-version', 'data-reactroot', 'data-v-app')
+
+# noscript内のJavaScript必須の表示
+NOSCRIPT_WARNING_PATTERN = re.compile(
+    r'enable\s+javascript|javascript\s+(?:is\s+)?(?:disabled|required)|requires\s+javascript'
+    r'|javascript\s*(?:を|が)\s*(?:有効|無効|オン|ON)|javascript\s*対応',
+    re.IGNORECASE
+)
+
+# 表示テキストに含めない要素
+NON_VISIBLE_TAGS = {'script', 'style', 'noscript', 'template', 'head', 'title'}
+
+
+def visible_text_length(element):
+    """要素内の表示テキストの文字数（空白を除く、script・style・noscript 内は数えない）"""
+    if element is None:
+        return 0
+    length = 0
+    for text in element.find_all(string=True):
+        if isinstance(text, Comment) or any(parent.name in NON_VISIBLE_TAGS for parent in text.parents):
+            continue
+        length += len(''.join(text.split()))
+    return length
+
+
+def detect_javascript_rendering(soup):
+    """静的HTMLの分析ではなくブラウザでの取得が必要かどうかを判定
+
+    Args:
+        soup: requestsで取得したHTMLの BeautifulSoup
+
+    Returns:
+        str: ブラウザでの取得が必要な理由（REASON_*）。静的HTMLで足りる場合は None
+    """
+    body = soup.body or soup
+    text_length = visible_text_length(body)
+
+    if text_length >= THIN_BODY_TEXT_LENGTH:
+        return None
+
+    for root in soup.find_all(lambda tag: tag.get('id') in SPA_ROOT_IDS
+                              or any(tag.has_attr(attribute) for attribute in SPA_ROOT_ATTRIBUTES)):
+        if visible_text_length(root) < SPA_ROOT_TEXT_LENGTH:
+            return REASON_SPA_ROOT
+
+    for noscript in soup.find_all('noscript'):
+        if NOSCRIPT_WARNING_PATTERN.search(noscript.get_text(' ')):
+            return REASON_NOSCRIPT_WARNING
+
+    if text_length < EMPTY_BODY_TEXT_LENGTH:
+        elements = len(body.find_all('a', href=True, limit=EMPTY_BODY_MAX_ELEMENTS)) + \
+            len(body.find_all('img', limit=EMPTY_BODY_MAX_ELEMENTS))
+        if elements < EMPTY_BODY_MAX_ELEMENTS:
+            return REASON_EMPTY_BODY
+
+    return None
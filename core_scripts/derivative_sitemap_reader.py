@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+XMLサイトマップの逐次読み込み（クロールの初期URL選定用）
+- iterparse で <loc> を1件ずつ読み込み、処理済みの要素は破棄（文書全体をメモリに載せない）
+- gzip圧縮（.xml.gz）は先頭のマジックバイトで判定して展開しながら読む
+- サイトマップインデックス（<sitemapindex>）は上限数までたどる
+- URLはスコア関数（is_high_value_page）で評価し、上位K件だけを固定サイズのヒープに保持
+- 1サイトマップあたりの読み込みバイト数・URL数・読み込み時間にも上限を設ける
+  （読み込み中はホスト単位の同時接続枠を保持するため、時間は企業の残り時間などで頭打ちにする）
+- 上位K件が一定数のURLの間変わらなければ、残りのURL・サイトマップは読まずに終了する
+
+メモリ使用量はサイトマップの大きさによらず上位K件分で一定。
+
+使用例:
+    reader = SitemapReader(open_stream, score=extractor.is_high_value_page, top_k=50)
+    for url, score in reader.read('https://example.co.jp/sitemap.xml'):
+        ...
+"""
+
+import io
+import gzip
+import time
+import heapq
+import logging
+from contextlib import closing
+import xml.etree.ElementTree as ET
+
+logger = logging.getLogger(__name__)
+
+# 保持する上位URL数の既定値
+DEFAULT_TOP_K = 50
+
+# たどるサイトマップ数（インデックスを含む）の上限
+DEFAULT_MAX_SITEMAPS = 10
+
+# 1サイトマップあたりの上限（URL数はサイトマッププロトコルの上限 50,000件）
+# バイト数はプロトコルの上限（50MB）より小さくし、初期URLの選定に十分な範囲だけを読む
+DEFAULT_MAX_URLS_PER_SITEMAP = 50000
+DEFAULT_MAX_BYTES_PER_SITEMAP = 5 * 1024 * 1024
+
+# 上位K件がこの件数のURLの間変わらなければ読み込みを終了する（None の場合は最後まで読む）
+DEFAULT_STABLE_URLS = 10000
+
+# 読み込みの単位
+READ_SIZE = 64 * 1024
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _local_name(tag):
+    """名前空間を除いたタグ名"""
+    return tag.rsplit('}', 1)[-1] if '}' in tag else tag
+
+
+class _StreamReader(io.RawIOBase):
+    """先読みした先頭部分に続けて元のストリームを読む読み込みラッパー
+
+    max_bytes・max_seconds を指定した場合、上限に達したら終端として扱う。
+    （時間は読み込みのたびに確認する。1回の読み込みの待ち時間は接続のタイムアウトで制限される）
+    （urllib3 のレスポンスは本文を読み切ると閉じた状態になるため、io.BufferedReader で直接包まない）
+    """
+
+    def __init__(self, stream, prefix=b'', max_bytes=None, max_seconds=None):
+        self.stream = stream
+        self.prefix = prefix
+        self.remaining = max_bytes
+        self.expires_at = time.monotonic() + max_seconds if max_seconds is not None else None
+        self.exhausted = False
+        self.timed_out = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = len(buffer)
+        if self.remaining is not None:
+            if self.remaining <= 0:
+                self.exhausted = True
+                return 0
+            size = min(size, self.remaining)
+        if self.expires_at is not None and time.monotonic() >= self.expires_at:
+            self.timed_out = True
+            return 0
+        if self.prefix:
+            data, self.prefix = self.prefix[:size], self.prefix[size:]
+        else:
+            data = self.stream.read(size)
+        if not data:
+            return 0
+        buffer[:len(data)] = data
+        if self.remaining is not None:
+            self.remaining -= len(data)
+        return len(data)
+
+
+def open_xml_stream(stream, max_bytes=DEFAULT_MAX_BYTES_PER_SITEMAP, max_seconds=None):
+    """バイナリストリームを読み込み上限（バイト数・時間）付きのXMLストリームに変換（gzipは展開）
+
+    Returns:
+        tuple: (XMLストリーム, 上限判定用のラッパー)
+    """
+    head = stream.read(READ_SIZE) or b''
+    source = _StreamReader(stream, head)
+    if head[:2] == GZIP_MAGIC:
+        source = gzip.GzipFile(fileobj=source, mode='rb')
+    budget = _StreamReader(source, max_bytes=max_bytes, max_seconds=max_seconds)
+    return io.BufferedReader(budget, READ_SIZE), budget
+
+
+class SitemapReader:
+    """サイトマップ（インデックスを含む）から価値の高いURLの上位K件を選ぶ
+
+    Args:
+        open_stream: URLを開く関数。open_stream(url) はコンテキストマネージャで、
+                     バイナリの読み込みストリーム（見つからない場合は None）を返す
+        score: URLのスコア関数 score(url) -> int（高いほど価値が高い）
+        accept: 対象にするURLか判定する関数（同じドメインのみなど）。サイトマップのURLにも適用
+        top_k: 保持する上位URL数
+        min_score: 保持する最低スコア
+        max_seconds_per_sitemap: 1サイトマップの読み込み時間の上限（秒）。関数を指定した場合は
+                                 サイトマップを開くたびに呼び出す（企業の残り時間など、None は上限なし）
+        stable_urls: 上位K件がこの件数のURLの間変わらなければ終了する（None の場合は最後まで読む）
+    """
+
+    def __init__(self, open_stream, score, accept=None, top_k=DEFAULT_TOP_K, min_score=1,
+                 max_sitemaps=DEFAULT_MAX_SITEMAPS, max_urls_per_sitemap=DEFAULT_MAX_URLS_PER_SITEMAP,
+                 max_bytes_per_sitemap=DEFAULT_MAX_BYTES_PER_SITEMAP, max_seconds_per_sitemap=None,
+                 stable_urls=DEFAULT_STABLE_URLS):
+        self.open_stream = open_stream
+        self.score = score
+        self.accept = accept
+        self.top_k = top_k
+        self.min_score = min_score
+        self.max_sitemaps = max_sitemaps
+        self.max_urls_per_sitemap = max_urls_per_sitemap
+        self.max_bytes_per_sitemap = max_bytes_per_sitemap
+        self.max_seconds_per_sitemap = max_seconds_per_sitemap
+        self.stable_urls = stable_urls
+        self.stats = {'sitemaps': 0, 'skipped_sitemaps': 0, 'urls': 0, 'kept': 0, 'truncated': 0, 'errors': 0,
+                      'timed_out': 0, 'stable_stop': False}
+
+    def read(self, sitemap_url):
+        """サイトマップを読み込み、上位K件のURLを [(URL, スコア), ...]（スコアの高い順）で返す"""
+        heap = []
+        counter = 0
+        # 上位K件が最後に変わってから読んだURL数
+        unchanged = 0
+        pending = [sitemap_url]
+        queued = {sitemap_url}
+
+        while pending:
+            if self.stats['timed_out'] or self.stats['stable_stop']:
+                self.stats['skipped_sitemaps'] += len(pending)
+                break
+            if self.stats['sitemaps'] >= self.max_sitemaps:
+                self.stats['skipped_sitemaps'] += len(pending)
+                logger.info(f"サイトマップの上限（{self.max_sitemaps}件）に達したため {len(pending)}件をスキップしました")
+                break
+            url = pending.pop(0)
+            self.stats['sitemaps'] += 1
+
+            # 途中で終了した場合もサイトマップの接続を閉じる
+            with closing(self._iter_locs(url)) as locs:
+                for kind, loc in locs:
+                    if kind == 'sitemap':
+                        if loc not in queued and (self.accept is None or self.accept(loc)):
+                            queued.add(loc)
+                            pending.append(loc)
+                        continue
+
+                    self.stats['urls'] += 1
+                    unchanged += 1
+                    score = self.score(loc)
+                    if score >= self.min_score and (self.accept is None or self.accept(loc)):
+                        # 同じスコアなら先に現れたURLを残す
+                        item = (score, -counter, loc)
+                        counter += 1
+                        if len(heap) < self.top_k:
+                            heapq.heappush(heap, item)
+                            unchanged = 0
+                        elif item > heap[0]:
+                            heapq.heapreplace(heap, item)
+                            unchanged = 0
+                    if self.stable_urls is not None and len(heap) >= self.top_k and unchanged >= self.stable_urls:
+                        self.stats['stable_stop'] = True
+                        logger.info(f"上位{self.top_k}件が{self.stable_urls:,}件のURLの間変わらないため、サイトマップの読み込みを終了しました")
+                        break
+
+        self.stats['kept'] = len(heap)
+        return [(loc, score) for score, _, loc in sorted(heap, reverse=True)]
+
+    def _iter_locs(self, url):
+        """1つのサイトマップから ('url' | 'sitemap', loc) を順に返す"""
+        try:
+            with self.open_stream(url) as stream:
+                if stream is None:
+                    return
+                max_seconds = self.max_seconds_per_sitemap
+                if callable(max_seconds):
+                    max_seconds = max_seconds()
+                xml_stream, budget = open_xml_stream(stream, self.max_bytes_per_sitemap, max_seconds)
+                root = None
+                kind = None
+                count = 0
+                # 名前空間付きタグ → タグ名（同じタグが繰り返し現れるため変換結果を保持）
+                names = {}
+                try:
+                    for event, element in ET.iterparse(xml_stream, events=('start', 'end')):
+                        if event == 'start':
+                            if root is None:
+                                root = element
+                                kind = {'urlset': 'url', 'sitemapindex': 'sitemap'}.get(_local_name(root.tag))
+                                if kind is None:
+                                    logger.debug(f"サイトマップではありません（{_local_name(root.tag)}）: {url}")
+                                    return
+                            continue
+
+                        tag = element.tag
+                        name = names.get(tag)
+                        if name is None:
+                            name = names[tag] = _local_name(tag)
+                        if name == 'loc':
+                            loc = (element.text or '').strip()
+                            if loc:
+                                count += 1
+                                yield kind, loc
+                            if count >= self.max_urls_per_sitemap:
+                                self.stats['truncated'] += 1
+                                return
+                        elif name == kind:
+                            # 処理済みの要素を破棄してメモリ使用量を一定に保つ
+                            root.clear()
+                except ET.ParseError as e:
+                    if budget.timed_out:
+                        self.stats['timed_out'] += 1
+                        logger.info(f"サイトマップの読み込み時間が上限（{max_seconds:.1f}秒）に達したため打ち切りました: {url}")
+                    elif budget.exhausted:
+                        self.stats['truncated'] += 1
+                        logger.info(f"サイトマップが上限（{self.max_bytes_per_sitemap:,}バイト）に達したため読み込みを打ち切りました: {url}")
+                    elif root is None:
+                        logger.debug(f"サイトマップではありません: {url} - {e}")
+                    else:
+                        self.stats['errors'] += 1
+                        logger.warning(f"サイトマップの解析エラー: {url} - {e}")
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"サイトマップの読み込みエラー: {url} - {e}")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+ストリーミング取得（本文サイズ・Content-Typeの制限とリダイレクト処理）
+- レスポンス本文はストリーミングで読み込み、上限バイト数・上限時間に達したら読み込みを打ち切る
+  （打ち切った接続は閉じ、メモリ使用量は上限バイト数までに抑える）
+- HTML/XML以外のContent-Type（PDF・画像など）はヘッダーの時点で本文を読まずに拒否
+- リダイレクトは上限回数までループで追跡し、ループ（同じURLへの再リダイレクト）も検出
+- エラー応答・リダイレクト応答の本文は小さな上限で読み切り、キープアライブ接続を再利用する
+
+使用例:
+    fetcher = StreamingFetcher(max_bytes=1024 * 1024)
+    response = fetcher.follow_redirects(url, lambda hop_url: session.get(hop_url, stream=True, allow_redirects=False))
+    fetcher.read_body(response)
+"""
+
+import time
+import logging
+import threading
+from urllib.parse import urljoin
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# 本文の上限バイト数の既定値（1MB、展開後のサイズ）
+DEFAULT_MAX_BODY_BYTES = 1024 * 1024
+
+# 本文の読み込み時間の上限（秒）
+DEFAULT_MAX_BODY_SECONDS = 15
+
+# リダイレクトの最大回数
+DEFAULT_MAX_REDIRECTS = 5
+
+# エラー応答・リダイレクト応答の本文の上限（読み切れば接続を再利用できる）
+ERROR_BODY_BYTES = 64 * 1024
+
+# 読み込みの単位
+CHUNK_SIZE = 64 * 1024
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+# 本文を読み込むContent-Type（指定がない場合も読み込む）
+ACCEPTED_CONTENT_TYPES = (
+    'text/html', 'application/xhtml+xml', 'text/plain',
+    'application/xml', 'text/xml', 'application/rss+xml', 'application/atom+xml',
+)
+
+
+class UnsupportedContentType(requests.exceptions.RequestException):
+    """本文を読み込まないContent-Type（PDF・画像など）"""
+
+
+def is_accepted_content_type(content_type, accepted=ACCEPTED_CONTENT_TYPES):
+    """Content-Typeヘッダーの値が読み込み対象か判定（空の場合は対象）"""
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    return not media_type or media_type in accepted
+
+
+class StreamingFetcher:
+    """本文の読み込み制限とリダイレクト追跡（スレッドセーフ、統計は全スレッドで集計）"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BODY_BYTES, max_seconds=DEFAULT_MAX_BODY_SECONDS,
+                 max_redirects=DEFAULT_MAX_REDIRECTS, accepted_content_types=ACCEPTED_CONTENT_TYPES):
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.max_redirects = max_redirects
+        self.accepted_content_types = tuple(accepted_content_types)
+
+        self._lock = threading.Lock()
+        self.bodies = 0
+        self.bytes_read = 0
+        self.truncated = 0
+        self.rejected = 0
+        self.redirects = 0
+        self.redirect_failures = 0
+
+    def _count(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def check_content_type(self, response):
+        """本文を読む前にContent-Typeを確認（対象外の場合は接続を閉じて UnsupportedContentType）"""
+        content_type = response.headers.get('Content-Type', '')
+        if not is_accepted_content_type(content_type, self.accepted_content_types):
+            response.close()
+            self._count(rejected=1)
+            raise UnsupportedContentType(f"対象外のContent-Type: {content_type} - {response.url}")
+
+    def read_body(self, response, max_bytes=None, max_seconds=None):
+        """本文を上限バイト数・上限時間まで読み込み、response.content に設定
+
+        上限に達した場合は response.truncated = True とし、接続を閉じる。
+        max_seconds を指定した場合は既定の上限時間より短い方を使う（企業の残り時間など）。
+
+        Returns:
+            requests.Response: 同じレスポンス（本文は読み込み済み）
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if max_seconds is None or (self.max_seconds is not None and self.max_seconds < max_seconds):
+            max_seconds = self.max_seconds
+        started = time.monotonic()
+        chunks = []
+        size = 0
+        truncated = False
+        try:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                if len(chunk) > max_bytes - size:
+                    chunks.append(chunk[:max_bytes - size])
+                    truncated = True
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+                if max_seconds is not None and time.monotonic() - started > max_seconds:
+                    truncated = True
+                    break
+        except Exception:
+            response.close()
+            raise
+        if truncated:
+            # 読み残しがある接続は再利用できないため閉じる
+            response.close()
+
+        body = b''.join(chunks)
+        response._content = body
+        response._content_consumed = True
+        response.truncated = truncated
+        self._count(bodies=1, bytes_read=len(body), truncated=1 if truncated else 0)
+        if truncated:
+            logger.info(f"本文が上限（{max_bytes:,}バイト / {max_seconds}秒）に達したため読み込みを打ち切りました: {response.url}")
+        return response
+
+    def follow_redirects(self, url, get):
+        """リダイレクトを上限回数まで追跡して最終レスポンスを返す
+
+        Args:
+            url: 取得するURL
+            get: 1回分の取得関数 get(url) -> requests.Response（リダイレクトは追跡しないこと）
+
+        Raises:
+            requests.exceptions.TooManyRedirects: 上限回数を超えた場合・ループした場合
+        """
+        seen = {url}
+        response = get(url)
+        hops = 0
+        while response.status_code in REDIRECT_STATUSES and response.headers.get('Location'):
+            next_url = urljoin(response.url or url, response.headers['Location'])
+            response.close()
+            if hops >= self.max_redirects or next_url in seen:
+                self._count(redirects=hops, redirect_failures=1)
+                reason = 'ループ' if next_url in seen else f'上限 {self.max_redirects}回'
+                raise requests.exceptions.TooManyRedirects(f"リダイレクトを中止しました（{reason}）: {url} -> {next_url}")
+            logger.info(f"リダイレクト: {response.url or url} -> {next_url}")
+            seen.add(next_url)
+            hops += 1
+            response = get(next_url)
+        response.redirect_hops = hops
+        self._count(redirects=hops)
+        return response
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'bodies': self.bodies,
+                'bytes_read': self.bytes_read,
+                'truncated': self.truncated,
+                'rejected': self.rejected,
+                'redirects': self.redirects,
+                'redirect_failures': self.redirect_failures,
+                'max_bytes': self.max_bytes
+            }
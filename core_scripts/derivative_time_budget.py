@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+企業ごとの処理時間の予算（期限）と段階別の処理時間ヒストグラム
+- 企業の抽出開始時に CompanyDeadline を作成し、取得・関連ページ探索・メール検証に渡す
+- 取得のタイムアウト・本文の読み込み時間・探索の期限は残り時間で頭打ちにする
+- 段階（トップページ・お問い合わせページ・関連ページ探索など）の開始時に残り時間を確認し、
+  使い切っている場合は DeadlineExceeded を送出して以降の段階をスキップする
+- 段階ごとの処理時間は StageHistogram に集計し、処理の終わりに分布を出力する
+
+使用例:
+    deadline = CompanyDeadline(90, histogram=STAGE_HISTOGRAM)
+    try:
+        deadline.begin('homepage')
+        response = session.get(url, timeout=deadline.timeout(5))
+        deadline.begin('contact_pages')
+        ...
+    except DeadlineExceeded:
+        ...
+    finally:
+        deadline.finish()
+"""
+
+import time
+import bisect
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 1企業あたりの処理時間の予算の既定値（秒）
+DEFAULT_COMPANY_BUDGET = 90
+
+# 残り時間で頭打ちにしたタイムアウトの下限（秒）
+MIN_TIMEOUT = 0.5
+
+# ヒストグラムの区間の上限（秒）
+HISTOGRAM_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+
+# 企業全体の処理時間を集計する段階名
+TOTAL_STAGE = 'total'
+
+
+class DeadlineExceeded(Exception):
+    """企業の処理時間の予算を使い切った"""
+
+    def __init__(self, stage):
+        super().__init__(f"処理時間の予算を使い切りました（{stage} 以降をスキップ）")
+        self.stage = stage
+
+
+class StageHistogram:
+    """段階ごとの処理時間の分布（スレッドセーフ、全企業で共有）"""
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stages = {}
+        self.exhausted = 0
+        self.skipped = {}
+
+    def record(self, stage, seconds):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {'count': 0, 'total': 0.0, 'max': 0.0,
+                                               'counts': [0] * (len(self.buckets) + 1)}
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            entry['counts'][bisect.bisect_left(self.buckets, seconds)] += 1
+
+    def record_exhausted(self, stage):
+        """予算切れでスキップした最初の段階を記録"""
+        with self._lock:
+            self.exhausted += 1
+            self.skipped[stage] = self.skipped.get(stage, 0) + 1
+
+    def _percentile(self, entry, fraction):
+        """区間の上限による百分位数の推定（最後の区間は最大値）"""
+        target = entry['count'] * fraction
+        seen = 0
+        for i, count in enumerate(entry['counts']):
+            seen += count
+            if count and seen >= target:
+                return self.buckets[i] if i < len(self.buckets) else entry['max']
+        return entry['max']
+
+    def get_stats(self):
+        with self._lock:
+            stages = {}
+            for stage, entry in self._stages.items():
+                stages[stage] = {
+                    'count': entry['count'],
+                    'total_seconds': entry['total'],
+                    'mean_seconds': entry['total'] / entry['count'],
+                    'p50_seconds': self._percentile(entry, 0.5),
+                    'p95_seconds': self._percentile(entry, 0.95),
+                    'max_seconds': entry['max'],
+                    'histogram': dict(zip([f'<={bound}s' for bound in self.buckets] + [f'>{self.buckets[-1]}s'],
+                                          entry['counts']))
+                }
+            return {'stages': stages, 'exhausted': self.exhausted, 'skipped': dict(self.skipped)}
+
+    def format_lines(self):
+        """段階ごとの分布を表示用の行で返す（処理時間の合計が大きい順）"""
+        stats = self.get_stats()
+        lines = []
+        for stage, entry in sorted(stats['stages'].items(), key=lambda item: -item[1]['total_seconds']):
+            histogram = ' '.join(f'{label}:{count}' for label, count in entry['histogram'].items() if count)
+            lines.append(f"{stage}: {entry['count']}件, 平均 {entry['mean_seconds']:.2f}秒, "
+                         f"p50≤{entry['p50_seconds']:g}秒, p95≤{entry['p95_seconds']:g}秒, "
+                         f"最大 {entry['max_seconds']:.2f}秒 [{histogram}]")
+        return lines
+
+
+class CompanyDeadline:
+    """1企業分の処理時間の予算（段階ごとの処理時間も記録）
+
+    Args:
+        seconds: 予算（秒）。None または0以下の場合は期限なし（処理時間の記録のみ）
+        histogram: 段階ごとの処理時間を集計する StageHistogram
+    """
+
+    def __init__(self, seconds=DEFAULT_COMPANY_BUDGET, histogram=None, clock=time.monotonic):
+        self.clock = clock
+        self.started = clock()
+        self.seconds = seconds if seconds and seconds > 0 else None
+        self.expires = self.started + self.seconds if self.seconds else None
+        self.histogram = histogram
+        self.stage_seconds = {}
+        self.skipped_stage = None
+        self._stage = None
+        self._stage_started = None
+        self._finished = False
+
+    def remaining(self):
+        """残り時間（秒、期限なしの場合は None）"""
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - self.clock())
+
+    def expired(self):
+        return self.expires is not None and self.clock() >= self.expires
+
+    def timeout(self, default, attempts=1):
+        """残り時間で頭打ちにしたタイムアウト（default が None の場合は残り時間）
+
+        attempts: 同じタイムアウトで行われうる試行回数（接続プールの再試行など）。合計が残り時間に収まるよう分割する
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        limit = max(MIN_TIMEOUT, remaining / max(1, attempts))
+        return limit if default is None else min(default, limit)
+
+    def begin(self, stage, check=True):
+        """段階を開始（前の段階の処理時間を記録）
+
+        check=True の場合、予算を使い切っていれば DeadlineExceeded を送出する
+        （ネットワークを使わない段階は check=False で記録だけ行う）。
+        """
+        self._end_stage()
+        if check:
+            self.check(stage)
+        self._stage = stage
+        self._stage_started = self.clock()
+
+    def check(self, stage=None):
+        """段階の途中で予算を確認し、使い切っていれば DeadlineExceeded を送出する
+
+        段階内で複数回ネットワークを使う処理（ページごとのレンダリングなど）の各回の前に呼ぶ。
+        stage を省略した場合は実行中の段階として記録する。
+        """
+        if not self.expired():
+            return
+        stage = stage or self._stage
+        if self.skipped_stage is None:
+            self.skipped_stage = stage
+            if self.histogram is not None:
+                self.histogram.record_exhausted(stage)
+        raise DeadlineExceeded(stage)
+
+    def _end_stage(self):
+        if self._stage is None:
+            return
+        elapsed = self.clock() - self._stage_started
+        self.stage_seconds[self._stage] = self.stage_seconds.get(self._stage, 0.0) + elapsed
+        if self.histogram is not None:
+            self.histogram.record(self._stage, elapsed)
+        self._stage = None
+
+    def finish(self):
+        """最後の段階と企業全体の処理時間を記録（2回目以降は何もしない）"""
+        if self._finished:
+            return
+        self._finished = True
+        self._end_stage()
+        if self.histogram is not None:
+            self.histogram.record(TOTAL_STAGE, self.elapsed())
+
+    def elapsed(self):
+        return self.clock() - self.started
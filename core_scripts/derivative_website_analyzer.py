@@ -7,7 +7,7 @@
 - derivative_input.csv を入力ファイルとして使用
 - 元システムとの完全分離
 - URL正規化: 常にトップページを評価対象とする
-- Selenium導入: JavaScript実行後のHTMLを解析
+- requests優先: 静的HTMLで分析し、JavaScriptによる描画が必要な兆候がある場合だけSeleniumで再取得
 - 評価配点: UX30点 + デザイン40点 + 技術30点 = 最大100点
 - ランク基準: A(65点以上) B(55-64点) C(55点以下) - 辛口評価
 """
@@ -24,6 +24,11 @@ from datetime import datetime
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 
+from derivative_http_cache import CacheMissError, get_shared_cache, add_cache_arguments, apply_cache_arguments
+from derivative_domain_planner import plan_by_domain
+from derivative_render_detector import REASON_FETCH_FAILED, detect_javascript_rendering
+from derivative_page_features import PageFeatureExtractor
+
 # Selenium関連のインポート
 try:
     from selenium import webdriver
@@ -54,10 +59,447 @@ logger = logging.getLogger('new_website_analyzer')
 INPUT_FILE = 'data/derivative_input.csv'
 OUTPUT_FILE_PREFIX = 'derivative_website_analysis_results'
 
+# 評価に使うキーワード（表示テキストは小文字で照合）
+BREADCRUMB_KEYWORDS = ('ホーム', 'home', '>', '»', 'breadcrumb')
+SEARCH_KEYWORDS = ('search', '検索')
+SITEMAP_KEYWORDS = ('サイトマップ', 'sitemap', 'カテゴリ', 'category')
+CONTACT_KEYWORDS = ('お問い合わせ', 'contact', '連絡', 'tel', '電話', 'phone', 'mail', 'メール', 'email')
+CONTACT_METHOD_KEYWORDS = (
+    ('tel', '電話'),
+    ('mail', 'メール', '@'),
+    ('form', 'フォーム'),
+    ('chat', 'チャット'),
+)
+COMPANY_KEYWORDS = ('会社概要', 'about', '企業情報', '会社案内', '運営者情報')
+PRIVACY_KEYWORDS = ('プライバシー', 'privacy', '個人情報')
+TERMS_KEYWORDS = ('利用規約', 'terms', '規約')
+PORTFOLIO_KEYWORDS = (('実績', '事例', 'case study', '導入事例'), ('portfolio', 'works', '制作実績', 'project'))
+NEWS_KEYWORDS = (('ニュース', 'news', 'お知らせ'), ('ブログ', 'blog', '記事'), ('更新', 'update', '最新'))
+SERVICE_KEYWORDS = (('サービス', 'service', 'ソリューション'), ('製品', 'product', 'プロダクト'),
+                    ('事業内容', 'business', '業務内容'))
+COMPANY_INFO_KEYWORDS = (('会社概要', 'about us', '企業情報'), ('代表', 'ceo', '社長', '代表取締役'),
+                         ('沿革', 'history', '設立'))
+SECURITY_PRIVACY_KEYWORDS = ('プライバシー', 'privacy', '個人情報保護')
+TITLE_COMPANY_KEYWORDS = ('株式会社', '会社', 'company', 'corp', 'inc')
+
+# マークアップ（str(soup)）で照合するキーワード（大文字小文字を区別）
+FONT_FAMILY_KEYWORD = 'font-family'
+COLOR_KEYWORDS = ('color:', 'background-color:')
+CSS_VARIABLE_KEYWORDS = ('--', 'var(', ':root')
+MEDIA_QUERY_KEYWORDS = ('@media', 'media=')
+# マークアップ（小文字）で照合するキーワード
+CSS_FRAMEWORK_KEYWORDS = ('bootstrap', 'tailwind', 'foundation', 'bulma')
+WEB_FONT_KEYWORDS = ('google fonts', 'web font', 'typekit')
+FONT_NAME_KEYWORDS = ('noto', 'roboto', 'open sans', 'lato', 'montserrat')
+COLOR_FUNCTION_KEYWORDS = ('rgb(', 'rgba(', 'hsl(', 'hsla(')
+RESPONSIVE_KEYWORDS = ('responsive', 'mobile-first', 'breakpoint')
+MOBILE_MENU_KEYWORDS = (('mobile-menu', 'hamburger', 'toggle-menu'), ('menu-toggle', 'nav-toggle', 'burger'))
+
+# CSSクラス・IDで照合するキーワード（小文字）
+NAV_CLASS_KEYWORD = 'nav'
+SEARCH_CLASS_KEYWORD = 'search'
+LOGO_KEYWORD = 'logo'
+COMPONENT_CLASS_KEYWORDS = ('btn', 'button', 'card', 'modal', 'nav')
+INTERACTIVE_CLASS_KEYWORDS = ('js-', 'interactive', 'toggle', 'dropdown')
+MOBILE_MENU_CLASS_KEYWORDS = ('menu', 'mobile')
+PORTFOLIO_CLASS_KEYWORDS = ('portfolio', 'case', 'work')
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+SEMANTIC_TAGS = ('header', 'nav', 'main', 'article', 'section', 'aside', 'footer')
+
+
+def _flatten(*groups):
+    keywords = []
+    for group in groups:
+        if isinstance(group, str):
+            keywords.append(group)
+        else:
+            keywords.extend(_flatten(*group))
+    return keywords
+
+
+# 評価に使う特徴量の抽出器（キーワードの照合器はモジュールの読み込み時に1回だけ構築）
+PAGE_FEATURE_EXTRACTOR = PageFeatureExtractor(
+    text_keywords=_flatten(BREADCRUMB_KEYWORDS, SEARCH_KEYWORDS, SITEMAP_KEYWORDS, CONTACT_KEYWORDS,
+                           CONTACT_METHOD_KEYWORDS, COMPANY_KEYWORDS, PRIVACY_KEYWORDS, TERMS_KEYWORDS,
+                           PORTFOLIO_KEYWORDS, NEWS_KEYWORDS, SERVICE_KEYWORDS, COMPANY_INFO_KEYWORDS,
+                           SECURITY_PRIVACY_KEYWORDS),
+    markup_keywords=_flatten(FONT_FAMILY_KEYWORD, COLOR_KEYWORDS, CSS_VARIABLE_KEYWORDS, MEDIA_QUERY_KEYWORDS),
+    markup_keywords_ci=_flatten(CSS_FRAMEWORK_KEYWORDS, WEB_FONT_KEYWORDS, FONT_NAME_KEYWORDS,
+                                COLOR_FUNCTION_KEYWORDS, RESPONSIVE_KEYWORDS, MOBILE_MENU_KEYWORDS),
+    class_keywords=_flatten(NAV_CLASS_KEYWORD, SEARCH_CLASS_KEYWORD, LOGO_KEYWORD, COMPONENT_CLASS_KEYWORDS,
+                            INTERACTIVE_CLASS_KEYWORDS, MOBILE_MENU_CLASS_KEYWORDS, PORTFOLIO_CLASS_KEYWORDS),
+    id_keywords=[LOGO_KEYWORD],
+    image_keyword=LOGO_KEYWORD,
+)
+
+
+def score_user_experience(features):
+    """ユーザーエクスペリエンス分析（30%）- 改善版"""
+    score = 0
+
+    # 1. ページ読み込み速度（7点）
+    if features.response_time is not None:
+        response_time = features.response_time
+        if response_time < 1:
+            score += 7
+        elif response_time < 2:
+            score += 6
+        elif response_time < 3:
+            score += 4
+        elif response_time < 5:
+            score += 3
+        else:
+            score += 1
+
+    # 2. ナビゲーション・メニュー構造（6点）
+    nav_score = 0
+    if features.count('nav', 'header') or features.class_has(NAV_CLASS_KEYWORD):
+        nav_score += 3
+    # メニュー項目の数をチェック
+    if features.text_links >= 5:
+        nav_score += 2
+    # パンくずリストの存在
+    if features.text_has(*BREADCRUMB_KEYWORDS):
+        nav_score += 1
+    score += nav_score
+
+    # 3. コンテンツの見つけやすさ（5点）
+    content_score = 0
+    # 見出し構造の確認
+    if features.count(*HEADING_TAGS) >= 3:
+        content_score += 2
+    # 検索機能の存在
+    if features.search_inputs or features.class_has(SEARCH_CLASS_KEYWORD) or features.text_has(*SEARCH_KEYWORDS):
+        content_score += 2
+    # サイトマップやカテゴリ分類
+    if features.text_has(*SITEMAP_KEYWORDS):
+        content_score += 1
+    score += content_score
+
+    # 4. お問い合わせ・連絡手段（5点）
+    contact_score = 0
+    if features.text_has(*CONTACT_KEYWORDS):
+        contact_score += 2
+    # 複数の連絡手段
+    contact_methods = sum(features.text_has(*keywords) for keywords in CONTACT_METHOD_KEYWORDS)
+    if contact_methods >= 2:
+        contact_score += 3
+    score += contact_score
+
+    # 5. 信頼性・透明性（4点）
+    trust_score = 0
+    # 会社情報の存在
+    if features.text_has(*COMPANY_KEYWORDS):
+        trust_score += 2
+    # プライバシーポリシー
+    if features.text_has(*PRIVACY_KEYWORDS):
+        trust_score += 1
+    # 利用規約
+    if features.text_has(*TERMS_KEYWORDS):
+        trust_score += 1
+    score += trust_score
+
+    # 6. モバイル対応（3点）
+    mobile_score = 0
+    if features.viewport:
+        mobile_score += 2
+    # レスポンシブデザインの兆候（media に screen を含むスタイルシート）
+    if features.screen_stylesheet:
+        mobile_score += 1
+    score += mobile_score
+
+    return min(score, 30)  # 最大30点
+
+
+def score_design_quality(features):
+    """デザイン品質分析（40%）- 辛口評価版"""
+    score = 0
+
+    # 1. ビジュアルデザイン・レイアウト（16点）- 辛口評価
+    visual_score = 0
+    # CSSの存在と品質（より厳しい基準）
+    if features.stylesheets:
+        visual_score += 2
+        # 複数のCSSファイル（デザインの複雑さを示唆）
+        if features.stylesheets >= 3:
+            visual_score += 2
+        # 外部CSSフレームワークの使用（Bootstrap、Tailwindなど）
+        if features.markup_has_ci(*CSS_FRAMEWORK_KEYWORDS):
+            visual_score += 1
+
+    # レイアウト構造の確認（より厳しい基準）
+    layout_elements = features.count('header', 'main', 'footer', 'aside', 'section')
+    if layout_elements >= 4:
+        visual_score += 3
+    elif layout_elements >= 2:
+        visual_score += 1
+
+    # フォントの設定（より厳しい基準）
+    font_score = sum([
+        features.markup_has(FONT_FAMILY_KEYWORD),
+        features.markup_has_ci(*WEB_FONT_KEYWORDS),
+        features.markup_has_ci(*FONT_NAME_KEYWORDS),
+    ])
+    if font_score >= 2:
+        visual_score += 2
+    elif font_score >= 1:
+        visual_score += 1
+
+    # カラースキーム（より厳しい基準）
+    color_indicators = sum([
+        features.markup_has(COLOR_KEYWORDS[0]),
+        features.markup_has(COLOR_KEYWORDS[1]),
+        features.hash_segments >= 3,  # 複数の色指定
+        features.markup_has_ci(*COLOR_FUNCTION_KEYWORDS),
+    ])
+    if color_indicators >= 3:
+        visual_score += 2
+    elif color_indicators >= 1:
+        visual_score += 1
+
+    score += visual_score
+
+    # 2. 画像・メディアの品質（10点）- 辛口評価
+    media_score = 0
+    images = features.images
+    if images > 0:
+        media_score += 1
+
+        # 画像の最適化（alt属性の存在）- より厳しい基準
+        alt_ratio = features.images_with_text_alt / images
+        if alt_ratio >= 0.9:
+            media_score += 3
+        elif alt_ratio >= 0.7:
+            media_score += 2
+        elif alt_ratio >= 0.5:
+            media_score += 1
+
+        # 適切な画像数（より厳しい基準）
+        if 5 <= images <= 12:
+            media_score += 2
+        elif 3 <= images <= 20:
+            media_score += 1
+
+        # 画像の最適化指標
+        optimization_score = 0
+        # 画像のサイズ指定
+        if features.images_with_size >= images * 0.7:
+            optimization_score += 1
+        # レスポンシブ画像（srcset属性）
+        if features.images_with_srcset >= images * 0.3:
+            optimization_score += 1
+        # 画像の遅延読み込み
+        if features.lazy_images >= images * 0.3:
+            optimization_score += 1
+
+        media_score += optimization_score
+
+    score += media_score
+
+    # 3. ブランディング・一貫性（8点）- 辛口評価
+    brand_score = 0
+
+    # ロゴの存在（より厳しい基準）
+    logo_score = sum([
+        features.class_has(LOGO_KEYWORD),
+        features.logo_image_alt,
+        features.logo_image_src,
+        features.id_has(LOGO_KEYWORD),
+    ])
+    if logo_score >= 2:  # 複数の指標でロゴを確認
+        brand_score += 2
+    elif logo_score >= 1:
+        brand_score += 1
+
+    # 企業名・ブランド名の表示（より厳しい基準）
+    title_text = (features.title_text or '').strip()
+    if title_text:
+        # タイトルの品質チェック
+        if 10 <= len(title_text) <= 60:  # 適切な長さ
+            brand_score += 1
+        if any(keyword in title_text.lower() for keyword in TITLE_COMPANY_KEYWORDS):
+            brand_score += 1
+
+    # 統一感のあるデザイン要素（より厳しい基準）
+    design_consistency_score = 0
+    # CSSクラスの体系的使用
+    if features.unique_class_count >= 10:
+        design_consistency_score += 1
+    # カラーパレットの一貫性（CSS変数の使用など）
+    if features.markup_has(*CSS_VARIABLE_KEYWORDS):
+        design_consistency_score += 1
+    # コンポーネント化の兆候
+    if features.class_tags(COMPONENT_CLASS_KEYWORDS) >= 3:
+        design_consistency_score += 1
+    brand_score += design_consistency_score
+
+    # ナビゲーションの一貫性（より厳しい基準、最大1点）
+    if features.count('nav') >= 1 or features.count('ul', 'ol') >= 2:
+        brand_score += 1
+
+    score += brand_score
+
+    # 4. 現代的なデザイン要素（6点）- 辛口評価
+    modern_score = 0
+
+    # レスポンシブデザイン（より厳しい基準）
+    responsive_score = sum([
+        features.viewport,
+        features.markup_has(*MEDIA_QUERY_KEYWORDS),
+        features.markup_has_ci(*RESPONSIVE_KEYWORDS),
+    ])
+    if responsive_score >= 3:
+        modern_score += 2
+    elif responsive_score >= 2:
+        modern_score += 1
+
+    # モダンなHTML5要素の使用（より厳しい基準）
+    html5_elements = features.count(*SEMANTIC_TAGS)
+    if html5_elements >= 4:
+        modern_score += 2
+    elif html5_elements >= 2:
+        modern_score += 1
+
+    # インタラクティブ要素（より厳しい基準）
+    interactive_elements = features.count('button', 'input', 'select', 'textarea')
+    advanced_interactive = features.onclick or features.class_has(*INTERACTIVE_CLASS_KEYWORDS)
+    if interactive_elements >= 3 and advanced_interactive:
+        modern_score += 1
+
+    # モバイル向けメニューの存在（UXから移動）
+    mobile_menu_indicators = sum([
+        features.markup_has_ci(*MOBILE_MENU_KEYWORDS[0]),
+        features.markup_has_ci(*MOBILE_MENU_KEYWORDS[1]),
+        features.class_tags(MOBILE_MENU_CLASS_KEYWORDS, require_all=True) > 0,
+    ])
+    if mobile_menu_indicators >= 2:  # より厳しい基準
+        modern_score += 1
+
+    score += modern_score
+
+    # 5. 実績・事例・コンテンツ充実度（UXから移動）（4点）- 辛口評価
+    content_richness_score = 0
+
+    # 実績・事例（より厳しい基準）
+    portfolio_indicators = sum(features.text_has(*keywords) for keywords in PORTFOLIO_KEYWORDS)
+    portfolio_indicators += features.class_has(*PORTFOLIO_CLASS_KEYWORDS)
+    if portfolio_indicators >= 2:  # 複数の指標で確認
+        content_richness_score += 1
+
+    # ニュース・ブログ（より厳しい基準）
+    if sum(features.text_has(*keywords) for keywords in NEWS_KEYWORDS) >= 2:
+        content_richness_score += 1
+
+    # サービス・製品紹介（より厳しい基準）
+    if sum(features.text_has(*keywords) for keywords in SERVICE_KEYWORDS) >= 2:
+        content_richness_score += 1
+
+    # 企業情報の充実度（全ての指標で確認）
+    if sum(features.text_has(*keywords) for keywords in COMPANY_INFO_KEYWORDS) >= 3:
+        content_richness_score += 1
+
+    score += content_richness_score
+
+    return min(score, 40)  # 最大40点
+
+
+def score_technical_quality(features):
+    """技術品質分析（30%）- 改善版"""
+    score = 0
+
+    # 1. セキュリティ・プロトコル（8点）
+    security_score = 0
+    # HTTPSの使用
+    if features.url.startswith('https://'):
+        security_score += 4
+    # セキュリティ関連のメタタグ
+    if features.security_meta:
+        security_score += 2
+    # プライバシーポリシーの存在
+    if features.text_has(*SECURITY_PRIVACY_KEYWORDS):
+        security_score += 2
+    score += security_score
+
+    # 2. SEO基礎対策（8点）
+    seo_score = 0
+    # タイトルタグ
+    title_text = (features.title_text or '').strip()
+    if title_text:
+        seo_score += 2
+        # タイトルの長さが適切
+        if 20 <= len(title_text) <= 60:
+            seo_score += 1
+
+    # メタディスクリプション
+    if features.description:
+        seo_score += 2
+        # ディスクリプションの長さが適切
+        if 80 <= len(features.description) <= 160:
+            seo_score += 1
+
+    # 見出しタグの適切な使用（H1は1つが理想）
+    if features.count('h1') == 1:
+        seo_score += 1
+
+    # 画像のalt属性（80%以上）
+    if features.images and features.images_with_alt >= features.images * 0.8:
+        seo_score += 1
+
+    score += seo_score
+
+    # 3. コード品質・構造（7点）
+    code_score = 0
+    # HTML5の基本構造
+    if features.count('html') and features.count('head') and features.count('body'):
+        code_score += 2
+    # セマンティックHTML5要素の使用
+    if features.count(*SEMANTIC_TAGS) >= 3:
+        code_score += 2
+    # 構造化データ
+    if features.ld_json_scripts:
+        code_score += 2
+    # CSSとJavaScriptの外部ファイル化
+    if features.stylesheets and features.scripts_with_src:
+        code_score += 1
+    score += code_score
+
+    # 4. パフォーマンス・最適化（4点）
+    performance_score = 0
+    # 画像の最適化（適切な数）
+    if 1 <= features.images <= 20:
+        performance_score += 1
+    # CSSファイルの数（多すぎない）
+    if 1 <= features.stylesheets <= 5:
+        performance_score += 1
+    # JavaScriptファイルの数（多すぎない）
+    if features.scripts_with_src <= 10:
+        performance_score += 1
+    # メタviewportの存在（モバイル最適化）
+    if features.viewport:
+        performance_score += 1
+    score += performance_score
+
+    # 5. アクセシビリティ（3点）
+    accessibility_score = 0
+    # 言語設定
+    if features.html_lang:
+        accessibility_score += 1
+    # フォームのラベル
+    if features.count('form') and features.count('label'):
+        accessibility_score += 1
+    # 見出し構造の論理性
+    if features.count(*HEADING_TAGS) >= 2:
+        accessibility_score += 1
+    score += accessibility_score
+
+    return min(score, 30)  # 最大30点
+
+
 class WebsiteAnalyzer:
     """ウェブサイト分析クラス"""
 
-    def __init__(self, timeout=30, use_selenium=True):
+    def __init__(self, timeout=30, use_selenium=True, http_cache=None):
         self.timeout = timeout
         self.page_load_timeout = min(timeout, 30)  # ページ読み込み専用タイムアウト
         self.implicit_wait = 10  # 要素待機タイムアウト
@@ -67,11 +509,27 @@ class WebsiteAnalyzer:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
 
-        # Seleniumドライバーの初期化（遅延初期化）
+        # 共有HTTPキャッシュ（メールアドレス抽出と同じページを再取得しない）
+        self.http_cache = http_cache or get_shared_cache()
+        if self.http_cache is not None and self.http_cache.offline and self.use_selenium:
+            logger.info("キャッシュのみモードのためSeleniumを使用しません")
+            self.use_selenium = False
+
+        # Seleniumドライバーの初期化（遅延初期化、JavaScriptによる描画が必要なページで初めて起動）
         self.driver = None
 
+        # 取得方法の集計（Seleniumへの切り替え率・推定短縮時間）
+        self.fetch_stats = {
+            'pages': 0,
+            'escalated': 0,
+            'reasons': {},
+            'requests_seconds': 0.0,
+            'selenium_seconds': 0.0,
+            'selenium_pages': 0,
+        }
+
         if self.use_selenium:
-            logger.info(f"Selenium機能が有効です（JavaScript対応）- タイムアウト: {self.timeout}秒")
+            logger.info(f"Selenium機能が有効です（JavaScriptによる描画が必要なページのみ）- タイムアウト: {self.timeout}秒")
         else:
             logger.info("BeautifulSoupのみで動作します（静的HTML解析）")
 
@@ -188,11 +646,19 @@ class WebsiteAnalyzer:
         """requestsで静的HTMLを取得"""
         try:
             logger.info(f"requestsでページを取得中: {url}")
-            response = self.session.get(url, timeout=self.timeout)
+            if self.http_cache is not None:
+                response = self.http_cache.get(
+                    url, lambda cache_url, conditional: self.session.get(cache_url, headers=conditional, timeout=self.timeout)
+                )
+            else:
+                response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
             logger.info(f"requestsでページ取得完了: {len(response.text)}文字")
             return response.text, response
 
+        except CacheMissError:
+            logger.warning(f"キャッシュにありません（キャッシュのみモード）: {url}")
+            return None, None
         except requests.exceptions.Timeout:
             logger.warning(f"requestsタイムアウト: {url}")
             return None, None
@@ -203,6 +669,56 @@ class WebsiteAnalyzer:
             logger.error(f"requests予期しないエラー: {url} - {e}")
             return None, None
 
+    def fetch_page(self, url):
+        """ページを取得（requests優先、JavaScriptによる描画が必要な兆候がある場合だけSeleniumで再取得）
+
+        Returns:
+            tuple: (BeautifulSoup, response, 取得方法, Seleniumに切り替えた理由)。取得できない場合の BeautifulSoup は None。
+            Seleniumで再取得した場合も response はrequestsでの応答（requestsで取得できなかった場合は None）
+        """
+        stats = self.fetch_stats
+        stats['pages'] += 1
+
+        started = time.time()
+        html_content, response = self.get_html_with_requests(url)
+        stats['requests_seconds'] += time.time() - started
+
+        soup = BeautifulSoup(html_content, 'html.parser') if html_content is not None else None
+        reason = detect_javascript_rendering(soup) if soup is not None else REASON_FETCH_FAILED
+        if reason is None or not self.use_selenium:
+            return soup, response, 'requests', None
+
+        logger.info(f"JavaScriptによる描画が必要なためSeleniumで再取得します: {url} (理由: {reason})")
+        stats['escalated'] += 1
+        stats['reasons'][reason] = stats['reasons'].get(reason, 0) + 1
+
+        started = time.time()
+        selenium_html = self.get_html_with_selenium(url)
+        if selenium_html is None:
+            # Seleniumでも取得できない場合は静的HTMLのまま分析
+            return soup, response, 'requests', reason
+        stats['selenium_seconds'] += time.time() - started
+        stats['selenium_pages'] += 1
+        # 最終URL・応答時間はrequestsでの取得結果を使う（requestsで取得できなかった場合は None）
+        return BeautifulSoup(selenium_html, 'html.parser'), response, 'selenium', reason
+
+    def get_fetch_stats(self):
+        """取得方法の集計
+
+        推定短縮時間は、Seleniumで取得しなかったページをすべてSeleniumで取得した場合
+        （従来のSelenium優先の動作）の推定時間から、requestsでの取得時間の合計を引いたもの。
+        Seleniumで取得したページがない場合は推定できないため None。
+        """
+        stats = dict(self.fetch_stats, reasons=dict(self.fetch_stats['reasons']))
+        pages = stats['pages']
+        stats['escalation_rate'] = stats['escalated'] / pages if pages else 0.0
+        if stats['selenium_pages']:
+            per_page = stats['selenium_seconds'] / stats['selenium_pages']
+            stats['estimated_seconds_saved'] = (pages - stats['selenium_pages']) * per_page - stats['requests_seconds']
+        else:
+            stats['estimated_seconds_saved'] = None
+        return stats
+
     def analyze_website(self, company_name, url):
         """ウェブサイトを分析してスコアを算出"""
         try:
@@ -211,26 +727,14 @@ class WebsiteAnalyzer:
             # URLの正規化（トップページに変換）
             normalized_url = self.normalize_url(url)
 
-            # HTMLを取得（Selenium優先、フォールバックでrequests）
-            html_content = None
-            response = None
-
-            # まずSeleniumで試行
-            if self.use_selenium:
-                html_content = self.get_html_with_selenium(normalized_url)
-
-            # Seleniumが失敗した場合、またはSeleniumが無効な場合はrequestsを使用
-            if html_content is None:
-                html_content, response = self.get_html_with_requests(normalized_url)
+            # HTMLを取得・解析（requests優先、必要な場合だけSelenium）
+            soup, response, analysis_method, escalation_reason = self.fetch_page(normalized_url)
 
-            if html_content is None:
+            if soup is None:
                 logger.error(f"HTMLの取得に失敗: {company_name} - {normalized_url}")
                 return self.create_error_result(company_name, normalized_url, 'html_fetch_error')
 
-            # HTMLを解析
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            # responseオブジェクトが無い場合（Seleniumの場合）は疑似的なresponseオブジェクトを作成
+            # responseオブジェクトが無い場合（requestsで取得できずSeleniumで取得した場合）は疑似的なresponseオブジェクトを作成
             if response is None:
                 class MockResponse:
                     def __init__(self, url):
@@ -242,10 +746,11 @@ class WebsiteAnalyzer:
                         self.elapsed = MockElapsed()
                 response = MockResponse(normalized_url)
 
-            # 各項目のスコアを計算
-            ux_score = self.analyze_user_experience(soup, response)
-            design_score = self.analyze_design_quality(soup)
-            technical_score = self.analyze_technical_quality(soup, response)
+            # 各項目のスコアを計算（特徴量は1回だけ抽出し、3項目で共有）
+            features = self.extract_features(soup, response)
+            ux_score = score_user_experience(features)
+            design_score = score_design_quality(features)
+            technical_score = score_technical_quality(features)
 
             # 総合スコアを計算（単純合計）- UX30点 + デザイン40点 + 技術30点 = 最大100点
             total_score = ux_score + design_score + technical_score
@@ -268,7 +773,8 @@ class WebsiteAnalyzer:
                 'total_score': round(total_score, 1),
                 'rank': rank,
                 'status': 'success',
-                'analysis_method': 'selenium' if self.use_selenium and html_content else 'requests'
+                'analysis_method': analysis_method,
+                'escalation_reason': escalation_reason or ''
             }
 
             logger.info(f"分析完了: {company_name} - 総合スコア: {total_score:.1f} (ランク: {rank}) - 方法: {result['analysis_method']}")
@@ -300,478 +806,21 @@ class WebsiteAnalyzer:
             'status': error_type
         }
 
+    def extract_features(self, soup, response):
+        """ページの特徴量を抽出（文書ツリーの走査・キーワードの検出は1ページにつき1回）"""
+        return PAGE_FEATURE_EXTRACTOR.extract(soup, response)
+
     def analyze_user_experience(self, soup, response):
-        """ユーザーエクスペリエンス分析（30%）- 改善版"""
-        score = 0
-        text_content = soup.get_text().lower()
-
-        # 1. ページ読み込み速度（7点）
-        if hasattr(response, 'elapsed'):
-            response_time = response.elapsed.total_seconds()
-            if response_time < 1:
-                score += 7
-            elif response_time < 2:
-                score += 6
-            elif response_time < 3:
-                score += 4
-            elif response_time < 5:
-                score += 3
-            else:
-                score += 1
-
-        # 2. ナビゲーション・メニュー構造（6点）
-        nav_score = 0
-        nav_elements = soup.find_all(['nav', 'header']) + soup.find_all(class_=lambda x: x and 'nav' in x.lower())
-        if nav_elements:
-            nav_score += 3
-        # メニュー項目の数をチェック
-        menu_items = soup.find_all(['a'])
-        if len([a for a in menu_items if a.get_text().strip()]) >= 5:
-            nav_score += 2
-        # パンくずリストの存在
-        if any(keyword in text_content for keyword in ['ホーム', 'home', '>', '»', 'breadcrumb']):
-            nav_score += 1
-        score += nav_score
-
-        # 3. コンテンツの見つけやすさ（5点）
-        content_score = 0
-        # 見出し構造の確認
-        headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        if len(headings) >= 3:
-            content_score += 2
-        # 検索機能の存在
-        search_elements = soup.find_all(['input'], type='search') + soup.find_all(class_=lambda x: x and 'search' in x.lower())
-        if search_elements or 'search' in text_content or '検索' in text_content:
-            content_score += 2
-        # サイトマップやカテゴリ分類
-        if any(keyword in text_content for keyword in ['サイトマップ', 'sitemap', 'カテゴリ', 'category']):
-            content_score += 1
-        score += content_score
-
-        # 4. お問い合わせ・連絡手段（5点）
-        contact_score = 0
-        contact_keywords = ['お問い合わせ', 'contact', '連絡', 'tel', '電話', 'phone', 'mail', 'メール', 'email']
-        if any(keyword in text_content for keyword in contact_keywords):
-            contact_score += 2
-        # 複数の連絡手段
-        contact_methods = sum([
-            'tel' in text_content or '電話' in text_content,
-            'mail' in text_content or 'メール' in text_content or '@' in text_content,
-            'form' in text_content or 'フォーム' in text_content,
-            'chat' in text_content or 'チャット' in text_content
-        ])
-        if contact_methods >= 2:
-            contact_score += 3
-        score += contact_score
-
-        # 5. 信頼性・透明性（4点）
-        trust_score = 0
-        # 会社情報の存在
-        company_keywords = ['会社概要', 'about', '企業情報', '会社案内', '運営者情報']
-        if any(keyword in text_content for keyword in company_keywords):
-            trust_score += 2
-        # プライバシーポリシー
-        if any(keyword in text_content for keyword in ['プライバシー', 'privacy', '個人情報']):
-            trust_score += 1
-        # 利用規約
-        if any(keyword in text_content for keyword in ['利用規約', 'terms', '規約']):
-            trust_score += 1
-        # 実績・事例は削除（デザイン性に移動）
-        score += trust_score
-
-        # 6. モバイル対応（3点）
-        mobile_score = 0
-        viewport_meta = soup.find('meta', attrs={'name': 'viewport'})
-        if viewport_meta:
-            mobile_score += 2
-        # レスポンシブデザインの兆候
-        css_links = soup.find_all('link', rel='stylesheet')
-        for link in css_links:
-            if link.get('media') and 'screen' in link.get('media'):
-                mobile_score += 1
-                break
-        # モバイル向けメニューの存在は削除（デザイン性に移動）
-        score += mobile_score
-
-        return min(score, 30)  # 最大30点
+        """ユーザーエクスペリエンス分析（30%）"""
+        return score_user_experience(self.extract_features(soup, response))
 
     def analyze_design_quality(self, soup):
-        """デザイン品質分析（40%）- 辛口評価版"""
-        score = 0
-        text_content = soup.get_text().lower()
-
-        # 1. ビジュアルデザイン・レイアウト（16点）- 辛口評価
-        visual_score = 0
-        # CSSの存在と品質（より厳しい基準）
-        css_links = soup.find_all('link', rel='stylesheet')
-        if css_links:
-            visual_score += 2  # 基本点を5→2に減点
-            # 複数のCSSファイル（デザインの複雑さを示唆）
-            if len(css_links) >= 3:  # 2→3に厳格化
-                visual_score += 2  # 3→2に減点
-            # 外部CSSフレームワークの使用（Bootstrap、Tailwindなど）
-            css_content = str(soup)
-            if any(framework in css_content.lower() for framework in ['bootstrap', 'tailwind', 'foundation', 'bulma']):
-                visual_score += 1
-
-        # レイアウト構造の確認（より厳しい基準）
-        layout_elements = soup.find_all(['header', 'main', 'footer', 'aside', 'section'])
-        if len(layout_elements) >= 4:  # 3→4に厳格化
-            visual_score += 3  # 4→3に減点
-        elif len(layout_elements) >= 2:
-            visual_score += 1  # 部分点を追加
-
-        # フォントの設定（より厳しい基準）
-        font_indicators = [
-            'font-family' in str(soup),
-            any(font in str(soup).lower() for font in ['google fonts', 'web font', 'typekit']),
-            any(font in str(soup).lower() for font in ['noto', 'roboto', 'open sans', 'lato', 'montserrat'])
-        ]
-        font_score = sum(font_indicators)
-        if font_score >= 2:
-            visual_score += 2  # 3→2に減点
-        elif font_score >= 1:
-            visual_score += 1
-
-        # カラースキーム（より厳しい基準）
-        color_indicators = [
-            'color:' in str(soup),
-            'background-color:' in str(soup),
-            '#' in str(soup) and len([x for x in str(soup).split('#') if len(x) >= 3]) >= 3,  # 複数の色指定
-            any(color in str(soup).lower() for color in ['rgb(', 'rgba(', 'hsl(', 'hsla('])
-        ]
-        if sum(color_indicators) >= 3:
-            visual_score += 2
-        elif sum(color_indicators) >= 1:
-            visual_score += 1
-
-        score += visual_score
-
-        # 2. 画像・メディアの品質（10点）- 辛口評価
-        media_score = 0
-        images = soup.find_all('img')
-        if len(images) > 0:
-            media_score += 1  # 基本点を4→1に大幅減点
-
-            # 画像の最適化（alt属性の存在）- より厳しい基準
-            images_with_alt = [img for img in images if img.get('alt') and img.get('alt').strip()]
-            alt_ratio = len(images_with_alt) / len(images) if len(images) > 0 else 0
-            if alt_ratio >= 0.9:  # 90%以上にalt属性（70%→90%に厳格化）
-                media_score += 3
-            elif alt_ratio >= 0.7:
-                media_score += 2  # 部分点を追加
-            elif alt_ratio >= 0.5:
-                media_score += 1
-
-            # 適切な画像数（より厳しい基準）
-            if 5 <= len(images) <= 12:  # 3-15→5-12に厳格化
-                media_score += 2
-            elif 3 <= len(images) <= 20:
-                media_score += 1  # 部分点を追加
-
-            # 画像の最適化指標（新規追加）
-            optimization_score = 0
-            # 画像のサイズ指定
-            images_with_size = [img for img in images if img.get('width') or img.get('height')]
-            if len(images_with_size) >= len(images) * 0.7:  # 0.5→0.7に厳格化
-                optimization_score += 1
-
-            # レスポンシブ画像（srcset属性）
-            images_with_srcset = [img for img in images if img.get('srcset')]
-            if len(images_with_srcset) >= len(images) * 0.3:  # 30%以上でsrcset
-                optimization_score += 1
-
-            # 画像の遅延読み込み
-            lazy_images = [img for img in images if img.get('loading') == 'lazy' or 'lazy' in str(img.get('class', ''))]
-            if len(lazy_images) >= len(images) * 0.3:  # 30%以上で遅延読み込み
-                optimization_score += 1
-
-            media_score += optimization_score
-
-        score += media_score
-
-        # 3. ブランディング・一貫性（8点）- 辛口評価
-        brand_score = 0
-
-        # ロゴの存在（より厳しい基準）
-        logo_indicators = [
-            len(soup.find_all(class_=lambda x: x and 'logo' in x.lower())) > 0,
-            len(soup.find_all('img', alt=lambda x: x and x and 'logo' in x.lower())) > 0,
-            len(soup.find_all('img', src=lambda x: x and 'logo' in x.lower())) > 0,
-            len(soup.find_all(id=lambda x: x and 'logo' in x.lower())) > 0
-        ]
-        logo_score = sum(logo_indicators)
-        if logo_score >= 2:  # 複数の指標でロゴを確認
-            brand_score += 2  # 3→2に減点
-        elif logo_score >= 1:
-            brand_score += 1
-
-        # 企業名・ブランド名の表示（より厳しい基準）
-        title = soup.find('title')
-        brand_name_score = 0
-        if title and title.get_text().strip():
-            title_text = title.get_text().strip()
-            # タイトルの品質チェック
-            if len(title_text) >= 10 and len(title_text) <= 60:  # 適切な長さ
-                brand_name_score += 1
-            if any(keyword in title_text.lower() for keyword in ['株式会社', '会社', 'company', 'corp', 'inc']):
-                brand_name_score += 1
-        brand_score += brand_name_score
-
-        # 統一感のあるデザイン要素（より厳しい基準）
-        design_consistency_score = 0
-        # CSSクラスの体系的使用
-        class_attrs = [elem.get('class', []) for elem in soup.find_all() if elem.get('class')]
-        unique_classes = set()
-        for classes in class_attrs:
-            if isinstance(classes, list):
-                unique_classes.update(classes)
-            else:
-                unique_classes.add(classes)
-
-        if len(unique_classes) >= 10:  # 十分なCSSクラス使用
-            design_consistency_score += 1
-
-        # カラーパレットの一貫性（CSS変数の使用など）
-        if any(indicator in str(soup) for indicator in ['--', 'var(', ':root']):
-            design_consistency_score += 1
-
-        # コンポーネント化の兆候
-        if len([elem for elem in soup.find_all() if elem.get('class') and
-               any(comp in str(elem.get('class')).lower() for comp in ['btn', 'button', 'card', 'modal', 'nav'])]) >= 3:
-            design_consistency_score += 1
-
-        brand_score += design_consistency_score
-
-        # ナビゲーションの一貫性（より厳しい基準）
-        nav_elements = soup.find_all(['nav'])  # navタグのみに限定
-        structured_nav = soup.find_all(['ul', 'ol'])
-        nav_quality_score = 0
-
-        if len(nav_elements) >= 1:
-            nav_quality_score += 1
-        # 構造化されたナビゲーション
-        if len(structured_nav) >= 2:
-            nav_quality_score += 1
-
-        brand_score += min(nav_quality_score, 1)  # 最大1点
-
-        score += brand_score
-
-        # 4. 現代的なデザイン要素（6点）- 辛口評価
-        modern_score = 0
-
-        # レスポンシブデザイン（より厳しい基準）
-        responsive_indicators = [
-            soup.find('meta', attrs={'name': 'viewport'}) is not None,
-            any(media in str(soup) for media in ['@media', 'media=']),
-            any(responsive in str(soup).lower() for responsive in ['responsive', 'mobile-first', 'breakpoint'])
-        ]
-        responsive_score = sum(responsive_indicators)
-        if responsive_score >= 3:
-            modern_score += 2  # 3→2に減点
-        elif responsive_score >= 2:
-            modern_score += 1
-
-        # モダンなHTML5要素の使用（より厳しい基準）
-        html5_elements = soup.find_all(['article', 'section', 'aside', 'nav', 'header', 'footer', 'main'])
-        semantic_score = 0
-        if len(html5_elements) >= 4:  # 2→4に厳格化
-            semantic_score += 2  # 2→2維持
-        elif len(html5_elements) >= 2:
-            semantic_score += 1
-        modern_score += semantic_score
-
-        # インタラクティブ要素（より厳しい基準）
-        interactive_elements = soup.find_all(['button', 'input', 'select', 'textarea'])
-        advanced_interactive = soup.find_all(attrs={'onclick': True}) + \
-                              soup.find_all(class_=lambda x: x and any(js in str(x).lower() for js in ['js-', 'interactive', 'toggle', 'dropdown']))
-
-        interactive_score = 0
-        if len(interactive_elements) >= 3 and len(advanced_interactive) >= 1:  # より高い基準
-            interactive_score += 1
-        modern_score += interactive_score
-
-        # モバイル向けメニューの存在（UXから移動）
-        mobile_menu_indicators = [
-            any(keyword in str(soup).lower() for keyword in ['mobile-menu', 'hamburger', 'toggle-menu']),
-            any(keyword in str(soup).lower() for keyword in ['menu-toggle', 'nav-toggle', 'burger']),
-            len(soup.find_all(class_=lambda x: x and 'menu' in str(x).lower() and 'mobile' in str(x).lower())) > 0
-        ]
-        if sum(mobile_menu_indicators) >= 2:  # より厳しい基準
-            modern_score += 1
-
-        score += modern_score
-
-        # 5. 実績・事例・コンテンツ充実度（UXから移動）（4点）- 辛口評価
-        content_richness_score = 0
-
-        # 実績・事例（より厳しい基準）
-        portfolio_indicators = [
-            any(keyword in text_content for keyword in ['実績', '事例', 'case study', '導入事例']),
-            any(keyword in text_content for keyword in ['portfolio', 'works', '制作実績', 'project']),
-            len(soup.find_all(class_=lambda x: x and any(p in str(x).lower() for p in ['portfolio', 'case', 'work']))) > 0
-        ]
-        if sum(portfolio_indicators) >= 2:  # 複数の指標で確認
-            content_richness_score += 1  # 2→1に減点
-
-        # ニュース・ブログ（より厳しい基準）
-        news_indicators = [
-            any(keyword in text_content for keyword in ['ニュース', 'news', 'お知らせ']),
-            any(keyword in text_content for keyword in ['ブログ', 'blog', '記事']),
-            any(keyword in text_content for keyword in ['更新', 'update', '最新'])
-        ]
-        if sum(news_indicators) >= 2:  # より厳しい基準
-            content_richness_score += 1
-
-        # サービス・製品紹介（より厳しい基準）
-        service_indicators = [
-            any(keyword in text_content for keyword in ['サービス', 'service', 'ソリューション']),
-            any(keyword in text_content for keyword in ['製品', 'product', 'プロダクト']),
-            any(keyword in text_content for keyword in ['事業内容', 'business', '業務内容'])
-        ]
-        if sum(service_indicators) >= 2:  # より厳しい基準
-            content_richness_score += 1
-
-        # 企業情報の充実度（新規追加）
-        company_info_indicators = [
-            any(keyword in text_content for keyword in ['会社概要', 'about us', '企業情報']),
-            any(keyword in text_content for keyword in ['代表', 'ceo', '社長', '代表取締役']),
-            any(keyword in text_content for keyword in ['沿革', 'history', '設立'])
-        ]
-        if sum(company_info_indicators) >= 3:  # 全ての指標で確認
-            content_richness_score += 1
-
-        score += content_richness_score
-
-        return min(score, 40)  # 最大40点
+        """デザイン品質分析（40%）"""
+        return score_design_quality(self.extract_features(soup, None))
 
     def analyze_technical_quality(self, soup, response):
-        """技術品質分析（30%）- 改善版"""
-        score = 0
-        text_content = soup.get_text().lower()
-
-        # 1. セキュリティ・プロトコル（8点）
-        security_score = 0
-        # HTTPSの使用
-        if response.url.startswith('https://'):
-            security_score += 4
-
-        # セキュリティ関連のメタタグ
-        security_headers = soup.find_all('meta', attrs={'http-equiv': lambda x: x and 'security' in x.lower()})
-        if security_headers:
-            security_score += 2
-
-        # プライバシーポリシーの存在
-        if any(keyword in text_content for keyword in ['プライバシー', 'privacy', '個人情報保護']):
-            security_score += 2
-
-        score += security_score
-
-        # 2. SEO基礎対策（8点）
-        seo_score = 0
-        # タイトルタグ
-        title = soup.find('title')
-        if title and title.get_text().strip():
-            title_text = title.get_text().strip()
-            seo_score += 2
-            # タイトルの長さが適切
-            if 20 <= len(title_text) <= 60:
-                seo_score += 1
-
-        # メタディスクリプション
-        description = soup.find('meta', attrs={'name': 'description'})
-        if description and description.get('content'):
-            desc_content = description.get('content')
-            seo_score += 2
-            # ディスクリプションの長さが適切
-            if 80 <= len(desc_content) <= 160:
-                seo_score += 1
-
-        # 見出しタグの適切な使用
-        h1_tags = soup.find_all('h1')
-        if len(h1_tags) == 1:  # H1は1つが理想
-            seo_score += 1
-
-        # 画像のalt属性
-        images = soup.find_all('img')
-        if images:
-            images_with_alt = [img for img in images if img.get('alt')]
-            if len(images_with_alt) >= len(images) * 0.8:  # 80%以上
-                seo_score += 1
-
-        score += seo_score
-
-        # 3. コード品質・構造（7点）
-        code_score = 0
-        # HTML5の基本構造
-        if soup.find('html') and soup.find('head') and soup.find('body'):
-            code_score += 2
-
-        # セマンティックHTML5要素の使用
-        semantic_elements = soup.find_all(['header', 'nav', 'main', 'article', 'section', 'aside', 'footer'])
-        if len(semantic_elements) >= 3:
-            code_score += 2
-
-        # 構造化データ
-        structured_data = soup.find_all(['script'], type='application/ld+json')
-        if structured_data:
-            code_score += 2
-
-        # CSSとJavaScriptの外部ファイル化
-        external_css = soup.find_all('link', rel='stylesheet')
-        external_js = soup.find_all('script', src=True)
-        if external_css and external_js:
-            code_score += 1
-
-        score += code_score
-
-        # 4. パフォーマンス・最適化（4点）
-        performance_score = 0
-        # 画像の最適化（適切な数）
-        images = soup.find_all('img')
-        if 1 <= len(images) <= 20:  # 適切な画像数
-            performance_score += 1
-
-        # CSSファイルの数（多すぎない）
-        css_files = soup.find_all('link', rel='stylesheet')
-        if 1 <= len(css_files) <= 5:
-            performance_score += 1
-
-        # JavaScriptファイルの数（多すぎない）
-        js_files = soup.find_all('script', src=True)
-        if len(js_files) <= 10:
-            performance_score += 1
-
-        # メタviewportの存在（モバイル最適化）
-        viewport_meta = soup.find('meta', attrs={'name': 'viewport'})
-        if viewport_meta:
-            performance_score += 1
-
-        score += performance_score
-
-        # 5. アクセシビリティ（3点）
-        accessibility_score = 0
-        # 言語設定
-        html_tag = soup.find('html')
-        if html_tag and html_tag.get('lang'):
-            accessibility_score += 1
-
-        # フォームのラベル
-        forms = soup.find_all('form')
-        if forms:
-            labels = soup.find_all('label')
-            if labels:
-                accessibility_score += 1
-
-        # 見出し構造の論理性
-        headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        if len(headings) >= 2:
-            accessibility_score += 1
-
-        score += accessibility_score
-
-        return min(score, 30)  # 最大30点
+        """技術品質分析（30%）"""
+        return score_technical_quality(self.extract_features(soup, response))
 
 def load_companies_from_csv(start_id=None, end_id=None):
     """CSVファイルから企業データを読み込む"""
@@ -855,9 +904,13 @@ def main():
     parser.add_argument('--test', action='store_true', help='テストモード（最初の5社のみ処理）')
     parser.add_argument('--no-selenium', action='store_true', help='Seleniumを無効にする（BeautifulSoupのみ）')
     parser.add_argument('--timeout', type=int, default=30, help='タイムアウト時間（秒）デフォルト: 30秒')
+    add_cache_arguments(parser)
 
     args = parser.parse_args()
 
+    # HTTPキャッシュの設定（--cache-only ではネットワークに接続しない）
+    apply_cache_arguments(args)
+
     # テストモードの場合
     if args.test:
         args.start_id = 1
@@ -880,18 +933,29 @@ def main():
 
     # ウェブサイト分析を実行（タイムアウト設定を適用）
     analyzer = WebsiteAnalyzer(timeout=args.timeout, use_selenium=not args.no_selenium)
-    results = []
+    results = {}
+
+    # 同じドメインの同じ企業はトップページを1回だけ分析し、結果を各企業に展開
+    plan = plan_by_domain(companies, get_url=lambda company: company['url'], get_name=lambda company: company['name'])
+    units = [(group.representative, group.members) for group in plan.groups]
+    units += [(company, [company]) for company in plan.unplanned]
 
     try:
-        for i, company in enumerate(companies, 1):
-            logger.info(f"進捗: {i}/{len(companies)} - 企業ID {company['id']}: {company['name']}")
+        for i, (company, members) in enumerate(units, 1):
+            logger.info(f"進捗: {i}/{len(units)} - 企業ID {company['id']}: {company['name']}"
+                        + (f"（同じドメインの {len(members)}社に適用）" if len(members) > 1 else ""))
 
             analysis_result = analyzer.analyze_website(company['name'], company['url'])
-            analysis_result['id'] = company['id']
-            results.append(analysis_result)
-
-            # サーバーに負荷をかけないよう少し待機
-            if i < len(companies):
+            for member in members:
+                member_result = dict(analysis_result)
+                member_result['id'] = member['id']
+                if member is not company:
+                    member_result['company_name'] = member['name']
+                    member_result['original_url'] = member['url']
+                results[member['id']] = member_result
+
+            # サーバーに負荷をかけないよう少し待機（キャッシュのみモードでは不要）
+            if i < len(units) and not args.cache_only:
                 wait_time = random.uniform(1, 3)
                 time.sleep(wait_time)
 
@@ -908,6 +972,9 @@ def main():
             except Exception as e:
                 logger.warning(f"Seleniumドライバーのクリーンアップエラー: {e}")
 
+    # 結果を入力順に並べる（中断した場合は分析済みの企業のみ）
+    results = [results[company['id']] for company in companies if company['id'] in results]
+
     # 結果を保存
     if results:
         output_file = save_results_to_csv(results, actual_start_id, actual_end_id)
@@ -923,12 +990,24 @@ def main():
                 method_counts[method] += 1
 
             logger.info(f"処理完了:")
-            logger.info(f"  - 処理企業数: {len(results)}社")
+            logger.info(f"  - 処理企業数: {len(results)}社（分析したドメイン: {len(units)}件）")
             logger.info(f"  - Aランク: {rank_counts['A']}社")
             logger.info(f"  - Bランク: {rank_counts['B']}社")
             logger.info(f"  - Cランク: {rank_counts['C']}社")
             logger.info(f"  - Selenium使用: {method_counts['selenium']}社")
             logger.info(f"  - requests使用: {method_counts['requests']}社")
+            fetch_stats = analyzer.get_fetch_stats()
+            reasons = ', '.join(f"{reason} {count}件" for reason, count in fetch_stats['reasons'].items()) or 'なし'
+            logger.info(f"  - Seleniumへの切り替え: {fetch_stats['escalated']}/{fetch_stats['pages']}ページ "
+                        f"({fetch_stats['escalation_rate'] * 100:.1f}%, 理由: {reasons})")
+            if fetch_stats['estimated_seconds_saved'] is not None:
+                logger.info(f"  - 推定短縮時間: {fetch_stats['estimated_seconds_saved']:.1f}秒"
+                            f"（Selenium 1ページあたり {fetch_stats['selenium_seconds'] / fetch_stats['selenium_pages']:.1f}秒, "
+                            f"requests合計 {fetch_stats['requests_seconds']:.1f}秒）")
+            if analyzer.http_cache is not None:
+                cache_stats = analyzer.http_cache.get_stats()
+                logger.info(f"  - HTTPキャッシュ: ヒット {cache_stats['hits']}件, 再検証(304) {cache_stats['revalidated']}件, "
+                            f"取得 {cache_stats['misses']}件 (ヒット率 {cache_stats['hit_rate'] * 100:.1f}%)")
             logger.info(f"  - 出力ファイル: {output_file}")
         else:
             logger.error("結果の保存に失敗しました")
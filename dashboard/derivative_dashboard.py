@@ -8,11 +8,13 @@ HUGANJOB営業メール送信システム専用ダッシュボード
 - 送信状況追跡と結果分析
 """
 
+import time  # キャッシュ用・起動時間計測用
+STARTUP_BEGIN = time.perf_counter()
+
 import os
 import json
 import logging
 import datetime
-import time  # キャッシュ用
 import sys
 import csv
 import uuid
@@ -21,18 +23,36 @@ import subprocess
 import threading
 import gc  # ガベージコレクション用
 import json  # HUGANJOB送信履歴読み込み用
-import pandas as pd
+# pandasは起動高速化のため使用する関数内で遅延インポートする
 import csv  # CSV操作用
 import re   # 正規表現用
 import tempfile  # 一時ファイル用
 import shutil    # ファイル操作用
+import hashlib   # ETag生成用
+import functools
 from werkzeug.utils import secure_filename  # ファイル名セキュリティ用
-from flask import Flask, render_template, request, jsonify, abort, Response, redirect
+from flask import Flask, render_template, request, jsonify, abort, Response, redirect, stream_with_context
+
+# ダッシュボード補助モジュール（dashboard/）をインポート可能にする
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from derivative_process_supervisor import ProcessOutputSupervisor
+from derivative_state_store import DashboardStateStore, file_lock
+from derivative_streaming_export import (
+    iter_csv_rows, read_csv_header, filter_rows, parse_date,
+    stream_csv, stream_ndjson, gzip_stream, accepts_gzip
+)
+
+# 共通モジュール（core_scripts/）をインポート可能にする
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core_scripts'))
+from derivative_csv_reader import CsvInputReader
+
+# 🆕 起動プロファイル用の計測点（--profile-startup で表示）
+STARTUP_TIMINGS = {'imports_done': time.perf_counter()}
 
-# HUGANJOB専用ロギング設定
+# HUGANJOB専用ロギング設定（DEBUGは --debug 指定時のみ。起動・応答の高速化のため）
 os.makedirs("logs/huganjob_dashboard", exist_ok=True)
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
         logging.FileHandler("logs/huganjob_dashboard/huganjob_dashboard.log", encoding='utf-8'),
@@ -57,6 +77,7 @@ SENT_EMAILS_FILE = 'data/huganjob_sent_emails_record.csv'
 PROCESS_HISTORY_FILE = 'data/huganjob_consolidated/process_history.json'
 CONSOLIDATED_DIR = 'data/huganjob_consolidated'
 DASHBOARD_CONFIG_FILE = 'config/huganjob_dashboard_config.json'
+STATE_DB_FILE = 'data/huganjob_consolidated/dashboard_state.sqlite3'
 
 # 派生版専用ファイル命名規則
 DERIVATIVE_EMAIL_SENDING_RESULTS = 'data/derivative_email_sending_results.csv'
@@ -86,9 +107,12 @@ LOG_FILES = {
     'dashboard': 'new_dashboard.log'
 }
 
-# 実行中のプロセス
+# 実行中のプロセス（このワーカーが起動したプロセスのみ。Popenを保持）
 running_processes = {}
 
+# 🆕 ワーカー間共有状態ストア（プロセスレジストリ・共有キャッシュ・開封重複排除）
+state_store = DashboardStateStore(STATE_DB_FILE)
+
 # 過去のプロセス履歴
 process_history = []
 process_history_max_size = 100
@@ -133,12 +157,23 @@ def sync_process_states():
         return
 
     try:
+        # 🆕 終了したワーカーが残した共有レジストリのエントリを削除
+        try:
+            pruned = state_store.prune_orphan_processes(is_pid_alive)
+            if pruned:
+                logger.info(f"共有プロセスレジストリから孤立エントリを削除: {pruned}件")
+        except Exception as e:
+            logger.warning(f"共有プロセスレジストリ整理エラー: {e}")
+
         import psutil
 
         # 実行中プロセスの状態をチェック
         processes_to_remove = []
 
-        for process_id, process_info in running_processes.items():
+        for process_id, process_info in list(running_processes.items()):
+            # 出力スーパーバイザーが監視中のプロセスは終了時に自動で完了処理される
+            if process_supervisor.is_watching(process_id):
+                continue
             try:
                 process = process_info.get('process')
                 if process:
@@ -165,7 +200,7 @@ def sync_process_states():
         for process_id in processes_to_remove:
             if process_id in running_processes:
                 logger.info(f"同期処理: 終了済みプロセス {process_id} を削除")
-                del running_processes[process_id]
+                unregister_running_process(process_id)
 
         last_process_sync_time = current_time
 
@@ -185,7 +220,10 @@ def fix_unmonitored_processes():
     try:
         processes_to_monitor = []
 
-        for process_id, process_info in running_processes.items():
+        for process_id, process_info in list(running_processes.items()):
+            # 出力スーパーバイザーが監視中のプロセスは終了時に自動で完了処理される
+            if process_supervisor.is_watching(process_id):
+                continue
             process = process_info.get('process')
             if process:
                 # プロセスが実際に終了しているかチェック
@@ -226,7 +264,7 @@ def fix_unmonitored_processes():
         for process_id in processes_to_monitor:
             if process_id in running_processes:
                 logger.info(f"未監視プロセス修正: 終了済みプロセス {process_id} を削除")
-                del running_processes[process_id]
+                unregister_running_process(process_id)
 
         if processes_to_monitor:
             logger.info(f"未監視プロセス修正完了: {len(processes_to_monitor)}件のプロセスを更新")
@@ -268,11 +306,11 @@ def add_process_to_history(process_info):
         if 'end_time' in history_entry and isinstance(history_entry['end_time'], datetime.datetime):
             history_entry['end_time'] = history_entry['end_time'].strftime('%Y-%m-%d %H:%M:%S')
 
-        # 履歴に追加
-        process_history.append(history_entry)
-
-        # 履歴を保存
-        save_process_history()
+        # 他ワーカーの追加分を失わないよう、排他ロック下で最新の履歴に追記して保存
+        with state_store.lock():
+            load_process_history()
+            process_history.append(history_entry)
+            save_process_history()
 
         return True
     except Exception as e:
@@ -281,6 +319,52 @@ def add_process_to_history(process_info):
         logger.error(traceback.format_exc())
         return False
 
+def is_pid_alive(pid):
+    """指定PIDのプロセスが生存しているか確認"""
+    if pid == os.getpid():
+        return True
+    try:
+        import psutil
+        return psutil.pid_exists(pid)
+    except ImportError:
+        pass
+    if os.name == 'nt':
+        # Windowsのos.killは対象を終了させてしまうため、確認できない場合は生存扱い
+        return True
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+def register_running_process(process_id, process_info):
+    """🆕 実行中プロセスを登録（ローカル＋ワーカー間共有レジストリ）"""
+    running_processes[process_id] = process_info
+    try:
+        state_store.upsert_process(process_id, process_info)
+    except Exception as e:
+        logger.warning(f"共有プロセスレジストリへの登録エラー: {e}")
+
+def unregister_running_process(process_id):
+    """🆕 実行中プロセスの登録を解除（ローカル＋ワーカー間共有レジストリ）"""
+    running_processes.pop(process_id, None)
+    try:
+        state_store.remove_process(process_id)
+    except Exception as e:
+        logger.warning(f"共有プロセスレジストリからの削除エラー: {e}")
+
+def get_all_running_processes():
+    """🆕 全ワーカーの実行中プロセスを取得（自ワーカー分はローカル情報を優先）"""
+    processes = {}
+    try:
+        processes.update(state_store.list_processes())
+    except Exception as e:
+        logger.warning(f"共有プロセスレジストリ読み込みエラー: {e}")
+    processes.update(list(running_processes.items()))
+    return processes
+
 # 企業データキャッシュ
 company_data_cache = None
 company_data_last_updated = None
@@ -498,7 +582,7 @@ def index():
         # 実行中のプロセス情報を取得（最大5件まで）
         active_processes = []
         process_count = 0
-        for pid, info in running_processes.items():
+        for pid, info in get_all_running_processes().items():
             if info['status'] == 'running' and process_count < 5:
                 active_processes.append({
                     'id': pid,
@@ -549,6 +633,17 @@ def get_basic_stats_lightweight():
         (datetime.datetime.now() - stats_last_updated).seconds < STATS_CACHE_TIMEOUT_SECONDS):
         return stats_cache
 
+    # 🆕 他ワーカーが計算済みの統計を共有キャッシュから取得
+    try:
+        shared_stats = state_store.cache_get('basic_stats_lightweight', STATS_CACHE_TIMEOUT_SECONDS)
+    except Exception as e:
+        logger.debug(f"共有キャッシュ読み込みエラー: {e}")
+        shared_stats = None
+    if shared_stats is not None:
+        stats_cache = shared_stats
+        stats_last_updated = datetime.datetime.now()
+        return shared_stats
+
     try:
         # 軽量版統計（ファイル存在チェックのみ）
         stats = {
@@ -590,6 +685,10 @@ def get_basic_stats_lightweight():
         # キャッシュ更新
         stats_cache = stats
         stats_last_updated = datetime.datetime.now()
+        try:
+            state_store.cache_set('basic_stats_lightweight', stats)
+        except Exception as e:
+            logger.debug(f"共有キャッシュ書き込みエラー: {e}")
 
         return stats
 
@@ -844,11 +943,12 @@ def clear_cache():
 stats_cache = None
 stats_last_updated = None
 
-def clear_all_caches():
-    """全てのキャッシュをクリア"""
+def reset_local_caches():
+    """このワーカーのローカルキャッシュを破棄"""
     global company_data_cache, company_data_last_updated, stats_cache, stats_last_updated
     global company_stats_cache, company_stats_last_updated, work_logs_cache, work_logs_last_updated
     global filtered_companies_cache, filtered_companies_last_updated
+    global daily_stats_cache, daily_stats_last_updated, open_rate_cache, open_rate_last_updated
 
     company_data_cache = None
     company_data_last_updated = None
@@ -860,12 +960,135 @@ def clear_all_caches():
     work_logs_last_updated = None
     filtered_companies_cache.clear()
     filtered_companies_last_updated.clear()
+    daily_stats_cache = None
+    daily_stats_last_updated = None
+    open_rate_cache = None
+    open_rate_last_updated = None
+
+def clear_all_caches():
+    """全てのキャッシュをクリア（全ワーカーに無効化を通知）"""
+    reset_local_caches()
+    publish_cache_invalidation()
 
     # ガベージコレクション実行
     gc.collect()
 
     logger.info("全てのキャッシュをクリアし、ガベージコレクションを実行しました")
 
+# 🆕 ワーカー間キャッシュ整合用の世代番号
+CACHE_GENERATION_NAME = 'dashboard_cache'
+local_cache_generation = None
+# 世代番号を確認する間隔（秒）。シングルワーカーで起動した場合は確認しない（自ワーカーの無効化は即時反映される）
+CACHE_GENERATION_CHECK_INTERVAL_SECONDS = 1.0
+cache_generation_checked_at = 0.0
+cache_generation_sync_enabled = True
+
+def publish_cache_invalidation():
+    """共有キャッシュを破棄し、世代番号を進めて他ワーカーのローカルキャッシュを無効化"""
+    global local_cache_generation
+    try:
+        state_store.cache_clear()
+        local_cache_generation = state_store.bump_generation(CACHE_GENERATION_NAME)
+    except Exception as e:
+        logger.warning(f"キャッシュ無効化通知エラー: {e}")
+
+@app.before_request
+def sync_cache_generation():
+    """他ワーカーがキャッシュを無効化していればローカルキャッシュを破棄（確認は一定間隔ごと）"""
+    global local_cache_generation, cache_generation_checked_at
+    if not cache_generation_sync_enabled:
+        return
+    now = time.monotonic()
+    if now - cache_generation_checked_at < CACHE_GENERATION_CHECK_INTERVAL_SECONDS:
+        return
+    cache_generation_checked_at = now
+    try:
+        generation = state_store.get_generation(CACHE_GENERATION_NAME)
+    except Exception as e:
+        logger.debug(f"キャッシュ世代番号の取得エラー: {e}")
+        return
+
+    if local_cache_generation is None:
+        local_cache_generation = generation
+    elif generation != local_cache_generation:
+        reset_local_caches()
+        local_cache_generation = generation
+
+# 🆕 条件付きGET（ETag/Last-Modified）対応
+# JSON APIの元データとなるファイル。更新時刻とサイズからデータバージョンを算出する
+CONDITIONAL_GET_DATA_FILES = [
+    INPUT_FILE,
+    HUGANJOB_EMAIL_SENDING_RESULTS,
+    'huganjob_email_resolution_results.csv',
+    'huganjob_sending_history.json',
+    'comprehensive_bounce_tracking_results.csv',
+    'data/huganjob_unsubscribe_log.csv',
+    'new_email_extraction_results_latest.csv',
+    'new_website_analysis_results_latest.csv',
+    f"{CONSOLIDATED_DIR}/new_email_extraction_results_consolidated.csv",
+    f"{CONSOLIDATED_DIR}/new_website_analysis_results_consolidated.csv",
+    f"{CONSOLIDATED_DIR}/new_sent_emails_record_consolidated.csv",
+    SENT_EMAILS_FILE,
+    PROGRESS_FILE,
+    DERIVATIVE_EMAIL_SENDING_RESULTS,
+    DERIVATIVE_BOUNCE_TRACKING,
+    DERIVATIVE_UNSUBSCRIBE_TRACKING,
+    DERIVATIVE_EMAIL_OPEN_TRACKING,
+]
+# glob で探索されるレポート類の追加・削除はディレクトリの更新時刻で検知する
+CONDITIONAL_GET_DATA_DIRS = ['.', 'data', CONSOLIDATED_DIR]
+
+def get_data_version():
+    """元データのバージョン（ETag用ハッシュ, 最終更新時刻）を取得"""
+    digest = hashlib.sha1()
+    last_modified = 0.0
+    for path in CONDITIONAL_GET_DATA_FILES + CONDITIONAL_GET_DATA_DIRS:
+        try:
+            st = os.stat(path)
+        except OSError:
+            digest.update(f"{path}:-;".encode('utf-8'))
+            continue
+        digest.update(f"{path}:{st.st_mtime_ns}:{st.st_size};".encode('utf-8'))
+        last_modified = max(last_modified, st.st_mtime)
+
+    # ダッシュボード経由の更新（キャッシュ無効化）と日付（「過去30日」等の既定期間）も反映
+    try:
+        generation = state_store.get_generation(CACHE_GENERATION_NAME)
+    except Exception:
+        generation = local_cache_generation
+    digest.update(f"gen:{generation};date:{datetime.date.today().isoformat()}".encode('utf-8'))
+    return digest.hexdigest()[:32], last_modified
+
+def conditional_json_response(view):
+    """データが更新されていなければ304を返すデコレーター（集計・シリアライズを省略）"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        version, last_modified = get_data_version()
+        etag = hashlib.sha1(f"{version}:{request.full_path}".encode('utf-8')).hexdigest()[:32]
+        last_modified_dt = (datetime.datetime.fromtimestamp(int(last_modified), datetime.timezone.utc)
+                            if last_modified else None)
+
+        not_modified = False
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains(etag)
+        elif request.if_modified_since and last_modified_dt:
+            not_modified = last_modified_dt <= request.if_modified_since
+
+        if not_modified:
+            response = Response(status=304)
+        else:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag)
+        if last_modified_dt:
+            response.last_modified = last_modified_dt
+        # キャッシュは保持しつつ毎回再検証させる
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return wrapper
+
 def optimize_memory():
     """メモリ使用量を最適化"""
     try:
@@ -898,6 +1121,7 @@ def optimize_memory():
 
 def load_csv_optimized(file_path, max_rows=None, columns=None):
     """最適化されたCSV読み込み"""
+    import pandas as pd  # 遅延インポート（起動高速化）
     try:
         start_time = datetime.datetime.now()
 
@@ -1000,6 +1224,7 @@ def load_company_data_lazy():
 
 def load_company_data():
     """企業データを読み込む（標準データと広告営業データの両方）"""
+    import pandas as pd  # 遅延インポート（起動高速化）
     global company_data_cache, company_data_last_updated
 
     logger.info("企業データの読み込みを開始します")
@@ -1443,6 +1668,7 @@ def get_min_company_id_from_file(file_path):
 
 def integrate_email_extraction_results_light(companies):
     """メール抽出結果を企業データに統合（軽量版）"""
+    import pandas as pd  # 遅延インポート（起動高速化）
     try:
         # HUGANJOB専用の抽出結果のみ処理
         huganjob_results_file = 'huganjob_email_resolution_results.csv'
@@ -1626,6 +1852,7 @@ def get_total_companies_count():
 
 def load_company_data_paginated(page, per_page, filter_type='all', search_query=''):
     """ページネーション対応の企業データ読み込み（軽量版）"""
+    import pandas as pd  # 遅延インポート（起動高速化）
     try:
         companies = []
 
@@ -2457,6 +2684,7 @@ def generate_email_content(companies):
     return companies
 
 @app.route('/api/companies')
+@conditional_json_response
 def api_companies():
     """企業データAPI"""
     try:
@@ -2476,6 +2704,7 @@ def api_companies():
         }), 500
 
 @app.route('/api/stats')
+@conditional_json_response
 def api_stats():
     """統計情報API - 軽量版対応"""
     try:
@@ -2574,6 +2803,7 @@ def api_refresh():
         stats_last_updated = None
         filtered_companies_cache = {}
         filtered_companies_last_updated = {}
+        publish_cache_invalidation()
 
         logger.info("全てのデータキャッシュをクリアしました")
 
@@ -2596,10 +2826,11 @@ def api_refresh():
 
 
 
-def analyze_huganjob_progress(process_info):
+def analyze_huganjob_progress(process_info, output=None):
     """HUGANJOB統合送信の進行状況を解析"""
     try:
-        output = process_info.get('output', '')
+        if output is None:
+            output = process_info.get('output', '')
         command = process_info.get('command', '')
 
         # HUGANJOB統合送信プロセスかどうか確認
@@ -2688,7 +2919,8 @@ def analyze_huganjob_progress(process_info):
 @app.route('/api/process_status/<process_id>')
 def get_process_status(process_id):
     """プロセスの状態を取得（進行状況表示強化）"""
-    if process_id not in running_processes:
+    all_processes = get_all_running_processes()
+    if process_id not in all_processes:
         # 履歴から検索
         for history_process in process_history:
             if history_process.get('id') == process_id:
@@ -2702,13 +2934,13 @@ def get_process_status(process_id):
 
         return jsonify({'success': False, 'message': 'プロセスが見つかりません'})
 
-    process_info = running_processes[process_id]
+    process_info = all_processes[process_id]
 
     # 出力を取得
-    output = process_info.get('output', '')
+    output = get_process_output_text(process_id, process_info)
 
     # 🆕 HUGANJOB統合送信の進行状況を解析
-    progress_info = analyze_huganjob_progress(process_info)
+    progress_info = analyze_huganjob_progress(process_info, output)
 
     # 状態を返す
     return jsonify({
@@ -2877,15 +3109,12 @@ def run_process(command, args=None):
 
         # プロセスを開始（リアルタイム出力対応）
         try:
+            # 出力はスーパーバイザーがバイナリのまま非ブロッキングで読み取り、UTF-8でデコードする
             process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,  # テキストモードで実行
-                encoding='utf-8',
-                errors='replace',
-                bufsize=1,  # 行バッファリング
-                universal_newlines=True,
+                bufsize=0,  # バッファリング無効化（セレクタ監視のため）
                 cwd=os.getcwd(),
                 env=env
             )
@@ -2905,7 +3134,7 @@ def run_process(command, args=None):
                 args_str = args
 
         # プロセス情報を記録
-        running_processes[process_id] = {
+        register_running_process(process_id, {
             'process': process,
             'command': command,
             'args': args,
@@ -2914,14 +3143,10 @@ def run_process(command, args=None):
             'status': 'running',
             'description': get_process_description(command, args),
             'output': ''
-        }
-
-        # 🆕 監視スレッドを開始（重要な修正）
-        monitor_thread = threading.Thread(target=monitor_process, args=(process_id,))
-        monitor_thread.daemon = True
-        monitor_thread.start()
+        })
 
-        logger.info(f"プロセス {process_id} の監視スレッドを開始しました")
+        # 🆕 出力スーパーバイザーに監視を登録（スレッドは生成しない）
+        monitor_process(process_id)
 
         return process_id
     except Exception as e:
@@ -2998,65 +3223,61 @@ def get_process_description(command, args):
     return description
 
 def monitor_process(process_id):
-    """プロセスの監視（強化版）"""
+    """プロセスの監視を出力スーパーバイザーに登録（強化版）
+
+    出力の読み取りと終了検出はスーパーバイザーの単一スレッドで行い、
+    終了時に finalize_process() が呼び出される。多重呼び出しは無視される。
+    """
     if process_id not in running_processes:
         logger.warning(f"プロセスID {process_id} が見つかりません。監視を終了します。")
         return
 
     process_info = running_processes[process_id]
-    process = process_info['process']
-    command = process_info['command']
+    process = process_info.get('process')
+    if process is None or process.stdout is None:
+        logger.warning(f"プロセス {process_id} は出力パイプを持たないため監視できません")
+        return
 
-    # 出力バッファ
-    output_buffer = []
+    process_info['status'] = 'running'
+    if process_supervisor.watch(process_id, process):
+        logger.info(f"プロセス {process_id} ({process_info['command']}) の監視を開始します")
+        ensure_output_publisher()
 
-    # 🆕 プロセス監視強化: 定期的な生存確認
-    last_alive_check = time.time()
-    check_interval = 10  # 10秒間隔でプロセス生存確認
+def get_process_output_text(process_id, process_info):
+    """プロセス出力（直近100行）を取得。監視中はリングバッファから要求時に生成"""
+    return process_supervisor.get_output(process_id, process_info.get('output', ''))
 
-    try:
-        logger.info(f"プロセス {process_id} ({command}) の監視を開始します")
+def get_process_output_stats(process_id, process_info):
+    """プロセス出力のバイト数・行数カウンタを取得"""
+    stats = process_supervisor.get_stats(process_id)
+    if stats:
+        return {'output_bytes': stats['output_bytes'], 'output_lines': stats['output_lines']}
+    return {
+        'output_bytes': process_info.get('output_bytes', 0),
+        'output_lines': process_info.get('output_lines', 0)
+    }
 
-        # 🆕 強化されたプロセス監視ループ
-        process_info['status'] = 'running'
+def log_process_output_line(process_id, line):
+    """子プロセスの出力行をダッシュボードログへ転送"""
+    logger.info(f"プロセス {process_id}: {line}")
 
-        while True:
-            # 定期的なプロセス生存確認
-            current_time = time.time()
-            if current_time - last_alive_check >= check_interval:
-                poll_result = process.poll()
-                if poll_result is not None:
-                    logger.info(f"プロセス {process_id} 終了検出（poll結果: {poll_result}）")
-                    return_code = poll_result
-                    break
-                last_alive_check = current_time
-                logger.debug(f"プロセス {process_id} 生存確認OK")
+def finalize_process(process_id, return_code, output):
+    """プロセス終了時の完了処理（スーパーバイザーから呼び出される）"""
+    process_info = running_processes.get(process_id)
+    if process_info is None:
+        # 停止API等で既に履歴へ移動済み
+        process_supervisor.forget(process_id)
+        return
 
-            # 出力読み取り（タイムアウト付き）
-            try:
-                line = process.stdout.readline()
-                if line:
-                    line = line.rstrip('\n\r')
-                    if line:
-                        output_buffer.append(line)
-                        process_info['output'] = '\n'.join(output_buffer[-100:])
-                        logger.info(f"プロセス {process_id}: {line}")
-                        sys.stdout.flush()
-                elif process.poll() is not None:
-                    # 出力が空でプロセスが終了している
-                    return_code = process.poll()
-                    logger.info(f"プロセス {process_id} 出力終了で終了検出（終了コード: {return_code}）")
-                    break
-            except Exception as e:
-                logger.warning(f"プロセス {process_id} 出力読み取りエラー: {e}")
-                # エラーが発生してもプロセス終了チェックは継続
-                if process.poll() is not None:
-                    return_code = process.poll()
-                    logger.info(f"プロセス {process_id} 例外後終了検出（終了コード: {return_code}）")
-                    break
+    command = process_info['command']
+
+    try:
+        logger.info(f"プロセス {process_id} 終了検出（終了コード: {return_code}）")
 
-            # CPU使用率を下げるための短時間スリープ
-            time.sleep(0.1)
+        # リングバッファの内容とカウンタを確定して保存
+        process_info['output'] = output
+        process_info.update(get_process_output_stats(process_id, process_info))
+        process_supervisor.forget(process_id)
 
         # プロセス完了処理
         if return_code == 0:
@@ -3084,7 +3305,7 @@ def monitor_process(process_id):
         # 🆕 即座に実行中プロセスから削除（遅延削除を廃止）
         if process_id in running_processes:
             logger.info(f"完了プロセス {process_id} を即座に削除します")
-            del running_processes[process_id]
+            unregister_running_process(process_id)
 
         # 🆕 プロセス終了通知（他のシステムコンポーネントへの通知）
         try:
@@ -3095,7 +3316,9 @@ def monitor_process(process_id):
                 'status': process_info['status'],
                 'return_code': return_code,
                 'end_time': process_info['end_time'].isoformat(),
-                'duration': str(datetime.datetime.now() - process_info['start_time'])
+                'duration': str(datetime.datetime.now() - process_info['start_time']),
+                'output_bytes': process_info.get('output_bytes', 0),
+                'output_lines': process_info.get('output_lines', 0)
             }
 
             # 完了ログファイルに記録
@@ -3108,7 +3331,7 @@ def monitor_process(process_id):
             logger.warning(f"プロセス完了ログ記録エラー: {log_error}")
 
     except Exception as e:
-        logger.error(f"プロセス {process_id} の監視中にエラーが発生しました: {e}")
+        logger.error(f"プロセス {process_id} の完了処理中にエラーが発生しました: {e}")
         process_info['status'] = 'error'
         process_info['error'] = str(e)
         process_info['end_time'] = datetime.datetime.now()
@@ -3119,7 +3342,58 @@ def monitor_process(process_id):
         # 🆕 エラープロセスも即座に削除
         if process_id in running_processes:
             logger.info(f"エラープロセス {process_id} を即座に削除します")
-            del running_processes[process_id]
+            unregister_running_process(process_id)
+
+# 🆕 子プロセス出力スーパーバイザー（全プロセスの出力を単一スレッドで監視）
+process_supervisor = ProcessOutputSupervisor(
+    on_exit=finalize_process,
+    on_line=log_process_output_line,
+    max_lines=100
+)
+
+# 🆕 出力スナップショットを共有レジストリへ反映する間隔（秒）
+PROCESS_OUTPUT_PUBLISH_INTERVAL = 1.0
+_output_publisher_lock = threading.Lock()
+_output_publisher_running = False
+
+def publish_process_outputs():
+    """監視中プロセスの出力を共有レジストリへ定期反映（他ワーカーからの参照用）"""
+    global _output_publisher_running
+    published_bytes = {}
+
+    while True:
+        time.sleep(PROCESS_OUTPUT_PUBLISH_INTERVAL)
+
+        watched = [pid for pid in list(running_processes) if process_supervisor.is_watching(pid)]
+        if not watched:
+            with _output_publisher_lock:
+                if not any(process_supervisor.is_watching(pid) for pid in list(running_processes)):
+                    _output_publisher_running = False
+                    return
+            continue
+
+        published_bytes = {pid: published_bytes.get(pid) for pid in watched}
+        for pid in watched:
+            stats = process_supervisor.get_stats(pid)
+            if not stats or published_bytes[pid] == stats['output_bytes']:
+                continue
+            try:
+                state_store.update_process_output(
+                    pid, process_supervisor.get_output(pid),
+                    stats['output_bytes'], stats['output_lines']
+                )
+                published_bytes[pid] = stats['output_bytes']
+            except Exception as e:
+                logger.warning(f"プロセス {pid} 出力の共有レジストリ反映エラー: {e}")
+
+def ensure_output_publisher():
+    """出力反映スレッドが動いていなければ開始"""
+    global _output_publisher_running
+    with _output_publisher_lock:
+        if _output_publisher_running:
+            return
+        _output_publisher_running = True
+    threading.Thread(target=publish_process_outputs, name='process-output-publisher', daemon=True).start()
 
 @app.route('/api/start_process', methods=['POST'])
 def start_process():
@@ -3166,10 +3440,6 @@ def start_process():
         if not process_id:
             return jsonify({'success': False, 'message': 'プロセスの開始に失敗しました'})
 
-        # 監視スレッドを開始
-        monitor_thread = threading.Thread(target=monitor_process, args=(process_id,))
-        monitor_thread.daemon = True
-        monitor_thread.start()
 
         logger.info(f"プロセス {process_id} を開始しました: {command} {args}")
 
@@ -3193,6 +3463,12 @@ def start_process():
 def stop_process(process_id):
     """プロセスを停止"""
     try:
+        if process_id and process_id not in running_processes:
+            # 🆕 他ワーカーが起動したプロセスはシグナルで終了させ、完了処理は所有ワーカーに任せる
+            remote_info = state_store.get_process(process_id)
+            if remote_info:
+                return stop_remote_process(process_id, remote_info)
+
         if not process_id or process_id not in running_processes:
             return jsonify({'success': False, 'message': 'プロセスが見つかりません'})
 
@@ -3213,7 +3489,7 @@ def stop_process(process_id):
         add_process_to_history(running_processes[process_id].copy())
 
         # 実行中プロセスから削除
-        del running_processes[process_id]
+        unregister_running_process(process_id)
 
         logger.info(f"プロセス {process_id} を停止しました")
 
@@ -3229,6 +3505,29 @@ def stop_process(process_id):
             'message': f'プロセス停止エラー: {e}'
         }), 500
 
+def stop_remote_process(process_id, process_info):
+    """他ワーカーが起動したプロセスを終了させる"""
+    pid = process_info.get('pid') or (int(process_id) if str(process_id).isdigit() else None)
+    if not pid:
+        return jsonify({'success': False, 'message': 'プロセスのPIDが不明です'})
+
+    try:
+        try:
+            import psutil
+            psutil.Process(pid).terminate()
+        except ImportError:
+            import signal
+            os.kill(pid, signal.SIGTERM)
+        logger.info(f"他ワーカー (PID: {process_info.get('owner_pid')}) のプロセス {process_id} に終了を要求しました")
+    except Exception as e:
+        logger.warning(f"プロセス {process_id} の終了中にエラー: {e}")
+        return jsonify({'success': False, 'message': f'プロセス停止エラー: {e}'})
+
+    return jsonify({
+        'success': True,
+        'message': f'プロセス {process_id} を停止しました'
+    })
+
 @app.route('/api/update_process_status', methods=['POST'])
 def update_process_status():
     """プロセス状態を手動で更新"""
@@ -3239,26 +3538,27 @@ def update_process_status():
         if not process_id:
             return jsonify({'success': False, 'message': 'プロセスIDが指定されていません'})
 
-        # プロセス履歴を読み込み
+        # プロセス履歴を読み込み（他ワーカーと排他）
         global process_history
-        load_process_history()
-
-        # 該当するプロセスを検索して更新
-        updated = False
-        for i, process in enumerate(process_history):
-            if process.get('id') == process_id:
-                process_history[i]['status'] = new_status
-                process_history[i]['end_time'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                updated = True
-                break
+        with state_store.lock():
+            load_process_history()
 
-        if updated:
-            # 履歴を保存
-            save_process_history()
+            # 該当するプロセスを検索して更新
+            updated = False
+            for i, process in enumerate(process_history):
+                if process.get('id') == process_id:
+                    process_history[i]['status'] = new_status
+                    process_history[i]['end_time'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    updated = True
+                    break
+
+            if updated:
+                # 履歴を保存
+                save_process_history()
 
+        if updated:
             # 実行中プロセスからも削除
-            if process_id in running_processes:
-                del running_processes[process_id]
+            unregister_running_process(process_id)
 
             logger.info(f"プロセス {process_id} の状態を {new_status} に更新しました")
 
@@ -3296,6 +3596,7 @@ def refresh_data():
         # キャッシュをクリア
         company_data_cache = None
         company_data_last_updated = None
+        publish_cache_invalidation()
 
         # データを再読み込み
         companies = load_company_data()
@@ -4018,6 +4319,7 @@ def get_bounce_companies_details(start_date, end_date):
         return []
 
 @app.route('/api/get_daily_stats')
+@conditional_json_response
 def get_daily_stats_api():
     """日別統計データを取得(AJAX用)"""
     start_date = request.args.get('start_date')
@@ -4196,7 +4498,7 @@ def get_processes():
         processes = []
         current_time = datetime.datetime.now()
 
-        for pid, info in running_processes.items():
+        for pid, info in get_all_running_processes().items():
             # 実行中のプロセスまたは最近完了したプロセスを表示
             show_process = False
 
@@ -4227,7 +4529,8 @@ def get_processes():
                     'start_time': info['start_time'].strftime('%Y-%m-%d %H:%M:%S'),
                     'status': info['status'],
                     'duration': duration,
-                    'output': info.get('output', ''),  # リアルタイム出力を追加
+                    'output': get_process_output_text(pid, info),  # リアルタイム出力を追加
+                    **get_process_output_stats(pid, info),
                     'error': info.get('error', '')  # エラー情報も追加
                 })
 
@@ -4240,12 +4543,13 @@ def get_processes():
 def get_process_output(process_id):
     """特定のプロセスの出力を取得"""
     try:
-        if process_id in running_processes:
-            process_info = running_processes[process_id]
+        process_info = get_all_running_processes().get(process_id)
+        if process_info:
             return jsonify({
                 'success': True,
                 'process_id': process_id,
-                'output': process_info.get('output', ''),
+                'output': get_process_output_text(process_id, process_info),
+                **get_process_output_stats(process_id, process_info),
                 'status': process_info.get('status', 'unknown'),
                 'start_time': process_info['start_time'].strftime('%Y-%m-%d %H:%M:%S'),
                 'duration': str(datetime.datetime.now() - process_info['start_time']).split('.')[0],
@@ -4299,10 +4603,6 @@ def process_batch_range():
         if not process_id:
             return jsonify({'success': False, 'message': 'バッチ処理の開始に失敗しました'})
 
-        # 監視スレッドを開始
-        monitor_thread = threading.Thread(target=monitor_process, args=(process_id,))
-        monitor_thread.daemon = True
-        monitor_thread.start()
 
         logger.info(f"バッチ処理プロセス {process_id} を開始しました: {process_type}")
 
@@ -4388,6 +4688,7 @@ def consolidate_files():
         }), 500
 
 @app.route('/api/companies')
+@conditional_json_response
 def get_companies_api():
     """企業データを取得（API用）"""
     try:
@@ -4404,6 +4705,101 @@ def get_companies_api():
             'error': str(e)
         }), 500
 
+# 🆕 ストリーミングエクスポート（CSV / NDJSON・gzip対応）
+def parse_export_filters():
+    """エクスポートAPI共通のフィルタ条件をクエリパラメータから取得
+
+    start_id, end_id: 企業ID範囲
+    status: カンマ区切りのステータス（none = 未設定）
+    date_from, date_to: 日付範囲（YYYY-MM-DD。date_to はその日を含む）
+    """
+    def to_int(name):
+        value = request.args.get(name, '').strip()
+        return int(value) if value.isdigit() else None
+
+    def to_date(name, inclusive_end=False):
+        value = request.args.get(name, '').strip()
+        parsed = parse_date(value)
+        if parsed and inclusive_end:
+            parsed += datetime.timedelta(days=1) if len(value) <= 10 else datetime.timedelta(seconds=1)
+        return parsed
+
+    status_param = request.args.get('status')
+    statuses = None
+    if status_param:
+        statuses = {'' if s.strip() == 'none' else s.strip() for s in status_param.split(',')}
+
+    return {
+        'start_id': to_int('start_id'),
+        'end_id': to_int('end_id'),
+        'statuses': statuses,
+        'date_from': to_date('date_from'),
+        'date_to': to_date('date_to', inclusive_end=True)
+    }
+
+def build_export_response(rows, fieldnames, basename):
+    """行ストリームからダウンロード用のストリーミングレスポンスを生成"""
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format == 'csv':
+        chunks = stream_csv(rows, fieldnames)
+        mimetype = 'text/csv; charset=utf-8'
+    elif export_format == 'ndjson':
+        chunks = stream_ndjson(rows)
+        mimetype = 'application/x-ndjson; charset=utf-8'
+    else:
+        return jsonify({'success': False, 'error': f'未対応の形式です: {export_format}'}), 400
+
+    filename = f"{basename}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    headers = {'Cache-Control': 'no-store', 'X-Accel-Buffering': 'no'}
+
+    if request.args.get('gzip', 'false').lower() == 'true':
+        # .gz ファイルとしてダウンロード
+        chunks = gzip_stream(chunks)
+        mimetype = 'application/gzip'
+        filename += '.gz'
+    else:
+        headers['Vary'] = 'Accept-Encoding'
+        if accepts_gzip(request.headers.get('Accept-Encoding')):
+            # 転送時のみ圧縮（クライアント側で自動展開）
+            chunks = gzip_stream(chunks)
+            headers['Content-Encoding'] = 'gzip'
+
+    headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+def export_csv_source(file_path, basename, id_column, status_column, date_column):
+    """CSVファイルをフィルタ付きでストリーミングエクスポート"""
+    if not os.path.exists(file_path):
+        return jsonify({'success': False, 'error': f'ファイルが見つかりません: {file_path}'}), 404
+
+    filters = parse_export_filters()
+    rows = filter_rows(
+        iter_csv_rows(file_path),
+        id_column=id_column, start_id=filters['start_id'], end_id=filters['end_id'],
+        status_column=status_column, statuses=filters['statuses'],
+        date_column=date_column, date_from=filters['date_from'], date_to=filters['date_to']
+    )
+    return build_export_response(rows, read_csv_header(file_path), basename)
+
+@app.route('/api/export/companies')
+def api_export_companies():
+    """企業データのストリーミングエクスポート（ステータス=バウンス状態, 日付=バウンス日時）"""
+    try:
+        return export_csv_source(INPUT_FILE, 'huganjob_companies', 'ID', 'バウンス状態', 'バウンス日時')
+    except Exception as e:
+        logger.error(f"企業データエクスポートエラー: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/export/sending-results')
+def api_export_sending_results():
+    """送信結果のストリーミングエクスポート（ステータス=送信結果, 日付=送信日時）"""
+    try:
+        return export_csv_source(HUGANJOB_EMAIL_SENDING_RESULTS, 'huganjob_sending_results',
+                                 '企業ID', '送信結果', '送信日時')
+    except Exception as e:
+        logger.error(f"送信結果エクスポートエラー: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 # manual ページは削除されました（不要なため）
 
 # ===== 問い合わせフォーム自動入力機能 =====
@@ -4526,6 +4922,7 @@ def contact_form_execute():
 
 def get_contact_form_stats():
     """問い合わせフォーム処理統計を取得"""
+    import pandas as pd  # 遅延インポート（起動高速化）
     try:
         stats = {
             'total_processed': 0,
@@ -4661,9 +5058,11 @@ def save_email_open_record(open_record):
                 'user_agent': open_record.get('user_agent', '')
             }
             writer.writerow(filtered_record)
+        return True
 
     except Exception as e:
         logger.error(f"開封記録ファイルの保存エラー: {e}")
+        return False
 
 
 
@@ -4754,10 +5153,6 @@ def process_bounces():
                 'message': 'バウンス処理の開始に失敗しました'
             }), 500
 
-        # 監視スレッドを開始
-        monitor_thread = threading.Thread(target=monitor_process, args=(process_id,))
-        monitor_thread.daemon = True
-        monitor_thread.start()
 
         logger.info(f"バウンス処理プロセス {process_id} を開始しました")
 
@@ -4841,10 +5236,6 @@ def process_auto_contact():
                 'message': '自動問い合わせ処理の開始に失敗しました'
             }), 500
 
-        # 監視スレッドを開始
-        monitor_thread = threading.Thread(target=monitor_process, args=(process_id,))
-        monitor_thread.daemon = True
-        monitor_thread.start()
 
         logger.info(f"自動問い合わせ処理プロセス {process_id} を開始しました")
 
@@ -5031,10 +5422,17 @@ def record_email_open_enhanced(tracking_id, request_obj, tracking_method='pixel'
     """メール開封を記録する（改善版・多重追跡対応）"""
     try:
         # 既に同じ方法で開封記録があるかチェック
-        if is_already_opened_by_method(tracking_id, tracking_method):
+        # 🆕 共有ストアで全ワーカー間の重複を原子的に排除し、初回のみ既存CSVも確認
+        if not claim_open_event(tracking_id, tracking_method) or is_already_opened_by_method(tracking_id, tracking_method):
             logger.info(f"既に開封済み ({tracking_method}): {tracking_id}")
             return
+    except Exception as e:
+        logger.error(f"開封記録の保存エラー ({tracking_method}): {e}")
+        return
 
+    # 登録後に記録できなかった場合は登録を取り消し、次の開封で再度記録できるようにする
+    recorded = False
+    try:
         # デバイスタイプを判定（改善版）
         user_agent = request_obj.environ.get('HTTP_USER_AGENT', '') if hasattr(request_obj, 'environ') else request_obj.headers.get('User-Agent', '')
         device_type = detect_device_type_enhanced(user_agent)
@@ -5058,7 +5456,9 @@ def record_email_open_enhanced(tracking_id, request_obj, tracking_method='pixel'
         }
 
         # 開封追跡ファイルに記録（拡張版）
-        save_email_open_record_enhanced(open_record)
+        recorded = save_email_open_record_enhanced(open_record)
+        if not recorded:
+            return
 
         logger.info(f"メール開封を記録しました ({tracking_method}): {tracking_id} at {now} [{device_type}]")
 
@@ -5067,6 +5467,25 @@ def record_email_open_enhanced(tracking_id, request_obj, tracking_method='pixel'
 
     except Exception as e:
         logger.error(f"開封記録の保存エラー ({tracking_method}): {e}")
+    finally:
+        if not recorded:
+            release_open_event(tracking_id, tracking_method)
+
+def claim_open_event(tracking_id, tracking_method):
+    """開封イベントを共有ストアに登録。同じイベントの2回目以降はFalse"""
+    try:
+        return state_store.claim_open_event(f"{tracking_id}:{tracking_method}")
+    except Exception as e:
+        # ストアが使えない場合はCSVによる重複チェックのみで続行
+        logger.warning(f"開封イベント重複排除エラー: {e}")
+        return True
+
+def release_open_event(tracking_id, tracking_method):
+    """開封イベントの登録を取り消す（記録に失敗した場合）"""
+    try:
+        state_store.release_open_event(f"{tracking_id}:{tracking_method}")
+    except Exception as e:
+        logger.warning(f"開封イベント登録の取り消しエラー: {e}")
 
 def is_already_opened_by_method(tracking_id, tracking_method):
     """指定されたトラッキングIDと方法で既に開封済みかチェック"""
@@ -5111,7 +5530,7 @@ def detect_device_type_enhanced(user_agent):
     return 'Unknown'
 
 def save_email_open_record_enhanced(open_record):
-    """開封記録をファイルに保存（拡張版）"""
+    """開封記録をファイルに保存（拡張版）。保存できた場合はTrue"""
     try:
         # ファイルが存在しない場合はヘッダーを作成
         file_exists = os.path.exists(NEW_EMAIL_OPEN_TRACKING)
@@ -5137,9 +5556,11 @@ def save_email_open_record_enhanced(open_record):
                 'referer': open_record.get('referer', '')
             }
             writer.writerow(filtered_record)
+        return True
 
     except Exception as e:
         logger.error(f"開封記録ファイルの保存エラー: {e}")
+        return False
 
 def clear_stats_cache():
     """統計キャッシュをクリアする"""
@@ -6316,6 +6737,7 @@ def remove_duplicate_open_records():
 # 開封率管理用のAPIエンドポイント
 
 @app.route('/api/open-rate-stats')
+@conditional_json_response
 def api_open_rate_stats():
     """開封率統計API"""
     try:
@@ -6626,6 +7048,79 @@ def extract_domain(url):
         logger.error(f"ドメイン抽出エラー: {e}")
         return url.lower()
 
+def has_valid_company_url(website):
+    """重複判定でドメイン比較に使える有効なURLかどうか"""
+    return bool(website and
+                website not in ['‐', '-', ''] and
+                website.startswith(('http://', 'https://')))
+
+class CompanyDuplicateIndex:
+    """
+    一括インポート用の重複判定インデックス
+    - 既存CSVを1回だけ読み込み、ドメイン・正規化企業名のハッシュ集合と最大IDを保持
+    - 判定ルールは is_company_duplicate() と同一（1行ごとのファイル再走査が不要）
+    - 採用した行を add() で登録することでバッチ内の重複も検出
+    """
+
+    def __init__(self):
+        self.domains = set()              # 有効なURLを持つ企業のドメイン
+        self.names_without_url = set()    # 有効なURLを持たない企業の正規化企業名
+        self.all_names = set()            # 全企業の正規化企業名
+        self.max_id = 0
+
+    @staticmethod
+    def normalize_name(company_name):
+        return (company_name or '').lower().strip()
+
+    @classmethod
+    def from_csv(cls, file_path):
+        """既存の企業CSVからインデックスを構築"""
+        index = cls()
+        if not os.path.exists(file_path):
+            return index
+
+        with open(file_path, 'r', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                index.add((row.get('企業名') or '').strip(), (row.get('企業ホームページ') or '').strip())
+                try:
+                    index.max_id = max(index.max_id, int(row.get('ID', 0)))
+                except (ValueError, TypeError):
+                    continue
+
+        logger.info(f"重複判定インデックス構築: ドメイン{len(index.domains)}件, 企業名{len(index.all_names)}件, 最大ID={index.max_id}")
+        return index
+
+    def add(self, company_name, website):
+        """企業をインデックスに登録"""
+        name = self.normalize_name(company_name)
+        if has_valid_company_url(website):
+            domain = extract_domain(website)
+            if domain:
+                self.domains.add(domain)
+        elif name:
+            self.names_without_url.add(name)
+        if name:
+            self.all_names.add(name)
+
+    def is_duplicate(self, company_name, website):
+        """重複判定（is_company_duplicate と同じ優先順位）"""
+        name = self.normalize_name(company_name)
+        if has_valid_company_url(website):
+            # 既存企業も有効なURLを持つ場合はドメイン、URLがない既存企業とは企業名で比較
+            domain = extract_domain(website)
+            if domain and domain in self.domains:
+                return True
+            return bool(name) and name in self.names_without_url
+
+        # 新規企業にURLがない場合は企業名で比較
+        return bool(name) and name in self.all_names
+
+    def next_id(self):
+        """次の企業IDを払い出す"""
+        self.max_id += 1
+        return self.max_id
+
 def get_next_company_id():
     """次の企業IDを取得"""
     try:
@@ -6679,31 +7174,92 @@ def add_company_to_csv(company_id, company_name, website, email_address, job_pos
         logger.error(f"CSV追加エラー: {e}")
         return False
 
+class CompanyCsvAppender:
+    """
+    企業CSVへの一括追記（原子的に置き換え）
+    既存ファイルの一時コピーに行を逐次追記し、commit() で os.replace により差し替える。
+    途中で失敗した場合は abort() で一時ファイルを破棄し、元のCSVは変更されない。
+    行はチャンクごとに書き出すため、追加件数が多くてもメモリに溜め込まない。
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.count = 0
+        self.first_id = None
+        self.last_id = None
+        self._file = None
+        self._writer = None
+        self._temp_path = None
+
+    def open(self):
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        fd, self._temp_path = tempfile.mkstemp(prefix='.import_', suffix='.csv', dir=directory)
+        os.close(fd)
+
+        if os.path.exists(self.file_path):
+            shutil.copyfile(self.file_path, self._temp_path)
+            # 末尾に改行がない場合は行が連結されないよう補う
+            with open(self._temp_path, 'rb+') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) not in (b'\n', b'\r'):
+                        f.write(b'\r\n')
+
+        self._file = open(self._temp_path, 'a', encoding='utf-8-sig', newline='')
+        self._writer = csv.writer(self._file)
+        return self
+
+    def write_rows(self, companies):
+        """(company_id, company_name, website, email_address, job_position) のリストを追記"""
+        for company_id, company_name, website, email_address, job_position in companies:
+            self._writer.writerow([
+                company_id,
+                company_name,
+                website,
+                email_address or '‐',
+                job_position,
+                '', '', '',  # バウンス状態・日時・理由
+                '', '', ''   # 配信停止状態・日時・理由
+            ])
+            if self.first_id is None:
+                self.first_id = company_id
+            self.last_id = company_id
+            self.count += 1
+
+    def commit(self):
+        """一時ファイルで元のCSVを置き換える"""
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            if self.count == 0:
+                os.remove(self._temp_path)
+                return True
+            if os.path.exists(self.file_path):
+                shutil.copymode(self.file_path, self._temp_path)
+            os.replace(self._temp_path, self.file_path)
+            logger.info(f"企業をCSVに一括追加: {self.count}社 (ID {self.first_id}〜{self.last_id})")
+            return True
+        except Exception as e:
+            logger.error(f"CSV一括追加エラー: {e}")
+            self.abort()
+            return False
+
+    def abort(self):
+        """一時ファイルを破棄（元のCSVは変更しない）"""
+        if self._file and not self._file.closed:
+            self._file.close()
+        if self._temp_path and os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
 def analyze_csv_file(file_path):
     """CSVファイルを解析してプレビューデータを生成"""
     try:
-        # 複数のエンコーディングでCSVファイルの読み込みを試行
-        encodings = ['utf-8-sig', 'utf-8', 'shift_jis', 'cp932', 'iso-2022-jp']
-        sample_lines = []
-
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    # 最初の数行を読んで構造を確認
-                    reader = csv.reader(f)
-                    for i, row in enumerate(reader):
-                        sample_lines.append(row)
-                        if i >= 10:  # 最初の11行（ヘッダー + 10行）
-                            break
-                logger.info(f"CSVファイル読み込み成功: エンコーディング={encoding}")
-                break
-            except UnicodeDecodeError:
-                continue
-            except Exception as e:
-                logger.warning(f"エンコーディング {encoding} での読み込み失敗: {e}")
-                continue
-        else:
-            return {'success': False, 'error': 'サポートされているエンコーディングでファイルを読み込めませんでした'}
+        # エンコーディングはファイル先頭のサンプルから判定し、最初の11行（ヘッダー + 10行）のみ読み込む
+        csv_reader = CsvInputReader(file_path)
+        sample_lines = csv_reader.read_head(11)
+        logger.info(f"CSVファイル読み込み成功: エンコーディング={csv_reader.encoding}")
 
         if not sample_lines:
             return {'success': False, 'error': 'CSVファイルが空です'}
@@ -6740,6 +7296,7 @@ def analyze_csv_file(file_path):
             'column_mapping': column_mapping,
             'preview_data': preview_data,
             'total_rows': len(data_rows),
+            'encoding': csv_reader.encoding,
             'quality_check': quality_check
         }
 
@@ -6849,8 +7406,23 @@ def check_data_quality(data_rows, column_mapping):
 
     return quality
 
-def import_companies_from_csv(file_path, skip_duplicates=True):
-    """CSVファイルから企業データをインポート"""
+# インポート結果の詳細（details / new_companies）にステータスごとに保持する最大件数
+# 件数の集計は全行で行うが、数十万行のインポートでもレスポンスとメモリを一定に保つ
+IMPORT_DETAIL_LIMIT = 1000
+
+def import_lock_path():
+    """CSVインポートをワーカー間で排他するロックファイル（企業CSVと同じディレクトリ）"""
+    return INPUT_FILE + '.import.lock'
+
+def import_companies_from_csv(file_path, skip_duplicates=True, progress_callback=None):
+    """CSVファイルから企業データをインポート
+
+    入力はエンコーディングを先頭サンプルから判定したうえでチャンク単位に逐次処理し、
+    採用した行は一時ファイル経由で企業CSVへ原子的に追記する。
+
+    Args:
+        progress_callback: チャンクごとに呼ばれる関数 (rows_read, bytes_read, total_bytes)
+    """
     try:
         # CSVファイルの解析
         analysis_result = analyze_csv_file(file_path)
@@ -6859,9 +7431,6 @@ def import_companies_from_csv(file_path, skip_duplicates=True):
 
         column_mapping = analysis_result['column_mapping']
 
-        # 現在の最大IDを取得
-        current_max_id = get_next_company_id() - 1
-
         # インポート結果の初期化
         import_stats = {
             'success': True,
@@ -6870,163 +7439,176 @@ def import_companies_from_csv(file_path, skip_duplicates=True):
             'skipped': 0,
             'errors': 0,
             'details': [],
-            'new_companies': []
+            'new_companies': [],
+            'incomplete_excluded': 0
         }
+        detail_counts = {}
+
+        def add_detail(detail):
+            """詳細をステータスごとの上限まで記録"""
+            status = detail['status']
+            detail_counts[status] = detail_counts.get(status, 0) + 1
+            if detail_counts[status] <= IMPORT_DETAIL_LIMIT:
+                import_stats['details'].append(detail)
+                return detail
+            import_stats['details_truncated'] = True
+            return None
 
-        # 複数のエンコーディングでCSVファイルの読み込みと処理
-        encodings = ['utf-8-sig', 'utf-8', 'shift_jis', 'cp932', 'iso-2022-jp']
+        last_progress_step = -1
+
+        def log_progress(rows_read, bytes_read, total_bytes):
+            """進捗をログ出力（10%刻み）"""
+            nonlocal last_progress_step
+            percent = int(bytes_read * 100 / total_bytes) if total_bytes else 100
+            if percent // 10 != last_progress_step:
+                last_progress_step = percent // 10
+                logger.info(f"CSVインポート進捗: {rows_read}行処理 ({percent}%, {bytes_read / 1024 / 1024:.1f}MB / {total_bytes / 1024 / 1024:.1f}MB)")
+            if progress_callback:
+                progress_callback(rows_read, bytes_read, total_bytes)
+
+        csv_reader = CsvInputReader(file_path, encoding=analysis_result.get('encoding'), progress_callback=log_progress)
+        logger.info(f"CSVインポート: エンコーディング={csv_reader.encoding}, サイズ={csv_reader.total_bytes}バイト")
+
+        # 既存データの読み込みから一括追記までをワーカー間で排他（重複判定とID採番の整合性を保つため）
+        # 大きなCSVでは長時間になるため、状態ストアの書き込みトランザクションではなくロックファイルを使う
+        with file_lock(import_lock_path()):
+            # 既存企業の重複判定インデックスと最大IDを1回の読み込みで構築
+            duplicate_index = CompanyDuplicateIndex.from_csv(INPUT_FILE)
+            appender = CompanyCsvAppender(INPUT_FILE).open()
+            added_details = []
 
-        for encoding in encodings:
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    reader = csv.reader(f)
-                    header = next(reader, None)  # ヘッダーをスキップ
+                row_num = 1  # 行番号は2から開始（ヘッダー除く）
+                for raw_rows, mapped_rows in csv_reader.iter_mapped_chunks(column_mapping):
+                    accepted = []
 
-                    # エンコーディングが成功した場合、処理を続行
-                    logger.info(f"CSVインポート: エンコーディング={encoding}で読み込み成功")
-                    break
-            except UnicodeDecodeError:
-                continue
-            except Exception as e:
-                logger.warning(f"エンコーディング {encoding} での読み込み失敗: {e}")
-                continue
-        else:
-            return {'success': False, 'error': 'サポートされているエンコーディングでファイルを読み込めませんでした'}
+                    for row, values in zip(raw_rows, mapped_rows):
+                        row_num += 1
+                        import_stats['total_processed'] += 1
 
-        # 成功したエンコーディングで再度ファイルを開いて処理
-        with open(file_path, 'r', encoding=encoding) as f:
-            reader = csv.reader(f)
-            header = next(reader, None)  # ヘッダーをスキップ
+                        try:
+                            company_name = values.get('company_name', '')
+                            website = values.get('website', '')
+                            email_address = values.get('email', '')
+                            job_position = values.get('job_position', '')
+
+                            logger.debug(f"行 {row_num} データ抽出: 企業名='{company_name}', URL='{website}', メール='{email_address}', 職種='{job_position}'")
+
+                            # 必須項目のチェック
+                            if not company_name or not job_position:
+                                import_stats['errors'] += 1
+                                add_detail({
+                                    'row': row_num,
+                                    'status': 'error',
+                                    'message': '必須項目（企業名、募集職種）が不足しています'
+                                })
+                                continue
 
-            for row_num, row in enumerate(reader, start=2):  # 行番号は2から開始（ヘッダー除く）
-                import_stats['total_processed'] += 1
+                            # 🆕 不完全データのバリデーション（メールアドレスとウェブサイトの両方が空）
+                            email_empty = not email_address or email_address.strip() in ['', '未登録', '-', '‐']
+                            website_empty = not website or website.strip() in ['', '‐', '-']
+
+                            if email_empty and website_empty:
+                                import_stats['errors'] += 1
+                                import_stats['incomplete_excluded'] += 1
+                                add_detail({
+                                    'row': row_num,
+                                    'status': 'excluded',
+                                    'company_name': company_name,
+                                    'message': '不完全データ: メールアドレスとウェブサイトの両方が空のため除外されました'
+                                })
+                                logger.debug(f"不完全データを除外: {company_name} (行 {row_num})")
+                                continue
 
-                try:
-                    # データの抽出（安全な取得）
-                    def safe_get_column(row, mapping_key, default=''):
-                        """安全に列データを取得"""
-                        try:
-                            col_index = column_mapping.get(mapping_key)
-                            if col_index is not None and len(row) > col_index:
-                                return row[col_index].strip()
-                            return default
-                        except Exception as e:
-                            logger.error(f"列データ取得エラー ({mapping_key}): {e}")
-                            return default
-
-                    company_name = safe_get_column(row, 'company_name')
-                    website = safe_get_column(row, 'website')
-                    email_address = safe_get_column(row, 'email')
-                    job_position = safe_get_column(row, 'job_position')
-
-                    logger.debug(f"行 {row_num} データ抽出: 企業名='{company_name}', URL='{website}', メール='{email_address}', 職種='{job_position}'")
-
-                    # 必須項目のチェック
-                    if not company_name or not job_position:
-                        import_stats['errors'] += 1
-                        import_stats['details'].append({
-                            'row': row_num,
-                            'status': 'error',
-                            'message': '必須項目（企業名、募集職種）が不足しています'
-                        })
-                        continue
+                            # ウェブサイトが空または「‐」の場合はデフォルト値を設定
+                            if not website or website in ['‐', '-', '']:
+                                website = '‐'
+
+                            # メールアドレスが「‐」の場合は空文字列として扱う（検証エラーを回避）
+                            if email_address in ['‐', '-']:
+                                email_address = ''
+
+                            # 重複チェック
+                            if skip_duplicates and duplicate_index.is_duplicate(company_name, website):
+                                import_stats['skipped'] += 1
+                                add_detail({
+                                    'row': row_num,
+                                    'status': 'skipped',
+                                    'company_name': company_name,
+                                    'message': '重複企業のためスキップしました'
+                                })
+                                continue
 
-                    # 🆕 不完全データのバリデーション（メールアドレスとウェブサイトの両方が空）
-                    email_empty = not email_address or email_address.strip() in ['', '未登録', '-', '‐']
-                    website_empty = not website or website.strip() in ['', '‐', '-']
-
-                    if email_empty and website_empty:
-                        import_stats['errors'] += 1
-                        import_stats['details'].append({
-                            'row': row_num,
-                            'status': 'excluded',
-                            'company_name': company_name,
-                            'message': '不完全データ: メールアドレスとウェブサイトの両方が空のため除外されました'
-                        })
-                        logger.info(f"不完全データを除外: {company_name} (行 {row_num})")
-                        continue
+                            # データ検証
+                            validation_result = validate_company_data(company_name, website, email_address)
+                            if not validation_result['valid']:
+                                import_stats['errors'] += 1
+                                add_detail({
+                                    'row': row_num,
+                                    'status': 'error',
+                                    'company_name': company_name,
+                                    'website': website,
+                                    'email': email_address,
+                                    'message': validation_result['error']
+                                })
+                                logger.warning(f"行 {row_num} 検証エラー: {validation_result['error']}, 企業名='{company_name}', URL='{website}', メール='{email_address}'")
+                                continue
 
-                    # ウェブサイトが空または「‐」の場合はデフォルト値を設定
-                    if not website or website in ['‐', '-', '']:
-                        website = '‐'
-
-                    # メールアドレスが「‐」の場合は空文字列として扱う（検証エラーを回避）
-                    if email_address in ['‐', '-']:
-                        email_address = ''
-
-                    # 重複チェック
-                    if skip_duplicates and is_company_duplicate(company_name, website):
-                        import_stats['skipped'] += 1
-                        import_stats['details'].append({
-                            'row': row_num,
-                            'status': 'skipped',
-                            'company_name': company_name,
-                            'message': '重複企業のためスキップしました'
-                        })
-                        continue
+                            # 新しいIDを生成し、以降の行との重複判定に備えてインデックスへ登録
+                            new_id = duplicate_index.next_id()
+                            duplicate_index.add(company_name, website)
 
-                    # データ検証
-                    validation_result = validate_company_data(company_name, website, email_address)
-                    if not validation_result['valid']:
-                        import_stats['errors'] += 1
-                        import_stats['details'].append({
-                            'row': row_num,
-                            'status': 'error',
-                            'company_name': company_name,
-                            'website': website,
-                            'email': email_address,
-                            'message': validation_result['error']
-                        })
-                        logger.warning(f"行 {row_num} 検証エラー: {validation_result['error']}, 企業名='{company_name}', URL='{website}', メール='{email_address}'")
-                        continue
+                            # CSVへはチャンクごとにまとめて追記（メールアドレスが空の場合は「‐」に戻す）
+                            csv_email_address = email_address if email_address else '‐'
+                            accepted.append((new_id, company_name, website, csv_email_address, job_position))
 
-                    # 新しいIDを生成
-                    current_max_id += 1
-                    new_id = current_max_id
+                            if len(import_stats['new_companies']) < IMPORT_DETAIL_LIMIT:
+                                import_stats['new_companies'].append({
+                                    'id': new_id,
+                                    'name': company_name,
+                                    'website': website,
+                                    'job_position': job_position
+                                })
+                            detail = add_detail({
+                                'row': row_num,
+                                'status': 'added',
+                                'company_name': company_name,
+                                'company_id': new_id,
+                                'message': f'企業を追加しました（ID: {new_id}）'
+                            })
+                            if detail:
+                                added_details.append(detail)
 
-                    # CSVファイルに追加（メールアドレスが空の場合は「‐」に戻す）
-                    csv_email_address = email_address if email_address else '‐'
-                    success = add_company_to_csv(new_id, company_name, website, csv_email_address, job_position)
+                        except Exception as e:
+                            import_stats['errors'] += 1
+                            add_detail({
+                                'row': row_num,
+                                'status': 'error',
+                                'message': f'処理エラー: {str(e)}',
+                                'raw_data': row[:4] if len(row) >= 4 else row,  # デバッグ用
+                                'column_mapping': column_mapping,  # デバッグ用
+                                'company_name': row[column_mapping['company_name']] if column_mapping['company_name'] is not None and len(row) > column_mapping['company_name'] else '不明'
+                            })
+                            logger.error(f"行 {row_num} 処理エラー: {e}, データ: {row[:4] if len(row) >= 4 else row}, 列マッピング: {column_mapping}")
 
-                    if success:
-                        import_stats['added'] += 1
-                        import_stats['new_companies'].append({
-                            'id': new_id,
-                            'name': company_name,
-                            'website': website,
-                            'job_position': job_position
-                        })
-                        import_stats['details'].append({
-                            'row': row_num,
-                            'status': 'added',
-                            'company_name': company_name,
-                            'company_id': new_id,
-                            'message': f'企業を追加しました（ID: {new_id}）'
-                        })
-                    else:
-                        import_stats['errors'] += 1
-                        import_stats['details'].append({
-                            'row': row_num,
-                            'status': 'error',
-                            'company_name': company_name,
-                            'message': 'CSVファイルへの追加に失敗しました'
-                        })
+                    appender.write_rows(accepted)
+            except BaseException:
+                appender.abort()
+                raise
 
-                except Exception as e:
-                    import_stats['errors'] += 1
-                    import_stats['details'].append({
-                        'row': row_num,
-                        'status': 'error',
-                        'message': f'処理エラー: {str(e)}',
-                        'raw_data': row[:4] if len(row) >= 4 else row,  # デバッグ用
-                        'column_mapping': column_mapping,  # デバッグ用
-                        'company_name': row[column_mapping['company_name']] if column_mapping['company_name'] is not None and len(row) > column_mapping['company_name'] else '不明'
-                    })
-                    logger.error(f"行 {row_num} 処理エラー: {e}, データ: {row[:4] if len(row) >= 4 else row}, 列マッピング: {column_mapping}")
-
-        # 🆕 不完全データ除外数をカウント
-        excluded_count = len([d for d in import_stats['details'] if d.get('status') == 'excluded'])
-        import_stats['incomplete_excluded'] = excluded_count
+            # 採用した全行で企業CSVを原子的に置き換え
+            if appender.commit():
+                import_stats['added'] = appender.count
+            else:
+                import_stats['errors'] += appender.count
+                import_stats['new_companies'] = []
+                for detail in added_details:
+                    detail.pop('company_id', None)
+                    detail['status'] = 'error'
+                    detail['message'] = 'CSVファイルへの追加に失敗しました'
+
+        # 🆕 不完全データ除外数
+        excluded_count = import_stats['incomplete_excluded']
 
         # 結果のサマリー
         if excluded_count > 0:
@@ -7159,7 +7741,7 @@ def start_high_quality_process(command, args, description):
         }
 
         # グローバルプロセスリストに追加
-        running_processes[process_id] = process_info
+        register_running_process(process_id, process_info)
 
         logger.info(f"高品質プロセス開始: {description} (ID: {process_id}, PID: {process.pid})")
 
@@ -7426,10 +8008,10 @@ def api_huganjob_progress():
     try:
         # 実行中のHUGANJOB統合送信プロセスを検索
         huganjob_processes = []
-        for process_id, process_info in running_processes.items():
+        for process_id, process_info in get_all_running_processes().items():
             command = process_info.get('command', '')
             if 'huganjob_unified_sender' in command:
-                progress_info = analyze_huganjob_progress(process_info)
+                progress_info = analyze_huganjob_progress(process_info, get_process_output_text(process_id, process_info))
                 huganjob_processes.append({
                     'process_id': process_id,
                     'status': process_info.get('status', 'unknown'),
@@ -7459,11 +8041,11 @@ def api_huganjob_active_processes():
     try:
         active_processes = []
 
-        # 実行中プロセスから検索
-        for process_id, process_info in running_processes.items():
+        # 実行中プロセスから検索（全ワーカー）
+        for process_id, process_info in get_all_running_processes().items():
             command = process_info.get('command', '')
             if 'huganjob_unified_sender' in command:
-                progress_info = analyze_huganjob_progress(process_info)
+                progress_info = analyze_huganjob_progress(process_info, get_process_output_text(process_id, process_info))
                 active_processes.append({
                     'process_id': process_id,
                     'command': command,
@@ -7489,7 +8071,7 @@ def api_get_active_processes():
     try:
         active_processes = []
 
-        for process_id, process_info in running_processes.items():
+        for process_id, process_info in get_all_running_processes().items():
             active_processes.append({
                 'id': process_id,
                 'command': process_info.get('command', ''),
@@ -7749,6 +8331,7 @@ def api_sheets_monitor_setup():
         }), 500
 
 @app.route('/api/huganjob/stats')
+@conditional_json_response
 def api_huganjob_stats():
     """HUGANJOB統計情報API"""
     try:
@@ -7864,6 +8447,121 @@ def api_huganjob_stats():
         logger.error(f"HUGANJOB統計情報API エラー: {e}")
         return jsonify({'success': False, 'message': str(e)})
 
+@app.route('/api/health')
+def api_health():
+    """死活監視用の軽量エンドポイント（ファイル読み込みなし）"""
+    return jsonify({'status': 'ok', 'pid': os.getpid()})
+
+# 🆕 起動直後の初回アクセスを遅くしないよう、重い初期化は起動後に遅延実行する
+STARTUP_WARMUP_DELAY_SECONDS = 2
+
+def deferred_startup_warmup():
+    """起動後のウォームアップ（pandas読み込み・プロセス履歴読み込み）"""
+    time.sleep(STARTUP_WARMUP_DELAY_SECONDS)
+    started = time.perf_counter()
+    try:
+        import pandas  # noqa: F401  初回の企業一覧表示を速くするため事前に読み込む
+        if STARTUP_LAZY_LOADING:
+            load_process_history()
+        logger.info(f"⚡ 遅延初期化完了 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+    except Exception as e:
+        logger.warning(f"遅延初期化エラー: {e}")
+
+def profile_startup(target_ms=300):
+    """起動時間の内訳を表示（--profile-startup）"""
+    script = os.path.abspath(__file__)
+    dashboard_dir = os.path.dirname(script)
+
+    module_ms = (STARTUP_TIMINGS['module_loaded'] - STARTUP_BEGIN) * 1000
+    imports_ms = (STARTUP_TIMINGS['imports_done'] - STARTUP_BEGIN) * 1000
+    route_count = len(list(app.url_map.iter_rules()))
+
+    print("=" * 60)
+    print("⏱️ HUGANJOBダッシュボード 起動プロファイル")
+    print("=" * 60)
+    print(f"モジュール読み込み全体: {module_ms:7.1f} ms")
+    print(f"  - 依存ライブラリのimport: {imports_ms:7.1f} ms")
+    print(f"  - アプリ・ルート定義 ({route_count}ルート): {module_ms - imports_ms:7.1f} ms")
+
+    # import内訳（-X importtime を別プロセスで取得）
+    env = os.environ.copy()
+    env['PYTHONPATH'] = dashboard_dir + os.pathsep + env.get('PYTHONPATH', '')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import derivative_dashboard'],
+        capture_output=True, text=True, encoding='utf-8', errors='replace', env=env, cwd=os.getcwd()
+    )
+    top_level = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        # インデントなし＝トップレベルでimportされたモジュール
+        if name.startswith(' ') and not name.startswith('  '):
+            top_level.append((int(parts[1]) / 1000, name.strip()))
+    top_level.sort(reverse=True)
+
+    print("\nimport内訳（累積時間・上位15件）:")
+    for cumulative_ms, name in top_level[:15]:
+        print(f"  {cumulative_ms:8.1f} ms  {name}")
+
+    # 初回応答までの時間（別プロセスで起動して /api/health に応答するまで）
+    port = find_available_port(5100, 50)
+    if not port:
+        print("\n❌ 計測用の空きポートが見つかりません")
+        return
+    import urllib.request
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, script, '--port', str(port), '--no-pid-file'],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=os.getcwd())
+    first_response_ms = None
+    try:
+        deadline = started + 30
+        while time.perf_counter() < deadline and server.poll() is None:
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1) as response:
+                    if response.status == 200:
+                        first_response_ms = (time.perf_counter() - started) * 1000
+                        break
+            except OSError:
+                time.sleep(0.005)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    print("")
+    if first_response_ms is None:
+        print("❌ 初回応答を計測できませんでした（ダッシュボードが起動しませんでした）")
+    else:
+        mark = '✅' if first_response_ms <= target_ms else '⚠️'
+        print(f"{mark} 初回応答までの時間: {first_response_ms:.0f} ms (目標 {target_ms} ms)")
+    print("=" * 60)
+
+def periodic_memory_cleanup():
+    """定期的なメモリクリーンアップ"""
+    while True:
+        time.sleep(300)  # 5分間隔
+        try:
+            optimize_memory()
+        except Exception as e:
+            logger.warning(f"定期メモリクリーンアップエラー: {e}")
+
+def start_background_tasks():
+    """バックグラウンド処理を開始（マルチプロセスモードでは各ワーカーで実行）"""
+    cleanup_thread = threading.Thread(target=periodic_memory_cleanup, daemon=True)
+    cleanup_thread.start()
+    logger.info("🧹 定期メモリクリーンアップを開始しました（5分間隔）")
+
+    warmup_thread = threading.Thread(target=deferred_startup_warmup, daemon=True)
+    warmup_thread.start()
+
+STARTUP_TIMINGS['module_loaded'] = time.perf_counter()
+
 if __name__ == '__main__':
     import argparse
 
@@ -7874,8 +8572,19 @@ if __name__ == '__main__':
     parser.add_argument('--debug', action='store_true', help='デバッグモードで起動')
     parser.add_argument('--cleanup', action='store_true', help='既存プロセスをクリーンアップしてから起動')
     parser.add_argument('--auto-port', action='store_true', help='利用可能なポートを自動検索')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='本番用マルチプロセスモードのワーカー数 (デフォルト: 1 = 開発サーバー)')
+    parser.add_argument('--profile-startup', action='store_true', help='起動時間の内訳を表示して終了')
+    parser.add_argument('--no-pid-file', action='store_true', help='PIDファイルを書き込まない（計測・テスト用）')
     args = parser.parse_args()
 
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    if args.profile_startup:
+        profile_startup()
+        sys.exit(0)
+
     try:
         # 初期化処理
         logger.info("=" * 60)
@@ -7919,7 +8628,8 @@ if __name__ == '__main__':
             sys.exit(1)
 
         # PIDファイルを保存
-        save_pid_file(target_port)
+        if not args.no_pid_file:
+            save_pid_file(target_port)
 
         # HUGANJOB起動メッセージ
         logger.info("🚀 HUGANJOBダッシュボードを起動します...")
@@ -7930,20 +8640,17 @@ if __name__ == '__main__':
         logger.info(f"📧 HUGANJOB営業メール送信システム専用")
         logger.info("=" * 60)
 
-        # 定期的なメモリクリーンアップを開始
-        def periodic_memory_cleanup():
-            """定期的なメモリクリーンアップ"""
-            import time
-            while True:
-                time.sleep(300)  # 5分間隔
-                try:
-                    optimize_memory()
-                except Exception as e:
-                    logger.warning(f"定期メモリクリーンアップエラー: {e}")
-
-        cleanup_thread = threading.Thread(target=periodic_memory_cleanup, daemon=True)
-        cleanup_thread.start()
-        logger.info("🧹 定期メモリクリーンアップを開始しました（5分間隔）")
+        # 🆕 本番用マルチプロセスモード（状態は共有ストア経由でワーカー間共有）
+        if args.workers > 1:
+            from derivative_prefork_server import serve_prefork
+            logger.info(f"🏭 本番モード: {args.workers}ワーカーで起動します")
+            serve_prefork(app, args.host, target_port, workers=args.workers,
+                          worker_init=start_background_tasks)
+            sys.exit(0)
+
+        # シングルワーカーではキャッシュの無効化は自プロセス内で完結するため世代番号を確認しない
+        cache_generation_sync_enabled = False
+        start_background_tasks()
 
         # Flaskアプリケーションを起動
         app.run(
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HUGANJOBダッシュボード用 本番マルチプロセスWSGIサーバー
+- 親プロセスでリッスンソケットを作成し、N個のワーカーをforkして共有
+- 各ワーカーはWerkzeugのスレッド付きWSGIサーバーで同じソケットからaccept
+- 親プロセスはワーカーを監視し、異常終了したワーカーを再起動
+- SIGTERM/SIGINTで全ワーカーを停止
+- fork非対応環境（Windows）では単一プロセスで起動
+
+gunicorn等の外部WSGIサーバーを使う場合は derivative_wsgi.py を参照。
+"""
+
+import os
+import time
+import signal
+import socket
+import logging
+
+logger = logging.getLogger(__name__)
+
+PREFORK_SUPPORTED = hasattr(os, 'fork')
+
+# ワーカーが短時間で連続終了した場合の再起動抑制（秒）
+RESPAWN_BACKOFF_SECONDS = 1.0
+
+
+def create_listen_socket(host, port, backlog=512):
+    """全ワーカーで共有するリッスンソケットを作成"""
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, host, port, sock, worker_init=None):
+    """ワーカープロセス本体（fork後の子プロセスで実行）"""
+    from werkzeug.serving import make_server
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    if worker_init:
+        worker_init()
+
+    server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+    logger.info(f"ワーカー起動 (PID: {os.getpid()})")
+    server.serve_forever()
+    os._exit(0)
+
+
+def _spawn_worker(app, host, port, sock, worker_init):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _run_worker(app, host, port, sock, worker_init)
+        except BaseException as e:
+            logger.error(f"ワーカー異常終了 (PID: {os.getpid()}): {e}")
+        os._exit(1)
+    return pid
+
+
+def serve_prefork(app, host, port, workers=4, worker_init=None):
+    """マルチプロセスでWSGIアプリケーションを提供
+
+    Args:
+        app: WSGIアプリケーション
+        host, port: リッスンアドレス
+        workers: ワーカープロセス数
+        worker_init: 各ワーカーでfork直後に呼び出す初期化関数
+    """
+    if not PREFORK_SUPPORTED or workers <= 1:
+        if workers > 1:
+            logger.warning("この環境ではforkが利用できないため、単一プロセスで起動します")
+        from werkzeug.serving import run_simple
+        if worker_init:
+            worker_init()
+        run_simple(host, port, app, threaded=True, use_reloader=False)
+        return
+
+    sock = create_listen_socket(host, port)
+    children = {}
+    stopping = False
+
+    def handle_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        # waitpid()はシグナル後も自動再開されるため例外で待機を抜ける
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, handle_stop)
+    signal.signal(signal.SIGINT, handle_stop)
+
+    logger.info(f"マルチプロセスモードで起動: {workers}ワーカー (http://{host}:{port}/)")
+    for _ in range(workers):
+        pid = _spawn_worker(app, host, port, sock, worker_init)
+        children[pid] = time.time()
+
+    try:
+        while not stopping:
+            try:
+                pid, status = os.waitpid(-1, 0)
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+
+            started_at = children.pop(pid, None)
+            if stopping or started_at is None:
+                continue
+
+            logger.warning(f"ワーカー (PID: {pid}) が終了しました (status: {status})。再起動します")
+            if time.time() - started_at < RESPAWN_BACKOFF_SECONDS:
+                time.sleep(RESPAWN_BACKOFF_SECONDS)
+            new_pid = _spawn_worker(app, host, port, sock, worker_init)
+            children[new_pid] = time.time()
+    except KeyboardInterrupt:
+        logger.info("停止シグナルを受信しました")
+    finally:
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.time() + 10
+        while children and time.time() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.1)
+                continue
+            children.pop(pid, None)
+        sock.close()
+        logger.info("全ワーカーを停止しました")
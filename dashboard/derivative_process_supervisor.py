@@ -0,0 +1,435 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HUGANJOBダッシュボード用 子プロセス出力スーパーバイザー
+- 全子プロセスの標準出力を1スレッドでセレクタ監視（POSIX）
+- プロセスごとに上限付きリングバッファで出力を保持
+- バイト数・行数カウンタを記録
+- パイプのクローズ／SIGCHLDで終了を即座に検出
+- SIGCHLDを設定できない場合（メインスレッド以外から開始した場合）はpoll()の定期確認で終了を検出
+- セレクタがパイプに使えない環境（Windows）ではプロセスごとの読み取りスレッドで代替
+"""
+
+import os
+import time
+import signal
+import logging
+import selectors
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# リングバッファの既定行数（ダッシュボード表示は直近100行）
+DEFAULT_MAX_LINES = 100
+# 1行あたりの最大バイト数（改行なしの巨大出力対策）
+MAX_LINE_BYTES = 8192
+# 1回のread()で読み取る最大バイト数
+READ_CHUNK_SIZE = 65536
+# セレクタ待機のタイムアウト（秒）。終了検出はイベント駆動のため保険としての値
+SELECT_TIMEOUT = 1.0
+# SIGCHLDを設定できない場合にpoll()で終了を確認する間隔（秒）
+EXIT_POLL_INTERVAL = 0.25
+
+# パイプをセレクタで扱えるか（Windowsのselectはソケット専用）
+PIPE_SELECT_SUPPORTED = os.name != 'nt'
+
+
+class ProcessOutputBuffer:
+    """1プロセス分の出力リングバッファとカウンタ"""
+
+    def __init__(self, max_lines=DEFAULT_MAX_LINES):
+        self.lines = deque(maxlen=max_lines)
+        self.partial = b''
+        self.bytes_read = 0
+        self.lines_read = 0
+        self.started_at = time.time()
+        self.last_output_at = None
+        self.closed = False
+
+    def feed(self, data):
+        """読み取ったバイト列を取り込み、完成した行のリストを返す"""
+        self.bytes_read += len(data)
+        self.last_output_at = time.time()
+
+        chunk = self.partial + data
+        parts = chunk.split(b'\n')
+        self.partial = parts.pop()
+
+        # 改行が来ないまま肥大化した場合は強制的に1行として確定
+        if len(self.partial) > MAX_LINE_BYTES:
+            parts.append(self.partial)
+            self.partial = b''
+
+        completed = []
+        for raw in parts:
+            line = raw.rstrip(b'\r').decode('utf-8', errors='replace')
+            if line:
+                self.lines.append(line)
+                completed.append(line)
+        self.lines_read += len(completed)
+        return completed
+
+    def flush(self):
+        """EOF時に残りの未完成行を確定する"""
+        completed = []
+        if self.partial:
+            line = self.partial.rstrip(b'\r').decode('utf-8', errors='replace')
+            self.partial = b''
+            if line:
+                self.lines.append(line)
+                self.lines_read += 1
+                completed.append(line)
+        self.closed = True
+        return completed
+
+    def text(self):
+        return '\n'.join(self.lines)
+
+    def stats(self):
+        return {
+            'output_bytes': self.bytes_read,
+            'output_lines': self.lines_read,
+            'buffered_lines': len(self.lines),
+            'last_output_at': self.last_output_at
+        }
+
+
+class ProcessOutputSupervisor:
+    """全子プロセスの出力を単一スレッドで監視するスーパーバイザー"""
+
+    def __init__(self, on_exit=None, on_line=None, max_lines=DEFAULT_MAX_LINES):
+        """
+        Args:
+            on_exit: 終了時コールバック on_exit(process_id, return_code, output_text)
+            on_line: 行受信時コールバック on_line(process_id, line)
+            max_lines: プロセスごとのリングバッファ行数
+        """
+        self.on_exit = on_exit
+        self.on_line = on_line
+        self.max_lines = max_lines
+
+        self._lock = threading.Lock()
+        self._buffers = {}      # process_id -> ProcessOutputBuffer
+        self._processes = {}    # process_id -> Popen
+        self._pending = deque()  # スーパーバイザースレッドへ登録待ちのプロセス
+        self._exiting = set()   # パイプはクローズ済みで終了待ちのプロセス
+
+        self._thread = None
+        self._running = False
+        self._selector = None
+        self._wakeup_r = None
+        self._wakeup_w = None
+        self._previous_sigchld = None
+        self._sigchld_installed = False
+
+    # ------------------------------------------------------------------
+    # 公開API
+    # ------------------------------------------------------------------
+    def start(self):
+        """スーパーバイザースレッドを開始（多重呼び出し可）"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+
+        if PIPE_SELECT_SUPPORTED:
+            self._selector = selectors.DefaultSelector()
+            self._wakeup_r, self._wakeup_w = os.pipe()
+            os.set_blocking(self._wakeup_r, False)
+            os.set_blocking(self._wakeup_w, False)
+            self._selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+            self._install_sigchld_handler()
+
+            self._thread = threading.Thread(target=self._run_selector_loop,
+                                            name='process-output-supervisor', daemon=True)
+            self._thread.start()
+            logger.info("プロセス出力スーパーバイザーを開始しました（セレクタ方式）")
+        else:
+            logger.info("プロセス出力スーパーバイザーを開始しました（読み取りスレッド方式）")
+
+    def stop(self):
+        """スーパーバイザースレッドを停止"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        self._wakeup()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def watch(self, process_id, process):
+        """プロセスを監視対象に追加（登録済みの場合は何もしない）
+
+        processはstdout=PIPEかつバイナリモード（text=Falseかつbufsize=0推奨）で
+        起動されている必要がある。
+        """
+        self.start()
+
+        with self._lock:
+            if process_id in self._buffers:
+                return False
+            self._buffers[process_id] = ProcessOutputBuffer(self.max_lines)
+            self._processes[process_id] = process
+
+        if PIPE_SELECT_SUPPORTED:
+            with self._lock:
+                self._pending.append(process_id)
+            self._wakeup()
+        else:
+            reader = threading.Thread(target=self._run_reader_thread, args=(process_id, process),
+                                      name=f'process-output-{process_id}', daemon=True)
+            reader.start()
+        return True
+
+    def is_watching(self, process_id):
+        with self._lock:
+            return process_id in self._buffers
+
+    def get_output(self, process_id, default=''):
+        """リングバッファの内容を文字列で取得（要求時にのみ結合）"""
+        with self._lock:
+            buffer = self._buffers.get(process_id)
+            if buffer is None:
+                return default
+            return buffer.text()
+
+    def get_stats(self, process_id):
+        """バイト数・行数カウンタを取得"""
+        with self._lock:
+            buffer = self._buffers.get(process_id)
+            if buffer is None:
+                return {}
+            return buffer.stats()
+
+    def forget(self, process_id):
+        """終了済みプロセスのバッファを破棄"""
+        with self._lock:
+            self._buffers.pop(process_id, None)
+            self._processes.pop(process_id, None)
+
+    # ------------------------------------------------------------------
+    # セレクタ方式（POSIX）
+    # ------------------------------------------------------------------
+    def _install_sigchld_handler(self):
+        """SIGCHLDでセレクタを起こす（メインスレッドからのみ設定可能）"""
+        if not hasattr(signal, 'SIGCHLD'):
+            return
+        if threading.current_thread() is not threading.main_thread():
+            logger.debug("メインスレッド以外から開始したため、poll()の定期確認で終了を検出します")
+            return
+        try:
+            self._previous_sigchld = signal.signal(signal.SIGCHLD, self._handle_sigchld)
+            self._sigchld_installed = True
+        except (ValueError, OSError) as e:
+            logger.debug(f"SIGCHLDハンドラを設定できません（poll()で終了を検出）: {e}")
+
+    def _handle_sigchld(self, signum, frame):
+        self._wakeup()
+        previous = self._previous_sigchld
+        if callable(previous):
+            previous(signum, frame)
+
+    def _wakeup(self):
+        if self._wakeup_w is None:
+            return
+        try:
+            os.write(self._wakeup_w, b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def _drain_wakeup(self):
+        try:
+            while os.read(self._wakeup_r, 4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _register_pending(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return
+                process_id = self._pending.popleft()
+                process = self._processes.get(process_id)
+            if process is None or process.stdout is None:
+                continue
+
+            fd = process.stdout.fileno()
+            try:
+                os.set_blocking(fd, False)
+                self._selector.register(fd, selectors.EVENT_READ, process_id)
+            except (ValueError, OSError) as e:
+                # 登録前にパイプが閉じられた場合は終了待ちへ
+                logger.debug(f"プロセス {process_id} の出力パイプ登録失敗: {e}")
+                self._exiting.add(process_id)
+
+    def _run_selector_loop(self):
+        while self._running:
+            self._register_pending()
+
+            # パイプがクローズ済みのプロセスがあれば短い間隔で終了コードを回収
+            # SIGCHLDで起こされない場合はpoll()の確認間隔で待機する
+            if self._exiting:
+                timeout = 0.05
+            elif self._sigchld_installed:
+                timeout = SELECT_TIMEOUT
+            else:
+                timeout = EXIT_POLL_INTERVAL
+            try:
+                events = self._selector.select(timeout)
+            except (InterruptedError, OSError):
+                events = []
+
+            for key, _ in events:
+                if key.data is None:
+                    self._drain_wakeup()
+                    continue
+                self._read_ready(key.fd, key.data)
+
+            self._poll_registered()
+            self._reap_exited()
+
+        try:
+            self._selector.close()
+        except Exception:
+            pass
+        wakeup_r, wakeup_w = self._wakeup_r, self._wakeup_w
+        self._wakeup_r = self._wakeup_w = None
+        for fd in (wakeup_r, wakeup_w):
+            try:
+                os.close(fd)
+            except (TypeError, OSError):
+                pass
+
+    def _read_ready(self, fd, process_id):
+        try:
+            data = os.read(fd, READ_CHUNK_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            logger.warning(f"プロセス {process_id} 出力読み取りエラー: {e}")
+            data = b''
+
+        if data:
+            self._consume(process_id, data)
+            return
+
+        # EOF: パイプのクローズ＝プロセス終了（または出力の完全クローズ）
+        try:
+            self._selector.unregister(fd)
+        except (KeyError, ValueError):
+            pass
+        self._consume_eof(process_id)
+        self._exiting.add(process_id)
+
+    def _poll_registered(self):
+        """パイプが開いたまま終了したプロセス（孫プロセスがパイプを保持している等）を検出"""
+        try:
+            registered = list(self._selector.get_map().values())
+        except (RuntimeError, ValueError):
+            return
+        for key in registered:
+            process_id = key.data
+            if process_id is None:
+                continue
+            with self._lock:
+                process = self._processes.get(process_id)
+            if process is None or process.poll() is None:
+                continue
+
+            # 終了済み: 読み取れる残りの出力を取り込んでから終了待ちへ
+            while True:
+                try:
+                    data = os.read(key.fd, READ_CHUNK_SIZE)
+                except (BlockingIOError, OSError):
+                    break
+                if not data:
+                    break
+                self._consume(process_id, data)
+            try:
+                self._selector.unregister(key.fd)
+            except (KeyError, ValueError):
+                pass
+            self._consume_eof(process_id)
+            self._exiting.add(process_id)
+
+    def _reap_exited(self):
+        if not self._exiting:
+            return
+        for process_id in list(self._exiting):
+            with self._lock:
+                process = self._processes.get(process_id)
+            if process is None:
+                self._exiting.discard(process_id)
+                continue
+            return_code = process.poll()
+            if return_code is None:
+                continue
+            self._exiting.discard(process_id)
+            self._close_stdout(process)
+            self._notify_exit(process_id, return_code)
+
+    # ------------------------------------------------------------------
+    # 読み取りスレッド方式（Windows）
+    # ------------------------------------------------------------------
+    def _run_reader_thread(self, process_id, process):
+        stream = process.stdout
+        try:
+            read = getattr(stream, 'read1', stream.read)
+            while True:
+                data = read(READ_CHUNK_SIZE)
+                if not data:
+                    break
+                self._consume(process_id, data)
+        except Exception as e:
+            logger.warning(f"プロセス {process_id} 出力読み取りエラー: {e}")
+        self._consume_eof(process_id)
+        return_code = process.wait()
+        self._close_stdout(process)
+        self._notify_exit(process_id, return_code)
+
+    # ------------------------------------------------------------------
+    # 共通処理
+    # ------------------------------------------------------------------
+    def _consume(self, process_id, data):
+        with self._lock:
+            buffer = self._buffers.get(process_id)
+            if buffer is None:
+                return
+            lines = buffer.feed(data)
+        self._emit_lines(process_id, lines)
+
+    def _consume_eof(self, process_id):
+        with self._lock:
+            buffer = self._buffers.get(process_id)
+            if buffer is None:
+                return
+            lines = buffer.flush()
+        self._emit_lines(process_id, lines)
+
+    def _emit_lines(self, process_id, lines):
+        if not self.on_line:
+            return
+        for line in lines:
+            try:
+                self.on_line(process_id, line)
+            except Exception as e:
+                logger.debug(f"行コールバックエラー: {e}")
+
+    def _close_stdout(self, process):
+        try:
+            if process.stdout:
+                process.stdout.close()
+        except Exception:
+            pass
+
+    def _notify_exit(self, process_id, return_code):
+        output = self.get_output(process_id)
+        if self.on_exit:
+            try:
+                self.on_exit(process_id, return_code, output)
+            except Exception as e:
+                logger.error(f"プロセス {process_id} 終了コールバックエラー: {e}")
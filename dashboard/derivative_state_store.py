@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HUGANJOBダッシュボード用 共有状態ストア（SQLite）
+- マルチプロセス（複数ワーカー）間で共有する状態を1つのSQLiteファイルに保持
+  - 実行中プロセスのレジストリ（出力スナップショットを含む）
+  - 共有キャッシュ（キー・値・更新時刻）とキャッシュ世代番号
+  - メール開封イベントの重複排除キー
+  - プロセス間排他ロック
+- 長時間の排他（CSVインポートなど）は状態ストアの書き込みトランザクションを使わず、
+  file_lock（ロックファイルによるプロセス間排他）を使う
+- WALモードで読み取りと書き込みを並行させる
+- 接続はプロセス（fork後を含む）・スレッドごとに自動生成
+"""
+
+import os
+import json
+import time
+import pickle
+import sqlite3
+import logging
+import datetime
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_DB = 'data/huganjob_consolidated/dashboard_state.sqlite3'
+
+# 書き込み競合時の待機時間（秒）
+BUSY_TIMEOUT_SECONDS = 10
+
+# 開封イベントの重複排除キーの保持期間（秒）と期限切れキーの削除間隔（秒）
+# 保持期間を過ぎたイベントの重複は開封記録CSVの確認で排除される
+OPEN_EVENT_TTL_SECONDS = 7 * 24 * 3600
+OPEN_EVENT_PRUNE_INTERVAL_SECONDS = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS processes (
+    process_id   TEXT PRIMARY KEY,
+    owner_pid    INTEGER NOT NULL,
+    info         TEXT NOT NULL,
+    output       TEXT NOT NULL DEFAULT '',
+    output_bytes INTEGER NOT NULL DEFAULT 0,
+    output_lines INTEGER NOT NULL DEFAULT 0,
+    updated_at   REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cache (
+    key        TEXT PRIMARY KEY,
+    value      BLOB NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS generations (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS open_events (
+    event_key  TEXT PRIMARY KEY,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS open_events_created_at ON open_events (created_at);
+"""
+
+# プロセス情報のうち日時として保存・復元するキー
+_DATETIME_KEYS = ('start_time', 'end_time')
+_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+def _encode_process_info(info):
+    """プロセス情報をJSONに変換（Popen等の非シリアライズ値は除外）"""
+    data = {}
+    for key, value in info.items():
+        if key in ('process', 'output'):
+            continue
+        if isinstance(value, datetime.datetime):
+            value = value.strftime(_DATETIME_FORMAT)
+        elif not isinstance(value, (str, int, float, bool, list, dict, type(None))):
+            continue
+        data[key] = value
+    return json.dumps(data, ensure_ascii=False)
+
+
+@contextmanager
+def file_lock(path):
+    """ロックファイルによるプロセス間排他ロック（取得できるまで待機）
+
+    SQLiteの書き込みトランザクションを保持しないため、長時間の処理を排他しても
+    状態ストアの他の書き込み（プロセスレジストリ・開封イベントなど）を妨げない。
+    ロックはファイルを開いたハンドルごとのため、同じプロセスのスレッド間でも排他される。
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'a+b') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            while True:
+                try:
+                    # LK_LOCK は約10秒で諦めるため、取得できるまで繰り返す
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _decode_process_info(text):
+    data = json.loads(text)
+    for key in _DATETIME_KEYS:
+        value = data.get(key)
+        if isinstance(value, str):
+            try:
+                data[key] = datetime.datetime.strptime(value, _DATETIME_FORMAT)
+            except ValueError:
+                pass
+    return data
+
+
+class DashboardStateStore:
+    """ダッシュボードのワーカー間共有状態ストア"""
+
+    def __init__(self, db_path=DEFAULT_STATE_DB, open_event_ttl=OPEN_EVENT_TTL_SECONDS):
+        self.db_path = db_path
+        self.open_event_ttl = open_event_ttl
+        self._local = threading.local()
+        self._initialized_pid = None
+        self._init_lock = threading.Lock()
+        self._open_events_pruned_at = 0.0
+
+    # ------------------------------------------------------------------
+    # 接続管理
+    # ------------------------------------------------------------------
+    def _connect(self):
+        """現在のプロセス・スレッド用の接続を取得（fork後は作り直す）"""
+        pid = os.getpid()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and getattr(self._local, 'pid', None) == pid:
+            return conn
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_SECONDS,
+                               isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+
+        with self._init_lock:
+            if self._initialized_pid != pid:
+                conn.executescript(SCHEMA)
+                self._initialized_pid = pid
+
+        self._local.conn = conn
+        self._local.pid = pid
+        return conn
+
+    @contextmanager
+    def lock(self):
+        """プロセス間排他ロック（SQLiteの書き込みトランザクションを利用）"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        finally:
+            conn.execute('COMMIT')
+
+    # ------------------------------------------------------------------
+    # プロセスレジストリ
+    # ------------------------------------------------------------------
+    def upsert_process(self, process_id, info):
+        """プロセス情報を登録・更新（出力スナップショットは保持）"""
+        conn = self._connect()
+        conn.execute(
+            'INSERT INTO processes (process_id, owner_pid, info, updated_at) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(process_id) DO UPDATE SET owner_pid=excluded.owner_pid, '
+            'info=excluded.info, updated_at=excluded.updated_at',
+            (str(process_id), os.getpid(), _encode_process_info(info), time.time())
+        )
+
+    def update_process_output(self, process_id, output, output_bytes, output_lines):
+        """プロセス出力のスナップショットを更新"""
+        conn = self._connect()
+        conn.execute(
+            'UPDATE processes SET output=?, output_bytes=?, output_lines=?, updated_at=? WHERE process_id=?',
+            (output, output_bytes, output_lines, time.time(), str(process_id))
+        )
+
+    def remove_process(self, process_id):
+        conn = self._connect()
+        conn.execute('DELETE FROM processes WHERE process_id=?', (str(process_id),))
+
+    def get_process(self, process_id):
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT process_id, owner_pid, info, output, output_bytes, output_lines FROM processes WHERE process_id=?',
+            (str(process_id),)
+        ).fetchone()
+        return self._row_to_process(row) if row else None
+
+    def list_processes(self):
+        """全ワーカーの実行中プロセスを {process_id: info} で取得"""
+        conn = self._connect()
+        rows = conn.execute(
+            'SELECT process_id, owner_pid, info, output, output_bytes, output_lines FROM processes'
+        ).fetchall()
+        processes = {}
+        for row in rows:
+            info = self._row_to_process(row)
+            processes[row[0]] = info
+        return processes
+
+    def prune_orphan_processes(self, is_alive):
+        """所有ワーカーが存在しないプロセス登録を削除"""
+        conn = self._connect()
+        rows = conn.execute('SELECT process_id, owner_pid FROM processes').fetchall()
+        removed = 0
+        for process_id, owner_pid in rows:
+            if not is_alive(owner_pid):
+                conn.execute('DELETE FROM processes WHERE process_id=?', (process_id,))
+                removed += 1
+        return removed
+
+    @staticmethod
+    def _row_to_process(row):
+        process_id, owner_pid, info_text, output, output_bytes, output_lines = row
+        info = _decode_process_info(info_text)
+        info['owner_pid'] = owner_pid
+        info['output'] = output
+        info['output_bytes'] = output_bytes
+        info['output_lines'] = output_lines
+        return info
+
+    # ------------------------------------------------------------------
+    # 共有キャッシュ
+    # ------------------------------------------------------------------
+    def cache_get(self, key, max_age=None):
+        """キャッシュ値を取得（期限切れ・未登録はNone）"""
+        conn = self._connect()
+        row = conn.execute('SELECT value, updated_at FROM cache WHERE key=?', (key,)).fetchone()
+        if not row:
+            return None
+        value, updated_at = row
+        if max_age is not None and time.time() - updated_at >= max_age:
+            return None
+        try:
+            return pickle.loads(value)
+        except Exception as e:
+            logger.debug(f"共有キャッシュの復元に失敗しました ({key}): {e}")
+            return None
+
+    def cache_set(self, key, value):
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache (key, value, updated_at) VALUES (?, ?, ?)',
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), time.time())
+        )
+
+    def cache_clear(self):
+        conn = self._connect()
+        conn.execute('DELETE FROM cache')
+
+    def get_generation(self, name):
+        conn = self._connect()
+        row = conn.execute('SELECT value FROM generations WHERE name=?', (name,)).fetchone()
+        return row[0] if row else 0
+
+    def bump_generation(self, name):
+        """世代番号を進める（他ワーカーのローカルキャッシュ無効化に使用）"""
+        conn = self._connect()
+        conn.execute(
+            'INSERT INTO generations (name, value) VALUES (?, 1) '
+            'ON CONFLICT(name) DO UPDATE SET value=value+1',
+            (name,)
+        )
+        return self.get_generation(name)
+
+    # ------------------------------------------------------------------
+    # 開封イベント重複排除
+    # ------------------------------------------------------------------
+    def claim_open_event(self, event_key):
+        """開封イベントを登録。初回のみTrue（全ワーカーで原子的）
+
+        記録に失敗した場合は release_open_event で登録を取り消すこと。
+        """
+        conn = self._connect()
+        now = time.time()
+        if now - self._open_events_pruned_at >= OPEN_EVENT_PRUNE_INTERVAL_SECONDS:
+            self._open_events_pruned_at = now
+            self.prune_open_events(now)
+        cursor = conn.execute(
+            'INSERT OR IGNORE INTO open_events (event_key, created_at) VALUES (?, ?)',
+            (event_key, now)
+        )
+        return cursor.rowcount == 1
+
+    def release_open_event(self, event_key):
+        """開封イベントの登録を取り消す（記録に失敗した場合に次の開封で再度記録できるようにする）"""
+        conn = self._connect()
+        conn.execute('DELETE FROM open_events WHERE event_key=?', (event_key,))
+
+    def prune_open_events(self, now=None):
+        """保持期間を過ぎた開封イベントを削除し、削除件数を返す"""
+        conn = self._connect()
+        cutoff = (now if now is not None else time.time()) - self.open_event_ttl
+        cursor = conn.execute('DELETE FROM open_events WHERE created_at < ?', (cutoff,))
+        return cursor.rowcount
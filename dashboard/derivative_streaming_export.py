@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HUGANJOBダッシュボード用 ストリーミングエクスポート
+- 元CSVを1行ずつ読みながらフィルタし、CSVまたはNDJSONとして逐次出力
+- 企業ID範囲・ステータス・日付範囲のフィルタに対応
+- gzip圧縮もストリーム上で実施（Accept-Encoding は q値まで解釈して判定）
+- 全件をメモリに載せないため、10万行以上でもメモリ使用量は一定
+"""
+
+import io
+import csv
+import json
+import zlib
+import datetime
+
+# 出力チャンクの目安サイズ（バイト）
+CHUNK_SIZE = 64 * 1024
+
+# 日付列の解析に使う書式（先頭から順に試行）
+DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d', '%Y/%m/%d %H:%M:%S', '%Y/%m/%d')
+
+
+def iter_csv_rows(file_path, encoding='utf-8-sig'):
+    """CSVを1行ずつ辞書で返す（ファイル全体は読み込まない）"""
+    with open(file_path, 'r', encoding=encoding, errors='replace', newline='') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            # 列数がヘッダーより多い行の余剰値は除外
+            row.pop(None, None)
+            yield row
+
+
+def read_csv_header(file_path, encoding='utf-8-sig'):
+    """CSVのヘッダー行のみを取得"""
+    with open(file_path, 'r', encoding=encoding, errors='replace', newline='') as f:
+        return next(csv.reader(f), [])
+
+
+def parse_date(value):
+    """日付文字列を datetime に変換（解析できない場合は None）"""
+    if not value:
+        return None
+    value = value.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def filter_rows(rows, id_column=None, start_id=None, end_id=None,
+                status_column=None, statuses=None,
+                date_column=None, date_from=None, date_to=None):
+    """行ストリームにフィルタを適用
+
+    Args:
+        statuses: 許可するステータス値の集合。空文字は「未設定」を表す
+        date_from, date_to: datetime（date_to はその日の終わりまでを含む）
+    """
+    for row in rows:
+        if id_column and (start_id is not None or end_id is not None):
+            try:
+                company_id = int(str(row.get(id_column, '')).strip())
+            except ValueError:
+                continue
+            if start_id is not None and company_id < start_id:
+                continue
+            if end_id is not None and company_id > end_id:
+                continue
+
+        if status_column and statuses is not None:
+            if (row.get(status_column) or '').strip() not in statuses:
+                continue
+
+        if date_column and (date_from or date_to):
+            row_date = parse_date(row.get(date_column, ''))
+            if row_date is None:
+                continue
+            if date_from and row_date < date_from:
+                continue
+            if date_to and row_date >= date_to:
+                continue
+
+        yield row
+
+
+def stream_csv(rows, fieldnames, with_bom=True):
+    """行ストリームをCSVのバイトチャンクとして逐次出力（Excel互換のBOM付きUTF-8）"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore')
+    if with_bom:
+        buffer.write('\ufeff')
+    writer.writeheader()
+
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def stream_ndjson(rows):
+    """行ストリームをNDJSON（1行1JSON）のバイトチャンクとして逐次出力"""
+    parts = []
+    size = 0
+    for row in rows:
+        line = json.dumps(row, ensure_ascii=False) + '\n'
+        parts.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield ''.join(parts).encode('utf-8')
+            parts = []
+            size = 0
+    if parts:
+        yield ''.join(parts).encode('utf-8')
+
+
+def accepts_gzip(accept_encoding):
+    """Accept-Encoding ヘッダーがgzipを受け付けるか（q値を解釈し、q=0 は拒否とみなす）
+
+    gzip（x-gzip）が明示されていればそのq値、なければ * のq値で判定する。
+    """
+    qualities = {}
+    for item in (accept_encoding or '').split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        if coding == 'x-gzip':
+            coding = 'gzip'
+        qualities[coding] = max(quality, qualities.get(coding, 0.0))
+
+    if 'gzip' in qualities:
+        return qualities['gzip'] > 0
+    return qualities.get('*', 0.0) > 0
+
+
+def gzip_stream(chunks, level=6):
+    """バイトチャンクのストリームをgzip形式で逐次圧縮"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HUGANJOBダッシュボード WSGIエントリポイント（外部WSGIサーバー用）
+
+リポジトリのルートディレクトリで実行すること（データファイルは相対パス）。
+
+    gunicorn --pythonpath dashboard -w 4 --threads 8 -b 127.0.0.1:5002 derivative_wsgi:application
+
+実行中プロセス・キャッシュ無効化・開封重複排除は共有状態ストア
+（data/huganjob_consolidated/dashboard_state.sqlite3）を介してワーカー間で共有される。
+外部サーバーを使わない場合は `python dashboard/derivative_dashboard.py --workers 4` で起動できる。
+"""
+
+from derivative_dashboard import app, ensure_directories, initialize_config_files, start_background_tasks
+
+ensure_directories()
+initialize_config_files()
+start_background_tasks()
+
+application = app
@@ -14,9 +14,16 @@ import logging
 import sys
 import os
 import time
+import threading
+import concurrent.futures
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 
+# 共通モジュール（core_scripts）
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core_scripts'))
+
+from derivative_email_validation import RESOLVER_RULES
+
 # ログ設定（高速化のためINFOレベルに設定）
 logging.basicConfig(
     level=logging.INFO,
@@ -32,6 +39,31 @@ logger = logging.getLogger(__name__)
 logging.getLogger('requests').setLevel(logging.WARNING)
 logging.getLogger('urllib3').setLevel(logging.WARNING)
 
+# メールアドレス決定結果の出力ファイル
+DEFAULT_RESULTS_FILE = 'huganjob_email_resolution_results.csv'
+
+# ウェブサイト抽出の同時実行数の既定値
+DEFAULT_RESOLVER_WORKERS = 8
+
+# 決定結果をファイルに書き出す間隔（件数・秒）
+RESULTS_FLUSH_EVERY = 200
+RESULTS_FLUSH_INTERVAL = 10.0
+
+# extract_email_from_website で検索する抽出結果ファイル（検索順、企業ID列は '企業ID' → 'ID' の順に照合）
+EXTRACTION_RESULT_FILES = (
+    'new_email_extraction_results_latest.csv',
+    'huganjob_email_extraction_results.csv',
+    'derivative_ad_email_extraction_results.csv'
+)
+
+# parse_extraction_result で最新の結果を検索する抽出結果ファイル（検索順、企業ID列は 'ID' → '企業ID' の順に照合）
+LATEST_RESULT_FILES = (
+    'email_extraction_results.csv',
+    'derivative_ad_email_extraction_results.csv',
+    'huganjob_email_extraction_results.csv'
+)
+LATEST_RESULT_ID_COLUMNS = ('ID', '企業ID')
+
 class HuganJobEmailResolver:
     """HUGAN JOB メールアドレス決定クラス"""
     
@@ -45,6 +77,13 @@ class HuganJobEmailResolver:
         self.csv_file_path = csv_file_path
         self.companies_df = None
         self.email_results = []
+        # 既存の抽出結果（初回の検索時に1回だけ読み込む）と高度なメール抽出器（スレッドごとに1つを使い回す）
+        self.result_store = None
+        self.extractors = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # 取得元ごとの処理件数・時間（resolve_email_addresses で集計）
+        self.resolution_stats = {}
         
         # ログディレクトリ作成
         os.makedirs('logs', exist_ok=True)
@@ -84,122 +123,19 @@ class HuganJobEmailResolver:
         Returns:
             bool: 有効な場合True
         """
-        if pd.isna(email) or email in ['‐', '-', '', ' ', None]:
-            return False
-
-        email_str = str(email).strip()
-        if not email_str:
-            return False
-
-        # 基本的なメールアドレス形式チェック
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email_str):
-            return False
-
-        # 長さチェック
-        if len(email_str) > 254:  # RFC 5321の制限
-            return False
-
-        # ローカル部とドメイン部の分離
-        try:
-            local_part, domain_part = email_str.split('@', 1)
-            if len(local_part) > 64 or len(local_part) == 0:  # RFC 5321の制限
-                return False
-            if len(domain_part) == 0:
-                return False
-        except ValueError:
-            return False
-
-        # 無効なファイル拡張子の除外チェック（大幅拡張）
-        invalid_extensions = {
-            # 画像ファイル
-            '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.bmp', '.ico',
-            '.tiff', '.tif', '.avif', '.heic', '.heif',
-            # ウェブファイル
-            '.css', '.js', '.woff', '.woff2', '.otf', '.ttf', '.eot',
-            '.map', '.json', '.xml', '.html', '.htm',
-            # 無効なドメイン拡張子
-            '.print', '.catalog', '.shop', '.contact', '.nav', '.main',
-            '.logo', '.banner', '.header', '.footer', '.sidebar', '.content',
-            '.image', '.string', '.easing', '.name', '.version', '.params',
-            '.config', '.settings', '.options', '.plugin', '.custom',
-            '.retargeting', '.datalayer', '.large', '.term', '.jquery',
-            # JavaScript/CSS関連
-            '.init', '.top', '.bottom', '.post', '.postdata', '.combox',
-            '.duration', '.after', '.selector', '.offset', '.areas',
-            '.mode', '.me', '.tag', '.captcha', '.mp', '.bg', '.com'
-        }
-
-        # レスポンシブ画像パターンの除外チェック（@2x.png, @3x.jpg等）
-        responsive_patterns = [
-            r'@\d+x\.(jpg|jpeg|png|gif|svg|webp|bmp|ico)$',
-            r'@retina\.(jpg|jpeg|png|gif|svg|webp|bmp|ico)$',
-            r'@mobile\.(jpg|jpeg|png|gif|svg|webp|bmp|ico)$',
-            r'@tablet\.(jpg|jpeg|png|gif|svg|webp|bmp|ico)$'
-        ]
-
-        email_lower = email_str.lower()
-
-        # 無効な拡張子の事前チェック（高速化）
-        if any(email_lower.endswith(ext) for ext in invalid_extensions):
-            return False
-
-        # ドメイン部の基本チェック
-        if not domain_part or '.' not in domain_part:
-            return False
-
-        # 有効なTLDパターンのチェック
-        domain_parts = domain_part.split('.')
-        if len(domain_parts) < 2:
-            return False
-
-        # 最後の部分（TLD）が有効かチェック
-        tld = domain_parts[-1]
-        if len(tld) < 2 or not tld.isalpha():
-            return False
-
-        # 連続するドットや無効な文字のチェック
-        if '..' in email_str or email_str.startswith('.') or email_str.endswith('.'):
-            return False
-
-        # レスポンシブ画像パターンチェック
-        for pattern in responsive_patterns:
-            if re.search(pattern, email_lower):
-                return False
-
-        # 一般的な無効パターンの除外
-        invalid_patterns = [
-            r'@\d+x\d+\.',  # @1080x360.jpg等のサイズ指定
-            r'@sp\.',       # @sp.jpg等のスマートフォン用
-            r'@pc\.',       # @pc.jpg等のPC用
-            r'@mobile\.',   # @mobile.jpg等
-            r'@tablet\.',   # @tablet.jpg等
-            r'banner.*@.*\.(jpg|png|gif|svg)',  # バナー画像
-            r'logo.*@.*\.(jpg|png|gif|svg)',    # ロゴ画像
-            r'icon.*@.*\.(jpg|png|gif|svg)',    # アイコン画像
-            r'hero.*@.*\.(jpg|png|gif|svg)',    # ヒーロー画像
-            r'thumb.*@.*\.(jpg|png|gif|svg)',   # サムネイル画像
-        ]
+        return RESOLVER_RULES.is_valid(email)
 
-        for pattern in invalid_patterns:
-            if re.search(pattern, email_lower):
-                return False
-
-        # 高速パターンマッチング：JavaScript/CSS変数パターンの除外
-        invalid_patterns = [
-            'window.', '.prototype.', '.version', '.params', '.config', '.settings', '.options',
-            '@plugin.', '@custom.', '@retargeting.', '@datalayer.', '@large.', '@term.', '@jquery.',
-            'summary@', 'search@', 'my@', 'gtm4wp@', '@reset.', '@polisy.', '@bg.', '@scroll.',
-            '@fade.', '@hide.', '@element.', '@container.', '@widget.', '@reload.', '@check.',
-            '@unit.', '@post.', '@challenge.', '@captcha.', '@2.', '@sp.', '@pc.', '@mobile.',
-            '@tablet.', 'comp-', 'webpackjsonp', 'self.webpackjsonp', 'thunderbolt.app'
-        ]
+    def valid_email_mask(self, emails):
+        """
+        is_valid_email と同じ判定を列単位で一括して行う
 
-        # 高速文字列検索（正規表現より高速）
-        if any(pattern in email_lower for pattern in invalid_patterns):
-            return False
+        Args:
+            emails (pd.Series): チェック対象のメールアドレスの列
 
-        return True
+        Returns:
+            pd.Series: 有効な場合True（emails と同じインデックス）
+        """
+        return RESOLVER_RULES.valid_mask(pd.Series(emails, dtype=object))
     
     def extract_email_from_website(self, company_id, company_name, website_url):
         """
@@ -214,43 +150,15 @@ class HuganJobEmailResolver:
             str or None: 抽出されたメールアドレス、失敗時はNone
         """
         try:
-            # 既存のメール抽出結果ファイルをチェック
-            extraction_files = [
-                'new_email_extraction_results_latest.csv',
-                'huganjob_email_extraction_results.csv',
-                'derivative_ad_email_extraction_results.csv'
-            ]
-
-            for extraction_file in extraction_files:
-                if os.path.exists(extraction_file):
-                    try:
-                        extraction_df = pd.read_csv(extraction_file, encoding='utf-8')
-
-                        # 企業IDまたは企業名で検索
-                        if '企業ID' in extraction_df.columns:
-                            match = extraction_df[extraction_df['企業ID'] == company_id]
-                        elif 'ID' in extraction_df.columns:
-                            match = extraction_df[extraction_df['ID'] == company_id]
-                        else:
-                            # 企業名で検索
-                            match = extraction_df[extraction_df['企業名'] == company_name]
-
-                        if not match.empty:
-                            email_col = None
-                            for col in ['メールアドレス', 'email', 'Email', 'EMAIL']:
-                                if col in match.columns:
-                                    email_col = col
-                                    break
-
-                            if email_col:
-                                extracted_email = match.iloc[0][email_col]
-                                if self.is_valid_email(extracted_email):
-                                    logger.info(f"既存抽出結果から取得: {company_name} -> {extracted_email}")
-                                    return extracted_email.strip()
-
-                    except Exception as e:
-                        logger.warning(f"抽出結果ファイル読み込みエラー: {extraction_file} - {e}")
-                        continue
+            # 既存のメール抽出結果（索引化済み、企業ID → 同じドメイン・同じ企業名の順に照合）
+            result_store = self.get_result_store()
+            if result_store is not None:
+                candidates = result_store.candidates(company_id, company_name, website_url, paths=EXTRACTION_RESULT_FILES)
+                for extraction_file, extracted_email in candidates:
+                    if self.is_valid_email(extracted_email):
+                        logger.info(f"既存抽出結果から取得: {company_name} -> {extracted_email} ({extraction_file})")
+                        self._local.extraction_source = 'existing_results'
+                        return extracted_email.strip()
 
             # 既存の抽出結果が見つからない場合は、新規抽出を実行
             logger.info(f"新規メール抽出実行: {company_name} ({website_url})")
@@ -279,10 +187,12 @@ class HuganJobEmailResolver:
             extracted_email = self.advanced_email_extraction(company_id, company_name, website_url)
             if extracted_email:
                 logger.info(f"✅ 高度抽出成功: {company_name} -> {extracted_email}")
+                self._local.extraction_source = 'advanced_extraction'
                 return extracted_email
 
             # 高度抽出が失敗した場合は簡易抽出を実行
             logger.info(f"🌐 簡易抽出にフォールバック: {company_name}")
+            self._local.extraction_source = 'simple_extraction'
             return self.simple_email_extraction(website_url, company_name)
 
         except Exception as e:
@@ -302,24 +212,9 @@ class HuganJobEmailResolver:
             str or None: 抽出されたメールアドレス、失敗時はNone
         """
         try:
-            # 既存の高度なメール抽出クラスをインポート
-            import sys
-            import os
-
-            # core_scriptsディレクトリをパスに追加
-            core_scripts_path = os.path.join(os.getcwd(), 'core_scripts')
-            if core_scripts_path not in sys.path:
-                sys.path.append(core_scripts_path)
-
-            from derivative_email_extractor import PrioritizedEmailExtractor
-
-            # 高度なメール抽出器を初期化（高速設定）
-            extractor = PrioritizedEmailExtractor(
-                timeout=5,
-                max_retries=1,
-                use_dynamic_extraction=False,  # 高速化のため無効
-                use_contact_form_analysis=False  # 高速化のため無効
-            )
+            # 高度なメール抽出器（決定処理全体で1つを使い回す）
+            extractor = self.get_extractor()
+            extractor.visited_urls = set()
 
             # 優先順位に基づくメール抽出を実行
             result = extractor.extract_emails_with_priority(
@@ -370,38 +265,15 @@ class HuganJobEmailResolver:
             str or None: 抽出されたメールアドレス
         """
         try:
-            # 最新の抽出結果ファイルをチェック
-            result_files = [
-                'email_extraction_results.csv',
-                'derivative_ad_email_extraction_results.csv',
-                'huganjob_email_extraction_results.csv'
-            ]
-
-            for result_file in result_files:
-                if os.path.exists(result_file):
-                    try:
-                        df = pd.read_csv(result_file, encoding='utf-8')
-
-                        # 企業IDまたは企業名で検索
-                        if 'ID' in df.columns:
-                            match = df[df['ID'] == company_id]
-                        elif '企業ID' in df.columns:
-                            match = df[df['企業ID'] == company_id]
-                        else:
-                            match = df[df['企業名'] == company_name]
-
-                        if not match.empty:
-                            # メールアドレス列を探す
-                            email_cols = ['メールアドレス', 'email', 'Email', 'EMAIL', 'extracted_email']
-                            for col in email_cols:
-                                if col in match.columns:
-                                    email = match.iloc[-1][col]  # 最新の結果を取得
-                                    if self.is_valid_email(email):
-                                        return str(email).strip()
-
-                    except Exception as e:
-                        logger.warning(f"結果ファイル読み込みエラー: {result_file} - {e}")
-                        continue
+            result_store = self.get_result_store()
+            if result_store is None:
+                return None
+
+            # 最新の抽出結果（各ファイルの最後の行）を優先順に照合
+            for _, email in result_store.candidates(company_id, company_name, latest=True, paths=LATEST_RESULT_FILES,
+                                                    id_columns=LATEST_RESULT_ID_COLUMNS):
+                if self.is_valid_email(email):
+                    return str(email).strip()
 
             return None
 
@@ -409,6 +281,64 @@ class HuganJobEmailResolver:
             logger.error(f"抽出結果解析エラー: {e}")
             return None
 
+    def get_result_store(self):
+        """既存の抽出結果のストアを取得（初回のみ作成、利用できない場合はNone）"""
+        if self.result_store is None:
+            try:
+                core_scripts_path = os.path.join(os.getcwd(), 'core_scripts')
+                if core_scripts_path not in sys.path:
+                    sys.path.append(core_scripts_path)
+
+                from derivative_extraction_store import ExtractionResultStore
+            except ImportError as e:
+                logger.warning(f"抽出結果ストアのインポートに失敗: {e}")
+                return None
+            self.result_store = ExtractionResultStore(
+                EXTRACTION_RESULT_FILES + tuple(path for path in LATEST_RESULT_FILES if path not in EXTRACTION_RESULT_FILES)
+            )
+        return self.result_store
+
+    def get_extractor(self):
+        """高度なメール抽出器を取得（スレッドごとに初回のみ作成し、セッション・接続を使い回す）"""
+        extractor = getattr(self._local, 'extractor', None)
+        if extractor is None:
+            core_scripts_path = os.path.join(os.getcwd(), 'core_scripts')
+            if core_scripts_path not in sys.path:
+                sys.path.append(core_scripts_path)
+
+            from derivative_email_extractor import PrioritizedEmailExtractor
+
+            # 高速設定で初期化
+            extractor = self._local.extractor = PrioritizedEmailExtractor(
+                timeout=5,
+                max_retries=1,
+                use_dynamic_extraction=False,  # 高速化のため無効
+                use_contact_form_analysis=False  # 高速化のため無効
+            )
+            with self._lock:
+                self.extractors.append(extractor)
+        return extractor
+
+    def close(self):
+        """高度なメール抽出器が使うHTML解析のプロセスプールを終了"""
+        with self._lock:
+            parse_pools = {id(extractor.parse_pool): extractor.parse_pool for extractor in self.extractors}
+        for parse_pool in parse_pools.values():
+            parse_pool.shutdown()
+
+    def get_http_cache(self):
+        """共有HTTPキャッシュを取得（利用できない場合はNone）"""
+        try:
+            core_scripts_path = os.path.join(os.getcwd(), 'core_scripts')
+            if core_scripts_path not in sys.path:
+                sys.path.append(core_scripts_path)
+
+            from derivative_http_cache import get_shared_cache
+            return get_shared_cache()
+        except ImportError as e:
+            logger.warning(f"HTTPキャッシュのインポートに失敗: {e}")
+            return None
+
     def simple_email_extraction(self, website_url, company_name):
         """
         簡易メール抽出（ウェブスクレイピング）
@@ -430,7 +360,14 @@ class HuganJobEmailResolver:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
 
-            response = requests.get(website_url, headers=headers, timeout=10)
+            # 共有HTTPキャッシュ経由で取得（抽出・分析で取得済みのページは再取得しない）
+            http_cache = self.get_http_cache()
+            if http_cache is not None:
+                response = http_cache.get(
+                    website_url, lambda url, conditional: requests.get(url, headers={**headers, **conditional}, timeout=10)
+                )
+            else:
+                response = requests.get(website_url, headers=headers, timeout=10)
             response.raise_for_status()
 
             # メールアドレスパターンを検索（有効なTLDのみ）
@@ -478,12 +415,47 @@ class HuganJobEmailResolver:
             logger.warning(f"❌ 簡易抽出エラー: {company_name} - {e}")
             return None
     
-    def resolve_email_addresses(self):
+    def plan_website_extraction(self, pending):
+        """
+        ウェブサイト抽出の対象をドメイン単位にまとめる
+
+        Args:
+            pending (list): (結果, 行) のリスト
+
+        Returns:
+            list: (代表の (結果, 行), 同じドメインの (結果, 行) のリスト) のリスト
+        """
+        try:
+            core_scripts_path = os.path.join(os.getcwd(), 'core_scripts')
+            if core_scripts_path not in sys.path:
+                sys.path.append(core_scripts_path)
+
+            from derivative_domain_planner import plan_by_domain
+        except ImportError as e:
+            logger.warning(f"ドメイン単位の処理計画のインポートに失敗（1社ずつ抽出します）: {e}")
+            return [(item, [item]) for item in pending]
+
+        plan = plan_by_domain(pending, get_url=lambda item: item[1]['企業ホームページ'],
+                              get_name=lambda item: item[1]['企業名'])
+        units = [(group.representative, group.members) for group in plan.groups]
+        # URLのない企業も既存の抽出結果を参照するため1社ずつ処理
+        units += [(item, [item]) for item in plan.unplanned]
+        logger.info(f"ウェブサイト抽出: {len(pending)}社 → {len(units)}件（ユニークドメイン {plan.domains}件）")
+        return units
+
+    def resolve_email_addresses(self, workers=DEFAULT_RESOLVER_WORKERS, output_file=None):
         """
         全企業のメールアドレスを決定
-        
+
+        第1段階でCSVの担当者メールアドレスを列単位で一括判定し（CSV直接）、
+        残りの企業は第2段階でドメイン単位にまとめてウェブサイト抽出を並列実行する。
+
+        Args:
+            workers (int): ウェブサイト抽出の同時実行数（1の場合は逐次実行）
+            output_file (str): 決定結果を逐次書き出すCSVファイル（Noneの場合は書き出さない）
+
         Returns:
-            list: メールアドレス決定結果のリスト
+            list: メールアドレス決定結果のリスト（入力順）
         """
         if self.companies_df is None:
             logger.error("企業データが読み込まれていません")
@@ -491,65 +463,154 @@ class HuganJobEmailResolver:
         
         logger.info("メールアドレス決定処理開始")
         self.email_results = []
-        
-        for index, row in self.companies_df.iterrows():
-            company_id = row['ID']
-            company_name = row['企業名']
-            website_url = row['企業ホームページ']
+        self.resolution_stats = {}
+        writer = ResolutionResultWriter(output_file) if output_file else None
+        started = time.perf_counter()
+
+        # 第1優先: CSVの担当者メールアドレス（列単位で一括判定）
+        rows = self.companies_df[['ID', '企業名', '企業ホームページ', '担当者メールアドレス', '募集職種']].to_dict('records')
+        csv_valid = self.valid_email_mask(self.companies_df['担当者メールアドレス']).tolist()
+        # ウェブサイトからの抽出が必要な企業（結果, 行）
+        pending_extraction = []
+
+        for row, valid in zip(rows, csv_valid):
             csv_email = row['担当者メールアドレス']
-            job_position = row['募集職種']
-            
             result = {
-                'company_id': company_id,
-                'company_name': company_name,
-                'website_url': website_url,
-                'job_position': job_position,
+                'company_id': row['ID'],
+                'company_name': row['企業名'],
+                'website_url': row['企業ホームページ'],
+                'job_position': row['募集職種'],
                 'csv_email': csv_email,
                 'final_email': None,
                 'email_source': None,
                 'status': 'pending'
             }
-            
-            # 第1優先: CSVの担当者メールアドレス
-            if self.is_valid_email(csv_email):
+            if valid:
                 result['final_email'] = csv_email.strip()
                 result['email_source'] = 'csv_direct'
                 result['status'] = 'success'
-                logger.info(f"✅ CSV直接: {company_name} -> {result['final_email']}")
-            
-            # 第2優先: ウェブサイトからの抽出
+                logger.debug(f"✅ CSV直接: {result['company_name']} -> {result['final_email']}")
             else:
-                extracted_email = self.extract_email_from_website(
-                    company_id, company_name, website_url
-                )
-                
-                if extracted_email and self.is_valid_email(extracted_email):
-                    result['final_email'] = extracted_email.strip()
-                    result['email_source'] = 'website_extraction'
-                    result['status'] = 'success'
-                    logger.info(f"✅ 抽出成功: {company_name} -> {result['final_email']}")
-                else:
-                    result['status'] = 'failed'
-                    logger.warning(f"❌ メール取得失敗: {company_name}")
-            
+                pending_extraction.append((result, row))
             self.email_results.append(result)
+
+        csv_direct_count = len(self.email_results) - len(pending_extraction)
+        self._record_source('csv_direct', csv_direct_count, time.perf_counter() - started)
+        logger.info(f"✅ CSV直接: {csv_direct_count}社（ウェブサイト抽出の対象 {len(pending_extraction)}社）")
+        if writer:
+            writer.add_all(result for result in self.email_results if result['status'] == 'success')
+            writer.flush()
+
+        # 第2優先: ウェブサイトからの抽出（同じドメインの企業は1回だけ抽出し、結果を各企業に適用）
+        units = self.plan_website_extraction(pending_extraction) if pending_extraction else []
+        extraction_started = time.perf_counter()
+        workers = max(1, min(int(workers or 1), len(units) or 1))
+        if units:
+            logger.info(f"🌐 ウェブサイト抽出: {len(units)}件を{workers}並列で実行")
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(self._extract_unit, representative) for representative, _ in units]
+            future_members = dict(zip(futures, (members for _, members in units)))
+            for future in concurrent.futures.as_completed(futures):
+                members = future_members[future]
+                extracted_email, source, seconds = future.result()
+                self._apply_extraction(members, extracted_email)
+                self._record_source(source if extracted_email else 'failed', len(members), seconds)
+                if writer:
+                    writer.add_all(result for result, _ in members)
+                    writer.flush_if_due()
+        finally:
+            # 中断時は未着手の抽出を取り消し、決定済みの結果を書き出す
+            executor.shutdown(wait=False, cancel_futures=True)
+            if writer:
+                writer.flush()
+
+        self.resolution_stats['website_extraction'] = {
+            'units': len(units),
+            'companies': len(pending_extraction),
+            'workers': workers if units else 0,
+            'seconds': time.perf_counter() - extraction_started
+        }
+        self.resolution_stats['total_seconds'] = time.perf_counter() - started
         
         # 統計情報
         success_count = len([r for r in self.email_results if r['status'] == 'success'])
-        csv_direct_count = len([r for r in self.email_results if r['email_source'] == 'csv_direct'])
         extraction_count = len([r for r in self.email_results if r['email_source'] == 'website_extraction'])
         
         logger.info("=" * 60)
         logger.info("📊 メールアドレス決定結果統計")
         logger.info("=" * 60)
         logger.info(f"総企業数: {len(self.email_results)}")
-        logger.info(f"成功: {success_count} ({success_count/len(self.email_results)*100:.1f}%)")
+        if self.email_results:
+            logger.info(f"成功: {success_count} ({success_count/len(self.email_results)*100:.1f}%)")
         logger.info(f"  - CSV直接: {csv_direct_count}")
         logger.info(f"  - ウェブ抽出: {extraction_count}")
         logger.info(f"失敗: {len(self.email_results) - success_count}")
+        for line in self.format_throughput_lines():
+            logger.info(line)
         logger.info("=" * 60)
         
         return self.email_results
+
+    def _extract_unit(self, representative):
+        """代表の企業についてウェブサイト抽出を実行（ワーカースレッドで実行）
+
+        Returns:
+            tuple: (抽出されたメールアドレス, 取得元, 処理時間（秒）)
+        """
+        _, row = representative
+        self._local.extraction_source = 'website_extraction'
+        started = time.perf_counter()
+        extracted_email = self.extract_email_from_website(row['ID'], row['企業名'], row['企業ホームページ'])
+        return extracted_email, self._local.extraction_source, time.perf_counter() - started
+
+    def _apply_extraction(self, members, extracted_email):
+        """抽出結果を同じドメインの企業に適用"""
+        if len(members) > 1:
+            logger.info(f"🔁 同じドメインの {len(members)}社に抽出結果を適用: {members[0][1]['企業ホームページ']}")
+
+        for result, _ in members:
+            if extracted_email and self.is_valid_email(extracted_email):
+                result['final_email'] = extracted_email.strip()
+                result['email_source'] = 'website_extraction'
+                result['status'] = 'success'
+                logger.info(f"✅ 抽出成功: {result['company_name']} -> {result['final_email']}")
+            else:
+                result['status'] = 'failed'
+                logger.warning(f"❌ メール取得失敗: {result['company_name']}")
+
+    def _record_source(self, source, companies, seconds):
+        """取得元ごとの企業数・処理時間を集計"""
+        sources = self.resolution_stats.setdefault('sources', {})
+        entry = sources.setdefault(source, {'companies': 0, 'units': 0, 'seconds': 0.0})
+        entry['companies'] += companies
+        entry['units'] += 1
+        entry['seconds'] += seconds
+
+    def format_throughput_lines(self):
+        """取得元ごとの処理件数・スループットを表示用の行で返す"""
+        labels = {
+            'csv_direct': 'CSV直接',
+            'existing_results': '既存抽出結果',
+            'advanced_extraction': '高度抽出',
+            'simple_extraction': '簡易抽出',
+            'website_extraction': 'ウェブ抽出',
+            'failed': '失敗'
+        }
+        lines = []
+        for source, entry in self.resolution_stats.get('sources', {}).items():
+            if not entry['companies']:
+                continue
+            rate = entry['companies'] / entry['seconds'] if entry['seconds'] > 0 else float('inf')
+            lines.append(f"{labels.get(source, source)}: {entry['companies']}社 / {entry['units']}件, "
+                         f"処理時間 {entry['seconds']:.2f}秒 ({rate:.1f}社/秒)")
+        extraction = self.resolution_stats.get('website_extraction')
+        if extraction and extraction['units']:
+            rate = extraction['companies'] / extraction['seconds'] if extraction['seconds'] > 0 else float('inf')
+            lines.append(f"ウェブサイト抽出 全体: {extraction['companies']}社 / {extraction['units']}件, "
+                         f"{extraction['workers']}並列で {extraction['seconds']:.2f}秒 ({rate:.1f}社/秒)")
+        return lines
     
     def get_sendable_companies(self):
         """
@@ -567,7 +628,7 @@ class HuganJobEmailResolver:
         
         return sendable
     
-    def save_results_to_csv(self, output_file="huganjob_email_resolution_results.csv"):
+    def save_results_to_csv(self, output_file=DEFAULT_RESULTS_FILE):
         """
         結果をCSVファイルに保存（既存結果を保持しながら追加）
 
@@ -578,50 +639,90 @@ class HuganJobEmailResolver:
             logger.warning("保存する結果がありません")
             return False
 
+        writer = ResolutionResultWriter(output_file)
+        writer.add_all(self.email_results)
+        return writer.flush()
+
+
+class ResolutionResultWriter:
+    """メールアドレス決定結果のCSVへの逐次書き出し（既存結果を保持しながら追加、スレッドセーフ）
+
+    既存のファイルは最初に1回だけ読み込み、書き出しのたびに
+    「既存結果（今回決定した企業IDを除く）＋今回の結果」を企業ID順で一時ファイルに書き、置き換える。
+    途中で停止しても、ファイルには決定済みの企業の結果が重複なく残る。
+    """
+
+    def __init__(self, output_file=DEFAULT_RESULTS_FILE, flush_every=RESULTS_FLUSH_EVERY,
+                 flush_interval=RESULTS_FLUSH_INTERVAL):
+        self.output_file = output_file
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._results = {}
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        self.flushes = 0
+        self.existing_df = self._load_existing()
+
+    def _load_existing(self):
+        if not os.path.exists(self.output_file):
+            logger.info("新しい結果ファイルを作成")
+            return None
         try:
-            # 新しい結果をDataFrameに変換
-            new_results_df = pd.DataFrame(self.email_results)
-
-            # 既存ファイルが存在する場合は読み込み
-            if os.path.exists(output_file):
-                try:
-                    existing_df = pd.read_csv(output_file, encoding='utf-8')
-                    logger.info(f"既存の結果ファイルを読み込み: {len(existing_df)}行")
-
-                    # 既存の企業IDを取得
-                    existing_ids = set(existing_df['company_id'].tolist()) if 'company_id' in existing_df.columns else set()
-
-                    # 新しい結果から既存IDと重複しないもののみを抽出
-                    new_ids = set(new_results_df['company_id'].tolist())
-                    duplicate_ids = existing_ids.intersection(new_ids)
+            existing_df = pd.read_csv(self.output_file, encoding='utf-8')
+            logger.info(f"既存の結果ファイルを読み込み: {len(existing_df)}行")
+            return existing_df
+        except Exception as e:
+            logger.warning(f"既存ファイル読み込みエラー: {e}、新しいファイルとして保存します")
+            return None
 
-                    if duplicate_ids:
-                        logger.info(f"重複する企業ID: {sorted(duplicate_ids)}")
+    def add_all(self, results):
+        """決定済みの結果を追加（同じ企業IDは後の結果で置き換える）"""
+        with self._lock:
+            for result in results:
+                self._results[result['company_id']] = dict(result)
+                self._unflushed += 1
+
+    def flush_if_due(self):
+        """前回の書き出しから件数・時間が経過していれば書き出す"""
+        with self._lock:
+            due = self._unflushed >= self.flush_every or (
+                self._unflushed and time.monotonic() - self._last_flush >= self.flush_interval)
+        return self.flush() if due else True
+
+    def flush(self):
+        """既存結果と今回の結果を結合してファイルを置き換える"""
+        with self._lock:
+            if not self._results:
+                if self.existing_df is None:
+                    logger.warning("保存する結果がありません")
+                    return False
+                return True
+            try:
+                new_results_df = pd.DataFrame(list(self._results.values()))
+                combined_df = new_results_df
+                if self.existing_df is not None:
+                    existing_df = self.existing_df
+                    if 'company_id' in existing_df.columns:
                         # 重複するIDの既存データを削除
-                        existing_df = existing_df[~existing_df['company_id'].isin(duplicate_ids)]
-                        logger.info(f"重複データを削除後: {len(existing_df)}行")
-
-                    # 既存データと新しいデータを結合
+                        existing_df = existing_df[~existing_df['company_id'].isin(self._results.keys())]
                     combined_df = pd.concat([existing_df, new_results_df], ignore_index=True)
 
-                except Exception as e:
-                    logger.warning(f"既存ファイル読み込みエラー: {e}、新しいファイルとして保存します")
-                    combined_df = new_results_df
-            else:
-                logger.info("新しい結果ファイルを作成")
-                combined_df = new_results_df
+                # 企業IDでソート
+                combined_df = combined_df.sort_values('company_id')
 
-            # 企業IDでソート
-            combined_df = combined_df.sort_values('company_id')
-
-            # CSVに保存
-            combined_df.to_csv(output_file, index=False, encoding='utf-8')
-            logger.info(f"結果をCSVに保存: {output_file} (合計: {len(combined_df)}行)")
-            return True
+                temp_file = f"{self.output_file}.tmp"
+                combined_df.to_csv(temp_file, index=False, encoding='utf-8')
+                os.replace(temp_file, self.output_file)
+                self._unflushed = 0
+                self._last_flush = time.monotonic()
+                self.flushes += 1
+                logger.info(f"結果をCSVに保存: {self.output_file} (合計: {len(combined_df)}行)")
+                return True
 
-        except Exception as e:
-            logger.error(f"CSV保存エラー: {e}")
-            return False
+            except Exception as e:
+                logger.error(f"CSV保存エラー: {e}")
+                return False
 
 def main():
     """メイン処理"""
@@ -631,6 +732,8 @@ def main():
     parser = argparse.ArgumentParser(description='HUGAN JOB メールアドレス決定システム')
     parser.add_argument('--start-id', type=int, help='開始ID（指定した場合、範囲処理）')
     parser.add_argument('--end-id', type=int, help='終了ID（指定した場合、範囲処理）')
+    parser.add_argument('--workers', type=int, default=DEFAULT_RESOLVER_WORKERS,
+                        help=f'ウェブサイト抽出の同時実行数（デフォルト: {DEFAULT_RESOLVER_WORKERS}）')
     args = parser.parse_args()
 
     print("=" * 60)
@@ -660,15 +763,19 @@ def main():
             print("❌ 指定されたID範囲に該当する企業がありません")
             return False
 
-    # メールアドレス決定
-    results = resolver.resolve_email_addresses()
+    # メールアドレス決定（結果は決定した順に逐次保存）
+    try:
+        results = resolver.resolve_email_addresses(workers=args.workers, output_file=DEFAULT_RESULTS_FILE)
+    finally:
+        resolver.close()
 
     if not results:
         print("❌ メールアドレス決定処理に失敗しました")
         return False
 
-    # 結果保存
-    resolver.save_results_to_csv()
+    print("\n⏱️ 取得元ごとのスループット:")
+    for line in resolver.format_throughput_lines():
+        print(f"  {line}")
 
     # 送信可能企業の表示
     sendable = resolver.get_sendable_companies()
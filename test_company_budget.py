@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+企業ごとの処理時間の予算 テスト（ローカルHTTPサーバー使用）
+
+応答の遅いテスト用サイトをローカルのHTTPサーバー（プロキシとして動作）で配信し、
+extract_emails_with_priority について以下を確認します。
+- 予算を使い切った場合は以降の段階をスキップし、予算＋α の時間でそれまでの結果を返すこと
+- 応答しないページの取得も、タイムアウトが残り時間で頭打ちになること
+- 失敗したリクエストの再試行（待機）は残り時間を超えて行わないこと
+- 応答の速いサイトでは予算の有無で結果が変わらないこと
+- 段階ごとの処理時間が結果とヒストグラムに記録されること
+
+使い方（リポジトリのルートで実行）:
+    python test_company_budget.py
+    python test_company_budget.py --budget 5 --delay 1.5
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# 抽出器のインポート前に設定（キャッシュを使わず毎回取得する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core_scripts'))
+
+from test_parsed_document import build_page, NAV_PAGES
+
+
+class SlowSiteHandler(BaseHTTPRequestHandler):
+    """ドメインごとに応答の速さが異なるテスト用サイト"""
+    protocol_version = 'HTTP/1.1'
+    delay = 1.0
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        domain = (parts.hostname or 'localhost').replace('www.', '')
+        path = parts.path or '/'
+
+        if domain.startswith('hang-'):
+            # 応答しないサイト
+            time.sleep(30)
+        elif domain.startswith('error-'):
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        elif domain.startswith('slow-'):
+            time.sleep(self.delay)
+
+        if path == '/' or path.rstrip('/').lstrip('/') in {p.rstrip('/') for p, _ in NAV_PAGES}:
+            # 遅いサイトのページにはメールアドレスを載せない（すべての段階を実行させる）
+            body = build_page(domain, path, 20)
+            if domain.startswith('slow-'):
+                body = body.replace(f'info@{domain}', '')
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        data = body.encode('utf-8')
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port_queue, delay):
+    SlowSiteHandler.delay = delay
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowSiteHandler)
+    # タイムアウトで切断したクライアントのエラーは無視
+    server.handle_error = lambda request, client_address: None
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='企業ごとの処理時間の予算 テスト')
+    parser.add_argument('--budget', type=float, default=4.0, help='1企業あたりの予算（秒）')
+    parser.add_argument('--delay', type=float, default=1.0, help='遅いサイトの1リクエストあたりの応答時間（秒）')
+    args = parser.parse_args()
+
+    print("🧪 企業ごとの処理時間の予算 テスト")
+    print("=" * 60)
+
+    port_queue = multiprocessing.Queue()
+    server_process = multiprocessing.Process(target=serve, args=(port_queue, args.delay), daemon=True)
+    server_process.start()
+    port = port_queue.get(timeout=10)
+    os.environ['HTTP_PROXY'] = f'http://127.0.0.1:{port}'
+    os.environ['http_proxy'] = f'http://127.0.0.1:{port}'
+    os.environ.pop('NO_PROXY', None)
+    os.environ.pop('no_proxy', None)
+
+    import derivative_email_extractor as extractor_module
+    from derivative_time_budget import StageHistogram, TOTAL_STAGE
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    histogram = StageHistogram()
+    checks = []
+    # 再試行までの待機時間（スリープ）の合計
+    slept = []
+    original_sleep = extractor_module.time.sleep
+
+    def recording_sleep(seconds):
+        slept.append(seconds)
+        original_sleep(seconds)
+
+    extractor_module.time.sleep = recording_sleep
+
+    results = []
+
+    def extract(domain, budget, timeout=10, max_retries=0):
+        extractor = extractor_module.PrioritizedEmailExtractor(timeout=timeout, max_retries=max_retries,
+                                                               company_budget=budget, stage_histogram=histogram)
+        started = time.perf_counter()
+        result = extractor.extract_emails_with_priority('株式会社サンプル', f'http://www.{domain}/', '1')
+        results.append(result)
+        return result, time.perf_counter() - started
+
+    # 1. 応答の遅いサイト（予算切れ）
+    result, elapsed = extract('slow-corp.co.jp', args.budget)
+    print(f"遅いサイト（1リクエスト {args.delay}秒, 予算 {args.budget}秒）: {elapsed:.2f}秒, "
+          f"予算切れ {result['budget_exhausted']}, 段階 {result['stage_seconds']}")
+    best = result['best_email']['email'] if result['best_email'] else None
+    checks.append(('予算切れの企業は予算＋1リクエスト分の時間で結果を返す',
+                   result['budget_exhausted'] and elapsed < args.budget + args.delay + 1.0))
+    checks.append(('以降の段階をスキップしても最適なアドレスを選択', best == 'info@slow-corp.co.jp'
+                   and 'generation' in result['stage_seconds'] and 'homepage' in result['stage_seconds']))
+
+    unlimited, unlimited_elapsed = extract('slow-corp.co.jp', 0)
+    print(f"  （予算なしの場合: {unlimited_elapsed:.2f}秒, 段階 {list(unlimited['stage_seconds'])}）")
+    checks.append(('予算なしより短時間', elapsed < unlimited_elapsed and not unlimited['budget_exhausted']))
+
+    # 2. 応答しないサイト（タイムアウトを残り時間で頭打ち）
+    result, elapsed = extract('hang-corp.co.jp', args.budget, timeout=20)
+    print(f"応答しないサイト（タイムアウト 20秒, 予算 {args.budget}秒）: {elapsed:.2f}秒")
+    checks.append(('応答しないページの取得は残り時間で打ち切る', result['budget_exhausted'] and elapsed < args.budget + 1.5))
+
+    # 3. エラー応答の再試行（待機は残り時間まで）
+    slept.clear()
+    result, elapsed = extract('error-corp.co.jp', 2.5, max_retries=3)
+    print(f"エラー応答のサイト（再試行 3回, 予算 2.5秒）: {elapsed:.2f}秒, 待機合計 {sum(slept):.1f}秒")
+    checks.append(('再試行の待機は残り時間を超えない', elapsed < 2.5 + 1.0 and sum(slept) < 2.5))
+
+    # 4. 応答の速いサイト（予算の有無で結果が同じ）
+    fast, fast_elapsed = extract('fast-corp.co.jp', 60)
+    fast_unlimited, _ = extract('fast-corp.co.jp', 0)
+    same = (fast['best_email'] == fast_unlimited['best_email']
+            and [e['email'] for e in fast['emails']] == [e['email'] for e in fast_unlimited['emails']])
+    print(f"速いサイト: {fast_elapsed:.2f}秒, {fast['best_email']['email'] if fast['best_email'] else None}")
+    checks.append(('予算内に終わる企業は予算の有無で結果が同じ', same and not fast['budget_exhausted']))
+
+    # 5. ヒストグラム
+    stats = histogram.get_stats()
+    print("\n段階別の処理時間:")
+    for line in histogram.format_lines():
+        print(f"  {line}")
+    print(f"予算切れ {stats['exhausted']}社, スキップ開始段階 {stats['skipped']}")
+    checks.append(('段階ごとの処理時間をヒストグラムに記録',
+                   stats['stages'][TOTAL_STAGE]['count'] == len(results)
+                   and stats['stages']['homepage']['count'] == len(results)
+                   and stats['exhausted'] == sum(1 for r in results if r['budget_exhausted'])))
+
+    extractor_module.time.sleep = original_sleep
+    server_process.terminate()
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
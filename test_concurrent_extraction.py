@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+企業単位の並列抽出 テスト（ネットワーク不使用）
+
+run_concurrent_extraction について以下を確認します。
+- 複数企業を同時に処理し、逐次処理より短い時間で終わること
+- 同一ホストへの同時リクエスト数が max_per_host を超えないこと（複数企業が共有するホストを含む）
+- 全体の同時接続数が max_connections を超えないこと
+- ワーカー数が多くても、起動するブラウザ（動的メール抽出）は max_browsers 個までで、終了時にすべて閉じること
+- 結果が入力順で返ること
+- ブラウザの空きを待つ時間・ページ読み込みのタイムアウトが企業の残り時間で頭打ちになること
+
+使い方（リポジトリのルートで実行）:
+    python test_concurrent_extraction.py
+    python test_concurrent_extraction.py --companies 24 --workers 8 --delay 0.05
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import threading
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+# 抽出器のインポート前に設定（キャッシュを使わず毎回取得する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core_scripts'))
+
+import derivative_email_extractor as extractor_module
+from derivative_time_budget import CompanyDeadline, DeadlineExceeded
+
+# 全企業のページが参照する共有ホスト（同時リクエストは1件まで）
+SHARED_HOST = 'https://assets.shared-cdn.jp'
+
+
+class ConcurrencyRecorder:
+    """ホスト別・全体の同時実行数の最大値を記録する"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.hosts = defaultdict(int)
+        self.host_peaks = defaultdict(int)
+
+    def enter(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            self.hosts[host] += 1
+            self.host_peaks[host] = max(self.host_peaks[host], self.hosts[host])
+
+    def leave(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            self.in_flight -= 1
+            self.hosts[host] -= 1
+
+
+class FakeBrowser:
+    """テスト用の動的メール抽出器（起動・終了の回数を記録）"""
+    lock = threading.Lock()
+    started = 0
+    closed = 0
+    active = 0
+    peak_active = 0
+
+    def __init__(self):
+        self.timeout = 5
+        self.page_load_timeouts = []
+        with FakeBrowser.lock:
+            FakeBrowser.started += 1
+
+    def extract_emails_from_dynamic_page(self, url):
+        self.page_load_timeouts.append(self.timeout)
+        with FakeBrowser.lock:
+            FakeBrowser.active += 1
+            FakeBrowser.peak_active = max(FakeBrowser.peak_active, FakeBrowser.active)
+        time.sleep(0.1)
+        with FakeBrowser.lock:
+            FakeBrowser.active -= 1
+        return []
+
+    def close_driver(self):
+        with FakeBrowser.lock:
+            FakeBrowser.closed += 1
+
+
+def check_dynamic_deadline():
+    """ブラウザの空き待ち・ページ読み込みのタイムアウトを企業の残り時間で頭打ちにする"""
+    pool = extractor_module.DynamicExtractorPool(max_browsers=1, timeout=5, factory=FakeBrowser)
+    extractor = extractor_module.PrioritizedEmailExtractor(use_dynamic_extraction=True, dynamic_pool=pool)
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold_browser():
+        with pool.acquire():
+            held.set()
+            release.wait(10)
+
+    holder = threading.Thread(target=hold_browser)
+    holder.start()
+    held.wait(5)
+    extractor.deadline = CompanyDeadline(0.5)
+    started = time.perf_counter()
+    waited = extractor.extract_emails_with_dynamic_rendering('https://company1.co.jp/contact/')
+    wait_elapsed = time.perf_counter() - started
+    release.set()
+    holder.join()
+
+    extractor.deadline = CompanyDeadline(2.0)
+    extractor.extract_emails_with_dynamic_rendering('https://company1.co.jp/contact/')
+    browser = pool._idle[0]
+    extractor.deadline = CompanyDeadline(0.01)
+    time.sleep(0.02)
+    try:
+        extractor.deadline.check('dynamic_rendering')
+        raised = False
+    except DeadlineExceeded:
+        raised = extractor.deadline.skipped_stage == 'dynamic_rendering'
+    extractor.deadline = None
+    pool.close()
+
+    print(f"ブラウザの空き待ち: 残り0.5秒 → {wait_elapsed:.2f}秒で打ち切り, "
+          f"ページ読み込みのタイムアウト: {browser.page_load_timeouts}（返却後 {browser.timeout}秒）")
+    return [
+        ('ブラウザの空き待ちは残り時間で打ち切る', waited == [] and wait_elapsed < 1.5
+         and pool.get_stats()['timeouts'] == 1),
+        ('ページ読み込みのタイムアウトを残り時間で頭打ち（返却後は既定値）',
+         len(browser.page_load_timeouts) == 1 and browser.page_load_timeouts[0] <= 2.0 and browser.timeout == 5),
+        ('段階の途中の確認で予算切れを検出', raised),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='企業単位の並列抽出 テスト')
+    parser.add_argument('--companies', type=int, default=16, help='企業数')
+    parser.add_argument('--workers', type=int, default=8, help='同時に処理する企業数')
+    parser.add_argument('--max-connections', type=int, default=4, help='全体の同時接続数の上限')
+    parser.add_argument('--max-browsers', type=int, default=2, help='ブラウザ数の上限')
+    parser.add_argument('--delay', type=float, default=0.03, help='1リクエストあたりの時間（秒）')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    print("🧪 企業単位の並列抽出 テスト")
+    print("=" * 60)
+
+    recorder = ConcurrencyRecorder()
+    extractor_module.REQUEST_LIMITER = extractor_module.HostRequestLimiter(
+        max_connections=args.max_connections, max_per_host=1)
+    extractor_module.DYNAMIC_EXTRACTION_AVAILABLE = True
+    extractor_module.DYNAMIC_POOL = extractor_module.DynamicExtractorPool(
+        max_browsers=args.max_browsers, factory=FakeBrowser)
+
+    def fake_extract(self, company_name, url, company_id=None, deadline=None):
+        # 自社サイトの3ページと共有ホストの1ページを取得し、動的メール抽出を1回行う
+        pages = [url, url + 'company/', url + 'contact/', f'{SHARED_HOST}/{company_id}.js']
+        for page in pages:
+            with self.request_limiter.acquire(page):
+                recorder.enter(page)
+                time.sleep(args.delay)
+                recorder.leave(page)
+        self.extract_emails_with_dynamic_rendering(url + 'contact/')
+        domain = urlsplit(url).netloc
+        best = {'email': f'info@{domain}', 'confidence': 0.9, 'source': 'test'}
+        return {'company_name': company_name, 'url': url, 'domain': domain, 'emails': [best],
+                'best_email': best, 'extraction_method': 'test', 'company_id': company_id,
+                'id': company_id, '企業ID': company_id}
+
+    extractor_module.PrioritizedEmailExtractor.extract_emails_with_priority = fake_extract
+
+    companies = [{'id': str(i + 1), '企業名': f'株式会社テスト{i + 1}', 'URL': f'https://company{i + 1}.co.jp/'}
+                 for i in range(args.companies)]
+
+    started = time.perf_counter()
+    results, stats = extractor_module.run_concurrent_extraction(
+        companies, workers=args.workers, use_dynamic_extraction=True, company_budget=0)
+    elapsed = time.perf_counter() - started
+    sequential = args.companies * 4 * args.delay
+
+    shared_host = urlsplit(SHARED_HOST).netloc
+    company_peak = max(peak for host, peak in recorder.host_peaks.items() if host != shared_host)
+    print(f"処理時間: {elapsed:.2f}秒（逐次処理の推定 {sequential:.2f}秒）")
+    print(f"同時接続: 最大 {recorder.peak}/{args.max_connections}, 企業サイトごと 最大 {company_peak}, "
+          f"共有ホスト 最大 {recorder.host_peaks[shared_host]}")
+    print(f"ブラウザ: 起動 {FakeBrowser.started}個 / 終了 {FakeBrowser.closed}個, "
+          f"同時使用 最大 {FakeBrowser.peak_active}, 統計 {stats['browsers']}")
+
+    checks = [
+        ('複数企業を同時に処理', recorder.peak > 1 and elapsed < sequential * 0.75),
+        ('同一ホストへの同時リクエストは1件まで', company_peak == 1 and recorder.host_peaks[shared_host] == 1),
+        ('全体の同時接続数が上限以下', recorder.peak <= args.max_connections
+         and stats['requests']['peak_in_flight'] <= args.max_connections),
+        ('ブラウザはワーカー数ではなく上限の数まで起動', 0 < FakeBrowser.started <= args.max_browsers
+         and FakeBrowser.peak_active <= args.max_browsers
+         and stats['browsers']['browsers'] == FakeBrowser.started
+         and stats['browsers']['borrows'] == args.companies),
+        ('終了時にすべてのブラウザを閉じる', FakeBrowser.closed == FakeBrowser.started),
+        ('結果が入力順', [r['company_id'] for r in results] == [c['id'] for c in companies]),
+    ] + check_dynamic_deadline()
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+条件付きGET（ETag / Last-Modified）テスト（Flaskテストクライアント使用）
+
+一時ディレクトリを作業ディレクトリにしてダッシュボードを読み込み、JSON API について以下を確認します。
+- 200応答に ETag・Last-Modified・Cache-Control: no-cache が付くこと
+- If-None-Match・If-Modified-Since が一致すれば、集計を行わずに本文なしの304を返すこと
+- クエリ文字列が異なれば別のETagになること
+- 元データのファイルが更新されるか、キャッシュ無効化が通知されればETagが変わり200を返すこと
+- エラー応答にはETagを付けないこと
+
+使い方（リポジトリのルートで実行）:
+    python test_conditional_get.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'dashboard'))
+
+COMPANY_CSV = ('ID,企業名,企業ホームページ,担当者メールアドレス,募集職種,バウンス状態,バウンス日時,バウンス理由\n'
+               '1,株式会社テスト,https://test.co.jp/,info@test.co.jp,営業,,,\n')
+
+
+def main():
+    print("🧪 条件付きGET（ETag / Last-Modified）テスト")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # 元データのパスは作業ディレクトリからの相対パス（ダッシュボードの読み込み前に移動）
+        os.chdir(work_dir)
+        os.makedirs('data', exist_ok=True)
+        with open('data/new_input_test.csv', 'w', encoding='utf-8-sig') as f:
+            f.write(COMPANY_CSV)
+
+        import derivative_dashboard as dashboard
+        dashboard.state_store = dashboard.DashboardStateStore(os.path.join(work_dir, 'state.sqlite3'))
+
+        calls = []
+        load_company_data = dashboard.load_company_data
+
+        def counting_load_company_data(*args, **kwargs):
+            calls.append(time.time())
+            return load_company_data(*args, **kwargs)
+
+        dashboard.load_company_data = counting_load_company_data
+        client = dashboard.app.test_client()
+        checks = []
+
+        # 1. 初回は200（ETag・Last-Modified付き）
+        first = client.get('/api/companies')
+        etag = first.headers.get('ETag')
+        last_modified = first.headers.get('Last-Modified')
+        print(f"初回: {first.status_code}, ETag={etag}, Last-Modified={last_modified}")
+        checks.append(('200応答に ETag・Last-Modified・no-cache を付ける',
+                       first.status_code == 200 and etag and last_modified
+                       and first.headers.get('Cache-Control') == 'no-cache'
+                       and first.get_json()['total'] == 1))
+
+        # 2. If-None-Match が一致すれば304（集計しない）
+        calls.clear()
+        cached = client.get('/api/companies', headers={'If-None-Match': etag})
+        multiple = client.get('/api/companies', headers={'If-None-Match': f'"other", {etag}'})
+        print(f"If-None-Match: {cached.status_code}, 本文 {len(cached.get_data())}バイト, 集計 {len(calls)}回")
+        checks.append(('If-None-Match が一致すれば本文なしの304',
+                       cached.status_code == 304 and not cached.get_data() and cached.headers.get('ETag') == etag
+                       and multiple.status_code == 304))
+        checks.append(('304応答では集計しない', not calls))
+
+        # 3. If-Modified-Since（If-None-Match がない場合）
+        since = client.get('/api/companies', headers={'If-Modified-Since': last_modified})
+        mismatch = client.get('/api/companies', headers={'If-None-Match': '"stale"', 'If-Modified-Since': last_modified})
+        checks.append(('If-Modified-Since で304（If-None-Match が優先）',
+                       since.status_code == 304 and mismatch.status_code == 200))
+
+        # 4. クエリ文字列ごとに別のETag
+        other_query = client.get('/api/stats?lightweight=true')
+        other_etag = other_query.headers.get('ETag')
+        checks.append(('クエリ文字列が異なれば別のETag',
+                       other_query.status_code == 200 and other_etag and other_etag != etag
+                       and client.get('/api/companies', headers={'If-None-Match': other_etag}).status_code == 200))
+
+        # 5. 元データのファイルが更新されればETagが変わる
+        time.sleep(0.01)
+        with open('data/new_input_test.csv', 'a', encoding='utf-8') as f:
+            f.write('2,株式会社サンプル,https://sample.co.jp/,info@sample.co.jp,営業,,,\n')
+        future = time.time() + 5
+        os.utime('data/new_input_test.csv', (future, future))
+        updated = client.get('/api/companies', headers={'If-None-Match': etag})
+        updated_etag = updated.headers.get('ETag')
+        print(f"ファイル更新後: {updated.status_code}, ETag={updated_etag}")
+        checks.append(('元データの更新でETagが変わり200を返す',
+                       updated.status_code == 200 and updated_etag != etag
+                       and updated.headers.get('Last-Modified') != last_modified))
+
+        # 6. キャッシュ無効化の通知でETagが変わる
+        dashboard.publish_cache_invalidation()
+        invalidated = client.get('/api/companies', headers={'If-None-Match': updated_etag})
+        checks.append(('キャッシュ無効化の通知でETagが変わる',
+                       invalidated.status_code == 200 and invalidated.headers.get('ETag') != updated_etag))
+
+        # 7. エラー応答にはETagを付けない
+        def failing_load_company_data(*args, **kwargs):
+            raise RuntimeError('読み込み失敗')
+
+        dashboard.load_company_data = failing_load_company_data
+        failed = client.get('/api/companies')
+        checks.append(('エラー応答にはETagを付けない', failed.status_code == 500 and 'ETag' not in failed.headers))
+        dashboard.load_company_data = load_company_data
+
+        os.chdir(ROOT)
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+非同期クロールフロンティア テスト
+
+core_scripts/derivative_crawl_frontier.py について以下を確認します。
+- URLの正規化（スキーム・www.・既定ポート・index.html・フラグメント・計測用パラメータの違いを同じURLとして扱う）
+- 探索順が お問い合わせ > 会社概要 > 採用情報 > その他 であること
+- 同一ホストへの同時取得数が複数サイトの探索をまたいで上限を超えないこと
+- 高品質なメールアドレスが見つかった時点で残りの取得をキャンセルすること
+- 期限を超えた探索を打ち切ること
+- 打ち切った探索は実行中のページの処理が終わってから戻ること（次の企業の処理中に抽出器の状態を書き換えない）
+- 探索を開始するトップページは採用情報ページとは別のページ種別（同じ順位）として扱うこと
+- 1つのイベントループで数百サイトを同時に探索できること
+- 抽出器の deep_crawl_for_emails がローカルHTTPサーバーのサイトを探索できること（同じURLを二重に取得しない）
+
+使い方（リポジトリのルートで実行）:
+    python test_crawl_frontier.py
+    python test_crawl_frontier.py --sites 500
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import threading
+import multiprocessing
+from urllib.parse import urlsplit
+
+# 抽出器のインポート前に設定（キャッシュを使わず毎回取得する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core_scripts'))
+
+from derivative_crawl_frontier import CrawlEngine, CrawlFrontier, PAGE_TYPE_RANKS, canonicalize_url, classify_page, crawl_priority
+from test_parsed_document import serve
+
+CANONICAL_CASES = [
+    ('https://www.Sample-Corp.co.jp/contact/#form', 'http://sample-corp.co.jp/contact'),
+    ('http://sample-corp.co.jp:80/index.html', 'https://sample-corp.co.jp/'),
+    ('https://sample-corp.co.jp/about/?utm_source=x&b=2&a=1', 'https://sample-corp.co.jp/about?a=1&b=2'),
+    ('/recruit/index.php', 'https://www.sample-corp.co.jp/recruit/'),
+]
+
+
+class FakeSite:
+    """process_page を持つテスト用の抽出器（ページごとのリンク・メールアドレス・取得時間を指定）"""
+
+    def __init__(self, domain, pages, delay=0.05, tracker=None):
+        self.domain = domain
+        self.pages = pages
+        self.delay = delay
+        self.tracker = tracker
+        self.processed = []
+
+    def process_page(self, url, base_url):
+        path = urlsplit(url).path or '/'
+        if self.tracker:
+            self.tracker.enter(url)
+        try:
+            time.sleep(self.delay.get(path, 0.01) if isinstance(self.delay, dict) else self.delay)
+        finally:
+            if self.tracker:
+                self.tracker.leave(url)
+        self.processed.append(path)
+        emails, links = self.pages.get(path, ([], []))
+        return {'emails': list(emails), 'links': [(crawl_priority(link), f'http://{self.domain}{link}') for link in links],
+                'url': url}
+
+
+class HostTracker:
+    """ホストごとの同時取得数の最大値を記録"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = {}
+        self.peak = {}
+
+    def enter(self, url):
+        host = urlsplit(url).hostname
+        with self.lock:
+            self.current[host] = self.current.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.current[host])
+
+    def leave(self, url):
+        host = urlsplit(url).hostname
+        with self.lock:
+            self.current[host] -= 1
+
+
+def quality_found(emails):
+    return any(email.split('@')[0] in ('info', 'contact') for email in emails)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='非同期クロールフロンティア テスト')
+    parser.add_argument('--sites', type=int, default=300, help='同時に探索するサイト数')
+    args = parser.parse_args()
+
+    print("🧪 非同期クロールフロンティア テスト")
+    print("=" * 60)
+    checks = []
+
+    # 1. URLの正規化
+    failures = [(a, b) for a, b in CANONICAL_CASES
+                if canonicalize_url(a, 'https://www.sample-corp.co.jp/') != canonicalize_url(b)]
+    for a, b in failures:
+        print(f"   正規化の不一致: {a} / {b}")
+    frontier = CrawlFrontier()
+    added = [frontier.push(a, 1) for a, _ in CANONICAL_CASES[:3]] + [frontier.push(b, 1) for _, b in CANONICAL_CASES[:3]]
+    checks.append(('URLを正規化して重複を除外', not failures and added == [True] * 3 + [False] * 3))
+
+    # 2. 探索順（同時取得1件で取得順を確認）
+    site_pages = {
+        '/': ([], ['/news/', '/recruit/', '/company/', '/contact/']),
+        '/contact/': (['sales@order.co.jp'], []),
+    }
+    engine = CrawlEngine(fetch_threads=8, max_per_host=1)
+    site = FakeSite('order.co.jp', site_pages, delay=0.01)
+    engine.crawl(site, 'http://order.co.jp/', [('http://order.co.jp/', crawl_priority('/', page_type='homepage'))],
+                 max_pages=10, max_workers=1)
+    print(f"取得順: {site.processed}")
+    checks.append(('お問い合わせ > 会社概要 > 採用情報 > その他 の順に探索',
+                   site.processed == ['/', '/contact/', '/company/', '/recruit/', '/news/']))
+    checks.append(('トップページは採用情報ページと同じ順位の別のページ種別',
+                   'homepage' in PAGE_TYPE_RANKS and PAGE_TYPE_RANKS['homepage'] == PAGE_TYPE_RANKS['recruit']
+                   and classify_page('http://order.co.jp/') is None))
+
+    # 3. 同一ホストの同時取得数（同じホストを4つの探索で同時に取得）
+    tracker = HostTracker()
+    engine = CrawlEngine(fetch_threads=16, max_per_host=2)
+    shared_pages = {'/': ([], ['/contact/', '/about/', '/recruit/', '/news/', '/privacy/'])}
+    jobs = [(FakeSite('shared-host.co.jp', shared_pages, delay=0.03, tracker=tracker), 'http://shared-host.co.jp/',
+             [('http://shared-host.co.jp/', 1)]) for _ in range(4)]
+    engine.crawl_many(jobs, max_pages=6, max_workers=5)
+    print(f"同一ホストの同時取得数: 最大 {tracker.peak.get('shared-host.co.jp')}（上限 2）")
+    checks.append(('同一ホストへの同時取得数が上限以下', tracker.peak.get('shared-host.co.jp') == 2))
+
+    # 4. 高品質なメールアドレスで早期終了（取得中のページは完了を待って結果を破棄、未開始のページは取得しない）
+    engine = CrawlEngine(fetch_threads=8, max_per_host=4)
+    early_pages = {'/contact/': (['info@early.co.jp'], ['/company/'])}
+    tracker = HostTracker()
+    site = FakeSite('early.co.jp', early_pages, delay={'/contact/': 0.05, '/about/': 0.5}, tracker=tracker)
+    seeds = [(f'http://early.co.jp{path}', crawl_priority(path)) for path in ('/contact/', '/about/', '/recruit/', '/news/')]
+    result = engine.crawl(site, 'http://early.co.jp/', seeds, max_pages=10, max_workers=2, stop_when=quality_found)
+    processed_on_return = list(site.processed)
+    running_on_return = tracker.current.get('early.co.jp', 0)
+    time.sleep(0.3)
+    print(f"早期終了: {result['pages']}ページで終了, 取得中止 {result['cancelled']}件, "
+          f"戻った時点で取得済みのページ {processed_on_return}（処理中 {running_on_return}件）")
+    checks.append(('高品質なメールアドレスで残りの取得をキャンセル',
+                   result['stopped_early'] and result['pages'] == 1 and result['cancelled'] == 1
+                   and site.processed == ['/contact/', '/about/']))
+    checks.append(('取得中のページの処理が終わってから戻る',
+                   running_on_return == 0 and processed_on_return == site.processed))
+
+    # 5. 期限（期限後は新しいページを取得せず、取得中のページの完了だけを待つ）
+    slow_pages = {'/': ([], ['/contact/', '/about/'])}
+    site = FakeSite('slow.co.jp', slow_pages, delay=1.0)
+    started = time.perf_counter()
+    result = engine.crawl(site, 'http://slow.co.jp/', [('http://slow.co.jp/', 1)], max_pages=10, max_workers=2,
+                          deadline=0.3)
+    elapsed = time.perf_counter() - started
+    print(f"期限 0.3秒: {elapsed:.2f}秒で終了（期限切れ={result['timed_out']}, 取得したページ {site.processed}）")
+    checks.append(('期限を超えた探索を打ち切る', result['timed_out'] and site.processed == ['/'] and elapsed < 1.5))
+
+    # 6. 1つのイベントループで数百サイト
+    engine = CrawlEngine(fetch_threads=128, max_per_host=1)
+    many_pages = {'/': ([], ['/contact/', '/about/']), '/contact/': (['recruit@x.co.jp'], []), '/about/': ([], [])}
+    jobs = [(FakeSite(f'site{i}.co.jp', many_pages, delay=0.05), f'http://site{i}.co.jp/', [(f'http://site{i}.co.jp/', 1)])
+            for i in range(args.sites)]
+    started = time.perf_counter()
+    results = engine.crawl_many(jobs, max_pages=3, max_workers=2)
+    elapsed = time.perf_counter() - started
+    sequential = args.sites * 3 * 0.05
+    stats = engine.get_stats()
+    print(f"{args.sites}サイト: {elapsed:.2f}秒（逐次の場合 約{sequential:.0f}秒）, 同時探索 最大{stats['peak_active_crawls']}サイト")
+    checks.append(('数百サイトを1つのイベントループで同時に探索',
+                   all(r['pages'] == 3 and r['emails'] for r in results)
+                   and stats['peak_active_crawls'] == args.sites and elapsed < sequential / 5))
+
+    # 7. 抽出器からの利用（ローカルHTTPサーバー）
+    port_queue = multiprocessing.Queue()
+    server_process = multiprocessing.Process(target=serve, args=(port_queue, 40), daemon=True)
+    server_process.start()
+    port = port_queue.get(timeout=10)
+    os.environ['HTTP_PROXY'] = f'http://127.0.0.1:{port}'
+    os.environ['http_proxy'] = f'http://127.0.0.1:{port}'
+    os.environ.pop('NO_PROXY', None)
+    os.environ.pop('no_proxy', None)
+
+    import derivative_email_extractor as extractor_module
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    requested = []
+    original_network_get = extractor_module.PrioritizedEmailExtractor._network_get
+
+    def recording_network_get(self, url, headers, timeout):
+        response = original_network_get(self, url, headers, timeout)
+        requested.append(canonicalize_url(url))
+        return response
+
+    extractor_module.PrioritizedEmailExtractor._network_get = recording_network_get
+
+    extractor = extractor_module.PrioritizedEmailExtractor(timeout=5, max_retries=0)
+    extractor.documents = {}
+    emails = extractor.deep_crawl_for_emails('http://www.crawl-corp.co.jp/', max_pages=8, max_workers=3,
+                                             adaptive_depth=False)
+    duplicates = len(requested) - len(set(requested))
+    print(f"抽出器: {sorted(emails)}, HTTPリクエスト {len(requested)}件（重複 {duplicates}件）")
+    checks.append(('抽出器の探索でメールアドレスを抽出',
+                   set(emails) == {'info@crawl-corp.co.jp', 'recruit@crawl-corp.co.jp'}))
+    checks.append(('同じURLを二重に取得しない', duplicates == 0))
+    server_process.terminate()
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
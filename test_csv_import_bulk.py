@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CSV一括インポート 性能・重複判定テスト
+
+一時ディレクトリに既存企業CSVとインポート用CSV（1万行）を生成し、
+import_companies_from_csv() の処理時間と結果を確認します。
+- 既存企業とのドメイン重複・企業名重複がスキップされること
+- インポートファイル内（バッチ内）の重複もスキップされること
+- IDが連番で払い出されること
+- Shift_JIS（cp932）等のファイルもエンコーディングを自動判定して読み込めること
+- 判定と合わないバイトは置換せず、行を返す前なら再判定して読み直し、返した後なら読み込みを中断すること
+- インポート中も共有状態ストアへの書き込み（開封イベント・キャッシュ世代）が待たされないこと
+- 同時に実行したインポートはロックファイルで1件ずつ処理され、IDが重複しないこと
+
+使い方（リポジトリのルートで実行）:
+    python test_csv_import_bulk.py
+    python test_csv_import_bulk.py --rows 20000 --existing 10000
+    python test_csv_import_bulk.py --encoding utf-8-sig
+"""
+
+import os
+import sys
+import csv
+import time
+import argparse
+import tempfile
+import threading
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'dashboard'))
+sys.path.insert(0, os.path.join(ROOT, 'core_scripts'))
+
+from derivative_csv_reader import CsvInputReader, CsvEncodingError
+
+# ダッシュボードは一時ディレクトリに移動してから読み込む（ログ・状態DBをリポジトリに残さない）
+dashboard = None
+
+HEADER = ['ID', '企業名', '企業ホームページ', '担当者メールアドレス', '募集職種',
+          'バウンス状態', 'バウンス日時', 'バウンス理由']
+
+
+def write_existing_csv(path, count):
+    """既存企業CSVを生成（偶数IDはURLあり、奇数IDはURLなし）"""
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for i in range(1, count + 1):
+            website = f'https://www.existing{i}.co.jp/' if i % 2 == 0 else '‐'
+            writer.writerow([i, f'既存企業{i}', website, '‐', '営業', '', '', ''])
+
+
+def write_import_csv(path, rows, existing, encoding='cp932'):
+    """インポート用CSVを生成（一部に既存・バッチ内重複を含める）"""
+    expected_skipped = 0
+    with open(path, 'w', encoding=encoding, newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['企業名', '企業ホームページ', '担当者メールアドレス', '募集職種'])
+        for i in range(rows):
+            if i % 10 == 0 and existing >= 2:
+                # 既存企業とドメイン重複（wwwの有無・パスは無視される）
+                target = (i // 10) % (existing // 2) * 2 + 2
+                writer.writerow([f'別名企業{i}', f'http://existing{target}.co.jp/recruit', '', '営業'])
+                expected_skipped += 1
+            elif i % 10 == 1 and existing >= 1:
+                # URLなし既存企業と企業名重複
+                target = (i // 10) % ((existing + 1) // 2) * 2 + 1
+                writer.writerow([f'既存企業{target}', f'https://other{i}.example.jp/', '', '営業'])
+                expected_skipped += 1
+            elif i % 10 == 2 and i > 10:
+                # バッチ内重複（10行前の新規企業と同じドメイン）
+                writer.writerow([f'重複企業{i}', f'https://new{i - 7}.example.jp/', '', '営業'])
+                expected_skipped += 1
+            else:
+                writer.writerow([f'新規企業{i}', f'https://new{i}.example.jp/', f'info@new{i}.example.jp', '営業'])
+    return expected_skipped
+
+
+def check_strict_decoding(work_dir):
+    """サンプルでの判定と合わないバイトの扱いを確認"""
+    ascii_rows = [[f'company{i}', f'https://company{i}.example.jp/', '', 'sales'] for i in range(2000)]
+    japanese_rows = [['株式会社テスト', 'https://test.example.jp/', '', '営業']] * 10
+
+    def write(path, parts):
+        with open(path, 'wb') as f:
+            for rows, encoding in parts:
+                for row in rows:
+                    f.write((','.join(row) + '\r\n').encode(encoding))
+
+    def read_all(reader):
+        return [row for chunk in reader.iter_chunks() for row in chunk]
+
+    # 行を返す前にデコードエラー → ファイル全体から再判定して読み直す
+    cp932_file = os.path.join(work_dir, 'cp932.csv')
+    write(cp932_file, [([['企業名', 'URL', 'メール', '職種']], 'cp932'), (japanese_rows, 'cp932')])
+    reader = CsvInputReader(cp932_file, encoding='utf-8')
+    rows = read_all(reader)
+    resniffed = reader.encoding == 'cp932' and len(rows) == 10 and rows[0][0] == '株式会社テスト'
+
+    # 返した後にデコードエラー → 置換せずに中断（正しいエンコーディングを提示）
+    late_file = os.path.join(work_dir, 'late_cp932.csv')
+    write(late_file, [([['name', 'url', 'email', 'job']], 'ascii'), (ascii_rows, 'ascii'), (japanese_rows, 'cp932')])
+    reader = CsvInputReader(late_file, encoding='utf-8', chunk_rows=100)
+    late_error = None
+    try:
+        read_all(reader)
+    except CsvEncodingError as e:
+        late_error = e
+    print(f"返した後のデコードエラー: {late_error}")
+    late_ok = late_error is not None and late_error.suggested_encoding == 'cp932'
+
+    # UTF-8とcp932が混在 → どの候補でも読めないため中断し、インポートは1行も追加しない
+    mixed_file = os.path.join(work_dir, 'mixed.csv')
+    write(mixed_file, [([['企業名', '企業ホームページ', '担当者メールアドレス', '募集職種']], 'utf-8'),
+                       (japanese_rows, 'utf-8'), (ascii_rows, 'ascii'), (japanese_rows, 'cp932')])
+    reader = CsvInputReader(mixed_file, chunk_rows=100)
+    mixed_error = None
+    try:
+        rows = read_all(reader)
+    except CsvEncodingError as e:
+        mixed_error = e
+    mixed_ok = reader.encoding == 'utf-8' and mixed_error is not None and mixed_error.suggested_encoding is None
+
+    input_file = os.path.join(work_dir, 'companies_strict.csv')
+    write_existing_csv(input_file, 10)
+    dashboard.INPUT_FILE = input_file
+    result = dashboard.import_companies_from_csv(mixed_file, skip_duplicates=True)
+    with open(input_file, 'r', encoding='utf-8-sig') as f:
+        count = sum(1 for _ in csv.DictReader(f))
+    print(f"混在ファイルのインポート: {result.get('error')}")
+    import_ok = result.get('success') is False and count == 10
+
+    return [
+        ('行を返す前のデコードエラーは再判定して読み直す', resniffed),
+        ('行を返した後のデコードエラーは中断して正しいエンコーディングを提示', late_ok),
+        ('どの候補でも読めないファイルは中断し、インポートは1行も追加しない', mixed_ok and import_ok),
+    ]
+
+
+def check_concurrent_imports(work_dir, import_file):
+    """インポート中の状態ストアへの書き込みと、同時に実行したインポートの排他"""
+    input_file = os.path.join(work_dir, 'concurrent.csv')
+    write_existing_csv(input_file, 10)
+    dashboard.INPUT_FILE = input_file
+    writes = []
+
+    def write_state():
+        started = time.perf_counter()
+        dashboard.state_store.claim_open_event(f'import-test-{len(writes)}')
+        dashboard.state_store.bump_generation('import-test')
+        writes.append(time.perf_counter() - started)
+
+    def progress(rows_read, bytes_read, total_bytes):
+        # インポートのロックを保持したまま、別スレッドから状態ストアに書き込む
+        if not writes:
+            writer = threading.Thread(target=write_state)
+            writer.start()
+            writer.join(timeout=5)
+            if not writes:
+                writes.append(None)
+
+    results = []
+    imports = [threading.Thread(target=lambda: results.append(dashboard.import_companies_from_csv(
+        import_file, skip_duplicates=False, progress_callback=progress))) for _ in range(2)]
+    for thread in imports:
+        thread.start()
+    for thread in imports:
+        thread.join()
+
+    with open(input_file, 'r', encoding='utf-8-sig') as f:
+        ids = [int(row['ID']) for row in csv.DictReader(f)]
+    added = sum(result.get('added', 0) for result in results)
+    print(f"インポート中の状態ストア書き込み: {'待機' if writes[0] is None else f'{writes[0] * 1000:.0f} ms'}, "
+          f"同時インポート: 追加 {added}行")
+    return [
+        ('インポート中も状態ストアへの書き込みを待たせない', writes[0] is not None and writes[0] < 1),
+        ('同時に実行したインポートでIDが重複しない',
+         len(results) == 2 and all(result.get('success') for result in results)
+         and ids == list(range(1, len(ids) + 1)) and len(ids) == 10 + added),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CSV一括インポート 性能・重複判定テスト')
+    parser.add_argument('--rows', type=int, default=10000, help='インポート行数')
+    parser.add_argument('--existing', type=int, default=5000, help='既存企業数')
+    parser.add_argument('--encoding', default='cp932', help='インポート用CSVのエンコーディング')
+    args = parser.parse_args()
+
+    print("🧪 CSV一括インポート 性能・重複判定テスト")
+    print("=" * 60)
+
+    global dashboard
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        import derivative_dashboard as dashboard
+
+        input_file = os.path.join(work_dir, 'companies.csv')
+        import_file = os.path.join(work_dir, 'import.csv')
+        write_existing_csv(input_file, args.existing)
+        expected_skipped = write_import_csv(import_file, args.rows, args.existing, args.encoding)
+
+        dashboard.INPUT_FILE = input_file
+        dashboard.state_store = dashboard.DashboardStateStore(os.path.join(work_dir, 'state.sqlite3'))
+
+        start = time.perf_counter()
+        result = dashboard.import_companies_from_csv(import_file, skip_duplicates=True)
+        elapsed = time.perf_counter() - start
+
+        print(f"既存: {args.existing}社 / インポート: {args.rows}行 ({args.encoding})")
+        print(f"処理時間: {elapsed:.2f}秒 ({args.rows / elapsed:,.0f}行/秒)")
+        print(f"結果: {result.get('message', result.get('error'))}")
+
+        with open(input_file, 'r', encoding='utf-8-sig') as f:
+            ids = [int(row['ID']) for row in csv.DictReader(f)]
+
+        concurrent_checks = check_concurrent_imports(work_dir, import_file)
+        strict_checks = check_strict_decoding(work_dir)
+        os.chdir(ROOT)
+
+    checks = [
+        ('インポート成功', result.get('success') is True),
+        ('スキップ件数が期待値と一致', result.get('skipped') == expected_skipped),
+        ('追加件数が期待値と一致', result.get('added') == args.rows - expected_skipped),
+        ('IDが重複なしの連番', ids == list(range(1, len(ids) + 1))),
+        ('10秒以内に完了', elapsed < 10),
+    ] + concurrent_checks + strict_checks
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
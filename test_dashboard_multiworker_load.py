@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUGANJOB ダッシュボード マルチワーカー負荷テスト
+
+ダッシュボードをワーカー数 1 / 2 / 4 で順に起動し、同じAPIに並列で
+リクエストを送り続けて、スループット（req/s）がワーカー数に応じて
+伸びることを確認します。
+ダッシュボードは一時ディレクトリ（テスト用の企業CSV・設定ディレクトリを用意）を
+作業ディレクトリにして起動し、リポジトリにログ・PIDファイルを残しません。
+
+使い方（リポジトリのルートで実行）:
+    python test_dashboard_multiworker_load.py
+    python test_dashboard_multiworker_load.py --path /api/get_daily_stats --duration 20 --workers 1 2 4 8
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+import urllib.error
+from concurrent.futures import ProcessPoolExecutor
+
+DASHBOARD_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard', 'derivative_dashboard.py')
+
+
+def prepare_work_dir(work_dir, companies):
+    """ダッシュボードが起動時に確認する企業CSV・設定ディレクトリを用意"""
+    os.makedirs(os.path.join(work_dir, 'data'), exist_ok=True)
+    os.makedirs(os.path.join(work_dir, 'config'), exist_ok=True)
+    with open(os.path.join(work_dir, 'data', 'new_input_test.csv'), 'w', encoding='utf-8-sig') as f:
+        f.write('ID,企業名,企業ホームページ,担当者メールアドレス,募集職種,バウンス状態,バウンス日時,バウンス理由\n')
+        for i in range(1, companies + 1):
+            bounced = i % 20 == 0
+            f.write(f"{i},株式会社テスト{i},https://test{i}.co.jp/,info@test{i}.co.jp,営業,"
+                    f"{'permanent' if bounced else ''},{'2024-06-01 10:00:00' if bounced else ''},\n")
+
+
+def wait_until_ready(url, timeout=60):
+    """ダッシュボードが応答するまで待機"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def client_loop(url, duration):
+    """1クライアント分のリクエストループ（別プロセスで実行）"""
+    ok = 0
+    errors = 0
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                response.read()
+                ok += 1
+        except Exception:
+            errors += 1
+    return ok, errors
+
+
+def run_load(port, path, workers, clients, duration, work_dir):
+    """指定ワーカー数でダッシュボードを起動して負荷をかける"""
+    server = subprocess.Popen(
+        [sys.executable, DASHBOARD_SCRIPT, '--port', str(port), '--workers', str(workers), '--no-pid-file'],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        cwd=work_dir
+    )
+    url = f'http://127.0.0.1:{port}{path}'
+
+    try:
+        if not wait_until_ready(url):
+            print(f"❌ ワーカー数 {workers}: ダッシュボードが起動しませんでした")
+            return None
+
+        # ウォームアップ（キャッシュ・遅延読み込みの影響を除く）
+        client_loop(url, 1.0)
+
+        with ProcessPoolExecutor(max_workers=clients) as pool:
+            futures = [pool.submit(client_loop, url, duration) for _ in range(clients)]
+            results = [f.result() for f in futures]
+
+        ok = sum(r[0] for r in results)
+        errors = sum(r[1] for r in results)
+        return {'workers': workers, 'requests': ok, 'errors': errors, 'rps': ok / duration}
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HUGANJOBダッシュボード マルチワーカー負荷テスト')
+    parser.add_argument('--path', default='/api/stats', help='負荷をかけるパス (デフォルト: /api/stats)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='試すワーカー数')
+    parser.add_argument('--clients', type=int, default=16, help='並列クライアント数')
+    parser.add_argument('--duration', type=float, default=10.0, help='計測時間（秒）')
+    parser.add_argument('--port', type=int, default=5102, help='テスト用ポート')
+    parser.add_argument('--companies', type=int, default=5000, help='テスト用の企業CSVの行数')
+    args = parser.parse_args()
+
+    print("🧪 HUGANJOB ダッシュボード マルチワーカー負荷テスト")
+    print("=" * 60)
+    print(f"対象: {args.path} / クライアント: {args.clients} / 計測: {args.duration}秒 / "
+          f"企業: {args.companies}社 / CPU: {os.cpu_count()}コア")
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        prepare_work_dir(work_dir, args.companies)
+        for workers in args.workers:
+            result = run_load(args.port, args.path, workers, args.clients, args.duration, work_dir)
+            if result:
+                results.append(result)
+                print(f"   ワーカー {workers:>2}: {result['rps']:8.1f} req/s "
+                      f"({result['requests']}件成功 / {result['errors']}件エラー)")
+
+    if not results:
+        print("❌ 計測できませんでした")
+        return 1
+
+    base = results[0]['rps'] or 1
+    print("\n📈 スケーリング（ワーカー1基準）")
+    for result in results:
+        print(f"   ワーカー {result['workers']:>2}: x{result['rps'] / base:.2f}")
+
+    scaled = len(results) < 2 or results[-1]['rps'] > results[0]['rps'] * 1.3
+    print("\n" + "=" * 60)
+    print("✅ ワーカー数に応じてスループットが向上しました" if scaled else "⚠️ スループットが向上しませんでした")
+    return 0 if scaled else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ダッシュボード起動 テスト（一時ディレクトリで起動）
+
+一時ディレクトリに入力ファイルを用意してダッシュボードを別プロセスで起動し、以下を確認します。
+- モジュール読み込み時に pandas をimportしないこと（起動後のウォームアップで読み込む）
+- 既定のログレベルがINFOであること（DEBUGは --debug 指定時のみ）
+- 起動後 /api/health がファイルを読まずに応答し、初回応答までの時間を計測できること
+- --no-pid-file ではPIDファイルを書き込まないこと
+- --profile-startup が起動時間の内訳・import内訳・初回応答までの時間を表示して終了すること
+
+使い方（リポジトリのルートで実行）:
+    python test_dashboard_startup.py
+    python test_dashboard_startup.py --max-first-response 5
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DASHBOARD = os.path.join(ROOT, 'dashboard', 'derivative_dashboard.py')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def prepare_work_dir(work_dir):
+    """ダッシュボードが起動時に確認する入力ファイル・設定ディレクトリを用意"""
+    os.makedirs(os.path.join(work_dir, 'data'), exist_ok=True)
+    os.makedirs(os.path.join(work_dir, 'config'), exist_ok=True)
+    with open(os.path.join(work_dir, 'data', 'new_input_test.csv'), 'w', encoding='utf-8-sig') as f:
+        f.write('ID,企業名,企業ホームページ,担当者メールアドレス,募集職種\n1,株式会社テスト,https://test.co.jp/,info@test.co.jp,営業\n')
+
+
+def wait_for_health(port, process, timeout):
+    """/api/health が応答するまでの時間（秒）と応答内容を返す"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout and process.poll() is None:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started, json.loads(response.read().decode('utf-8'))
+        except OSError:
+            time.sleep(0.01)
+    return None, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ダッシュボード起動 テスト')
+    parser.add_argument('--max-first-response', type=float, default=10.0,
+                        help='初回応答までの時間の上限（秒、テスト環境向けの緩い値）')
+    args = parser.parse_args()
+
+    print("🧪 ダッシュボード起動 テスト")
+    print("=" * 60)
+    checks = []
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        prepare_work_dir(work_dir)
+
+        # 1. モジュール読み込み時の状態
+        probe = subprocess.run(
+            [sys.executable, '-c',
+             'import sys, logging\n'
+             f'sys.path.insert(0, {os.path.dirname(DASHBOARD)!r})\n'
+             'import derivative_dashboard as d\n'
+             "print('pandas' in sys.modules, logging.getLogger().level,"
+             " round((d.STARTUP_TIMINGS['module_loaded'] - d.STARTUP_BEGIN) * 1000))"],
+            capture_output=True, text=True, encoding='utf-8', errors='replace', cwd=work_dir, timeout=120
+        )
+        fields = probe.stdout.strip().splitlines()[-1].split() if probe.stdout.strip() else []
+        print(f"モジュール読み込み: {fields[2] if len(fields) == 3 else '?'} ms, pandas読み込み済み: "
+              f"{fields[0] if fields else '?'}, ログレベル: {fields[1] if len(fields) > 1 else '?'}")
+        checks.append(('モジュール読み込み時に pandas をimportしない', probe.returncode == 0 and fields[:1] == ['False']))
+        checks.append(('既定のログレベルはINFO', fields[1:2] == ['20']))
+
+        # 2. 起動して初回応答まで
+        port = free_port()
+        server = subprocess.Popen([sys.executable, DASHBOARD, '--port', str(port), '--no-pid-file'],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=work_dir)
+        try:
+            first_response, health = wait_for_health(port, server, args.max_first_response)
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        if first_response is None:
+            print("初回応答: 応答なし")
+        else:
+            print(f"初回応答までの時間: {first_response * 1000:.0f} ms（上限 {args.max_first_response:g}秒）")
+        checks.append(('起動後 /api/health が応答', health is not None and health.get('status') == 'ok'
+                       and health.get('pid') == server.pid))
+        pid_files = [name for name in os.listdir(work_dir) if name.endswith('.pid')]
+        pid_files += [name for name in os.listdir(os.path.join(work_dir, 'data')) if name.endswith('.pid')]
+        checks.append(('--no-pid-file ではPIDファイルを書き込まない', not pid_files))
+
+        # 3. --profile-startup
+        profile = subprocess.run([sys.executable, DASHBOARD, '--profile-startup'],
+                                 capture_output=True, text=True, encoding='utf-8', errors='replace',
+                                 cwd=work_dir, timeout=180)
+        output = profile.stdout
+        for line in output.splitlines():
+            if 'ms' in line and ('全体' in line or '初回応答' in line):
+                print(f"   {line.strip()}")
+        checks.append(('--profile-startup が内訳を表示して終了',
+                       profile.returncode == 0 and '起動プロファイル' in output
+                       and '依存ライブラリのimport' in output and 'import内訳' in output))
+        checks.append(('--profile-startup が初回応答までの時間を計測', '初回応答までの時間' in output))
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
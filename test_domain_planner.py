@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ドメイン単位の処理計画 テスト（ローカルHTTPサーバー使用）
+
+同じウェブサイトを持つ企業行を含む入力に対し、以下を確認します。
+- URLの正規化（www・大文字・パスの違いを同じドメインとして扱う、ホスティングサービスは利用者ごとに区別）
+- 同じドメインでも別の企業（企業名が異なり、代表URLのディレクトリの配下にない行）はまとめないこと
+  （data/new_input_test_comprehensive.csv の実データで、同じホストを持つグループ会社を区別する）
+- 利用者を特定できないホスティングサービスのURL（投稿ページなど）はグループ化しないこと
+- メールアドレス抽出（run_concurrent_extraction）はドメインごとに1回だけで、結果が各企業IDに展開されること
+- メールアドレス決定（HuganJobEmailResolver）でもドメインごとに1回だけ抽出し、
+  CSVに記載された担当者メールアドレスは企業ごとに優先されること
+
+使い方（リポジトリのルートで実行）:
+    python test_domain_planner.py
+    python test_domain_planner.py --rows-per-domain 5
+"""
+
+import os
+import sys
+import csv
+import logging
+import tempfile
+import argparse
+import multiprocessing
+
+# 抽出器のインポート前に設定（キャッシュを使わず毎回取得する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'core_scripts'))
+
+from derivative_domain_planner import normalize_site_domain, normalize_company_name, plan_by_domain
+from test_parsed_document import serve
+
+REAL_DATA_FILE = os.path.join(ROOT, 'data', 'new_input_test_comprehensive.csv')
+
+NORMALIZATION_CASES = [
+    ('https://www.sample-corp.co.jp/', 'sample-corp.co.jp'),
+    ('http://SAMPLE-CORP.co.jp/recruit/index.html', 'sample-corp.co.jp'),
+    ('sample-corp.co.jp', 'sample-corp.co.jp'),
+    ('https://www.sample-corp.co.jp:8080/about', 'sample-corp.co.jp'),
+    ('https://note.com/sample_a/n/123', 'note.com/sample_a'),
+    ('https://note.com/sample_b', 'note.com/sample_b'),
+    ('https://sites.google.com/view/acme/home', 'sites.google.com/view/acme'),
+    ('https://sites.google.com/view/beta-corp', 'sites.google.com/view/beta-corp'),
+    ('https://sites.google.com/site/acme/recruit', 'sites.google.com/site/acme'),
+    ('https://sites.google.com/', None),
+    ('https://www.facebook.com/pages/Acme/123456', 'facebook.com/pages/acme'),
+    ('https://www.facebook.com/acme.official/about', 'facebook.com/acme.official'),
+    ('https://www.facebook.com/profile.php?id=100012345', 'facebook.com/profile.php?id=100012345'),
+    ('https://www.facebook.com/p/12345', None),
+    ('https://www.instagram.com/acme_official/', 'instagram.com/acme_official'),
+    ('https://www.instagram.com/p/Cx12AbC/', None),
+    ('https://note.com/', None),
+    ('‐', None),
+    ('', None),
+    (float('nan'), None),
+]
+
+
+def build_companies(rows_per_domain, domains):
+    """同じドメインの企業（募集職種ごとの複数行）を含む企業リスト（ドメインが交互に現れる並び）"""
+    companies = []
+    paths = ['', 'recruit/', 'company/about.html', '']
+    for i in range(rows_per_domain):
+        for d in range(domains):
+            prefix = 'www.' if i % 2 == 0 else ''
+            url = f"http://{prefix}sample-corp{d}.co.jp/{paths[i % len(paths)]}"
+            name = f'株式会社サンプル{d}' if i % 2 == 0 else f'サンプル{d} 株式会社'
+            companies.append({'id': str(len(companies) + 1), '企業名': name, 'URL': url})
+    companies.append({'id': str(len(companies) + 1), '企業名': '株式会社URLなし', 'URL': ''})
+    return companies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ドメイン単位の処理計画 テスト')
+    parser.add_argument('--rows-per-domain', type=int, default=4, help='1ドメインあたりの企業行数')
+    parser.add_argument('--domains', type=int, default=3, help='ドメイン数')
+    args = parser.parse_args()
+
+    print("🧪 ドメイン単位の処理計画 テスト")
+    print("=" * 60)
+    checks = []
+
+    # 1. URLの正規化
+    failures = [(url, expected, normalize_site_domain(url)) for url, expected in NORMALIZATION_CASES
+                if normalize_site_domain(url) != expected]
+    for url, expected, actual in failures:
+        print(f"   正規化の不一致: {url!r} 期待={expected} 実際={actual}")
+    checks.append(('URLをドメイン単位に正規化', not failures))
+
+    # ホスティングサービスは利用者ごとに別グループ、利用者を特定できないURLはグループ化しない
+    hosted = [{'URL': url} for url in ('https://sites.google.com/view/acme/home', 'https://sites.google.com/view/acme',
+                                       'https://sites.google.com/view/beta-corp/home', 'https://www.instagram.com/p/Cx12AbC/',
+                                       'https://www.instagram.com/p/Dy34EfG/')]
+    hosted_plan = plan_by_domain(hosted, get_url=lambda company: company['URL'])
+    hosted_groups = sorted((group.key, len(group.members)) for group in hosted_plan.groups)
+    print(f"   ホスティングサービス: {hosted_groups}, グループ化しない {len(hosted_plan.unplanned)}件")
+    checks.append(('ホスティングサービスは利用者ごとにグループ化',
+                   hosted_groups == [('sites.google.com/view/acme', 2), ('sites.google.com/view/beta-corp', 1)]
+                   and len(hosted_plan.unplanned) == 2))
+
+    # 同じホストの別企業: 企業名が同じ行か、代表URLのディレクトリの配下の行だけをまとめる
+    same_host = [
+        {'企業名': '株式会社親会社', 'URL': 'https://group-corp.co.jp/'},
+        {'企業名': '親会社株式会社', 'URL': 'https://www.group-corp.co.jp/recruit/'},
+        {'企業名': '株式会社子会社A', 'URL': 'https://group-corp.co.jp/child-a/'},
+        {'企業名': '子会社A 採用窓口', 'URL': 'https://group-corp.co.jp/child-a/recruit/index.html'},
+        {'企業名': '株式会社子会社B', 'URL': 'https://group-corp.co.jp/company_b.html'},
+    ]
+    same_host_plan = plan_by_domain(same_host, get_url=lambda company: company['URL'],
+                                    get_name=lambda company: company['企業名'])
+    same_host_groups = [[company['企業名'] for company in group.members] for group in same_host_plan.groups]
+    print(f"   同じホストの別企業: {same_host_groups}")
+    checks.append(('同じホストでも企業名が異なりディレクトリ外の行はまとめない',
+                   same_host_groups == [['株式会社親会社', '親会社株式会社'], ['株式会社子会社A', '子会社A 採用窓口'],
+                                        ['株式会社子会社B']]
+                   and same_host_plan.domains == 1))
+
+    # 実データ: 同じホストを持つグループ会社（パナソニックの各社、山中産業と関西チューブなど）
+    with open(REAL_DATA_FILE, encoding='utf-8-sig', newline='') as f:
+        real_rows = list(csv.DictReader(f))
+    real_plan = plan_by_domain(real_rows, get_url=lambda row: row['企業ホームページ'], get_name=lambda row: row['企業名'])
+    real_units = {group.key: [] for group in real_plan.groups}
+    for group in real_plan.groups:
+        real_units[group.key].append(sorted(int(row['ID']) for row in group.members))
+    mixed = [[row['企業名'] for row in group.members] for group in real_plan.groups
+             if len({normalize_company_name(row['企業名']) for row in group.members}) > 1]
+    print(f"   実データ: {real_plan.summary()}")
+    print(f"   panasonic.co.jp: {real_units.get('panasonic.co.jp')}, yamanakagroup.jp: {real_units.get('yamanakagroup.jp')}")
+    checks.append(('実データの同じホストのグループ会社を別の処理単位にする',
+                   real_units.get('panasonic.co.jp') == [[143], [1115], [1116]]
+                   and real_units.get('yamanakagroup.jp') == [[321, 322], [334]]
+                   and not mixed and len(real_plan.groups) > real_plan.domains))
+
+    # 2. メールアドレス抽出（ローカルサーバー経由）
+    # 抽出器・決定処理は作業ディレクトリにログを書き込むため、一時ディレクトリで読み込む（リポジトリに残さない）
+    work_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+    os.chdir(work_dir.name)
+    os.makedirs('logs', exist_ok=True)
+    port_queue = multiprocessing.Queue()
+    server_process = multiprocessing.Process(target=serve, args=(port_queue, 40), daemon=True)
+    server_process.start()
+    port = port_queue.get(timeout=10)
+    os.environ['HTTP_PROXY'] = f'http://127.0.0.1:{port}'
+    os.environ['http_proxy'] = f'http://127.0.0.1:{port}'
+    os.environ.pop('NO_PROXY', None)
+    os.environ.pop('no_proxy', None)
+
+    import derivative_email_extractor as extractor_module
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    requested = []
+    original_network_get = extractor_module.PrioritizedEmailExtractor._network_get
+
+    def recording_network_get(self, url, headers, timeout):
+        response = original_network_get(self, url, headers, timeout)
+        requested.append(url)
+        return response
+
+    extractor_module.PrioritizedEmailExtractor._network_get = recording_network_get
+
+    companies = build_companies(args.rows_per_domain, args.domains)
+    plan = plan_by_domain(companies, get_url=lambda company: company['URL'])
+    results, stats = extractor_module.run_concurrent_extraction(companies, workers=4)
+    server_process.terminate()
+
+    homepage_requests = {}
+    for url in requested:
+        if url.rstrip('/').count('/') == 2:
+            key = normalize_site_domain(url)
+            homepage_requests[key] = homepage_requests.get(key, 0) + 1
+    per_row_estimate = len(requested) / max(1, len(plan.groups)) * (len(companies) - 1)
+    print(f"抽出: {len(companies)}社 / {stats['domains']}件（ユニークドメイン {len(plan.groups)}件）, "
+          f"HTTPリクエスト {len(requested)}件（1社ずつ抽出した場合 約{per_row_estimate:.0f}件）")
+
+    fanned_out = all(
+        result['company_id'] == company['id'] and result['company_name'] == company['企業名']
+        and result['url'] == company['URL']
+        for result, company in zip(results, companies)
+    )
+    shared_email = all(
+        result['best_email'] and result['best_email']['email'] == f"info@{normalize_site_domain(company['URL'])}"
+        for result, company in zip(results, companies) if company['URL']
+    )
+    checks.append(('抽出はドメインごとに1回', stats['domains'] == args.domains + 1
+                   and len(homepage_requests) == args.domains and all(count == 1 for count in homepage_requests.values())))
+    checks.append(('結果を入力順に各企業ID・企業名・URLで展開', len(results) == len(companies) and fanned_out))
+    checks.append(('同じドメインの企業は同じメールアドレス', shared_email))
+
+    # 3. メールアドレス決定（CSVの担当者メールアドレスを優先）
+    from huganjob_email_address_resolver import HuganJobEmailResolver
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'companies.csv')
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['ID', '企業名', '企業ホームページ', '担当者メールアドレス', '募集職種'])
+            for company in companies:
+                writer.writerow([int(company['id']), company['企業名'], company['URL'] or '‐', '‐', '営業'])
+            overrides = {}
+            for d in range(args.domains):
+                company_id = len(companies) + d + 1
+                overrides[company_id] = f'saiyo{d}@sample-corp{d}.co.jp'
+                writer.writerow([company_id, f'株式会社サンプル{d}-採用', f'https://www.sample-corp{d}.co.jp/',
+                                 overrides[company_id], '営業'])
+
+        resolver = HuganJobEmailResolver(csv_file_path=csv_path)
+        resolver.load_companies_data()
+        extraction_calls = []
+
+        def extract_email_from_website(company_id, company_name, website_url):
+            extraction_calls.append(website_url)
+            domain = normalize_site_domain(website_url)
+            return f'info@{domain}' if domain else None
+
+        resolver.extract_email_from_website = extract_email_from_website
+        resolver_results = resolver.resolve_email_addresses()
+
+    by_id = {int(result['company_id']): result for result in resolver_results}
+    override_kept = all(by_id[company_id]['final_email'] == email and by_id[company_id]['email_source'] == 'csv_direct'
+                        for company_id, email in overrides.items())
+    extracted_ok = all(
+        by_id[int(company['id'])]['final_email'] == f"info@{normalize_site_domain(company['URL'])}"
+        for company in companies if company['URL']
+    )
+    print(f"メールアドレス決定: {len(resolver_results)}社, ウェブサイト抽出 {len(extraction_calls)}回")
+    checks.append(('決定処理の抽出はドメインごとに1回（URLなしは個別）', len(extraction_calls) == args.domains + 1))
+    checks.append(('CSVの担当者メールアドレスを企業ごとに優先', override_kept))
+    checks.append(('抽出結果を同じドメインの企業に適用', extracted_ok))
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    os.chdir(ROOT)
+    work_dir.cleanup()
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
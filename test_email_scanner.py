@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+メールアドレス候補スキャナー 一致確認・マイクロベンチマーク
+
+保存済みページ（共有HTTPキャッシュ・リポジトリ内のHTML）と難読化表記のサンプルに対し、
+core_scripts/derivative_email_scanner.py の EmailScanner と、
+従来の方式（各パターンで全文に re.findall）を比較します。
+- 有効なアドレス（ローカル部64文字・全体254文字以内）の抽出結果が一致すること
+- 保存済みページでの処理時間
+- 長い英数字の連続を含む入力でも処理時間が入力長に比例すること
+
+使い方（リポジトリのルートで実行）:
+    python test_email_scanner.py
+    python test_email_scanner.py --cache-db data/http_cache/http_cache.sqlite3 --limit 500
+"""
+
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'core_scripts'))
+
+from derivative_email_scanner import (EMAIL_SCANNER, BASIC_EMAIL_REGEX, OBFUSCATED_EMAIL_PATTERNS)
+from derivative_http_cache import HttpCache, DEFAULT_CACHE_PATH
+
+OBFUSCATION_SAMPLE = """
+<html><body>
+<p>お問い合わせ: info@sample-corp.co.jp / sales ＠ sample-corp.co.jp</p>
+<p>contact[at]sample-corp.co.jp, support(at)sample-corp.co.jp</p>
+<p>recruit [アット] sample-corp.co.jp / hr（アット）sample-corp.co.jp</p>
+<p>office[ドット]sample-corp[ドット]jp, press（ドット）sample-corp（ドット）jp</p>
+<p>soumu&#64;sample-corp.co.jp soumu2 &commat; sample-corp.co.jp</p>
+<p>keiri ※ sample-corp.co.jp, eigyo★sample-corp★jp, jimu＃sample-corp.co.jp</p>
+<p>kikaku@sample-corp . jp, koho @ sample-corp ． jp, web@sample-corp[dot]jp</p>
+<p>mailto:info@sample-corp.co.jp%3Fsubject%3D""" + '%E3%81%8A' * 200 + """</p>
+<p>""" + 'x' * 400 + """@too-long-local.co.jp</p>
+</body></html>
+"""
+
+OBFUSCATION_EXPECTED = {
+    'info@sample-corp.co.jp', 'sales@sample-corp.co.jp', 'contact@sample-corp.co.jp', 'support@sample-corp.co.jp',
+    'recruit@sample-corp.co.jp', 'hr@sample-corp.co.jp', 'office@sample-corp.jp', 'press@sample-corp.jp',
+    'soumu@sample-corp.co.jp', 'soumu2@sample-corp.co.jp', 'keiri@sample-corp.co.jp', 'eigyo@sample-corp.jp',
+    'jimu@sample-corp.co.jp', 'kikaku@sample-corp.jp', 'koho@sample-corp.jp', 'web@sample-corp.jp',
+}
+
+
+def reference_candidates(text):
+    """従来の方式: 各パターンで全文に re.findall を実行"""
+    candidates = list(BASIC_EMAIL_REGEX.findall(text))
+    for patterns in OBFUSCATED_EMAIL_PATTERNS.values():
+        for pattern in patterns:
+            candidates.extend(re.findall(pattern, text))
+    return candidates
+
+
+def scanner_candidates(text):
+    basic, obfuscated = EMAIL_SCANNER.scan(text)
+    return basic + obfuscated
+
+
+def to_valid_emails(candidates):
+    """候補を抽出処理と同じ形式のアドレスにし、長さの制限を満たすものだけを返す"""
+    emails = set()
+    for candidate in candidates:
+        if isinstance(candidate, tuple):
+            email = f"{candidate[0]}@{candidate[1]}" if len(candidate) == 2 else f"{candidate[0]}@{candidate[1]}.{candidate[2]}"
+        else:
+            email = candidate
+        email = re.sub(r'\s+', '', email.strip().lower())
+        local = email.split('@')[0]
+        if len(local) <= 64 and len(email) <= 254:
+            emails.add(email)
+    return emails
+
+
+def load_corpus(cache_db, limit):
+    """保存済みページを読み込む（共有HTTPキャッシュ + リポジトリ内のHTML）"""
+    pages = []
+    if cache_db and os.path.exists(cache_db):
+        cache = HttpCache(path=cache_db)
+        for url, entry in cache.iter_entries(limit=limit):
+            encoding = entry['encoding'] or 'utf-8'
+            pages.append((url, entry['content'].decode(encoding, errors='replace')))
+        print(f"共有HTTPキャッシュから {len(pages)} ページを読み込みました: {cache_db}")
+    else:
+        print(f"共有HTTPキャッシュがありません（リポジトリ内のHTMLのみ使用）: {cache_db}")
+
+    for path in sorted(glob.glob(os.path.join(ROOT, '*.html')) + glob.glob(os.path.join(ROOT, 'templates', '*.html'))):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            pages.append((os.path.relpath(path, ROOT), f.read()))
+    pages.append(('難読化サンプル', OBFUSCATION_SAMPLE))
+    return pages
+
+
+def measure(func, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description='メールアドレス候補スキャナー 一致確認・マイクロベンチマーク')
+    parser.add_argument('--cache-db', default=os.path.join(ROOT, DEFAULT_CACHE_PATH), help='共有HTTPキャッシュのパス')
+    parser.add_argument('--limit', type=int, default=300, help='キャッシュから読み込む最大ページ数')
+    parser.add_argument('--repeat', type=int, default=5, help='計測の繰り返し回数')
+    args = parser.parse_args()
+
+    print("🧪 メールアドレス候補スキャナー 一致確認・マイクロベンチマーク")
+    print("=" * 60)
+
+    pages = load_corpus(args.cache_db, args.limit)
+    total_chars = sum(len(text) for _, text in pages)
+    print(f"対象: {len(pages)} ページ / {total_chars:,} 文字\n")
+
+    mismatches = []
+    reference_time = 0.0
+    scanner_time = 0.0
+    for name, text in pages:
+        expected = to_valid_emails(reference_candidates(text))
+        actual = to_valid_emails(scanner_candidates(text))
+        if expected != actual:
+            mismatches.append((name, sorted(expected - actual), sorted(actual - expected)))
+        reference_time += measure(reference_candidates, text, args.repeat)
+        scanner_time += measure(scanner_candidates, text, args.repeat)
+
+    for name, missing, extra in mismatches[:10]:
+        print(f"   不一致: {name} 不足={missing[:5]} 余分={extra[:5]}")
+
+    sample_emails = to_valid_emails(scanner_candidates(OBFUSCATION_SAMPLE))
+    print(f"難読化サンプルの抽出結果: {len(sample_emails)} 件")
+    speedup = reference_time / scanner_time if scanner_time else 0
+    print(f"保存済みページ全体: 従来 {reference_time * 1000:.1f}ms → スキャナー {scanner_time * 1000:.1f}ms（{speedup:.1f}倍）")
+
+    # 長い英数字の連続（従来方式では入力長の二乗に比例して遅くなる入力）
+    # 従来方式は短い入力でのみ計測（連続の長さの二乗に比例するため）
+    reference_input = ('a' * 2000 + ' ') * 5
+    small = ('a' * 20000 + ' ') * 5
+    large = small * 10
+    reference_small = measure(reference_candidates, reference_input, 1)
+    scanner_small = measure(scanner_candidates, small, args.repeat)
+    scanner_large = measure(scanner_candidates, large, args.repeat)
+    growth = scanner_large / scanner_small if scanner_small else 0
+    print(f"長い英数字の連続 {len(reference_input):,}文字: 従来 {reference_small * 1000:.0f}ms")
+    print(f"長い英数字の連続 {len(small):,}文字: スキャナー {scanner_small * 1000:.1f}ms")
+    print(f"長い英数字の連続 {len(large):,}文字: スキャナー {scanner_large * 1000:.1f}ms（入力10倍で {growth:.1f}倍）")
+
+    checks = [
+        ('保存済みページで従来方式と抽出結果が一致', not mismatches),
+        ('難読化表記をすべて抽出', OBFUSCATION_EXPECTED <= sample_emails),
+        ('保存済みページで従来方式より高速', scanner_time < reference_time),
+        ('処理時間が入力長にほぼ比例（入力10倍で20倍未満）', growth < 20),
+    ]
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
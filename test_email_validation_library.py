@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+メールアドレス判定ライブラリ（derivative_email_validation）テスト
+
+以下を確認します。
+- 規則セットごとの判定（抽出候補・送信先の決定・厳密な形式チェック）が想定どおりであること
+- 列単位の判定（valid_mask・classify_emails・clean_email_addresses）が1件ずつの判定と一致すること
+- 入力例・使い捨てドメイン・ロールベースアドレスの分類
+- 抽出器・決定処理・広告メール送信の各モジュールがライブラリの判定を使うこと
+- 10万件の一括判定が1秒未満で終わること
+
+使い方（リポジトリのルートで実行）:
+    python test_email_validation_library.py
+    python test_email_validation_library.py --count 300000
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+
+# 抽出器のインポート前に設定（キャッシュを使わず毎回取得する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'core_scripts'))
+
+import pandas as pd
+
+from derivative_email_validation import (
+    EXTRACTION_RULES, RESOLVER_RULES, STRICT_RULES, classify_emails, clean_email_address, clean_email_addresses
+)
+
+# (アドレス, 抽出候補, 送信先の決定, 厳密な形式チェック)
+# 厳密な形式チェックは形式・長さのみを判定する（画像ファイル名等の除外は行わない）
+RULE_CASES = [
+    ('info@sample-corp.co.jp', True, True, True),
+    (' saiyo@sample-corp.co.jp ', True, True, False),
+    ('INFO@SAMPLE.JP', True, True, True),
+    ('logo@2x.png', False, False, False),
+    ('hero01@sample.jp.webp', False, False, True),
+    ('name@sp.sample.jp', False, False, True),
+    ('a..b@sample.jp', True, False, True),
+    ('.a@sample.jp', True, False, False),
+    ('window.x@sample.jp', False, False, True),
+    ('summary@sample.jp', False, False, True),
+    ('x' * 65 + '@sample.jp', False, False, False),
+    ('a@sample.j', False, False, False),
+    ('info@@sample.jp', False, False, False),
+    ('', False, False, False),
+    (None, False, False, False),
+    (12345, False, False, False),
+]
+
+
+def random_emails(count, seed=1):
+    """一括判定の確認用のアドレス（有効・無効・入力例・使い捨て・ロールベースを含む）"""
+    rng = random.Random(seed)
+    locals_ = ['info', 'saiyo', 'logo', 'banner', 'tanaka.taro', 'x..y', 'summary', 'user+tag', '.dot',
+               'comp-1', 'contact', 'test']
+    domains = ['sample.co.jp', 'sample.com', 'example.com', '2x.png', 'sp.sample.jp', 'mailinator.com',
+               'sample.jpg', 'sample', 'mobile.sample.jp', 'sub.sample.or.jp', 'Sample.JP']
+    emails = [f"{rng.choice(locals_)}{rng.choice(['', str(i)])}@{rng.choice(domains)}" for i in range(count)]
+    emails[::97] = ['"表示名 <client@sample.co.jp>"@www.sample.ne.jp'] * len(emails[::97])
+    return emails
+
+
+def main():
+    parser = argparse.ArgumentParser(description='メールアドレス判定ライブラリ テスト')
+    parser.add_argument('--count', type=int, default=100000, help='一括判定の件数')
+    args = parser.parse_args()
+
+    print("🧪 メールアドレス判定ライブラリ テスト")
+    print("=" * 60)
+    checks = []
+
+    # 1. 規則セットごとの判定
+    failures = []
+    for email, *expected in RULE_CASES:
+        actual = [rules.is_valid(email) for rules in (EXTRACTION_RULES, RESOLVER_RULES, STRICT_RULES)]
+        if actual != expected:
+            failures.append((email, expected, actual))
+    for email, expected, actual in failures:
+        print(f"   判定の不一致: {email!r} 期待={expected} 実際={actual}")
+    checks.append(('規則セットごとの判定', not failures))
+
+    # 2. 列単位の判定と1件ずつの判定の一致・処理時間
+    emails = pd.Series(random_emails(args.count) + [case[0] for case in RULE_CASES], dtype=object)
+    consistent = True
+    timings = {}
+    for rules in (EXTRACTION_RULES, RESOLVER_RULES, STRICT_RULES):
+        started = time.perf_counter()
+        mask = rules.valid_mask(emails)
+        timings[rules.name] = time.perf_counter() - started
+        consistent &= mask.tolist() == [rules.is_valid(email) for email in emails]
+        print(f"一括判定（{rules.name}）: {len(emails)}件 {timings[rules.name]:.2f}秒, 有効 {int(mask.sum())}件")
+    checks.append(('一括判定が1件ずつの判定と一致', consistent))
+    checks.append((f'{args.count}件の一括判定が1秒未満', max(timings.values()) < 1.0 * args.count / 100000))
+
+    # 3. 分類
+    started = time.perf_counter()
+    table = classify_emails(emails)
+    print(f"分類: {time.perf_counter() - started:.2f}秒, {table.sum().to_dict()}")
+    sample = classify_emails(['info@example.com', 'Tanaka@Mailinator.com', 'contact@sample.co.jp',
+                              'tanaka@sample.co.jp', 'your-email@sample.com', None])
+    checks.append(('入力例・使い捨てドメイン・ロールベースの分類',
+                   sample['example'].tolist() == [True, False, False, False, True, False]
+                   and sample['disposable'].tolist() == [False, True, False, False, False, False]
+                   and sample['role_based'].tolist() == [True, False, True, False, False, False]
+                   and table.index.equals(emails.index)))
+
+    # 4. クリーニング
+    cleaned = clean_email_addresses(emails)
+    checks.append(('クリーニング（表示名・@以降の除去）',
+                   clean_email_address('"HUGAN JOB <client@hugan.co.jp>"@www4009.sakura.ne.jp') == 'client@hugan.co.jp'
+                   and clean_email_address('info@sample.co.jp"abc') == 'info@sample.co.jp'
+                   and [None if pd.isna(email) else email for email in cleaned]
+                   == [clean_email_address(email) for email in emails]))
+
+    # 5. 各モジュールがライブラリの判定を使う
+    # 決定処理はログを作業ディレクトリの logs/ に書き込むため、一時ディレクトリで読み込む（リポジトリに残さない）
+    work_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+    os.chdir(work_dir.name)
+    os.makedirs('logs', exist_ok=True)
+    import huganjob_email_address_resolver as resolver_module
+    from derivative_email_extractor import PrioritizedEmailExtractor
+    from derivative_ad_email_sender import AdEmailSender
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    resolver = resolver_module.HuganJobEmailResolver()
+    extractor = PrioritizedEmailExtractor.__new__(PrioritizedEmailExtractor)
+    cases = [case[0] for case in RULE_CASES]
+    checks.append(('抽出器・決定処理・広告メール送信が同じライブラリで判定',
+                   [extractor.is_valid_email_format(e) for e in cases if isinstance(e, str)]
+                   == [EXTRACTION_RULES.is_valid(e) for e in cases if isinstance(e, str)]
+                   and [extractor.verify_email_format(e) for e in cases if isinstance(e, str)]
+                   == [STRICT_RULES.is_valid(e) for e in cases if isinstance(e, str)]
+                   and [resolver.is_valid_email(e) for e in cases] == [RESOLVER_RULES.is_valid(e) for e in cases]
+                   and AdEmailSender.clean_email_address(None, '"a <b@c.jp>"@d.jp') == 'b@c.jp'))
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    os.chdir(ROOT)
+    work_dir.cleanup()
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
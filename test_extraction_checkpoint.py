@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+メールアドレス抽出の再開（チェックポイント）テスト（ローカルHTTPサーバー使用）
+
+テスト用の企業サイトをローカルのHTTPサーバー（プロキシとして動作）で配信し、
+core_scripts/derivative_email_extractor.py をサブプロセスとして実行して以下を確認します。
+- 抽出の途中で強制終了しても、完了した企業の結果がチェックポイントに残ること
+- 書き込み途中の不完全な行があっても読み込み・追記できること
+- --resume で完了済みの企業をスキップし、残りの企業だけを抽出すること（出力CSVには全企業）
+- --max-result-age を超えた結果は再抽出すること
+- --check-homepage でトップページの内容が変わった企業だけを再抽出すること
+  （表示されないトークン・nonceだけが変わった場合や、同じドメインの代表企業の結果を複製した企業は再抽出しない）
+- 処理時間の予算切れの結果は再利用せず、アドレスがなかった完了済みの結果は再利用すること（生成アドレスのみの再抽出は retry_fallback 指定時）
+
+使い方（リポジトリのルートで実行）:
+    python test_extraction_checkpoint.py
+    python test_extraction_checkpoint.py --companies 12
+"""
+
+import os
+import sys
+import csv
+import glob
+import time
+import uuid
+import signal
+import logging
+import tempfile
+import argparse
+import subprocess
+import multiprocessing
+from http.server import ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# 抽出器のインポート前に設定（キャッシュを使わず毎回取得する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+EXTRACTOR = os.path.join(ROOT, 'core_scripts', 'derivative_email_extractor.py')
+sys.path.insert(0, os.path.join(ROOT, 'core_scripts'))
+
+from derivative_extraction_checkpoint import ExtractionCheckpoint
+from test_parsed_document import SiteHandler, build_page
+
+
+class VersionedSiteHandler(SiteHandler):
+    """変更ファイルに記載されたドメインはトップページの内容を変えて返す
+
+    トップページには表示されない値（CSRFトークン・nonce・生成時刻）をリクエストごとに変えて埋め込む。
+    """
+    changed_file = None
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        domain = (parts.hostname or '').replace('www.', '')
+        changed = set()
+        if self.changed_file and os.path.exists(self.changed_file):
+            with open(self.changed_file, encoding='utf-8') as f:
+                changed = set(f.read().split())
+        if (parts.path or '/') == '/':
+            token = uuid.uuid4().hex
+            extra = (f'<form method="post"><input type="hidden" name="csrf_token" value="{token}"></form>'
+                     f'<script nonce="{token}">window.renderedAt = {time.time()};</script>')
+            if domain in changed:
+                extra += '<p>お知らせを更新しました</p>'
+            data = build_page(domain, 'トップ（更新）' if domain in changed else 'トップ',
+                              self.paragraphs, extra).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        super().do_GET()
+
+
+def serve(port_queue, changed_file):
+    VersionedSiteHandler.paragraphs = 60
+    VersionedSiteHandler.changed_file = changed_file
+    server = ThreadingHTTPServer(('127.0.0.1', 0), VersionedSiteHandler)
+    # 強制終了したクライアントの接続切断は無視
+    server.handle_error = lambda request, client_address: None
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def count_lines(path):
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb') as f:
+        return sum(1 for line in f if line.endswith(b'\n'))
+
+
+def run_extractor(workdir, input_file, checkpoint, env, *extra):
+    command = [sys.executable, EXTRACTOR, '--input-file', input_file, '--checkpoint-file', checkpoint,
+               '--workers', '2', '--no-dynamic', *extra]
+    return subprocess.run(command, cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=600)
+
+
+def latest_output(workdir):
+    files = sorted(glob.glob(os.path.join(workdir, 'derivative_email_extraction_results_*.csv')), key=os.path.getmtime)
+    if not files:
+        return []
+    with open(files[-1], encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='メールアドレス抽出の再開（チェックポイント）テスト')
+    parser.add_argument('--companies', type=int, default=8, help='企業数')
+    args = parser.parse_args()
+
+    print("🧪 メールアドレス抽出の再開（チェックポイント）テスト")
+    print("=" * 60)
+    checks = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        changed_file = os.path.join(workdir, 'changed.txt')
+        port_queue = multiprocessing.Queue()
+        server_process = multiprocessing.Process(target=serve, args=(port_queue, changed_file), daemon=True)
+        server_process.start()
+        port = port_queue.get(timeout=10)
+
+        env = dict(os.environ)
+        env.update({'HTTP_PROXY': f'http://127.0.0.1:{port}', 'http_proxy': f'http://127.0.0.1:{port}',
+                    'HUGANJOB_HTTP_CACHE_MODE': 'disabled', 'PYTHONIOENCODING': 'utf-8'})
+        env.pop('NO_PROXY', None)
+        env.pop('no_proxy', None)
+
+        input_file = os.path.join(workdir, 'input.csv')
+        domains = [f'resume-corp{i}.co.jp' for i in range(args.companies)]
+        with open(input_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['企業名', '企業URL'])
+            for i, domain in enumerate(domains):
+                writer.writerow([f'株式会社再開{i}', f'http://www.{domain}/'])
+        checkpoint = os.path.join(workdir, 'checkpoint.jsonl')
+
+        # 1. 途中で強制終了（完了した企業の結果が残ること）
+        command = [sys.executable, EXTRACTOR, '--input-file', input_file, '--checkpoint-file', checkpoint,
+                   '--workers', '1', '--no-dynamic']
+        process = subprocess.Popen(command, cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.time() + 120
+        while count_lines(checkpoint) < 2 and process.poll() is None and time.time() < deadline:
+            time.sleep(0.05)
+        process.send_signal(signal.SIGKILL)
+        process.wait()
+        done_before_kill = count_lines(checkpoint)
+        print(f"強制終了までに完了: {done_before_kill}/{args.companies}社")
+        checks.append(('強制終了しても完了した企業の結果が残る', 0 < done_before_kill < args.companies))
+
+        # 2. 書き込み途中の不完全な行
+        with open(checkpoint, 'ab') as f:
+            f.write(b'{"company_id": "999", "url": "http://trunc')
+        loaded = ExtractionCheckpoint(checkpoint)
+        checks.append(('不完全な行を無視して読み込む', len(loaded.records) == done_before_kill))
+
+        # 3. --resume で残りの企業だけを抽出
+        run_extractor(workdir, input_file, checkpoint, env, '--resume')
+        loaded = ExtractionCheckpoint(checkpoint)
+        extracted = loaded.lines - done_before_kill
+        rows = latest_output(workdir)
+        print(f"--resume: 追加で抽出 {extracted}社, 出力CSV {len(rows)}行")
+        checks.append(('--resume は残りの企業だけを抽出', extracted == args.companies - done_before_kill))
+        checks.append(('出力CSVに全企業の結果', len(rows) == args.companies
+                       and all(row['メールアドレス'] == f'info@{domain}' for row, domain in zip(rows, domains))))
+
+        # 4. すべて完了済みなら抽出しない
+        lines = loaded.lines
+        run_extractor(workdir, input_file, checkpoint, env, '--resume')
+        checks.append(('完了済みの再実行では抽出しない', ExtractionCheckpoint(checkpoint).lines == lines))
+
+        # 5. 経過時間による鮮度
+        run_extractor(workdir, input_file, checkpoint, env, '--resume', '--max-result-age', '0')
+        checks.append(('経過時間を超えた結果は再抽出', ExtractionCheckpoint(checkpoint).lines == lines + args.companies))
+
+        # 6. トップページの変更による鮮度
+        lines = ExtractionCheckpoint(checkpoint).lines
+        with open(changed_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(domains[:2]))
+        run_extractor(workdir, input_file, checkpoint, env, '--resume', '--check-homepage')
+        loaded = ExtractionCheckpoint(checkpoint)
+        reextracted = loaded.lines - lines
+        print(f"--check-homepage: トップページが変わった2社のうち {reextracted}社を再抽出")
+        checks.append(('トップページが変わった企業だけを再抽出（トークン・nonceの違いは無視）', reextracted == 2))
+
+        # 7. 同じドメインの代表企業の結果を複製した企業は、代表企業のトップページで鮮度を判定
+        shared_input = os.path.join(workdir, 'shared.csv')
+        with open(shared_input, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['企業名', '企業URL'])
+            writer.writerow(['株式会社再開0', f'http://www.{domains[0]}/'])
+            writer.writerow(['株式会社再開0', f'http://www.{domains[0]}/recruit/'])
+        shared_checkpoint = os.path.join(workdir, 'shared.jsonl')
+        run_extractor(workdir, shared_input, shared_checkpoint, env)
+        lines = ExtractionCheckpoint(shared_checkpoint).lines
+        run_extractor(workdir, shared_input, shared_checkpoint, env, '--resume', '--check-homepage')
+        loaded = ExtractionCheckpoint(shared_checkpoint)
+        homepage_urls = [record.get('homepage_url') for record in loaded.records.values()]
+        print(f"複製した結果: ハッシュを算出したURL {homepage_urls}, 再抽出 {loaded.lines - lines}社")
+        checks.append(('複製した結果は代表企業のトップページのURLとハッシュを記録',
+                       lines == 2 and homepage_urls == [f'http://www.{domains[0]}/'] * 2))
+        checks.append(('複製した結果は変更がなければ再抽出しない', loaded.lines == lines))
+
+        # 8. 予算切れの結果は鮮度があっても再利用しない
+        #    アドレスがなかった結果は完了として再利用（生成アドレスのみの再抽出は retry_fallback 指定時だけ）
+        partial = ExtractionCheckpoint(os.path.join(workdir, 'partial.jsonl'))
+        generated = {'email': 'info@a.co.jp', 'source': 'generated_mechanical'}
+        found = {'emails': [{'email': 'info@a.co.jp', 'source': 'footer'}, generated], 'best_email': generated,
+                 'budget_exhausted': False}
+        partial.append('1', 'http://a.co.jp/', found)
+        partial.append('2', 'http://b.co.jp/', dict(found, budget_exhausted=True))
+        partial.append('3', 'http://c.co.jp/', {'emails': [generated], 'best_email': generated})
+        partial.append('4', 'http://d.co.jp/', {'emails': [], 'best_email': None})
+        checks.append(('予算切れの結果は再抽出',
+                       partial.get_fresh('1', 'http://a.co.jp/') == found
+                       and partial.get_fresh('2', 'http://b.co.jp/') is None))
+        checks.append(('アドレスがなかった完了済みの結果は再利用',
+                       partial.get_fresh('3', 'http://c.co.jp/') is not None
+                       and partial.get_fresh('4', 'http://d.co.jp/') is not None))
+        checks.append(('retry_fallback 指定時は生成アドレスのみの結果を再抽出',
+                       partial.get_fresh('3', 'http://c.co.jp/', retry_fallback=True) is None
+                       and partial.get_fresh('4', 'http://d.co.jp/', retry_fallback=True) is not None
+                       and partial.get_fresh('1', 'http://a.co.jp/', retry_fallback=True) == found))
+
+        server_process.terminate()
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.CRITICAL)
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+メールアドレス抽出結果のストア テスト
+
+一時ディレクトリに既存の抽出結果CSVを作成し、以下を確認します。
+- 抽出結果CSVは決定処理全体で1回だけ読み込まれること（企業ごとに読み直さない）
+- 企業ID（企業ID列のないファイルは企業名）で照合し、見つからない場合は同じドメイン・同じ企業名の結果を使うこと
+  （同じホストにある別企業の結果は使わない）
+- ファイルの検索順・無効なアドレスの読み飛ばし・最新の結果（最後の行）の取得が従来と同じであること
+  （ウェブサイト抽出は企業ID列を '企業ID' → 'ID'、最新の結果は 'ID' → '企業ID' の順に照合、
+  email_extraction_results.csv は最新の結果の取得だけで検索）
+- ホスティングサービス（sites.google.com/view/<サイト名> など）の結果を別の利用者の企業に使わないこと
+- HuganJobEmailResolver が高度なメール抽出器を（スレッドごとに）1つだけ作成して使い回すこと
+- 検索にかかる時間が企業数に比例すること（ファイルサイズに比例しない）
+
+使い方（リポジトリのルートで実行）:
+    python test_extraction_store.py
+    python test_extraction_store.py --rows 50000 --companies 5000
+"""
+
+import os
+import sys
+import csv
+import time
+import logging
+import tempfile
+import argparse
+
+# 抽出器のインポート前に設定（キャッシュを使わず毎回取得する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'core_scripts'))
+
+
+def write_csv(path, header, rows, encoding='utf-8'):
+    with open(path, 'w', newline='', encoding=encoding) as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='メールアドレス抽出結果のストア テスト')
+    parser.add_argument('--rows', type=int, default=20000, help='大きな抽出結果ファイルの行数')
+    parser.add_argument('--companies', type=int, default=2000, help='決定処理の企業数')
+    args = parser.parse_args()
+
+    print("🧪 メールアドレス抽出結果のストア テスト")
+    print("=" * 60)
+
+    # 決定処理はログを作業ディレクトリの logs/ に書き込むため、一時ディレクトリで読み込む（リポジトリに残さない）
+    work_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+    os.chdir(work_dir.name)
+    os.makedirs('logs', exist_ok=True)
+    import pandas as pd
+    import huganjob_email_address_resolver as resolver_module
+    from derivative_extraction_store import ExtractionResultStore
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    checks = []
+    original_read_csv = pd.read_csv
+    reads = []
+
+    def counting_read_csv(path, *a, **kw):
+        reads.append(path)
+        return original_read_csv(path, *a, **kw)
+
+    pd.read_csv = counting_read_csv
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            # 1つ目: 企業ID列あり（BOM付き）、ID 3 は無効なアドレス、ID 4 は2行（最初と最新）
+            write_csv('new_email_extraction_results_latest.csv',
+                      ['企業ID', '企業名', 'ドメイン', 'メールアドレス'],
+                      [[1, '株式会社A', 'a-corp.co.jp', 'info@a-corp.co.jp'],
+                       [6, '株式会社F', 'https://sites.google.com/view/f-corp/home', 'info@f-corp.jp'],
+                       [3, '株式会社C', 'c-corp.co.jp', 'logo@2x.png'],
+                       [143, 'パナソニックエイジフリー株式会社', 'https://panasonic.co.jp/paf/recruit/',
+                        'info@paf.example.jp'],
+                       [4, '株式会社D', 'd-corp.co.jp', 'old@d-corp.co.jp'],
+                       [4, '株式会社D', 'd-corp.co.jp', 'new@d-corp.co.jp']], encoding='utf-8-sig')
+            # 2つ目: 企業ID列なし（企業名で照合）
+            write_csv('huganjob_email_extraction_results.csv',
+                      ['企業名', 'URL', 'email'],
+                      [['株式会社B', 'https://www.b-corp.co.jp/', 'saiyo@b-corp.co.jp'],
+                       ['株式会社C', 'https://c-corp.co.jp/', 'contact@c-corp.co.jp']])
+            # 3つ目: 大きなファイル
+            write_csv('derivative_ad_email_extraction_results.csv',
+                      ['ID', '企業名', '企業ホームページ', 'メールアドレス'],
+                      [[10000 + i, f'株式会社大量{i}', f'https://www.bulk{i}.co.jp/', f'info@bulk{i}.co.jp']
+                       for i in range(args.rows)])
+
+            # 4つ目: parse_extraction_result が最初に検索するファイル（同じ企業の結果が2行）
+            write_csv('email_extraction_results.csv', ['ID', 'extracted_email'],
+                      [[5, 'old@e-corp.co.jp'], [5, 'new@e-corp.co.jp']])
+
+            resolver = resolver_module.HuganJobEmailResolver(csv_file_path='companies.csv')
+            lookup = resolver.extract_email_from_website
+            resolver.run_email_extraction = lambda company_id, company_name, website_url: None
+
+            cases = [
+                ((1, '株式会社A', 'https://a-corp.co.jp/'), 'info@a-corp.co.jp'),
+                ((2, '株式会社B', 'https://b-corp.co.jp/'), 'saiyo@b-corp.co.jp'),
+                # 1つ目の結果が無効な場合は次のファイル
+                ((3, '株式会社C', 'https://c-corp.co.jp/'), 'contact@c-corp.co.jp'),
+                # 企業IDが見つからない場合は同じドメイン・同じ企業名の結果（www・パス・法人格の表記の違いは同じ）
+                ((99, 'Ａ 株式会社', 'http://www.a-corp.co.jp/recruit/'), 'info@a-corp.co.jp'),
+                # 同じドメインでも別の企業の結果は使わない（同じホストのグループ会社）
+                ((94, '株式会社Aホールディングス', 'https://a-corp.co.jp/'), None),
+                ((1115, 'パナソニック環境エンジニアリング株式会社', 'https://panasonic.co.jp/hvac/peseng/'), None),
+                # ホスティングサービスは同じサイトの結果だけを使い、別の利用者の結果は使わない
+                ((97, '株式会社F', 'https://sites.google.com/view/f-corp/recruit'), 'info@f-corp.jp'),
+                ((96, '株式会社G', 'https://sites.google.com/view/g-corp/home'), None),
+                ((95, '株式会社H', 'https://sites.google.com/'), None),
+                ((4, '株式会社D', 'https://d-corp.co.jp/'), 'old@d-corp.co.jp'),
+                ((10005, '株式会社大量5', 'https://www.bulk5.co.jp/'), 'info@bulk5.co.jp'),
+                ((98, '株式会社なし', 'https://none-corp.co.jp/'), None),
+            ]
+            failures = [(arg, expected, lookup(*arg)) for arg, expected in cases if lookup(*arg) != expected]
+            for arg, expected, actual in failures:
+                print(f"   照合の不一致: {arg} 期待={expected} 実際={actual}")
+            checks.append(('企業ID・企業名・同じドメイン（同じ企業名）の順に照合し、無効なアドレスは次の候補へ', not failures))
+            checks.append(('最新の結果（最後の行）を取得', resolver.parse_extraction_result(5, '株式会社E') == 'new@e-corp.co.jp'
+                           and resolver.parse_extraction_result(4, '株式会社D') is None
+                           and lookup(5, '株式会社E', None) is None))
+
+            # 企業ID列が両方あるファイルは検索ごとの優先順で照合（ID 7 と 企業ID 8 が同じ行）
+            write_csv('both_id_columns.csv', ['ID', '企業ID', 'メールアドレス'], [[7, 8, 'info@g-corp.co.jp']])
+            both = ExtractionResultStore(['both_id_columns.csv'])
+            checks.append(('企業ID列の優先順（ウェブサイト抽出は企業ID、最新の結果はID）',
+                           both.candidates(8) == both.candidates(7, id_columns=('ID', '企業ID'))
+                           == [('both_id_columns.csv', 'info@g-corp.co.jp')]
+                           and both.candidates(7) == [] and both.candidates(8, id_columns=('ID', '企業ID')) == []))
+
+            # 決定処理全体の読み込み回数と検索時間
+            reads.clear()
+            resolver.result_store.reload()
+            started = time.perf_counter()
+            found = sum(1 for i in range(args.companies)
+                        if lookup(10000 + i, f'株式会社大量{i}', f'https://bulk{i}.co.jp/'))
+            store_elapsed = time.perf_counter() - started
+            read_count = len(reads)
+
+            # 従来の方式（企業ごとにCSVを読み直す）の1社あたりの時間
+            sample = 20
+            started = time.perf_counter()
+            for i in range(sample):
+                for path in ('new_email_extraction_results_latest.csv', 'huganjob_email_extraction_results.csv',
+                             'derivative_ad_email_extraction_results.csv'):
+                    df = original_read_csv(path, encoding='utf-8')
+                    if 'ID' in df.columns:
+                        df[df['ID'] == 10000 + i]
+            per_company = (time.perf_counter() - started) / sample
+            stats = resolver.result_store.get_stats()
+            print(f"決定処理: {args.companies}社 / {stats['rows']}行, 読み込み {read_count}回, "
+                  f"{store_elapsed:.2f}秒（従来の方式の推定 {per_company * args.companies:.1f}秒）")
+            checks.append(('抽出結果CSVは1ファイルにつき1回だけ読み込む', read_count == 4 and found == args.companies))
+            checks.append(('検索の時間はファイルの読み直しより短い', store_elapsed < per_company * args.companies / 5))
+        finally:
+            os.chdir(cwd)
+            pd.read_csv = original_read_csv
+
+    # 高度なメール抽出器の使い回し
+    import derivative_email_extractor as extractor_module
+    created = []
+    original_init = extractor_module.PrioritizedEmailExtractor.__init__
+
+    def counting_init(self, *a, **kw):
+        created.append(self)
+        original_init(self, *a, **kw)
+
+    extractor_module.PrioritizedEmailExtractor.__init__ = counting_init
+    original_extract = extractor_module.PrioritizedEmailExtractor.extract_emails_with_priority
+    extractor_module.PrioritizedEmailExtractor.extract_emails_with_priority = (
+        lambda self, company_name, url, company_id=None: {'best_email': None})
+    try:
+        resolver = resolver_module.HuganJobEmailResolver()
+        for i in range(5):
+            resolver.advanced_email_extraction(i, f'株式会社{i}', f'https://corp{i}.co.jp/')
+    finally:
+        extractor_module.PrioritizedEmailExtractor.__init__ = original_init
+        extractor_module.PrioritizedEmailExtractor.extract_emails_with_priority = original_extract
+    checks.append(('高度なメール抽出器を1つだけ作成して使い回す', len(created) == 1 and resolver.extractors == created))
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    os.chdir(ROOT)
+    work_dir.cleanup()
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共有HTTPキャッシュ テスト（ローカルHTTPサーバー使用）
+
+ローカルにテスト用HTTPサーバーを起動し、core_scripts/derivative_http_cache.py の
+動作を確認します。外部ネットワークには接続しません。
+- 初回取得で保存され、鮮度期間内はサーバーに接続しないこと
+- 期限切れ後は ETag / Last-Modified で再検証し、304なら本文を再利用すること
+- 内容が変わった場合は新しい本文で更新されること
+- キャッシュのみモードではサーバーに接続せず、未保存URLは CacheMissError になること
+- サイズ上限を超えると古いエントリから削除されること
+- キープアライブ接続が再利用されること（HttpSessionPool）
+
+使い方（リポジトリのルートで実行）:
+    python test_http_cache.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core_scripts'))
+
+from derivative_http_cache import HttpCache, CacheMissError, normalize_cache_url, MODE_OFFLINE
+from derivative_http_session import HttpSessionPool
+
+# パスごとの本文とETag（テスト中に書き換える）
+PAGES = {
+    '/': ('<html><body>info@example.co.jp トップページ</body></html>', '"v1"'),
+    '/contact': ('<html><body>お問い合わせ</body></html>', None),
+}
+REQUEST_LOG = []
+
+
+class TestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        REQUEST_LOG.append((path, self.headers.get('If-None-Match'), self.headers.get('If-Modified-Since')))
+
+        if path.startswith('/large/'):
+            body = os.urandom(64 * 1024).hex().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        if path not in PAGES:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        text, etag = PAGES[path]
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = text.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Last-Modified', 'Mon, 01 Jan 2024 00:00:00 GMT')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    print("🧪 共有HTTPキャッシュ テスト")
+    print("=" * 60)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    pool = HttpSessionPool()
+
+    def fetch(url, headers):
+        return pool.get(url, headers=headers, timeout=5)
+
+    checks = []
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        cache_path = os.path.join(work_dir, 'http_cache.sqlite3')
+        cache = HttpCache(path=cache_path, max_age_hours=1)
+
+        # 1. 初回取得 → 保存
+        response = cache.get(base_url + '/', fetch)
+        checks.append(('初回取得で本文を取得', response.status_code == 200 and 'トップページ' in response.text))
+        checks.append(('初回取得はネットワークから', response.from_cache is False and len(REQUEST_LOG) == 1))
+
+        # 2. 鮮度期間内 → サーバーに接続しない（URLの表記揺れも同じキー）
+        response = cache.get(base_url + '/#top', fetch)
+        checks.append(('鮮度期間内はキャッシュを返す', response.from_cache is True and len(REQUEST_LOG) == 1))
+        checks.append(('キャッシュから本文・URLを復元', 'トップページ' in response.text and response.url.startswith(base_url)))
+        checks.append(('URL正規化', normalize_cache_url('HTTP://Example.COM:80?b=2&a=1#x') == 'http://example.com/?a=1&b=2'))
+
+        # 3. 期限切れ → 条件付きリクエストで再検証（304）
+        stale_cache = HttpCache(path=cache_path, max_age_hours=0)
+        response = stale_cache.get(base_url + '/', fetch)
+        last = REQUEST_LOG[-1]
+        checks.append(('期限切れは If-None-Match で再検証', last[1] == '"v1"' and last[2] is not None))
+        checks.append(('304の場合はキャッシュ本文を再利用', response.status_code == 200 and 'トップページ' in response.text))
+        checks.append(('再検証の統計', stale_cache.get_stats()['revalidated'] == 1))
+
+        # 4. 内容が変わった場合 → 200で更新
+        PAGES['/'] = ('<html><body>sales@example.co.jp 更新後</body></html>', '"v2"')
+        response = stale_cache.get(base_url + '/', fetch)
+        checks.append(('内容変更時は新しい本文を取得', '更新後' in response.text and response.from_cache is False))
+        response = cache.get(base_url + '/', fetch)
+        checks.append(('更新後の本文がキャッシュされる', '更新後' in response.text and response.from_cache is True))
+
+        # 5. キャッシュのみモード
+        offline_cache = HttpCache(path=cache_path, max_age_hours=0, mode=MODE_OFFLINE)
+        before = len(REQUEST_LOG)
+        response = offline_cache.get(base_url + '/', fetch)
+        checks.append(('キャッシュのみモードは期限切れでも接続しない', len(REQUEST_LOG) == before and '更新後' in response.text))
+        try:
+            offline_cache.get(base_url + '/contact', fetch)
+            missed = False
+        except CacheMissError:
+            missed = True
+        checks.append(('未保存URLは CacheMissError', missed and len(REQUEST_LOG) == before))
+
+        # 6. サイズ上限による削除
+        small_cache = HttpCache(path=os.path.join(work_dir, 'small.sqlite3'), max_age_hours=1, max_mb=0.2)
+        for i in range(10):
+            small_cache.get(f'{base_url}/large/{i}', fetch)
+        small_cache.evict()
+        stats = small_cache.get_stats()
+        checks.append(('サイズ上限を超えたエントリを削除', stats['size_bytes'] <= 0.2 * 1024 * 1024 and stats['evicted'] > 0))
+        checks.append(('最近参照したエントリは残る', small_cache.lookup(f'{base_url}/large/9') is not None))
+        checks.append(('古いエントリから削除', small_cache.lookup(f'{base_url}/large/0') is None))
+
+        print(f"キャッシュ統計: {cache.get_stats()}")
+
+    connection_stats = pool.get_stats()
+    print(f"接続統計: {connection_stats}")
+    checks.append(('キープアライブ接続を再利用', connection_stats['new_connections'] < connection_stats['requests']))
+
+    server.shutdown()
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
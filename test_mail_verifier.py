@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+メールアドレス検証サービス テスト（ローカルDNS・SMTPサーバー使用）
+
+ローカルで起動したDNSサーバー（MXレコードを返す）とSMTPサーバー（RCPT TOに応答）に対し、
+core_scripts/derivative_mail_verifier.py の MailVerifier と抽出器の検証処理を実行して以下を確認します。
+- MXレコードの解決はドメインごとに1回だけ（MXなしの結果もキャッシュ）
+- TTL経過後は再解決すること
+- 同じドメインの同時解決は1回の問い合わせにまとめられること
+- 複数ドメインのMXレコードを非同期DNSで並行して解決すること
+- 複数アドレスのSMTP検証はMXホストごとに1回の接続で行うこと
+- キャッチオール判定はドメインごとに1回だけ行い、結果を再利用すること
+- 検証の途中で切断された場合も、それまでに得た応答の結果を保持すること
+
+使い方（リポジトリのルートで実行）:
+    python test_mail_verifier.py
+    python test_mail_verifier.py --dns-delay 0.3 --domains 20
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import threading
+import socketserver
+
+import dns.flags
+import dns.message
+import dns.rcode
+import dns.rrset
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core_scripts'))
+
+from derivative_mail_verifier import MailVerifier
+
+# ドメイン → MXホスト（localhost はローカルSMTPサーバー）
+MX_ZONE = {
+    'sample-corp.co.jp': 'localhost.',
+    'sample-group.co.jp': 'localhost.',
+    'catchall-corp.co.jp': 'localhost.',
+}
+
+# SMTPサーバーが受け付けるアドレス・すべてのアドレスを受け付けるドメイン
+ACCEPTED_ADDRESSES = {'info@sample-corp.co.jp', 'sales@sample-corp.co.jp', 'recruit@sample-corp.co.jp',
+                      'info@sample-group.co.jp'}
+CATCH_ALL_DOMAINS = {'catchall-corp.co.jp'}
+
+
+class DnsHandler(socketserver.BaseRequestHandler):
+    """MXレコードの問い合わせに応答するDNSサーバー（遅延・問い合わせ数を記録）"""
+    delay = 0.0
+    queries = []
+    lock = threading.Lock()
+
+    def handle(self):
+        data, sock = self.request
+        query = dns.message.from_wire(data)
+        question = query.question[0]
+        name = question.name.to_text().rstrip('.')
+        with self.lock:
+            self.queries.append(name)
+        if self.delay:
+            time.sleep(self.delay)
+
+        response = dns.message.make_response(query)
+        response.flags |= dns.flags.AA
+        exchange = MX_ZONE.get(name)
+        if exchange is None and name.startswith('bulk'):
+            exchange = 'localhost.'
+        if exchange:
+            response.answer.append(dns.rrset.from_text(question.name, 300, 'IN', 'MX', f'10 {exchange}'))
+        else:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+        sock.sendto(response.to_wire(), self.client_address)
+
+
+class SmtpHandler(socketserver.StreamRequestHandler):
+    """RCPT TO に応答するだけのSMTPサーバー（接続数・RCPT数を記録）"""
+    sessions = 0
+    rcpts = []
+    # 1セッションでこの数のRCPTに応答した後は応答せずに切断する（None: 切断しない）
+    disconnect_after_rcpts = None
+    lock = threading.Lock()
+
+    def reply(self, line):
+        self.wfile.write((line + '\r\n').encode('ascii'))
+
+    def handle(self):
+        with self.lock:
+            SmtpHandler.sessions += 1
+        self.reply('220 localhost ESMTP test')
+        answered = 0
+        for raw in self.rfile:
+            line = raw.decode('ascii', errors='replace').strip()
+            command = line[:4].upper()
+            if command in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            elif command in ('MAIL', 'RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif command == 'RCPT':
+                if self.disconnect_after_rcpts is not None and answered >= self.disconnect_after_rcpts:
+                    break
+                answered += 1
+                address = line.split(':', 1)[1].strip().strip('<>').lower()
+                with self.lock:
+                    self.rcpts.append(address)
+                if address in ACCEPTED_ADDRESSES or address.split('@')[-1] in CATCH_ALL_DOMAINS:
+                    self.reply('250 OK')
+                else:
+                    self.reply('550 No such user')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                break
+            else:
+                self.reply('502 Not implemented')
+
+
+def start_server(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server.server_address[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='メールアドレス検証サービス テスト')
+    parser.add_argument('--dns-delay', type=float, default=0.2, help='非同期解決の確認時のDNS応答遅延（秒）')
+    parser.add_argument('--domains', type=int, default=10, help='非同期解決の確認に使うドメイン数')
+    args = parser.parse_args()
+
+    print("🧪 メールアドレス検証サービス テスト")
+    print("=" * 60)
+
+    socketserver.ThreadingUDPServer.daemon_threads = True
+    socketserver.ThreadingTCPServer.daemon_threads = True
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    dns_port = start_server(socketserver.ThreadingUDPServer(('127.0.0.1', 0), DnsHandler))
+    smtp_port = start_server(socketserver.ThreadingTCPServer(('127.0.0.1', 0), SmtpHandler))
+
+    def new_verifier(**kwargs):
+        return MailVerifier(nameservers=['127.0.0.1'], dns_port=dns_port, smtp_port=smtp_port, **kwargs)
+
+    import derivative_email_extractor as extractor_module
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    checks = []
+
+    # 1. 抽出器の verify_email: ドメインごとに1回だけ解決（MXなしもキャッシュ）
+    verifier = new_verifier()
+    extractor = extractor_module.PrioritizedEmailExtractor(mail_verifier=verifier)
+    candidates = [f'{prefix}@{domain}' for domain in ('sample-corp.co.jp', 'catchall-corp.co.jp', 'nx-corp.co.jp')
+                  for prefix in ('info', 'contact', 'sales', 'recruit')]
+    for _ in range(3):
+        for email in candidates:
+            extractor.verify_email(email, email.split('@')[1])
+    stats = verifier.get_stats()
+    print(f"verify_email {len(candidates) * 3}回（3ドメイン）: DNS問い合わせ {stats['dns_queries']}件 "
+          f"（従来は1回の検証につき最大3件）, MXキャッシュヒット率 {stats['mx_hit_rate'] * 100:.0f}%")
+    nx_result = extractor.verify_email('info@nx-corp.co.jp', 'nx-corp.co.jp')
+    checks.append(('MXレコードの解決はドメインごとに1回', stats['dns_queries'] == 3))
+    checks.append(('MXレコードがないドメインの結果もキャッシュ',
+                   verifier.get_stats()['dns_queries'] == 3 and not nx_result['has_mx_record']))
+
+    # 2. TTL経過後は再解決
+    verifier = new_verifier(mx_ttl=0.3, negative_mx_ttl=0.3)
+    verifier.has_mx('sample-corp.co.jp')
+    verifier.has_mx('sample-corp.co.jp')
+    time.sleep(0.4)
+    verifier.has_mx('sample-corp.co.jp')
+    checks.append(('TTL経過後に再解決', verifier.get_stats()['dns_queries'] == 2))
+
+    # 3. 同じドメインの同時解決は1回の問い合わせ
+    DnsHandler.delay = args.dns_delay
+    verifier = new_verifier()
+    threads = [threading.Thread(target=verifier.get_mx_hosts, args=('sample-group.co.jp',)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    checks.append(('同時解決は1回の問い合わせにまとめる', verifier.get_stats()['dns_queries'] == 1))
+
+    # 4. 複数ドメインの非同期解決
+    verifier = new_verifier()
+    domains = [f'bulk{i}-corp.co.jp' for i in range(args.domains)]
+    started = time.perf_counter()
+    resolved = verifier.resolve_many(domains)
+    elapsed = time.perf_counter() - started
+    DnsHandler.delay = 0.0
+    sequential = args.dns_delay * len(domains)
+    print(f"{len(domains)}ドメインの非同期解決: {elapsed:.2f}秒（1件ずつ解決した場合 約{sequential:.1f}秒）")
+    checks.append(('複数ドメインを並行して解決',
+                   all(resolved[d] == ['localhost'] for d in domains) and elapsed < sequential / 2))
+
+    # 5. SMTP検証: MXホストごとに1回の接続、キャッチオール判定は1回
+    verifier = new_verifier()
+    extractor = extractor_module.PrioritizedEmailExtractor(mail_verifier=verifier, use_smtp_verification=True)
+    addresses = ['info@sample-corp.co.jp', 'sales@sample-corp.co.jp', 'recruit@sample-corp.co.jp',
+                 'contact@sample-corp.co.jp', 'support@sample-corp.co.jp', 'info@sample-group.co.jp']
+    SmtpHandler.sessions = 0
+    SmtpHandler.rcpts.clear()
+    extractor.prefetch_verification(addresses)
+    sessions, rcpts = SmtpHandler.sessions, len(SmtpHandler.rcpts)
+    print(f"{len(addresses)}アドレス（2ドメイン・同じMXホスト）: SMTP接続 {sessions}件, RCPT {rcpts}件")
+    verifications = {email: extractor.verify_email(email, email.split('@')[1]) for email in addresses}
+    checks.append(('同じMXホストのアドレスは1回の接続で検証', sessions == 1 and rcpts == len(addresses) + 2))
+    checks.append(('検証結果が正しい（受け付けたアドレスのみ有効）',
+                   all(verifications[email]['smtp_valid'] == (email in ACCEPTED_ADDRESSES) for email in addresses)))
+    checks.append(('一括検証後の verify_email は再接続しない', SmtpHandler.sessions == 1))
+
+    SmtpHandler.sessions = 0
+    SmtpHandler.rcpts.clear()
+    first = extractor.verify_smtp_batch(['info@catchall-corp.co.jp', 'sales@catchall-corp.co.jp'])
+    later = extractor.verify_smtp('recruit@catchall-corp.co.jp')
+    probes = sum(1 for address in SmtpHandler.rcpts if address.split('@')[0] not in ('info', 'sales', 'recruit'))
+    checks.append(('キャッチオールドメインを判定',
+                   all(r['is_catch_all'] for r in first.values()) and later['is_catch_all']))
+    checks.append(('キャッチオール判定はドメインごとに1回', probes == 1 and SmtpHandler.rcpts.count('recruit@catchall-corp.co.jp') == 1))
+
+    # 6. 途中で切断された場合は、それまでに得た応答の結果を保持する
+    verifier = new_verifier()
+    SmtpHandler.disconnect_after_rcpts = 2
+    partial = verifier.verify_addresses(addresses[:5])
+    SmtpHandler.disconnect_after_rcpts = None
+    answered = [email for email in addresses[:5] if partial[email]['response_code'] is not None]
+    print(f"2件目のRCPT後に切断: 応答を得たアドレス {answered}")
+    checks.append(('切断前に得た応答の結果を保持',
+                   answered == addresses[:2] and all(partial[email]['is_valid'] for email in answered)
+                   and not any(partial[email]['is_valid'] for email in addresses[2:5])))
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
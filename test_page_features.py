@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ウェブサイト評価の特徴量抽出（1回の走査で特徴量を作成し、スコアは特徴量から算出）テスト
+
+以下を確認します。
+- KeywordMatcher（Aho-Corasick法）が重なり合うキーワードも含めてすべて検出すること
+- サンプルページのスコア（UX・デザイン・技術）が従来の判定と同じであること
+- マークアップ（str(soup)）の生成・特徴量の抽出が1ページにつき1回だけであること
+- 抽出対象ではないキーワードで判定しようとした場合はエラーになること
+- 大きなページでも1ページあたりの分析時間が短いこと
+
+使い方（リポジトリのルートで実行）:
+    python test_page_features.py
+    python test_page_features.py --repeat 50
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+from datetime import timedelta
+
+# 分析器のインポート前に設定（キャッシュを使わず毎回取得する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'core_scripts'))
+
+from bs4 import BeautifulSoup
+
+from derivative_page_features import KeywordMatcher
+
+# サンプルページ（企業サイト・SPA・HTML断片・画像の多いページ）
+CORPORATE = ('<!DOCTYPE html><html lang="ja"><head><meta charset="utf-8">'
+             '<meta name="viewport" content="width=device-width">'
+             '<meta name="description" content="' + '株式会社サンプルは地域のお客様に寄り添うサービスを提供しています。' * 3 + '">'
+             '<title>株式会社サンプル | 公式サイト - 地域密着のサービス</title>'
+             '<link rel="stylesheet" href="/css/bootstrap.min.css"><link rel="stylesheet" href="/css/style.css" media="screen">'
+             '<style>:root{--main:#0a3d62}body{font-family:"Noto Sans JP";color:#333;background-color:#fff}'
+             '@media (max-width:768px){.nav{display:none}}</style>'
+             '<script type="application/ld+json">{"@type":"Organization"}</script><script src="/js/app.js"></script>'
+             '</head><body><header><div class="site-logo" id="logo"><img src="/img/logo.png" alt="株式会社サンプル ロゴ" width="200"></div>'
+             '<nav class="global-nav"><ul><li><a href="/">ホーム</a></li><li><a href="/about">会社概要</a></li>'
+             '<li><a href="/service">サービス</a></li><li><a href="/works">制作実績</a></li><li><a href="/news">お知らせ</a></li>'
+             '<li><a href="/contact">お問い合わせ</a></li></ul></nav>'
+             '<button class="menu-toggle mobile-menu js-toggle">メニュー</button></header>'
+             '<main><section class="hero"><h1>地域とともに</h1><img src="/img/a.jpg" alt="外観" loading="lazy" width="10">'
+             '<img src="/img/b.jpg" alt="社員" srcset="/img/b@2x.jpg 2x"></section>'
+             '<section class="card works"><h2>導入事例</h2><p>portfolio project 実績</p></section>'
+             '<section class="news"><h2>ニュース</h2><p>最新のブログ記事を更新しました。</p></section>'
+             '<section><h2>事業内容</h2><p>製品・ソリューション business</p>'
+             '<p>代表取締役 社長 沿革 設立 会社概要</p></section>'
+             '<form><label>お名前</label><input type="text"><input type="search" class="search-box"><textarea></textarea>'
+             '<button class="btn btn-primary">送信</button></form></main>'
+             '<footer><p>TEL 03-0000-0000 メール info@sample.co.jp プライバシーポリシー 利用規約 サイトマップ</p></footer>'
+             '</body></html>')
+SPA = ('<!DOCTYPE html><html><head><title>App</title><script src="/static/js/main.js"></script></head>'
+       '<body><noscript>You need to enable JavaScript to run this app.</noscript><div id="root"></div></body></html>')
+MINIMAL = '<p>Welcome to <a href="http://example.jp/">our page</a> &gt; home</p>'
+GALLERY = ('<html><head><title>Gallery</title><link rel="STYLESHEET" href="x.css"></head><body>'
+           + ''.join(f'<img src="/img/{i}.jpg" alt="{"" if i % 3 else "photo"}" class="Lazy">' for i in range(15))
+           + '<div class="Mobile Menu" onclick="x()">MENU</div><div style="COLOR:RED; FONT-FAMILY:Roboto">#abc #def #123</div>'
+           + '<ol><li>1</li></ol><ul><li>2</li></ul><select></select><input><button>go</button></body></html>')
+
+# (名前, HTML, URL, レスポンス時間, 従来の判定でのスコア (UX, デザイン, 技術))
+SAMPLES = [
+    ('企業サイト', CORPORATE, 'https://www.sample.co.jp/', 0.8, (30, 34, 28)),
+    ('SPA', SPA, 'https://app.example.jp/', 2.5, (4, 0, 9)),
+    ('HTML断片', MINIMAL, 'http://example.jp/', 6, (2, 0, 1)),
+    ('画像ギャラリー', GALLERY, 'https://g.jp/', 1.2, (6, 6, 10)),
+]
+
+
+class Response:
+    def __init__(self, url, elapsed):
+        self.url = url
+        self.elapsed = timedelta(seconds=elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ウェブサイト評価の特徴量抽出 テスト')
+    parser.add_argument('--repeat', type=int, default=30, help='大きなページで企業サイトの本文を繰り返す回数')
+    args = parser.parse_args()
+
+    print("🧪 ウェブサイト評価の特徴量抽出 テスト")
+    print("=" * 60)
+    checks = []
+
+    # 1. キーワードの検出
+    keywords = ['mail', 'email', 'e', 'about', 'about us', '会社', '会社概要', '概要', '>', 'us', 'sus']
+    matcher = KeywordMatcher(keywords)
+    rng = random.Random(1)
+    alphabet = ['mail', 'e', 'ma', 'il', 'about', ' us', '会社', '概要', '>', 's', 'x', ' ']
+    texts = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))) for _ in range(2000)]
+    mismatches = [text for text in texts if matcher.find(text) != {k for k in keywords if k in text}]
+    for text in mismatches[:5]:
+        print(f"   検出の不一致: {text!r}")
+    checks.append(('重なり合うキーワードもすべて検出', not mismatches))
+
+    # 2. スコアが従来の判定と同じ
+    import derivative_website_analyzer as analyzer_module
+    logging.getLogger().setLevel(logging.CRITICAL)
+    analyzer = analyzer_module.WebsiteAnalyzer(use_selenium=False)
+
+    failures = []
+    for name, html, url, elapsed, expected in SAMPLES:
+        soup = BeautifulSoup(html, 'html.parser')
+        response = Response(url, elapsed)
+        features = analyzer.extract_features(soup, response)
+        actual = (analyzer_module.score_user_experience(features), analyzer_module.score_design_quality(features),
+                  analyzer_module.score_technical_quality(features))
+        wrappers = (analyzer.analyze_user_experience(soup, response), analyzer.analyze_design_quality(soup),
+                    analyzer.analyze_technical_quality(soup, response))
+        print(f"   {name}: {actual}")
+        if actual != expected or wrappers != expected:
+            failures.append((name, expected, actual, wrappers))
+    for name, expected, actual, wrappers in failures:
+        print(f"   スコアの不一致: {name} 従来={expected} 特徴量={actual} メソッド={wrappers}")
+    checks.append(('サンプルページのスコアが従来の判定と同じ', not failures))
+
+    # 3. マークアップの生成・特徴量の抽出は1ページにつき1回
+    decode_calls = []
+    extract_calls = []
+    original_decode = BeautifulSoup.decode
+    original_extract = analyzer.extract_features
+
+    def counting_decode(self, *a, **kw):
+        decode_calls.append(self)
+        return original_decode(self, *a, **kw)
+
+    def counting_extract(soup, response):
+        extract_calls.append(soup)
+        return original_extract(soup, response)
+
+    BeautifulSoup.decode = counting_decode
+    analyzer.extract_features = counting_extract
+    analyzer.get_html_with_requests = lambda url: (CORPORATE, Response(url, 0.8))
+    try:
+        result = analyzer.analyze_website('株式会社サンプル', 'https://www.sample.co.jp/recruit/')
+    finally:
+        BeautifulSoup.decode = original_decode
+        del analyzer.extract_features
+    checks.append(('マークアップの生成・特徴量の抽出は1ページにつき1回',
+                   len(decode_calls) == 1 and len(extract_calls) == 1
+                   and (result['ux_score'], result['design_score'], result['technical_score']) == SAMPLES[0][4]))
+
+    # 4. 抽出対象ではないキーワード
+    features = analyzer.extract_features(BeautifulSoup(CORPORATE, 'html.parser'), None)
+    try:
+        features.text_has('採用情報')
+        rejected = False
+    except ValueError:
+        rejected = True
+    checks.append(('抽出対象ではないキーワードはエラー', rejected))
+
+    # 5. 大きなページの分析時間
+    body = CORPORATE.split('<body>', 1)[1].split('</body>', 1)[0]
+    large = CORPORATE.replace(body, body * args.repeat)
+    soup = BeautifulSoup(large, 'html.parser')
+    response = Response('https://www.sample.co.jp/', 0.8)
+    started = time.perf_counter()
+    features = analyzer.extract_features(soup, response)
+    scores = (analyzer_module.score_user_experience(features), analyzer_module.score_design_quality(features),
+              analyzer_module.score_technical_quality(features))
+    elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(3):
+        str(soup)
+    serialize = (time.perf_counter() - started) / 3
+    print(f"大きなページ: {len(large)}文字, 特徴量の抽出とスコア {elapsed * 1000:.0f}ms "
+          f"（マークアップの生成1回 {serialize * 1000:.0f}ms）, スコア {scores}")
+    # 従来の判定はマークアップを項目ごとに20回以上生成していた
+    checks.append(('大きなページの分析時間がマークアップの生成数回分以内', elapsed < serialize * 5))
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML解析のプロセスプール テスト（保存済みページ + ローカルHTTPサーバー使用）
+
+保存済みのページ（共有HTTPキャッシュ・リポジトリ内のHTML・テスト用ページ）を使って以下を確認します。
+- プロセスプールでの抽出結果（メールアドレス・フッター・リンク・関連ページ・お問い合わせページの追加抽出）が
+  取得したスレッドで解析した場合と一致すること
+- 解析結果から生成したドキュメントはメインプロセスで解析木を構築しないこと
+- ワーカー数に応じた解析のスループット（CPUコアが2以上の環境では速度向上を確認）
+- extract_emails_with_priority の結果がプロセスプールの有無で変わらないこと
+- ワーカープロセスが異常終了した場合は通常の解析に切り替わること
+- ワーカープロセスは fork ではなく forkserver（または spawn）で起動すること
+- 解析が時間内に終わらない場合はそのページだけ通常の解析を行い、プロセスプールは使い続けること
+- メールアドレス決定処理（HuganJobEmailResolver）の終了時にプロセスプールが終了すること
+
+使い方（リポジトリのルートで実行）:
+    python test_parse_pool.py
+    python test_parse_pool.py --workers 8 --pages 400
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import multiprocessing
+import concurrent.futures
+
+# 抽出器のインポート前に設定（キャッシュを使わず毎回取得する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core_scripts'))
+
+from test_parsed_document import build_page, serve
+from test_email_scanner import load_corpus, ROOT
+from derivative_http_cache import DEFAULT_CACHE_PATH
+
+
+def build_corpus(cache_db, limit, synthetic):
+    """[(URL, 本文のバイト列, エンコーディング), ...] を作成"""
+    pages = []
+    for i, (name, html) in enumerate(load_corpus(cache_db, limit)):
+        url = name if name.startswith(('http://', 'https://')) else f'http://www.saved-{i}.co.jp/{name}'
+        pages.append((url, html.encode('utf-8'), 'utf-8'))
+
+    for i in range(synthetic):
+        domain = f'corpus-{i}.co.jp'
+        form = (f'<form action="/send" method="post"><p>個人情報の取扱いについて：'
+                f'お問合せ窓口 recruit@{domain}</p><input name="name"></form>') if i % 3 == 0 else ''
+        html = build_page(domain, f'ページ{i}', 100 + (i % 5) * 40, form)
+        pages.append((f'http://www.{domain}/', html.encode('utf-8'), 'utf-8'))
+
+    # エンコーディングの指定がない・Shift_JISのページ（デコードもワーカーで行う）
+    sjis = build_page('sjis-corp.co.jp', '会社概要', 30).replace('charset="utf-8"', 'charset="shift_jis"')
+    pages.append(('http://www.sjis-corp.co.jp/', sjis.encode('shift_jis'), 'shift_jis'))
+    pages.append(('http://www.sjis-corp.co.jp/about/', sjis.encode('shift_jis'), None))
+    return pages
+
+
+def local_analysis(extractor, url, content, encoding):
+    """取得したスレッドでの解析（従来の方式）"""
+    from derivative_parsed_document import ParsedDocument, decode_body
+    document = ParsedDocument(url, decode_body(content, encoding))
+    privacy_emails, form_reply_emails = extractor.extract_contact_page_emails(document)
+    return {
+        'content_hash': document.content_hash,
+        'emails': extractor.extract_document_emails(document),
+        'links': document.links,
+        'contact_pages': extractor.find_document_contact_pages(document),
+        'footer_emails': extractor.extract_emails_from_footer(document.html, url, document=document),
+        'privacy_emails': privacy_emails,
+        'form_reply_emails': form_reply_emails,
+    }
+
+
+def run_company(extractor_module, parse_pool, domain):
+    extractor = extractor_module.PrioritizedEmailExtractor(timeout=10, max_retries=0, parse_pool=parse_pool)
+    started = time.perf_counter()
+    result = extractor.extract_emails_with_priority('株式会社サンプル', f'http://www.{domain}/', '1')
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTML解析のプロセスプール テスト')
+    parser.add_argument('--cache-db', default=os.path.join(ROOT, DEFAULT_CACHE_PATH), help='共有HTTPキャッシュのパス')
+    parser.add_argument('--limit', type=int, default=300, help='キャッシュから読み込む最大ページ数')
+    parser.add_argument('--pages', type=int, default=60, help='追加するテスト用ページ数')
+    parser.add_argument('--workers', type=int, help='ワーカープロセス数（デフォルト: CPUコア数、最低2）')
+    args = parser.parse_args()
+
+    print("🧪 HTML解析のプロセスプール テスト")
+    print("=" * 60)
+
+    port_queue = multiprocessing.Queue()
+    server_process = multiprocessing.Process(target=serve, args=(port_queue, 200), daemon=True)
+    server_process.start()
+    port = port_queue.get(timeout=10)
+    os.environ['HTTP_PROXY'] = f'http://127.0.0.1:{port}'
+    os.environ['http_proxy'] = f'http://127.0.0.1:{port}'
+    os.environ.pop('NO_PROXY', None)
+    os.environ.pop('no_proxy', None)
+
+    # 抽出器・決定処理は作業ディレクトリにログを書き込むため、一時ディレクトリで読み込む（リポジトリに残さない）
+    work_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+    os.chdir(work_dir.name)
+    os.makedirs('logs', exist_ok=True)
+    import derivative_email_extractor as extractor_module
+    from derivative_parse_pool import ParsePool, ANALYSIS_SECTIONS, available_cpus
+    from derivative_parsed_document import ParsedDocument
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    cpus = available_cpus()
+    workers = args.workers or max(2, cpus)
+    pages = build_corpus(args.cache_db, args.limit, args.pages)
+    total_bytes = sum(len(content) for _, content, _ in pages)
+    print(f"対象: {len(pages)} ページ / {total_bytes / 1024 / 1024:.1f}MB, CPUコア {cpus}, ワーカー {workers}\n")
+
+    checks = []
+    extractor = extractor_module.PrioritizedEmailExtractor(timeout=10, max_retries=0)
+    extractor.current_company_name = ''
+    pool = ParsePool(workers=workers)
+
+    # 1. 抽出結果の一致
+    mismatches = []
+    lazy = True
+    for url, content, encoding in pages:
+        expected = local_analysis(extractor, url, content, encoding)
+        analysis = pool.analyze(url, content, encoding, sections=ANALYSIS_SECTIONS)
+        actual = {key: analysis.get(key) for key in expected} if analysis else None
+        if actual != expected:
+            mismatches.append(url)
+
+        # 解析結果から生成したドキュメントは解析木を構築せずに各抽出処理に応える
+        document = ParsedDocument.from_analysis(url, content, encoding, analysis)
+        extractor.extract_document_emails(document)
+        extractor.find_document_contact_pages(document)
+        extractor.extract_emails_from_footer(document.html, url, document=document)
+        extractor.extract_contact_page_emails(document)
+        lazy = lazy and document._soup is None and document.content_hash == expected['content_hash']
+    start_method = pool._executor._mp_context.get_start_method()
+    print(f"抽出結果の一致: {len(pages) - len(mismatches)}/{len(pages)} ページ（起動方法: {start_method}）")
+    for url in mismatches[:5]:
+        print(f"  不一致: {url}")
+    checks.append(('プロセスプールの抽出結果が通常の解析と一致', not mismatches))
+    checks.append(('解析結果から生成したドキュメントはメインプロセスで解析木を構築しない', lazy))
+    checks.append(('ワーカープロセスを fork 以外の方法で起動', start_method in ('forkserver', 'spawn')))
+
+    # 2. スループット（I/Oスレッドから解析を依頼する構成）
+    started = time.perf_counter()
+    for url, content, encoding in pages:
+        local_analysis(extractor, url, content, encoding)
+    serial_elapsed = time.perf_counter() - started
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers * 2) as io_threads:
+        started = time.perf_counter()
+        list(io_threads.map(lambda page: pool.analyze(*page, sections=ANALYSIS_SECTIONS), pages))
+        pool_elapsed = time.perf_counter() - started
+    speedup = serial_elapsed / pool_elapsed if pool_elapsed > 0 else 0
+    print(f"スループット: 通常の解析 {len(pages) / serial_elapsed:.1f}ページ/秒, "
+          f"プロセスプール（{workers}プロセス）{len(pages) / pool_elapsed:.1f}ページ/秒 (x{speedup:.2f})")
+    if cpus >= 2:
+        checks.append((f'CPUコア数（{cpus}）に応じて解析が高速化', speedup >= min(cpus, workers) * 0.5))
+    else:
+        print("  （CPUコアが1つの環境のため速度向上の確認は省略）")
+
+    # 3. extract_emails_with_priority の結果（プロセスプールの有無）
+    baseline, baseline_elapsed = run_company(extractor_module, ParsePool(workers=0), 'pool-corp.co.jp')
+    pooled, pooled_elapsed = run_company(extractor_module, pool, 'pool-corp.co.jp')
+    same = (baseline['best_email'] == pooled['best_email']
+            and [e['email'] for e in baseline['emails']] == [e['email'] for e in pooled['emails']]
+            and baseline['homepage_hash'] == pooled['homepage_hash'])
+    print(f"extract_emails_with_priority: {pooled['best_email']['email'] if pooled['best_email'] else None} "
+          f"(通常 {baseline_elapsed:.2f}秒, プロセスプール {pooled_elapsed:.2f}秒)")
+    checks.append(('プロセスプールの有無で抽出結果が同じ', same and pooled['best_email'] is not None))
+
+    stats = pool.get_stats()
+    print(f"統計: {stats['pages']}ページ / {stats['bytes_parsed'] / 1024 / 1024:.1f}MB, "
+          f"解析時間合計 {stats['parse_seconds']:.2f}秒, 失敗 {stats['failures']}件")
+
+    # 4. ワーカープロセスの異常終了
+    for process in list(pool._executor._processes.values()):
+        process.kill()
+    time.sleep(0.5)
+    url, content, encoding = pages[-3]
+    fallback = pool.analyze(url, content, encoding)
+    extractor = extractor_module.PrioritizedEmailExtractor(timeout=10, max_retries=0, parse_pool=pool)
+    extractor.visited_urls = set()
+    document = extractor.get_document('http://www.broken-corp.co.jp/')
+    checks.append(('ワーカーの異常終了後は通常の解析に切り替わる',
+                   fallback is None and not pool.enabled and document is not None
+                   and extractor.extract_document_emails(document) == ['info@broken-corp.co.jp']))
+
+    pool.shutdown()
+
+    # 5. 解析の待ち時間の上限（ワーカーの起動を待たずに時間切れにする）
+    slow_pool = ParsePool(workers=1, timeout=0.001)
+    extractor = extractor_module.PrioritizedEmailExtractor(timeout=10, max_retries=0, parse_pool=slow_pool)
+    extractor.visited_urls = set()
+    document = extractor.get_document('http://www.timeout-corp.co.jp/')
+    timeout_stats = slow_pool.get_stats()
+    checks.append(('時間内に終わらない解析は通常の解析に切り替える',
+                   timeout_stats['timeouts'] == 1 and slow_pool.enabled and document is not None
+                   and extractor.extract_document_emails(document) == ['info@timeout-corp.co.jp']))
+
+    # 6. メールアドレス決定処理の終了時にプロセスプールを終了
+    from huganjob_email_address_resolver import HuganJobEmailResolver
+    resolver = HuganJobEmailResolver()
+    resolver.extractors.append(extractor)
+    resolver.close()
+    checks.append(('メールアドレス決定処理の終了時にプロセスプールを終了', slow_pool._executor is None))
+    server_process.terminate()
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    os.chdir(ROOT)
+    work_dir.cleanup()
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
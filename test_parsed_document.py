@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析済みドキュメント共有 テスト（ローカルHTTPサーバー使用）
+
+テスト用の企業サイトを別プロセスのHTTPサーバー（プロキシとして動作）で配信し、
+extract_emails_with_priority() を実行して以下を確認します。
+- トップページの取得・解析が1企業につき1回だけであること
+- 訪問済みのトップページでも関連ページ探索（find_contact_pages）が機能すること
+- 取得したページ数と解析済みドキュメント数が一致すること（同じページを再解析しない）
+- 1企業あたりのCPU時間
+- 内容のハッシュが表示テキストとリンクだけで決まること（トークン・nonce・コメントの違いは無視）
+
+使い方（リポジトリのルートで実行）:
+    python test_parsed_document.py
+    python test_parsed_document.py --companies 20 --paragraphs 400
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# 抽出器のインポート前に設定（キャッシュを使わず毎回解析する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core_scripts'))
+
+NAV_PAGES = [
+    ('contact.html', 'お問い合わせ'), ('about/', '会社概要'), ('recruit/', '採用情報'),
+    ('news/', 'ニュース'), ('privacy/', 'プライバシーポリシー'), ('service/', '事業内容'),
+    ('works/', '施工実績'), ('faq/', 'よくある質問'), ('blog/', 'ブログ'), ('access/', 'アクセス'),
+]
+
+
+def build_page(domain, title, paragraphs, body_extra=''):
+    """ナビゲーション・本文・フッターを持つテスト用ページを生成"""
+    nav = ''.join(f'<li><a href="/{path}">{text}</a></li>' for path, text in NAV_PAGES)
+    body = ''.join(
+        f'<section class="block-{i}"><h2>見出し{i}</h2><p>当社は{i}年の実績があります。'
+        f'<span>製品{i}</span>の製造・販売を行っています。<a href="/products/{i}">詳細</a></p></section>'
+        for i in range(paragraphs)
+    )
+    footer = (f'<footer id="footer"><div class="footer-info"><p>株式会社サンプル 〒100-0001 東京都千代田区1-1</p>'
+              f'<p>TEL: 03-0000-0000 / E-mail: info@{domain}</p>'
+              f'<p>&copy; 2024 Sample Co., Ltd.</p></div></footer>')
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title></head>'
+            f'<body><header><ul class="nav">{nav}</ul></header><main>{body}{body_extra}</main>{footer}</body></html>')
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    """プロキシとして受けたリクエストのホスト名ごとにテスト用サイトを返す"""
+    protocol_version = 'HTTP/1.1'
+    paragraphs = 200
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        domain = (parts.hostname or 'localhost').replace('www.', '')
+        path = parts.path or '/'
+
+        if path == '/':
+            body = build_page(domain, 'トップ', self.paragraphs)
+        elif path == '/contact.html':
+            form = (f'<form action="/send" method="post"><p>個人情報の取扱いについて：'
+                    f'お問合せ窓口 recruit@{domain}</p><input name="name"></form>')
+            body = build_page(domain, 'お問い合わせ', self.paragraphs // 4, form)
+        elif path.rstrip('/').lstrip('/') in {p.rstrip('/') for p, _ in NAV_PAGES}:
+            body = build_page(domain, path, self.paragraphs // 2)
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port_queue, paragraphs):
+    SiteHandler.paragraphs = paragraphs
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SiteHandler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def check_content_hash():
+    """内容のハッシュは表示テキストとリンクから算出する"""
+    from derivative_parsed_document import ParsedDocument
+
+    def content_hash(extra='', token='a1', text='製品一覧', href='/products/'):
+        html = (f'<html><head><title>トップ</title><meta name="csrf-token" content="{token}"></head><body>'
+                f'<form><input type="hidden" name="_token" value="{token}"></form>'
+                f'<script nonce="{token}">var t = "{token}";</script><style>.x{{}}</style><!-- {token} -->'
+                f'<p>{text}</p>  <a href="{href}">詳細</a>{extra}</body></html>')
+        return ParsedDocument('https://sample.co.jp/', html).content_hash
+
+    base = content_hash()
+    return [
+        ('トークン・nonce・コメント・空白の違いではハッシュが変わらない',
+         content_hash(token='b2') == base and content_hash(extra='\n  ') == base),
+        ('表示テキスト・リンク先の違いではハッシュが変わる',
+         content_hash(text='製品情報') != base and content_hash(href='/items/') != base),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='解析済みドキュメント共有 テスト')
+    parser.add_argument('--companies', type=int, default=5, help='処理する企業数')
+    parser.add_argument('--paragraphs', type=int, default=200, help='トップページの本文ブロック数')
+    args = parser.parse_args()
+
+    print("🧪 解析済みドキュメント共有 テスト")
+    print("=" * 60)
+
+    # サーバーは別プロセスで起動（サーバー側のCPU時間を計測に含めない）
+    port_queue = multiprocessing.Queue()
+    server_process = multiprocessing.Process(target=serve, args=(port_queue, args.paragraphs), daemon=True)
+    server_process.start()
+    port = port_queue.get(timeout=10)
+
+    # http:// のリクエストはすべてローカルサーバーへ（プロキシ経由）
+    os.environ['HTTP_PROXY'] = f'http://127.0.0.1:{port}'
+    os.environ['http_proxy'] = f'http://127.0.0.1:{port}'
+    os.environ.pop('NO_PROXY', None)
+    os.environ.pop('no_proxy', None)
+
+    import derivative_email_extractor as extractor_module
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    # リクエストを記録
+    requested = []
+    original_network_get = extractor_module.PrioritizedEmailExtractor._network_get
+
+    def recording_network_get(self, url, headers, timeout):
+        response = original_network_get(self, url, headers, timeout)
+        requested.append((url, response.status_code))
+        return response
+
+    extractor_module.PrioritizedEmailExtractor._network_get = recording_network_get
+
+    extractor = extractor_module.PrioritizedEmailExtractor(timeout=5, max_retries=0)
+    cpu_times = []
+    checks = []
+
+    for i in range(args.companies):
+        domain = f'sample-corp{i}.co.jp'
+        url = f'http://www.{domain}/'
+        extractor.visited_urls = set()
+        requested.clear()
+
+        cpu_start = time.process_time()
+        result = extractor.extract_emails_with_priority(f'株式会社サンプル{i}', url, i + 1)
+        cpu_times.append(time.process_time() - cpu_start)
+
+        found = {e['email'] for e in result['emails']}
+        homepage_requests = sum(1 for u, _ in requested if u == url)
+        contact_requested = any(u.endswith('/contact.html') for u, _ in requested)
+        fetched_pages = {u for u, status in requested if status == 200}
+        documents = getattr(extractor, 'documents', None)
+
+        if i == 0:
+            print(f"取得リクエスト数: {len(requested)} / 抽出メールアドレス: {sorted(found)}")
+            if documents is not None:
+                print(f"解析済みドキュメント数: {len(documents)}")
+            checks.append(('トップページの取得は1回だけ', homepage_requests == 1))
+            checks.append(('フッターのメールアドレスを抽出', f'info@{domain}' in found))
+            checks.append(('お問い合わせページを探索・抽出', contact_requested and f'recruit@{domain}' in found))
+            checks.append(('取得したページごとにドキュメントを1つだけ保持',
+                           documents is not None and set(documents) == fetched_pages))
+
+    server_process.terminate()
+    checks += check_content_hash()
+
+    average = sum(cpu_times) / len(cpu_times)
+    print(f"1企業あたりのCPU時間: 平均 {average * 1000:.0f}ms（最小 {min(cpu_times) * 1000:.0f}ms / 最大 {max(cpu_times) * 1000:.0f}ms）")
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HUGANJOB プロセス出力スーパーバイザー テストスクリプト
+
+ダッシュボードの子プロセス出力監視（derivative_process_supervisor）が
+- 出力をリングバッファに上限付きで保持すること
+- バイト数・行数カウンタを正しく記録すること
+- 大量出力の子プロセスでもCPU使用量が増えないこと
+- 終了を即座に検出すること
+- メインスレッド以外から開始した場合（SIGCHLDなし）もpoll()で終了を検出すること
+を確認します。
+
+各テスト関数は assert で検証するため pytest からも実行できます。
+
+使い方（リポジトリのルートで実行）:
+    python test_process_output_supervisor.py
+    python -m pytest test_process_output_supervisor.py
+"""
+
+import os
+import sys
+import time
+import threading
+import subprocess
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard'))
+
+from derivative_process_supervisor import ProcessOutputSupervisor
+
+
+def spawn(code):
+    """テスト用の子プロセスを起動（ダッシュボードと同じくバイナリ・非バッファ）"""
+    return subprocess.Popen(
+        [sys.executable, '-c', code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=0
+    )
+
+
+def test_ring_buffer_and_counters():
+    """リングバッファとカウンタのテスト"""
+    print("\n1️⃣ リングバッファ・カウンタ")
+    print("-" * 30)
+
+    finished = {}
+    done = threading.Event()
+
+    def on_exit(process_id, return_code, output):
+        finished[process_id] = (return_code, output)
+        done.set()
+
+    supervisor = ProcessOutputSupervisor(on_exit=on_exit, max_lines=100)
+    try:
+        process = spawn("import sys\nfor i in range(5000): print(f'行 {i}')\nsys.exit(3)")
+        supervisor.watch('p1', process)
+        assert done.wait(30), "終了が検出されませんでした"
+
+        stats = supervisor.get_stats('p1')
+        return_code, output = finished['p1']
+        lines = output.split('\n')
+        expected_bytes = sum(len(f'行 {i}\n'.encode('utf-8')) for i in range(5000))
+        print(f"   終了コード: {return_code}, 保持行数: {len(lines)}, 最終行: {lines[-1]}")
+        print(f"   カウンタ: {stats['output_lines']}行 / {stats['output_bytes']}バイト (期待値 {expected_bytes})")
+
+        assert return_code == 3, f"終了コード {return_code}"
+        assert len(lines) == 100 and lines[-1] == '行 4999', "リングバッファの内容が不正"
+        assert stats['output_lines'] == 5000, f"行数カウンタ {stats['output_lines']}"
+        assert stats['output_bytes'] == expected_bytes, f"バイト数カウンタ {stats['output_bytes']}"
+    finally:
+        supervisor.stop()
+
+
+def test_many_chatty_processes():
+    """大量出力プロセス複数同時監視のCPU使用量テスト"""
+    print("\n2️⃣ 大量出力プロセス x 8 の同時監視")
+    print("-" * 30)
+
+    remaining = {'count': 8}
+    done = threading.Event()
+    lock = threading.Lock()
+
+    def on_exit(process_id, return_code, output):
+        with lock:
+            remaining['count'] -= 1
+            if remaining['count'] == 0:
+                done.set()
+
+    supervisor = ProcessOutputSupervisor(on_exit=on_exit)
+    code = "import sys\nfor i in range(200000): sys.stdout.write('x' * 60 + '\\n')"
+    try:
+        cpu_start = time.process_time()
+        wall_start = time.time()
+        for i in range(8):
+            supervisor.watch(f'chatty{i}', spawn(code))
+        done.wait(120)
+        wall = time.time() - wall_start
+        cpu = time.process_time() - cpu_start
+
+        total_lines = sum(supervisor.get_stats(f'chatty{i}')['output_lines'] for i in range(8))
+        print(f"   合計 {total_lines:,}行 / 経過 {wall:.2f}秒 / 監視側CPU {cpu:.2f}秒")
+        assert total_lines == 8 * 200000, f"行数 {total_lines:,}"
+
+        # 監視プロセスは待機中にCPUを消費しないこと
+        cpu_idle_start = time.process_time()
+        idle = spawn("import time\ntime.sleep(2)")
+        supervisor.watch('idle', idle)
+        idle.wait()
+        time.sleep(0.2)
+        cpu_idle = time.process_time() - cpu_idle_start
+        print(f"   無出力プロセス待機2秒間の監視側CPU: {cpu_idle:.3f}秒")
+        assert cpu_idle < 0.2, f"待機中の監視側CPU {cpu_idle:.3f}秒"
+    finally:
+        supervisor.stop()
+
+
+def test_exit_detection_latency():
+    """終了検出の即時性テスト"""
+    print("\n3️⃣ 終了検出レイテンシ")
+    print("-" * 30)
+
+    detected = {}
+    done = threading.Event()
+
+    def on_exit(process_id, return_code, output):
+        detected['at'] = time.time()
+        done.set()
+
+    supervisor = ProcessOutputSupervisor(on_exit=on_exit)
+    try:
+        process = spawn("import time\ntime.sleep(0.5)")
+        supervisor.watch('quick', process)
+        process.wait()
+        exited_at = time.time()
+        done.wait(10)
+
+        latency = detected.get('at', float('inf')) - exited_at
+        print(f"   終了から検出まで: {latency * 1000:.1f}ms")
+        assert latency < 0.5, f"終了検出まで {latency * 1000:.1f}ms"
+    finally:
+        supervisor.stop()
+
+
+def test_exit_detection_from_worker_thread():
+    """メインスレッド以外から開始した場合の終了検出テスト（孫プロセスがパイプを保持）"""
+    print("\n4️⃣ ワーカースレッドから開始した場合の終了検出")
+    print("-" * 30)
+
+    detected = {}
+    done = threading.Event()
+
+    def on_exit(process_id, return_code, output):
+        detected.update(at=time.time(), return_code=return_code, output=output)
+        done.set()
+
+    # ダッシュボードと同じくリクエスト処理スレッドから開始する
+    supervisor = ProcessOutputSupervisor(on_exit=on_exit)
+    try:
+        starter = threading.Thread(target=supervisor.start)
+        starter.start()
+        starter.join()
+
+        # 孫プロセスが標準出力を引き継ぐため、子プロセスの終了後もパイプはクローズされない
+        process = spawn("import subprocess, sys\n"
+                        "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(3)'])\n"
+                        "print('起動完了')\nsys.exit(5)")
+        supervisor.watch('worker', process)
+        process.wait()
+        exited_at = time.time()
+        done.wait(10)
+
+        latency = detected.get('at', float('inf')) - exited_at
+        print(f"   SIGCHLD: {'あり' if supervisor._sigchld_installed else 'なし'}, "
+              f"終了から検出まで: {latency * 1000:.1f}ms")
+        assert not supervisor._sigchld_installed, "ワーカースレッドからSIGCHLDハンドラを設定した"
+        assert latency < 1.0, f"終了検出まで {latency * 1000:.1f}ms"
+        assert detected.get('return_code') == 5 and detected.get('output') == '起動完了', "終了コード・出力が不正"
+    finally:
+        supervisor.stop()
+
+
+def main():
+    print("🧪 HUGANJOB プロセス出力スーパーバイザー テスト開始")
+    print("=" * 60)
+
+    results = []
+    for test in (test_ring_buffer_and_counters, test_many_chatty_processes,
+                 test_exit_detection_latency, test_exit_detection_from_worker_thread):
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ 失敗: {e}")
+            results.append(False)
+        else:
+            print("✅ 成功")
+            results.append(True)
+
+    print("\n" + "=" * 60)
+    if all(results):
+        print("🎉 全テスト成功")
+        return 0
+    print("⚠️ 一部のテストが失敗しました")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ウェブサイト分析の取得方法（requests優先・必要な場合だけSelenium）テスト
+
+以下を確認します。
+- 静的HTMLで足りるページ（本文のあるページ・SSR済みのSPA・noscriptのあるページ）はSeleniumに切り替えないこと
+- 本文が空・SPAのルート要素が空・noscriptの警告表示・requestsでの取得失敗の場合だけSeleniumで再取得すること
+- Seleniumでも取得できない場合は静的HTMLのまま分析すること
+- Seleniumで再取得した場合も、最終URL・応答時間はrequestsでの応答のものを使うこと
+- 切り替え率・理由・推定短縮時間が集計されること（Selenium優先の従来の動作より短い時間で終わること）
+
+使い方（リポジトリのルートで実行）:
+    python test_render_escalation.py
+    python test_render_escalation.py --pages 40 --selenium-delay 0.3
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from types import SimpleNamespace
+from datetime import timedelta
+
+# 分析器のインポート前に設定（キャッシュを使わず毎回取得する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'core_scripts'))
+
+from bs4 import BeautifulSoup
+
+from derivative_render_detector import detect_javascript_rendering
+
+ARTICLE = '<p>' + '株式会社サンプルは地域に根ざした事業を展開しています。' * 20 + '</p>'
+NAVIGATION = '<nav><a href="/">ホーム</a><a href="/about">会社概要</a><a href="/recruit">採用情報</a></nav>'
+
+# (説明, HTML, 期待する理由)
+PAGES = [
+    ('本文のあるページ', f'<html><body>{NAVIGATION}{ARTICLE}</body></html>', None),
+    ('SSR済みのSPA', f'<html><body><div id="__next">{NAVIGATION}{ARTICLE}</div></body></html>', None),
+    ('本文とGTMのnoscript', f'<html><body><noscript><iframe src="https://www.googletagmanager.com/ns.html">'
+                          f'</iframe></noscript>{ARTICLE}</body></html>', None),
+    ('画像とリンクだけのトップページ', '<html><body><a href="/top"><img src="a.jpg"></a><a href="/en">EN</a>'
+                                 '<img src="b.jpg"></body></html>', None),
+    ('本文が空', '<html><head><title>会社</title><script>var a = "' + 'x' * 500 + '";</script></head>'
+             '<body><!-- 読み込み中 --></body></html>', 'empty_body'),
+    ('空のSPAルート要素', '<html><body><div id="root"></div><footer>© 2024 株式会社サンプル All rights reserved. '
+                     'プライバシーポリシー</footer><script src="/static/js/main.js"></script></body></html>', 'spa_root'),
+    ('Angularのルート要素', '<html><body><app-root ng-version="15.0.0"></app-root><p>読み込み中です。しばらくお待ちください。'
+                        'ページが表示されない場合は再読み込みしてください。</p></body></html>', 'spa_root'),
+    ('noscriptの警告', '<html><body><noscript>このサイトを表示するにはJavaScriptを有効にしてください。</noscript>'
+                    '<header>株式会社サンプル 公式サイト トップページへようこそ。ただいま準備中です。</header></body></html>',
+     'noscript_warning'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ウェブサイト分析の取得方法 テスト')
+    parser.add_argument('--pages', type=int, default=24, help='分析するページ数')
+    parser.add_argument('--requests-delay', type=float, default=0.01, help='requestsでの取得1件あたりの時間（秒）')
+    parser.add_argument('--selenium-delay', type=float, default=0.2, help='Seleniumでの取得1件あたりの時間（秒）')
+    args = parser.parse_args()
+
+    print("🧪 ウェブサイト分析の取得方法 テスト")
+    print("=" * 60)
+    checks = []
+
+    # 1. 兆候の判定
+    failures = []
+    for label, html, expected in PAGES:
+        actual = detect_javascript_rendering(BeautifulSoup(html, 'html.parser'))
+        print(f"   {label}: {actual or '静的HTMLで分析'}")
+        if actual != expected:
+            failures.append((label, expected, actual))
+    for label, expected, actual in failures:
+        print(f"   判定の不一致: {label} 期待={expected} 実際={actual}")
+    checks.append(('JavaScriptによる描画が必要なページだけを判定', not failures))
+
+    # 2. 分析器の取得方法
+    import derivative_website_analyzer as analyzer_module
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    rendered = f'<html><body>{NAVIGATION}{ARTICLE}</body></html>'
+    pages = {f'https://site{i}.co.jp/': PAGES[i % len(PAGES)] for i in range(args.pages)}
+    pages['https://down.co.jp/'] = ('取得失敗', None, 'fetch_failed')
+    pages['https://broken.co.jp/'] = ('Seleniumでも取得失敗', PAGES[4][1], 'empty_body')
+    selenium_calls = []
+
+    def get_html_with_requests(url):
+        time.sleep(args.requests_delay)
+        html = pages[url][1]
+        if html is None:
+            return None, None
+        # リダイレクト後の最終URLと応答時間を持つrequestsの応答
+        return html, SimpleNamespace(url=url + 'index.html', elapsed=timedelta(seconds=0.3))
+
+    def get_html_with_selenium(url):
+        selenium_calls.append(url)
+        time.sleep(args.selenium_delay)
+        return None if url == 'https://broken.co.jp/' else rendered
+
+    analyzer = analyzer_module.WebsiteAnalyzer(use_selenium=False)
+    analyzer.use_selenium = True
+    analyzer.get_html_with_requests = get_html_with_requests
+    analyzer.get_html_with_selenium = get_html_with_selenium
+
+    started = time.perf_counter()
+    results = {url: analyzer.analyze_website(f'株式会社{i}', url) for i, url in enumerate(pages)}
+    elapsed = time.perf_counter() - started
+    # 従来の動作（すべてのページをSeleniumで取得）の推定時間
+    selenium_first = len(pages) * args.selenium_delay
+
+    expected_escalations = [url for url, (_, _, reason) in pages.items() if reason]
+    methods_ok = all(
+        results[url]['analysis_method'] == ('selenium' if reason and url != 'https://broken.co.jp/' else 'requests')
+        and results[url]['escalation_reason'] == (reason or '')
+        for url, (_, _, reason) in pages.items()
+    )
+    checks.append(('兆候のあるページだけSeleniumで再取得', selenium_calls == expected_escalations and methods_ok))
+    checks.append(('取得できない場合も分析を続ける', results['https://broken.co.jp/']['status'] == 'success'
+                   and results['https://down.co.jp/']['status'] == 'success'))
+
+    stats = analyzer.get_fetch_stats()
+    print(f"分析: {len(pages)}ページ {elapsed:.2f}秒（Selenium優先の推定 {selenium_first:.2f}秒）")
+    print(f"Seleniumへの切り替え: {stats['escalated']}/{stats['pages']}ページ ({stats['escalation_rate'] * 100:.1f}%), "
+          f"理由: {stats['reasons']}, 推定短縮時間: {stats['estimated_seconds_saved']:.2f}秒")
+    checks.append(('切り替え率・理由・推定短縮時間を集計',
+                   stats['pages'] == len(pages) and stats['escalated'] == len(expected_escalations)
+                   and sum(stats['reasons'].values()) == stats['escalated']
+                   and stats['selenium_pages'] == len(expected_escalations) - 1
+                   and stats['estimated_seconds_saved'] > 0))
+    checks.append(('Selenium優先の従来の動作より短い時間で分析', elapsed < selenium_first * 0.75))
+
+    # 3. Seleniumで再取得した場合もrequestsでの応答（最終URL・応答時間）を使う
+    escalated_url = next(url for url in expected_escalations if url not in ('https://down.co.jp/', 'https://broken.co.jp/'))
+    soup, response, method, _ = analyzer.fetch_page(escalated_url)
+    features = analyzer.extract_features(soup, response)
+    _, down_response, down_method, _ = analyzer.fetch_page('https://down.co.jp/')
+    print(f"Seleniumで再取得したページ: 最終URL {features.url}, 応答時間 {features.response_time}秒")
+    checks.append(('Seleniumで再取得してもrequestsでの最終URL・応答時間を使う',
+                   method == 'selenium' and features.url == escalated_url + 'index.html'
+                   and features.response_time == 0.3
+                   and down_method == 'selenium' and down_response is None))
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
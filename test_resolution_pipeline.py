@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+メールアドレス決定処理（段階実行・並列抽出・逐次保存）テスト
+
+一時ディレクトリに企業データ・既存の抽出結果・決定結果CSVを作成し、以下を確認します。
+- CSVの担当者メールアドレスの一括判定（valid_email_mask）が1件ずつの判定（is_valid_email）と一致すること
+- ウェブサイト抽出が並列に実行され、結果（優先順位・同じドメインへの適用）が逐次実行と同じであること
+- 決定結果がウェブサイト抽出の完了を待たずにCSVへ書き出され、既存の結果と重複しないこと
+- 中断した場合も決定済みの結果がCSVに残ること
+- 取得元ごとの処理件数・スループットが集計されること
+
+使い方（リポジトリのルートで実行）:
+    python test_resolution_pipeline.py
+    python test_resolution_pipeline.py --domains 40 --delay 0.3 --workers 16
+"""
+
+import os
+import sys
+import csv
+import time
+import random
+import logging
+import tempfile
+import argparse
+
+# 抽出器のインポート前に設定（キャッシュを使わず毎回取得する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'core_scripts'))
+
+from derivative_domain_planner import normalize_site_domain
+
+EMAIL_CASES = [
+    'info@sample-corp.co.jp', ' saiyo@sample-corp.co.jp ', 'INFO@SAMPLE.JP', 'a.b+c@sub.sample.jp',
+    '‐', '-', '', ' ', None, float('nan'), 12345, 'info@sample.com', 'me@sample.me', 'logo@2x.png',
+    'banner-top@sample.jp.jpg', 'icon@sample.co.jp', 'user@localhost', 'a..b@sample.jp', '.a@sample.jp',
+    'a@sample..jp', 'a@sample.j', 'window.x@sample.jp', 'summary@sample.jp', 'x' * 65 + '@sample.jp',
+    'a@' + 'b' * 250 + '.jp', 'info@sample.co.jp\n', 'info@@sample.jp', 'hero01@sample.jp.webp',
+    'info@sample.co.jp.', 'name@sp.sample.jp', 'info@1080x360.sample.jp', 'comp-1@sample.jp',
+]
+
+
+def random_emails(count, seed=1):
+    """判定の一致を確認するためのランダムなアドレス（有効・無効の両方を含む）"""
+    rng = random.Random(seed)
+    locals_ = ['info', 'saiyo', 'logo', 'banner', 'a.b', 'x..y', 'summary', 'my', 'user+tag', '.dot', 'comp-1']
+    domains = ['sample.co.jp', 'sample.com', 'sample.jp', '2x.png', 'sp.sample.jp', 'sample.me',
+               'sample.jpg', 'sample', 'mobile.sample.jp', 'sample.co.jp.', 'sub.sample.or.jp']
+    return [f"{rng.choice(locals_)}@{rng.choice(domains)}" for _ in range(count)]
+
+
+def write_companies(path, domains, rows_per_domain, csv_direct):
+    rows = []
+    for d in range(domains):
+        for i in range(rows_per_domain):
+            rows.append([len(rows) + 1, f'株式会社サンプル{d}', f'https://www.sample-corp{d}.co.jp/', '‐', '営業'])
+    for i in range(csv_direct):
+        rows.append([len(rows) + 1, f'株式会社直接{i}', f'https://direct{i}.co.jp/', f'saiyo@direct{i}.co.jp', '営業'])
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['ID', '企業名', '企業ホームページ', '担当者メールアドレス', '募集職種'])
+        writer.writerows(rows)
+    return len(rows)
+
+
+def read_results(path):
+    with open(path, encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='メールアドレス決定処理 テスト')
+    parser.add_argument('--domains', type=int, default=24, help='ウェブサイト抽出の対象ドメイン数')
+    parser.add_argument('--rows-per-domain', type=int, default=2, help='1ドメインあたりの企業行数')
+    parser.add_argument('--csv-direct', type=int, default=300, help='担当者メールアドレスのある企業数')
+    parser.add_argument('--delay', type=float, default=0.2, help='ウェブサイト抽出1件あたりの時間（秒）')
+    parser.add_argument('--workers', type=int, default=8, help='ウェブサイト抽出の同時実行数')
+    args = parser.parse_args()
+
+    print("🧪 メールアドレス決定処理 テスト")
+    print("=" * 60)
+
+    # 決定処理はログを作業ディレクトリの logs/ に書き込むため、一時ディレクトリで読み込む（リポジトリに残さない）
+    work_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+    os.chdir(work_dir.name)
+    os.makedirs('logs', exist_ok=True)
+    import huganjob_email_address_resolver as resolver_module
+    logging.getLogger().setLevel(logging.CRITICAL)
+    checks = []
+
+    # 1. 一括判定と1件ずつの判定の一致
+    import pandas as pd
+    resolver = resolver_module.HuganJobEmailResolver()
+    emails = EMAIL_CASES + random_emails(100000)
+    started = time.perf_counter()
+    mask = resolver.valid_email_mask(pd.Series(emails, dtype=object)).tolist()
+    vector_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    scalar = [resolver.is_valid_email(email) for email in emails]
+    scalar_elapsed = time.perf_counter() - started
+    mismatches = [(email, m, v) for email, m, v in zip(emails, mask, scalar) if m != v]
+    for email, m, v in mismatches[:5]:
+        print(f"   判定の不一致: {email!r} 一括={m} 1件ずつ={v}")
+    print(f"一括判定: {len(emails)}件 {vector_elapsed:.2f}秒（1件ずつ {scalar_elapsed:.2f}秒）, 有効 {sum(mask)}件")
+    checks.append(('一括判定が1件ずつの判定と一致', not mismatches and any(mask) and not all(mask)))
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            total = write_companies('companies.csv', args.domains, args.rows_per_domain, args.csv_direct)
+            # 既存の抽出結果（最初の2ドメイン）と、前回の決定結果（今回の対象と重複する企業ID 1 と対象外の企業ID）
+            with open('new_email_extraction_results_latest.csv', 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['企業ID', '企業名', 'ドメイン', 'メールアドレス'])
+                for d in range(2):
+                    writer.writerow([d * args.rows_per_domain + 1, f'株式会社サンプル{d}',
+                                     f'sample-corp{d}.co.jp', f'stored@sample-corp{d}.co.jp'])
+            previous = [{'company_id': 1, 'company_name': '旧', 'final_email': 'old@example.jp', 'status': 'success'},
+                        {'company_id': 99999, 'company_name': '対象外', 'final_email': 'keep@example.jp',
+                         'status': 'success'}]
+            pd.DataFrame(previous).to_csv('huganjob_email_resolution_results.csv', index=False, encoding='utf-8')
+
+            observed = []
+
+            def build_resolver(fail_after=None):
+                resolver = resolver_module.HuganJobEmailResolver(csv_file_path='companies.csv')
+                resolver.load_companies_data()
+                calls = []
+
+                def advanced_email_extraction(company_id, company_name, website_url):
+                    calls.append(website_url)
+                    if not observed and os.path.exists('huganjob_email_resolution_results.csv'):
+                        observed.append(read_results('huganjob_email_resolution_results.csv'))
+                    if fail_after is not None and len(calls) > fail_after:
+                        raise KeyboardInterrupt()
+                    time.sleep(args.delay)
+                    domain = normalize_site_domain(website_url)
+                    # 3ドメインに1つは抽出に失敗（簡易抽出にフォールバック）
+                    return None if domain.endswith(('2.co.jp', '5.co.jp', '8.co.jp')) else f'info@{domain}'
+
+                resolver.advanced_email_extraction = advanced_email_extraction
+                resolver.simple_email_extraction = lambda website_url, company_name: None
+                return resolver, calls
+
+            # 2. 逐次実行と並列実行
+            serial, _ = build_resolver()
+            started = time.perf_counter()
+            serial_results = serial.resolve_email_addresses(workers=1)
+            serial_elapsed = time.perf_counter() - started
+
+            observed.clear()
+            concurrent_resolver, calls = build_resolver()
+            started = time.perf_counter()
+            results = concurrent_resolver.resolve_email_addresses(
+                workers=args.workers, output_file='huganjob_email_resolution_results.csv')
+            concurrent_elapsed = time.perf_counter() - started
+
+            print(f"決定処理: {total}社, ウェブサイト抽出 {len(calls)}件, 逐次 {serial_elapsed:.2f}秒 / "
+                  f"{args.workers}並列 {concurrent_elapsed:.2f}秒")
+            same = [(r['company_id'], r['final_email'], r['email_source'], r['status']) for r in serial_results] == \
+                   [(r['company_id'], r['final_email'], r['email_source'], r['status']) for r in results]
+            by_id = {r['company_id']: r for r in results}
+            checks.append(('並列実行の結果が逐次実行と同じ（入力順・優先順位・同じドメインへの適用）',
+                           same and len(calls) == args.domains - 2
+                           and by_id[1]['final_email'] == 'stored@sample-corp0.co.jp'
+                           and by_id[total]['email_source'] == 'csv_direct'))
+            checks.append(('ウェブサイト抽出を並列に実行', concurrent_elapsed < serial_elapsed / 3))
+
+            # 3. 逐次保存
+            saved = read_results('huganjob_email_resolution_results.csv')
+            saved_ids = [int(row['company_id']) for row in saved]
+            early = observed[0] if observed else []
+            early_direct = sum(1 for row in early if row.get('email_source') == 'csv_direct')
+            print(f"逐次保存: 抽出開始時点 {len(early)}行（CSV直接 {early_direct}行）→ 完了時 {len(saved)}行")
+            checks.append(('CSV直接の結果はウェブサイト抽出を待たずに書き出す', early_direct == args.csv_direct))
+            checks.append(('既存の結果を保持し、企業IDの重複なく企業ID順で保存',
+                           saved_ids == sorted(set(saved_ids)) and len(saved) == total + 1
+                           and {'keep@example.jp', 'stored@sample-corp0.co.jp'} <= {r['final_email'] for r in saved}
+                           and 'old@example.jp' not in {r['final_email'] for r in saved}))
+
+            # 4. 取得元ごとのスループット
+            sources = concurrent_resolver.resolution_stats['sources']
+            print("取得元ごとのスループット:")
+            for line in concurrent_resolver.format_throughput_lines():
+                print(f"  {line}")
+            checks.append(('取得元ごとの企業数を集計',
+                           sources['csv_direct']['companies'] == args.csv_direct
+                           and sources['existing_results']['companies'] == 2 * args.rows_per_domain
+                           and sum(entry['companies'] for entry in sources.values()) == total))
+
+            # 5. 中断
+            os.remove('huganjob_email_resolution_results.csv')
+            interrupted, _ = build_resolver(fail_after=args.workers)
+            try:
+                interrupted.resolve_email_addresses(workers=2, output_file='huganjob_email_resolution_results.csv')
+                raised = False
+            except KeyboardInterrupt:
+                raised = True
+            saved = read_results('huganjob_email_resolution_results.csv')
+            decided = sum(1 for r in interrupted.email_results if r['status'] != 'pending')
+            print(f"中断: 決定済み {decided}社, 保存 {len(saved)}行")
+            checks.append(('中断した場合も決定済みの結果を保存', raised and len(saved) == decided
+                           and decided >= args.csv_direct))
+        finally:
+            os.chdir(cwd)
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    os.chdir(ROOT)
+    work_dir.cleanup()
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+XMLサイトマップの逐次読み込み テスト（ローカルHTTPサーバー使用）
+
+テスト用のサイトをローカルのHTTPサーバー（プロキシとして動作）で配信し、以下を確認します。
+- 大規模なgzip圧縮サイトマップを一定のメモリ使用量で読み込み、上位K件が全件をスコア順に並べた結果と一致すること
+- サイトマップインデックス（入れ子を含む）を上限数までたどり、他ドメインのサイトマップはたどらないこと
+- /sitemap.xml がHTML（ソフト404）の場合は何も追加しないこと
+- deep_crawl_for_emails がサイトマップにだけ載っているページを探索すること
+- 読み込みをバイト数・時間（企業の残り時間を含む）で打ち切り、上位K件が変わらなくなれば残りを読まないこと
+- 従来の方式（BeautifulSoupで文書全体を解析）との処理時間・メモリ使用量の比較
+
+使い方（リポジトリのルートで実行）:
+    python test_sitemap_reader.py
+    python test_sitemap_reader.py --urls 200000   # 1サイトマップの上限（50,000件）を超える場合
+"""
+
+import os
+import sys
+import gzip
+import time
+import logging
+import argparse
+import tracemalloc
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# 抽出器のインポート前に設定（キャッシュを使わず毎回取得する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core_scripts'))
+
+from test_parsed_document import build_page
+
+NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+EXTRA_SITEMAPS = 12
+# 少しずつ配信する（遅い）サイトマップの1回の送信量と間隔
+SLOW_CHUNK_BYTES = 8 * 1024
+SLOW_CHUNK_INTERVAL = 0.05
+
+
+def sitemap_paths(count):
+    """大規模サイトマップのパス（大半は商品ページ、一部に価値の高いページ）"""
+    paths = []
+    for i in range(count):
+        if i % 50000 == 7:
+            paths.append(f'/contact/branch-{i}/')
+        elif i % 5000 == 3:
+            paths.append(f'/recruit/entry-{i}.html')
+        elif i % 2000 == 1:
+            paths.append(f'/company/office-{i}.html')
+        elif i % 1000 == 0:
+            paths.append(f'/news/{i}.html')
+        else:
+            paths.append(f'/products/item-{i}.html')
+    return paths
+
+
+def urlset(domain, paths):
+    urls = ''.join(f'<url><loc>http://www.{domain}{path}</loc><lastmod>2024-01-01</lastmod></url>\n' for path in paths)
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{NS}">\n{urls}</urlset>\n'.encode('utf-8')
+
+
+def sitemapindex(locs):
+    items = ''.join(f'<sitemap><loc>{loc}</loc></sitemap>\n' for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{NS}">\n{items}</sitemapindex>\n'.encode('utf-8')
+
+
+class SitemapSiteHandler(BaseHTTPRequestHandler):
+    """サイトマップとページを返すテスト用サイト"""
+    protocol_version = 'HTTP/1.1'
+    bodies = {}
+
+    @classmethod
+    def build(cls, url_count):
+        domain = 'sitemap-corp.co.jp'
+        big = urlset(domain, sitemap_paths(url_count))
+        cls.bodies = {
+            (domain, '/sitemap.xml'): sitemapindex(
+                [f'http://www.{domain}/sitemap-products.xml.gz', f'http://www.{domain}/sitemap-nested.xml',
+                 'http://www.other-corp.co.jp/sitemap.xml']),
+            (domain, '/sitemap-products.xml.gz'): gzip.compress(big),
+            (domain, '/sitemap-nested.xml'): sitemapindex([f'http://www.{domain}/sitemap-pages.xml']),
+            (domain, '/sitemap-pages.xml'): urlset(domain, ['/', '/inquiry/form.html', '/about/greeting.html']),
+            ('index-corp.co.jp', '/sitemap.xml'): sitemapindex(
+                [f'http://www.index-corp.co.jp/sitemap-{i}.xml' for i in range(EXTRA_SITEMAPS)]),
+        }
+        for i in range(EXTRA_SITEMAPS):
+            cls.bodies[('index-corp.co.jp', f'/sitemap-{i}.xml')] = urlset('index-corp.co.jp', [f'/contact/office-{i}/'])
+        cls.bodies[('slow-corp.co.jp', '/sitemap.xml')] = urlset('slow-corp.co.jp', sitemap_paths(20000))
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        domain = (parts.hostname or 'localhost').replace('www.', '')
+        path = parts.path or '/'
+        body = self.bodies.get((domain, path))
+        content_type = 'application/x-gzip' if path.endswith('.gz') else 'application/xml'
+
+        if body is None and path == '/':
+            body, content_type = build_page(domain, 'トップ', 20).encode('utf-8'), 'text/html; charset=utf-8'
+        elif body is None and path == '/inquiry/form.html':
+            form = f'<form><p>お問い合わせ窓口: toiawase@{domain}</p></form>'
+            body, content_type = build_page(domain, 'お問い合わせフォーム', 5, form).encode('utf-8'), 'text/html; charset=utf-8'
+        elif body is None and path == '/sitemap.xml':
+            # ソフト404（HTMLのページを200で返す）
+            body, content_type = build_page(domain, 'ページが見つかりません', 5).encode('utf-8'), 'text/html; charset=utf-8'
+
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if domain != 'slow-corp.co.jp':
+            self.wfile.write(body)
+            return
+        for offset in range(0, len(body), SLOW_CHUNK_BYTES):
+            self.wfile.write(body[offset:offset + SLOW_CHUNK_BYTES])
+            self.wfile.flush()
+            time.sleep(SLOW_CHUNK_INTERVAL)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port_queue, url_count):
+    SitemapSiteHandler.build(url_count)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SitemapSiteHandler)
+    # 読み込みを打ち切ったクライアントの接続切断は無視
+    server.handle_error = lambda request, client_address: None
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def measure(function):
+    """(戻り値, 秒, ピークメモリ) を返す"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = function()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='XMLサイトマップの逐次読み込み テスト')
+    parser.add_argument('--urls', type=int, default=50000, help='大規模サイトマップのURL数')
+    parser.add_argument('--top-k', type=int, default=50, help='保持する上位URL数')
+    args = parser.parse_args()
+
+    print("🧪 XMLサイトマップの逐次読み込み テスト")
+    print("=" * 60)
+
+    port_queue = multiprocessing.Queue()
+    server_process = multiprocessing.Process(target=serve, args=(port_queue, args.urls), daemon=True)
+    server_process.start()
+    port = port_queue.get(timeout=60)
+    os.environ['HTTP_PROXY'] = f'http://127.0.0.1:{port}'
+    os.environ['http_proxy'] = f'http://127.0.0.1:{port}'
+    os.environ.pop('NO_PROXY', None)
+    os.environ.pop('no_proxy', None)
+
+    import derivative_email_extractor as extractor_module
+    from derivative_sitemap_reader import SitemapReader, DEFAULT_MAX_URLS_PER_SITEMAP
+    from derivative_time_budget import CompanyDeadline
+    from bs4 import BeautifulSoup
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    checks = []
+    base = 'http://www.sitemap-corp.co.jp/'
+    extractor = extractor_module.PrioritizedEmailExtractor(timeout=10, max_retries=0)
+
+    def new_reader(base_url, **options):
+        extractor.visited_urls = set()
+        return SitemapReader(extractor.open_sitemap_stream, score=extractor.is_high_value_page,
+                             accept=lambda url: extractor.is_same_domain(base_url, url), **{'top_k': args.top_k, **options})
+
+    # 1. 大規模なgzipサイトマップ（上位K件、全件を読んだ結果と比べるため打ち切りの上限は外す）
+    reader = new_reader(base, max_bytes_per_sitemap=50 * 1024 * 1024, stable_urls=None)
+    top, elapsed, peak = measure(lambda: reader.read(f'{base}sitemap-products.xml.gz'))
+    scored = [(extractor.is_high_value_page(f'http://www.sitemap-corp.co.jp{path}'), i, f'http://www.sitemap-corp.co.jp{path}')
+              for i, path in enumerate(sitemap_paths(args.urls)[:DEFAULT_MAX_URLS_PER_SITEMAP])]
+    expected = [(url, score) for score, _, url in sorted((s for s in scored if s[0] > 0), key=lambda s: (-s[0], s[1]))[:args.top_k]]
+    print(f"gzipサイトマップ {args.urls:,}件: 上位{len(top)}件, {elapsed:.2f}秒, ピークメモリ {peak / 1024 / 1024:.2f}MB")
+    checks.append(('上位K件が全件をスコア順に並べた結果と一致',
+                   top == expected and reader.stats['urls'] == min(args.urls, DEFAULT_MAX_URLS_PER_SITEMAP)))
+    checks.append(('メモリ使用量がサイトマップの大きさによらず一定（2MB未満）', peak < 2 * 1024 * 1024))
+
+    # 従来の方式（文書全体を取得してBeautifulSoupで解析、全URLをスコア付け）との比較（URL数を1/10に縮小）
+    subset = args.urls // 10
+    plain = urlset('sitemap-corp.co.jp', sitemap_paths(subset))
+
+    def legacy():
+        soup = BeautifulSoup(plain.decode('utf-8'), 'html.parser')
+        return [(-extractor.is_high_value_page(loc.text.strip()), loc.text.strip()) for loc in soup.find_all('loc')]
+
+    _, legacy_elapsed, legacy_peak = measure(legacy)
+    print(f"  （従来の方式 {subset:,}件: {legacy_elapsed:.2f}秒, ピークメモリ {legacy_peak / 1024 / 1024:.1f}MB）")
+    checks.append(('従来の方式（1/10の件数）より高速・省メモリ', elapsed < legacy_elapsed and peak * 10 < legacy_peak))
+
+    # 2. サイトマップインデックス（入れ子・他ドメイン）
+    reader = new_reader(base)
+    top = reader.read(f'{base}sitemap.xml')
+    urls = [url for url, _ in top]
+    print(f"インデックス: サイトマップ {reader.stats['sitemaps']}件を読み込み, 上位{len(top)}件")
+    checks.append(('入れ子のインデックスをたどり、他ドメインのサイトマップはたどらない',
+                   reader.stats['sitemaps'] == 4 and f'{base}inquiry/form.html' in urls))
+
+    reader = new_reader('http://www.index-corp.co.jp/', max_sitemaps=5)
+    top = reader.read('http://www.index-corp.co.jp/sitemap.xml')
+    print(f"インデックスの上限: {reader.stats['sitemaps']}件を読み込み, {reader.stats['skipped_sitemaps']}件をスキップ")
+    checks.append(('インデックスは上限数までたどる', reader.stats['sitemaps'] == 5 and len(top) == 4
+                   and reader.stats['skipped_sitemaps'] == EXTRA_SITEMAPS - 4))
+
+    # 3. ソフト404
+    reader = new_reader('http://www.html-corp.co.jp/')
+    top = reader.read('http://www.html-corp.co.jp/sitemap.xml')
+    checks.append(('HTMLのソフト404は無視', top == [] and reader.stats['errors'] == 0))
+
+    # 4. 読み込みの打ち切り（バイト数・時間・上位K件が変わらない場合）
+    reader = new_reader(base, max_bytes_per_sitemap=1024 * 1024, stable_urls=None)
+    reader.read(f'{base}sitemap-products.xml.gz')
+    truncated_by_bytes = reader.stats['truncated'] == 1 and 0 < reader.stats['urls'] < min(args.urls, 15000)
+
+    reader = new_reader(base, top_k=5, stable_urls=3000)
+    top = reader.read(f'{base}sitemap.xml')
+    print(f"上位K件が変わらない場合: URL {reader.stats['urls']:,}件で終了, "
+          f"スキップしたサイトマップ {reader.stats['skipped_sitemaps']}件")
+    checks.append(('上限バイト数・上位K件が変わらない場合に読み込みを終了',
+                   truncated_by_bytes and reader.stats['stable_stop'] and len(top) == 5
+                   and reader.stats['urls'] < min(args.urls, DEFAULT_MAX_URLS_PER_SITEMAP)
+                   and reader.stats['skipped_sitemaps'] == 1))
+
+    slow_base = 'http://www.slow-corp.co.jp/'
+    slow_size = len(urlset('slow-corp.co.jp', sitemap_paths(20000)))
+    reader = new_reader(slow_base, max_seconds_per_sitemap=0.5)
+    _, slow_elapsed, _ = measure(lambda: reader.read(f'{slow_base}sitemap.xml'))
+    extractor.deadline = CompanyDeadline(1.0)
+    deadline_reader = new_reader(slow_base, max_seconds_per_sitemap=extractor.sitemap_read_seconds)
+    _, deadline_elapsed, _ = measure(lambda: deadline_reader.read(f'{slow_base}sitemap.xml'))
+    extractor.deadline = None
+    print(f"遅いサイトマップ: 上限0.5秒 → {slow_elapsed:.2f}秒, 企業の残り時間1秒 → {deadline_elapsed:.2f}秒 "
+          f"（全体の配信には約{slow_size / SLOW_CHUNK_BYTES * SLOW_CHUNK_INTERVAL:.0f}秒）")
+    checks.append(('読み込み時間の上限（企業の残り時間を含む）で打ち切る',
+                   reader.stats['timed_out'] == 1 and slow_elapsed < 2
+                   and deadline_reader.stats['timed_out'] == 1 and deadline_elapsed < 2.5))
+
+    # 5. 関連ページ探索の初期URL
+    extractor.visited_urls = set()
+    extractor.documents = {}
+    emails = extractor.deep_crawl_for_emails(base, max_pages=10, max_workers=3, adaptive_depth=False)
+    print(f"deep_crawl_for_emails: {sorted(emails)}")
+    checks.append(('サイトマップにだけ載っているページを探索', 'toiawase@sitemap-corp.co.jp' in emails))
+
+    server_process.terminate()
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ストリーミングエクスポート テスト（Flaskテストクライアント使用）
+
+一時ディレクトリに企業CSV・送信結果CSVを生成し、/api/export/* について以下を確認します。
+- CSV（BOM付きUTF-8）・NDJSON で全行を出力し、ID範囲・ステータス・日付範囲のフィルタが効くこと
+- gzip=true では .gz ファイルとしてダウンロードでき、展開すると非圧縮の出力と一致すること
+- Accept-Encoding のq値を解釈し、q=0 で拒否されたgzipでは転送時に圧縮しないこと
+- 出力は複数のチャンクに分けて逐次送られること
+
+使い方（リポジトリのルートで実行）:
+    python test_streaming_export.py
+    python test_streaming_export.py --rows 50000
+"""
+
+import os
+import sys
+import csv
+import gzip
+import json
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'dashboard'))
+
+from derivative_streaming_export import accepts_gzip
+
+COMPANY_HEADER = ['ID', '企業名', '企業ホームページ', '担当者メールアドレス', '募集職種',
+                  'バウンス状態', 'バウンス日時', 'バウンス理由']
+RESULT_HEADER = ['企業ID', '企業名', 'メールアドレス', '送信結果', '送信日時']
+
+# (Accept-Encoding, gzipを受け付けるか)
+ACCEPT_ENCODINGS = [
+    ('gzip', True),
+    ('gzip, deflate, br', True),
+    ('deflate, gzip;q=0.5', True),
+    ('GZIP;Q=1.0', True),
+    ('x-gzip', True),
+    ('*', True),
+    ('*;q=0.1', True),
+    ('', False),
+    (None, False),
+    ('deflate, br', False),
+    ('gzip;q=0', False),
+    ('gzip;q=0.0, deflate', False),
+    ('gzip; q=0, *', False),
+    ('*;q=0', False),
+    ('identity', False),
+    ('gzip;q=invalid', False),
+]
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ストリーミングエクスポート テスト')
+    parser.add_argument('--rows', type=int, default=20000, help='企業CSVの行数')
+    args = parser.parse_args()
+
+    print("🧪 ストリーミングエクスポート テスト")
+    print("=" * 60)
+
+    checks = []
+
+    # 1. Accept-Encoding の解釈
+    mismatches = [(value, expected) for value, expected in ACCEPT_ENCODINGS if accepts_gzip(value) != expected]
+    for value, expected in mismatches:
+        print(f"   判定の不一致: Accept-Encoding={value!r} 期待={expected}")
+    checks.append(('Accept-Encoding のq値を解釈（q=0 は拒否）', not mismatches))
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # ダッシュボードが読み込み時に作るログ・状態DBをリポジトリに残さない
+        os.chdir(work_dir)
+        import derivative_dashboard as dashboard
+
+        company_file = os.path.join(work_dir, 'companies.csv')
+        result_file = os.path.join(work_dir, 'sending_results.csv')
+        write_csv(company_file, COMPANY_HEADER, [
+            [i, f'株式会社テスト{i}', f'https://test{i}.co.jp/', f'info@test{i}.co.jp', '営業',
+             'permanent' if i % 10 == 0 else '', '2024-06-01 10:00:00' if i % 10 == 0 else '', '']
+            for i in range(1, args.rows + 1)
+        ])
+        write_csv(result_file, RESULT_HEADER, [
+            [i, f'株式会社テスト{i}', f'info@test{i}.co.jp', 'success' if i % 3 else 'failed',
+             f'2024-06-{i % 30 + 1:02d} 09:00:00']
+            for i in range(1, 301)
+        ])
+        dashboard.INPUT_FILE = company_file
+        dashboard.HUGANJOB_EMAIL_SENDING_RESULTS = result_file
+        client = dashboard.app.test_client()
+
+        # 2. CSV: 全行・BOM付き、複数チャンクで逐次送信
+        response = client.get('/api/export/companies', buffered=False)
+        chunk_count = sum(1 for _ in response.response)
+        response.close()
+        response = client.get('/api/export/companies')
+        body = response.get_data()
+        rows = list(csv.DictReader(body.decode('utf-8-sig').splitlines()))
+        print(f"CSV: {len(rows)}行 / {len(body) / 1024:.0f}KB / {chunk_count}チャンク, "
+              f"Content-Disposition: {response.headers.get('Content-Disposition')}")
+        checks.append(('CSVで全行を出力（BOM付きUTF-8）',
+                       response.status_code == 200 and body.startswith(b'\xef\xbb\xbf')
+                       and len(rows) == args.rows and rows[-1]['企業名'] == f'株式会社テスト{args.rows}'
+                       and response.mimetype == 'text/csv'))
+        checks.append(('出力を複数のチャンクで逐次送信', chunk_count > 1))
+
+        # 3. フィルタ（ID範囲・ステータス・日付範囲）
+        filtered = client.get('/api/export/companies?start_id=101&end_id=200&status=permanent').get_data()
+        filtered_ids = [row['ID'] for row in csv.DictReader(filtered.decode('utf-8-sig').splitlines())]
+        dated = client.get('/api/export/sending-results?format=ndjson&status=failed'
+                           '&date_from=2024-06-10&date_to=2024-06-12').get_data()
+        records = [json.loads(line) for line in dated.decode('utf-8').splitlines()]
+        checks.append(('ID範囲・ステータスでフィルタ', filtered_ids == [str(i) for i in range(110, 201, 10)]))
+        checks.append(('NDJSONで出力し日付範囲（終了日を含む）でフィルタ',
+                       records and all(r['送信結果'] == 'failed' and '2024-06-10' <= r['送信日時'][:10] <= '2024-06-12'
+                                       for r in records)
+                       and len(records) == sum(1 for i in range(1, 301) if i % 3 == 0 and 10 <= i % 30 + 1 <= 12)))
+
+        # 4. gzip=true: .gz ファイルとしてダウンロード
+        response = client.get('/api/export/companies?gzip=true')
+        downloaded = gzip.decompress(response.get_data())
+        checks.append(('gzip=true で .gz ファイルをダウンロード',
+                       response.mimetype == 'application/gzip'
+                       and response.headers['Content-Disposition'].endswith('.csv.gz"')
+                       and 'Content-Encoding' not in response.headers and downloaded == body))
+
+        # 5. 転送時の圧縮（Accept-Encoding のq値に従う）
+        compressed = client.get('/api/export/companies?format=ndjson', headers={'Accept-Encoding': 'gzip, deflate'})
+        refused = client.get('/api/export/companies?format=ndjson', headers={'Accept-Encoding': 'gzip;q=0, deflate'})
+        plain = refused.get_data()
+        print(f"NDJSON: 非圧縮 {len(plain) / 1024:.0f}KB / 転送時圧縮 {len(compressed.get_data()) / 1024:.0f}KB")
+        checks.append(('Accept-Encoding: gzip では転送時に圧縮',
+                       compressed.headers.get('Content-Encoding') == 'gzip'
+                       and gzip.decompress(compressed.get_data()) == plain
+                       and len(plain.splitlines()) == args.rows))
+        checks.append(('gzip;q=0 では圧縮しない（Vary: Accept-Encoding）',
+                       'Content-Encoding' not in refused.headers
+                       and refused.headers.get('Vary') == 'Accept-Encoding'
+                       and compressed.headers.get('Vary') == 'Accept-Encoding'))
+
+        # 6. 未対応の形式
+        checks.append(('未対応の形式は400', client.get('/api/export/companies?format=xml').status_code == 400))
+
+        os.chdir(ROOT)
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
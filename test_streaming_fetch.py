@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ストリーミング取得 テスト（ローカルHTTPサーバー使用）
+
+テスト用のサイトをローカルのHTTPサーバー（プロキシとして動作）で配信し、
+PrioritizedEmailExtractor.fetch_url について以下を確認します。
+- 巨大なページは上限バイト数で読み込みを打ち切り、取得時間・メモリ使用量が上限に比例すること
+- PDF・画像などHTML以外のContent-Typeは本文を読まずに拒否すること
+- リダイレクトを上限回数まで追跡し、上限超過・ループは中止すること
+- 打ち切ったページからも先頭部分のメールアドレスを抽出できること
+
+使い方（リポジトリのルートで実行）:
+    python test_streaming_fetch.py
+    python test_streaming_fetch.py --huge-mb 100
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tracemalloc
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# 抽出器のインポート前に設定（キャッシュを使わず毎回取得する）
+os.environ['HUGANJOB_HTTP_CACHE_MODE'] = 'disabled'
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core_scripts'))
+
+BLOCK = ('<p>' + '当社は地域密着型のサービスを提供しています。' * 20 + '</p>\n').encode('utf-8')
+
+
+class StreamingSiteHandler(BaseHTTPRequestHandler):
+    """巨大ページ・PDF・リダイレクトを返すテスト用サイト"""
+    protocol_version = 'HTTP/1.1'
+    huge_bytes = 50 * 1024 * 1024
+
+    def send_stream(self, content_type, head, total):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(total))
+        self.end_headers()
+        try:
+            self.wfile.write(head)
+            sent = len(head)
+            while sent < total:
+                chunk = BLOCK[:total - sent]
+                self.wfile.write(chunk)
+                sent += len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path = parts.path or '/'
+        domain = (parts.hostname or 'localhost').replace('www.', '')
+
+        if path == '/huge.html':
+            head = f'<html><head><meta charset="utf-8"></head><body><p>E-mail: info@{domain}</p>'.encode('utf-8')
+            self.send_stream('text/html; charset=utf-8', head, self.huge_bytes)
+        elif path == '/catalog.pdf':
+            self.send_stream('application/pdf', b'%PDF-1.4\n', self.huge_bytes)
+        elif path == '/logo.png':
+            self.send_stream('image/png', b'\x89PNG\r\n', self.huge_bytes)
+        elif path.startswith('/hop/'):
+            remaining = int(path.rsplit('/', 1)[1])
+            location = f'/hop/{remaining - 1}' if remaining > 1 else '/final.html'
+            self.send_redirect(location)
+        elif path in ('/loop-a', '/loop-b'):
+            self.send_redirect('/loop-b' if path == '/loop-a' else '/loop-a')
+        elif path == '/final.html':
+            data = f'<html><body><p>recruit@{domain}</p></body></html>'.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    def send_redirect(self, location):
+        data = b'<html><body>Moved</body></html>'
+        self.send_response(301)
+        self.send_header('Location', location)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port_queue, huge_bytes):
+    StreamingSiteHandler.huge_bytes = huge_bytes
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StreamingSiteHandler)
+    # 読み込みを打ち切ったクライアントの接続切断は無視
+    server.handle_error = lambda request, client_address: None
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def timed_fetch(extractor, url):
+    """visited_urls をリセットして取得し、(レスポンス, 秒, ピークメモリ) を返す"""
+    extractor.visited_urls = set()
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = extractor.fetch_url(url)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return response, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ストリーミング取得 テスト')
+    parser.add_argument('--huge-mb', type=int, default=50, help='巨大ページ・PDFのサイズ（MB）')
+    args = parser.parse_args()
+
+    print("🧪 ストリーミング取得 テスト")
+    print("=" * 60)
+
+    huge_bytes = args.huge_mb * 1024 * 1024
+    port_queue = multiprocessing.Queue()
+    server_process = multiprocessing.Process(target=serve, args=(port_queue, huge_bytes), daemon=True)
+    server_process.start()
+    port = port_queue.get(timeout=10)
+    os.environ['HTTP_PROXY'] = f'http://127.0.0.1:{port}'
+    os.environ['http_proxy'] = f'http://127.0.0.1:{port}'
+    os.environ.pop('NO_PROXY', None)
+    os.environ.pop('no_proxy', None)
+
+    import derivative_email_extractor as extractor_module
+    from derivative_streaming_fetch import StreamingFetcher, DEFAULT_MAX_BODY_BYTES
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    requested = []
+    original_network_get = extractor_module.PrioritizedEmailExtractor._network_get
+
+    def recording_network_get(self, url, headers, timeout):
+        requested.append(url)
+        return original_network_get(self, url, headers, timeout)
+
+    extractor_module.PrioritizedEmailExtractor._network_get = recording_network_get
+
+    fetcher = StreamingFetcher(max_redirects=5)
+    extractor = extractor_module.PrioritizedEmailExtractor(timeout=10, max_retries=0, page_fetcher=fetcher)
+    base = 'http://www.stream-corp.co.jp'
+    checks = []
+
+    # 1. 巨大ページ（上限バイト数で打ち切り）
+    response, elapsed, peak = timed_fetch(extractor, f'{base}/huge.html')
+    size = len(response.content) if response else 0
+    print(f"巨大ページ {args.huge_mb}MB: {size:,}バイトで打ち切り, {elapsed:.2f}秒, ピークメモリ {peak / 1024 / 1024:.1f}MB")
+    checks.append(('巨大ページは上限バイト数で読み込みを打ち切る',
+                   response is not None and size == DEFAULT_MAX_BODY_BYTES and response.truncated))
+    checks.append(('メモリ使用量が上限バイト数に比例（本文サイズに比例しない）', peak < DEFAULT_MAX_BODY_BYTES * 8))
+    emails = extractor.extract_emails_from_html(response.text if response else '', f'{base}/huge.html')
+    checks.append(('打ち切ったページの先頭からメールアドレスを抽出', emails == ['info@stream-corp.co.jp']))
+
+    # 本文をすべて読む場合との比較
+    full_fetcher = StreamingFetcher(max_bytes=huge_bytes * 2)
+    full_extractor = extractor_module.PrioritizedEmailExtractor(timeout=10, max_retries=0, page_fetcher=full_fetcher)
+    full_response, full_elapsed, full_peak = timed_fetch(full_extractor, f'{base}/huge.html')
+    print(f"  （上限なしの場合: {len(full_response.content):,}バイト, {full_elapsed:.2f}秒, "
+          f"ピークメモリ {full_peak / 1024 / 1024:.1f}MB）")
+    checks.append(('上限なしより短時間で取得', elapsed * 3 < full_elapsed))
+
+    # 2. HTML以外（本文を読まずに拒否）
+    rejected = []
+    for path in ('/catalog.pdf', '/logo.png'):
+        response, elapsed, peak = timed_fetch(extractor, f'{base}{path}')
+        rejected.append(response is None and elapsed < 1.0 and peak < DEFAULT_MAX_BODY_BYTES)
+        print(f"{path}: {'拒否' if response is None else '取得'}, {elapsed:.2f}秒, ピークメモリ {peak / 1024 / 1024:.2f}MB")
+    stats = fetcher.get_stats()
+    checks.append(('PDF・画像は本文を読まずに拒否', all(rejected) and stats['rejected'] == 2))
+
+    # 3. リダイレクト
+    requested.clear()
+    response, _, _ = timed_fetch(extractor, f'{base}/hop/3')
+    chain_ok = (response is not None and response.url.endswith('/final.html')
+                and response.redirect_hops == 3 and len(requested) == 4)
+    print(f"リダイレクト3回: {response.url if response else None}（リクエスト {len(requested)}件）")
+    checks.append(('リダイレクトを追跡して最終ページを取得', chain_ok))
+
+    requested.clear()
+    response, _, _ = timed_fetch(extractor, f'{base}/hop/20')
+    print(f"リダイレクト20回: {'中止' if response is None else '取得'}（リクエスト {len(requested)}件, 上限 5回）")
+    checks.append(('上限回数を超えるリダイレクトは中止', response is None and len(requested) == 6))
+
+    requested.clear()
+    response, _, _ = timed_fetch(extractor, f'{base}/loop-a')
+    print(f"リダイレクトのループ: {'中止' if response is None else '取得'}（リクエスト {len(requested)}件）")
+    checks.append(('リダイレクトのループを検出して中止', response is None and len(requested) == 2))
+
+    server_process.terminate()
+
+    stats = fetcher.get_stats()
+    print(f"\n統計: 本文 {stats['bodies']}件 / {stats['bytes_read']:,}バイト, 打ち切り {stats['truncated']}件, "
+          f"拒否 {stats['rejected']}件, リダイレクト {stats['redirects']}回 / 中止 {stats['redirect_failures']}件")
+
+    print()
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+
+    passed = all(ok for _, ok in checks)
+    print("\n" + "=" * 60)
+    print("✅ すべてのチェックに合格しました" if passed else "❌ 失敗したチェックがあります")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())